@@ -14,10 +14,18 @@ import re
 import os
 from urllib.parse import urljoin, urlparse
 from datetime import datetime
+import sys
 import requests
 from bs4 import BeautifulSoup
 from config import YOUR_NAME, YOUR_SERVICES, YOUR_VALUE, PERSONALIZATION_RULES, FALLBACK_HOOK
 
+# Shared on-disk page cache from scrape-mails, so re-runs don't refetch homepages
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'scrape-mails', 'anemails'))
+try:
+    from page_cache import cached_get as http_get
+except ImportError:
+    http_get = requests.get
+
 # === SETTINGS ===
 LEADS_FILE = "leads.csv"
 OUTPUT_FILE = "outreach_drafts.txt"
@@ -37,7 +45,7 @@ def fetch_company_snippet(url, max_chars=300):
         return ""
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Research Bot; personal use)'}
-        response = requests.get(url, headers=headers, timeout=10)
+        response = http_get(url, headers=headers, timeout=10)
         response.raise_for_status()
         
         soup = BeautifulSoup(response.text, 'html.parser')
@@ -13,6 +13,7 @@ CONFIGURATION: Set via environment variables or config.yaml
 """
 
 import os
+import sys
 import time
 import csv
 import json
@@ -27,6 +28,19 @@ from pathlib import Path
 from dotenv import load_dotenv
 import googlemaps
 
+# Shared lead scoring rules, keyword matcher and page cache live with the enrichment tools:
+# this script needs the scrape-mails/anemails directory next to scrape-leads, and numpy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scrape-mails" / "anemails"))
+try:
+    from keywords import KeywordMatcher
+    from lead_scoring import RULES as SCORING_RULES, score_row
+    from page_cache import cached_get
+except ImportError as e:
+    raise ImportError(
+        f"{e}. lean_business_scraper.py needs scrape-mails/anemails alongside scrape-leads "
+        "and numpy: pip install -r requirements.txt"
+    )
+
 # ==============================
 # 🔐 CONFIGURATION LOADER
 # ==============================
@@ -227,6 +241,7 @@ B2B_KEYWORDS = [
     "agence", "entreprise", "cabinet", "société",  # French
     "agentur", "unternehmen", "beratung", "kanzlei",  # German
 ]
+B2B_MATCHER = KeywordMatcher.of(B2B_KEYWORDS)
 
 # ==============================
 # 🛠️ GOOGLE MAPS CLIENT FACTORY (COMPATIBLE WITH ALL VERSIONS)
@@ -335,7 +350,7 @@ def extract_email_from_website(base_url, max_attempts=3):
     for path in paths[:max_attempts]:
         try:
             url = urljoin(base_url, path)
-            response = session.get(url, timeout=5, allow_redirects=True)
+            response = cached_get(url, get=session.get, timeout=5, allow_redirects=True)
             if response.status_code != 200:
                 continue
 
@@ -356,62 +371,14 @@ def extract_email_from_website(base_url, max_attempts=3):
 def categorize_business(name, types):
     """Categorize business type."""
     text = f"{name} {' '.join(types)}".lower()
-    for kw in B2B_KEYWORDS:
-        if kw in text:
-            return "B2B"
-    return "B2C"
+    return "B2B" if B2B_MATCHER.search(text) else "B2C"
 
 def score_lead(rating, reviews, has_phone, has_email, has_website, category):
-    """Score lead quality (0-100)."""
-    score = 0
-    tags = []
-
-    # Rating (max 35)
-    if rating >= 4.7:
-        score += 35
-    elif rating >= 4.5:
-        score += 30
-    elif rating >= 4.3:
-        score += 25
-    elif rating >= 4.0:
-        score += 15
-
-    # Reviews (max 25)
-    if reviews >= 150:
-        score += 25
-    elif reviews >= 75:
-        score += 20
-    elif reviews >= 30:
-        score += 15
-    elif reviews >= 10:
-        score += 10
-
-    # Contact info (max 35)
-    if has_email:
-        score += 30
-        tags.append("Email✓")
-    if has_phone:
-        score += 15
-        tags.append("Phone✓")
-    if has_website and not has_email:
-        score += 5
-        tags.append("Website")
-
-    # Category (max 15)
-    if category == "B2B":
-        score += 15
-        tags.append("B2B")
-
-    # Quality tiers
-    if score >= 85:
-        quality = "🔥 HOT"
-    elif score >= 65:
-        quality = "⭐ WARM"
-    elif score >= 45:
-        quality = "💼 POTENTIAL"
-    else:
-        quality = "❄️ COLD"
-
+    """Score lead quality (0-100) with the shared 'places_lead' rules."""
+    score, quality, tags = score_row(SCORING_RULES["places_lead"], {
+        "rating": rating, "review_count": reviews, "phone": has_phone,
+        "email": has_email, "website": has_website, "category": category,
+    })
     return score, quality, "; ".join(tags)
 
 # ==============================
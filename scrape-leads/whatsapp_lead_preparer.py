@@ -15,6 +15,7 @@ POWERED BY: phonenumbers library (Google's libphonenumber)
 import pandas as pd
 import re
 import os
+import sys
 import json
 import logging
 import yaml
@@ -22,6 +23,17 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from collections import defaultdict
 
+# Shared lead scoring rules live with the enrichment tools:
+# this script needs the scrape-mails/anemails directory next to scrape-leads, and numpy
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "scrape-mails" / "anemails"))
+try:
+    from lead_scoring import RULES as SCORING_RULES, score_columns
+except ImportError as e:
+    raise ImportError(
+        f"{e}. whatsapp_lead_preparer.py needs scrape-mails/anemails alongside scrape-leads "
+        "and numpy: pip install -r requirements.txt"
+    )
+
 # Import phonenumbers for international phone validation
 try:
     import phonenumbers
@@ -254,44 +266,10 @@ def deduplicate_leads(df):
 # 🏆 LEAD SCORING
 # ==============================
 
-def calculate_outreach_score(row):
-    """Calculate outreach priority (0-100)."""
-    score = 0
-    
-    quality = str(row.get("lead_quality", "")).upper()
-    if "HOT" in quality or "🔥" in quality:
-        score += 40
-    elif "WARM" in quality or "⭐" in quality:
-        score += 30
-    elif "POTENTIAL" in quality or "💼" in quality:
-        score += 20
-    else:
-        score += 10
-    
-    has_email = pd.notna(row.get("email")) and str(row.get("email")).strip() not in ["", "N/A"]
-    has_website = pd.notna(row.get("website")) and str(row.get("website")).strip() not in ["", "N/A"]
-    has_phone = pd.notna(row.get("e164_phone"))
-    
-    if has_email: score += 20
-    if has_website: score += 10
-    if has_phone: score += 10
-    
-    rating = float(row.get("rating", 0))
-    if rating >= 4.5: score += 15
-    elif rating >= 4.0: score += 10
-    
-    reviews = int(row.get("review_count", 0))
-    if reviews >= 100: score += 5
-    elif reviews >= 30: score += 3
-    
-    return min(score, 100)
-
-def assign_priority(score):
-    """Convert score to priority tier."""
-    if score >= 80: return "🔥 PRIORITY 1"
-    elif score >= 60: return "⭐ PRIORITY 2"
-    elif score >= 40: return "💼 PRIORITY 3"
-    else: return "📋 PRIORITY 4"
+def score_outreach(df):
+    """Outreach score (0-100) and priority tier for every row, as whole columns."""
+    scored = score_columns(SCORING_RULES["outreach"], df, len(df))
+    return scored["score"], scored["tier"]
 
 # ==============================
 # 💬 MESSAGE TEMPLATES
@@ -434,8 +412,7 @@ def prepare_whatsapp_leads():
 
     # Calculate scores
     logger.info("🏆 Calculating outreach scores...")
-    valid_df["outreach_score"] = valid_df.apply(calculate_outreach_score, axis=1)
-    valid_df["priority"] = valid_df["outreach_score"].apply(assign_priority)
+    valid_df["outreach_score"], valid_df["priority"] = score_outreach(valid_df)
 
     # Deduplicate
     valid_df = deduplicate_leads(valid_df)
@@ -0,0 +1,116 @@
+"""
+AIMD (additive-increase / multiplicative-decrease) concurrency controller.
+
+Caps the number of HTTP requests in flight across all sites. Every clean
+response grows the window by 1/window (about +1 per window's worth of
+successes); a timeout, 429, 5xx or a sustained latency blow-up halves it,
+at most once per cooldown so a burst of failures from one bad moment
+counts as a single congestion event. Per-host politeness (the connector's
+limit_per_host and DomainLimiter's delay) is enforced separately and is
+never loosened by this controller.
+"""
+
+import asyncio
+import time
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Optional
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+AIMD_MIN_WINDOW      = 4
+AIMD_MAX_WINDOW      = 100
+AIMD_DECREASE        = 0.5    # multiplicative factor on congestion
+AIMD_COOLDOWN        = 2.0    # seconds between two decreases
+AIMD_LATENCY_FACTOR  = 3.0    # smoothed latency above factor × best smoothed latency = congestion
+AIMD_LATENCY_ALPHA   = 0.1    # EWMA weight of a new latency sample
+
+# outcome labels passed to record()
+OK, TIMEOUT, THROTTLED, SERVER_ERROR, NEUTRAL = 'ok', 'timeout', 'throttled', 'server_error', 'neutral'
+_CONGESTION = frozenset([TIMEOUT, THROTTLED, SERVER_ERROR])
+
+
+def classify_status(status: int) -> str:
+    if status == 429:
+        return THROTTLED
+    if status >= 500:
+        return SERVER_ERROR
+    return OK
+
+
+class AimdController:
+    """Global in-flight request window; use `async with controller.slot():` around each request."""
+    def __init__(self, initial: int, min_window: int = AIMD_MIN_WINDOW, max_window: int = AIMD_MAX_WINDOW,
+                 decrease: float = AIMD_DECREASE, cooldown: float = AIMD_COOLDOWN,
+                 latency_factor: float = AIMD_LATENCY_FACTOR,
+                 clock: Callable[[], float] = time.monotonic):
+        self.min_window     = max(1, min_window)
+        self.max_window     = max(self.min_window, max_window)
+        self._window        = float(min(max(initial, self.min_window), self.max_window))
+        self.decrease       = decrease
+        self.cooldown       = cooldown
+        self.latency_factor = latency_factor
+        self.clock          = clock
+        self.in_flight      = 0
+        self.latency: Optional[float]      = None   # EWMA of successful request latency
+        self.best_latency: Optional[float] = None   # lowest EWMA seen: the uncongested baseline
+        self.counts: Dict[str, int] = dict.fromkeys((OK, TIMEOUT, THROTTLED, SERVER_ERROR, NEUTRAL), 0)
+        self.decreases      = 0
+        self._last_decrease = float('-inf')
+        self._cond          = asyncio.Condition()
+
+    @property
+    def window(self) -> int:
+        return int(self._window)
+
+    # ── admission ──
+    async def acquire(self):
+        async with self._cond:
+            await self._cond.wait_for(lambda: self.in_flight < self.window)
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._cond:
+            self.in_flight -= 1
+            self._cond.notify_all()
+
+    @asynccontextmanager
+    async def slot(self):
+        await self.acquire()
+        try:
+            yield
+        finally:
+            await self.release()
+
+    # ── feedback ──
+    def record(self, outcome: str, latency: Optional[float] = None):
+        self.counts[outcome] = self.counts.get(outcome, 0) + 1
+        if outcome in _CONGESTION:
+            self._decrease()
+            return
+        if outcome != OK:
+            return
+        if latency is not None:
+            a = AIMD_LATENCY_ALPHA
+            self.latency      = latency if self.latency is None else (1 - a) * self.latency + a * latency
+            self.best_latency = self.latency if self.best_latency is None else min(self.best_latency, self.latency)
+            if self.latency > self.latency_factor * self.best_latency:
+                # rebase so a permanently slower network is one event, not a ratchet to min_window
+                self.best_latency = self.latency
+                self._decrease()
+                return
+        self._window = min(self.max_window, self._window + 1.0 / self._window)
+
+    def _decrease(self):
+        now = self.clock()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self._window  = max(float(self.min_window), self._window * self.decrease)
+        self.decreases += 1
+
+    def status(self) -> str:
+        """Short summary for progress logs."""
+        lat = f"{self.latency:.2f}s" if self.latency is not None else '-'
+        return (f"win={self.window} inflight={self.in_flight} lat={lat} "
+                f"timeouts={self.counts[TIMEOUT]} 429={self.counts[THROTTLED]} 5xx={self.counts[SERVER_ERROR]}")
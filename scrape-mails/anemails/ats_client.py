@@ -0,0 +1,297 @@
+"""
+Job-board API client for job_scraper.py (Greenhouse, Lever, SmartRecruiters).
+
+These boards are public JSON APIs served from a handful of shared hosts,
+so the per-domain politeness of polite_get() (robots.txt, one lock per
+base domain, DOMAIN_REQUEST_DELAY apart) put every Greenhouse company in
+one queue behind boards-api.greenhouse.io. Here each API host gets:
+
+  - its own requests.Session, keeping up to ATS_POOL_SIZE connections alive
+    across boards;
+  - a token-bucket rate budget (ATS_RATE_BUDGETS: requests per second and
+    burst) shared by every thread, instead of a fixed 2 s gap;
+  - board JSON kept in a PageCache (ATS_CACHE_DIR). Within ATS_CACHE_TTL a
+    board is served from disk; after that it is revalidated with
+    If-None-Match / If-Modified-Since, and an unchanged board costs a 304.
+
+fetch_many() fetches a list of boards concurrently; job_scraper uses it to
+prefetch the boards it already knows (from the careers discovery cache)
+before its per-company workers start.
+
+    client = shared_client()
+    jobs, note = client.jobs('greenhouse', 'acme')         # note: ok / not_modified / cached / not_found / ...
+    jobs, note, digest = client.board('greenhouse', 'acme', known_hash=digest)   # jobs None: payload unchanged
+    boards = client.fetch_many([('greenhouse', 'acme'), ('lever', 'globex')])
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import quote, urlsplit
+
+from page_cache import PageCache, cached_get
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+ATS_CACHE_DIR   = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'ats_cache')
+ATS_CACHE_TTL   = 30 * 60      # seconds a board is used without asking; later it costs a conditional GET
+ATS_TIMEOUT     = 10
+ATS_RETRIES     = 2
+ATS_POOL_SIZE   = 8            # keep-alive connections per API host
+ATS_CONCURRENCY = 8            # boards in flight in fetch_many()
+ATS_MAX_RETRY_AFTER = 30       # cap on a 429's Retry-After
+# API host -> (requests per second, burst). Far below what the APIs allow; shared by all threads.
+ATS_RATE_BUDGETS = {
+    'boards-api.greenhouse.io': (5.0, 10),
+    'api.lever.co':             (5.0, 10),
+    'api.smartrecruiters.com':  (2.0, 5),
+}
+ATS_DEFAULT_BUDGET = (2.0, 4)
+
+USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36'
+
+
+# ─────────────────────────────────────────────
+# BOARD PAYLOADS
+# ─────────────────────────────────────────────
+
+def parse_greenhouse(data, token: str) -> List[Dict]:
+    jobs = []
+    if isinstance(data, dict):
+        for j in data.get('jobs', []):
+            jobs.append({
+                'job_id': str(j.get('id', '')),
+                'job_title': j.get('title', ''),
+                'job_url': j.get('absolute_url', ''),
+                'location': (j.get('location') or {}).get('name', ''),
+                'department': ', '.join(d.get('name', '') for d in j.get('departments', [])),
+                'posted_date': j.get('updated_at', ''),
+            })
+    return jobs
+
+
+def parse_lever(data, token: str) -> List[Dict]:
+    jobs = []
+    if isinstance(data, list):
+        for j in data:
+            categories = j.get('categories', {}) or {}
+            jobs.append({
+                'job_id': str(j.get('id', '')),
+                'job_title': j.get('text', ''),
+                'job_url': j.get('hostedUrl', ''),
+                'location': categories.get('location', ''),
+                'department': categories.get('team', ''),
+                'posted_date': j.get('createdAt', ''),
+            })
+    return jobs
+
+
+def parse_smartrecruiters(data, token: str) -> List[Dict]:
+    jobs = []
+    if isinstance(data, dict):
+        for j in data.get('content', []):
+            loc = j.get('location', {}) or {}
+            jobs.append({
+                'job_id': str(j.get('id', '')),
+                'job_title': j.get('name', ''),
+                'job_url': f"https://jobs.smartrecruiters.com/{token}/{j.get('id', '')}",
+                'location': loc.get('city', ''),
+                'department': (j.get('department') or {}).get('label', ''),
+                'posted_date': j.get('releasedDate', ''),
+            })
+    return jobs
+
+
+# platform -> (board URL template, payload parser)
+ATS_APIS: Dict[str, Tuple[str, Callable]] = {
+    'greenhouse':      ('https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=false', parse_greenhouse),
+    'lever':           ('https://api.lever.co/v0/postings/{token}?mode=json', parse_lever),
+    'smartrecruiters': ('https://api.smartrecruiters.com/v1/companies/{token}/postings', parse_smartrecruiters),
+}
+
+
+# ─────────────────────────────────────────────
+# RATE BUDGET
+# ─────────────────────────────────────────────
+
+class RateBudget:
+    """Token bucket: `rate` requests per second on average, up to `burst` at once. Thread-safe."""
+
+    def __init__(self, rate: float, burst: int, clock=time.monotonic, sleep=time.sleep):
+        self.rate   = rate
+        self.burst  = max(1, burst)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = float(self.burst)
+        self._stamp  = clock()
+        self._lock   = threading.Lock()
+        self.waited  = 0.0
+
+    def acquire(self):
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._stamp) * self.rate)
+            self._stamp  = now
+            self._tokens -= 1             # reserve now; a deficit is the caller's wait
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+            self.waited += wait
+        if wait:
+            self._sleep(wait)
+
+    def pause(self, seconds: float):
+        """Spend the budget for `seconds` (a 429's Retry-After): later callers wait it out too."""
+        with self._lock:
+            self._tokens = min(self._tokens, 0.0) - seconds * self.rate
+
+
+# ─────────────────────────────────────────────
+# CLIENT
+# ─────────────────────────────────────────────
+
+class AtsClient:
+    """Board fetches with per-host sessions and budgets; see the module docstring."""
+
+    def __init__(self, cache: Optional[PageCache] = None, budgets: Optional[Dict] = None,
+                 apis: Optional[Dict] = None, pool_size: int = ATS_POOL_SIZE, timeout: float = ATS_TIMEOUT):
+        self.cache     = cache if cache is not None else PageCache(root=ATS_CACHE_DIR, ttl=ATS_CACHE_TTL)
+        self.budgets   = dict(ATS_RATE_BUDGETS if budgets is None else budgets)
+        self.apis      = dict(ATS_APIS if apis is None else apis)
+        self.pool_size = pool_size
+        self.timeout   = timeout
+        self._sessions: Dict[str, object] = {}
+        self._buckets:  Dict[str, RateBudget] = {}
+        self._lock     = threading.Lock()
+        self.requests = self.not_modified = self.cached = self.failed = 0
+
+    def board_url(self, platform: str, token: str) -> str:
+        return self.apis[platform][0].format(token=quote(token, safe=''))
+
+    def _host(self, host: str):
+        """(session, budget) for an API host, made on first use."""
+        with self._lock:
+            if host not in self._sessions:
+                import requests
+                from requests.adapters import HTTPAdapter
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                session.headers.update({'User-Agent': USER_AGENT, 'Accept': 'application/json'})
+                self._sessions[host] = session
+                self._buckets[host]  = RateBudget(*self.budgets.get(host, ATS_DEFAULT_BUDGET))
+            return self._sessions[host], self._buckets[host]
+
+    def get_json(self, url: str, known_hash: str = ''):
+        """
+        (decoded JSON or None, note, payload hash). note: ok / not_modified /
+        cached / not_found / ...; 'unchanged' (and no JSON) when the body
+        hashes to `known_hash`, so an unchanged board is not even decoded.
+        """
+        session, budget = self._host(urlsplit(url).hostname or '')
+        note = 'fetch_failed'
+        for attempt in range(ATS_RETRIES + 1):
+            sent = []
+            try:
+                resp = cached_get(url, cache=self.cache, get=session.get, timeout=self.timeout,
+                                  before_request=lambda: (budget.acquire(), sent.append(1)))
+            except Exception:
+                resp = None
+            with self._lock:
+                self.requests += bool(sent)
+            if resp is not None and resp.status_code == 200:
+                if resp.from_cache:
+                    note = 'not_modified' if sent else 'cached'
+                    with self._lock:
+                        self.not_modified += bool(sent)
+                        self.cached       += not sent
+                else:
+                    note = 'ok'
+                digest = payload_hash(resp.content)
+                if digest == known_hash:
+                    return None, 'unchanged', digest
+                try:
+                    return json.loads(resp.content), note, digest
+                except ValueError:
+                    return None, 'invalid_json', ''
+            if resp is not None and resp.status_code in (404, 410):
+                return None, 'not_found', ''
+            if resp is not None and resp.status_code == 429:
+                budget.pause(_retry_after(resp.headers.get('Retry-After')))
+                note = 'rate_limited'
+            elif resp is not None and resp.status_code < 500:
+                return None, f'http_{resp.status_code}', ''
+            if attempt < ATS_RETRIES:
+                time.sleep(random.uniform(0.5, 1.0) * (attempt + 1))
+        with self._lock:
+            self.failed += 1
+        return None, note, ''
+
+    def board(self, platform: str, token: str, known_hash: str = '') -> Tuple[Optional[List[Dict]], str, str]:
+        """(postings, note, payload hash); postings is None when the payload hashes to `known_hash`."""
+        if platform not in self.apis:
+            return [], 'unsupported_ats', ''
+        data, note, digest = self.get_json(self.board_url(platform, token), known_hash)
+        if note == 'unchanged':
+            return None, note, digest
+        return (self.apis[platform][1](data, token) if data is not None else []), note, digest
+
+    def jobs(self, platform: str, token: str) -> Tuple[List[Dict], str]:
+        """A board's postings (job_scraper's job dicts) and how they were obtained."""
+        jobs, note, _ = self.board(platform, token)
+        return jobs, note
+
+    def fetch_many(self, boards: Iterable[Tuple[str, str]], workers: int = ATS_CONCURRENCY) -> Dict:
+        """{(platform, token): (jobs, note)} for many boards, `workers` at a time (each host keeps its budget)."""
+        boards = list(dict.fromkeys(boards))
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as ex:
+            return dict(zip(boards, ex.map(lambda b: self.jobs(*b), boards)))
+
+    def save(self):
+        self.cache.save()
+
+    def close(self):
+        self.save()
+        with self._lock:
+            sessions, self._sessions = list(self._sessions.values()), {}
+        for s in sessions:
+            s.close()
+
+    def summary(self) -> str:
+        return (f"ATS boards: {self.requests} requests, {self.not_modified} unchanged (304), "
+                f"{self.cached} from cache, {self.failed} failed")
+
+
+def payload_hash(body: bytes) -> str:
+    return hashlib.sha1(body).hexdigest()
+
+
+def _retry_after(value) -> float:
+    try:
+        return min(ATS_MAX_RETRY_AFTER, max(1.0, float(value)))
+    except (TypeError, ValueError):
+        return 5.0
+
+
+# ─────────────────────────────────────────────
+# SHARED INSTANCE
+# ─────────────────────────────────────────────
+
+_shared: Optional[AtsClient] = None
+_shared_lock = threading.Lock()
+
+
+def shared_client() -> AtsClient:
+    """Process-wide client over ATS_CACHE_DIR, loaded on first use and saved at exit."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = AtsClient(PageCache.load(ATS_CACHE_DIR, ttl=ATS_CACHE_TTL))
+            atexit.register(_shared.close)
+        return _shared
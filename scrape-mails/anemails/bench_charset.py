@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark: requests' apparent_encoding (detection over the whole body)
+vs fetch_guard.decode_html (header → BOM → <meta> → UTF-8 → bounded detection).
+
+Runs over the pages in the on-disk page cache (fill it with any crawl). If
+the cache holds fewer than --min pages, synthetic farm pages in a mix of
+declared / undeclared UTF-8, Windows-1252 and Windows-1251 are added.
+
+Usage: python bench_charset.py [--cache DIR] [--min 300] [--repeat 3]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from requests.models import Response
+from requests.structures import CaseInsensitiveDict
+
+from fetch_guard import charset_from_bom, charset_from_header, charset_from_meta, decode_html
+from page_cache import PAGE_CACHE_DIR, PageCache
+from sitefarm import FarmConfig, make_spec, render_page
+
+_LOCAL = {
+    'cp1252': 'Müller & Söhne – Größe, déjà vu, café, naïve “quotes”. ',
+    'cp1251': 'Компания предлагает услуги по всей стране. Свяжитесь с нами. ',
+}
+
+
+def cached_pages(root: str):
+    if not os.path.isdir(root):
+        return []
+    return [(p.body, p.headers.get('content-type', ''), None) for p in PageCache.load(root).pages()]
+
+
+def synthetic_pages(n: int, seed: int = 7):
+    """Farm pages, 10-300 KB, in the charset situations crawlers actually meet, with their true text."""
+    rng, cfg, out = random.Random(seed), FarmConfig(sites=n, seed=seed), []
+    for i in range(n):
+        cfg.page_kb = rng.choice((10, 25, 60, 120, 300))
+        html = render_page(cfg, make_spec(cfg, i), '/about')
+        case = rng.choices(('utf8-header', 'utf8-meta', 'utf8-bare', 'cp1252-bare', 'cp1251-meta', 'cp1251-bare'),
+                           (35, 25, 20, 10, 5, 5))[0]
+        charset = 'utf-8' if case.startswith('utf8') else case.split('-')[0]
+        text = _LOCAL.get(charset, 'Ünïcödé “smart” text – ') * 20
+        html = html.replace('<h1>', f'<p>{text}</p><h1>', 1)
+        if case.endswith('meta'):
+            html = html.replace('<head>', f'<head><meta charset="{charset}">', 1)
+        ctype = 'text/html; charset=utf-8' if case == 'utf8-header' else 'text/html'
+        out.append((html.encode(charset), ctype, html))
+    return out
+
+
+def with_apparent_encoding(body: bytes, ctype: str) -> str:
+    r = Response()
+    r._content = body
+    r.headers  = CaseInsensitiveDict({'Content-Type': ctype})
+    r.encoding = r.apparent_encoding or 'utf-8'
+    return r.text
+
+
+def resolved_by(body: bytes, ctype: str) -> str:
+    if charset_from_bom(body):
+        return 'bom'
+    if charset_from_header(ctype):
+        return 'header'
+    if charset_from_meta(body):
+        return 'meta'
+    try:
+        body.decode('utf-8')
+        return 'utf-8'
+    except UnicodeDecodeError:
+        return 'detect'
+
+
+def timed(fn, pages, repeat: int):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t0  = time.perf_counter()
+        out = [fn(b, c) for b, c, _ in pages]
+        best = min(best, time.perf_counter() - t0)
+    return best, out
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--cache', default=PAGE_CACHE_DIR)
+    ap.add_argument('--min', type=int, default=300)
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    pages = cached_pages(args.cache)
+    real  = len(pages)
+    if real < args.min:
+        pages += synthetic_pages(args.min - real)
+    mb = sum(len(b) for b, _, _ in pages) / 1e6
+    steps = {}
+    for b, c, _ in pages:
+        k = resolved_by(b, c)
+        steps[k] = steps.get(k, 0) + 1
+    print(f"{len(pages)} pages ({real} from {args.cache}), {mb:.1f} MB")
+    print("  charset from: " + ', '.join(f'{k} {v}' for k, v in sorted(steps.items(), key=lambda kv: -kv[1])))
+
+    slow, a = timed(with_apparent_encoding, pages, args.repeat)
+    fast, b = timed(decode_html, pages, args.repeat)
+    known = [(i, t) for i, (_, _, t) in enumerate(pages) if t is not None]
+    for name, secs, texts in (('apparent_encoding', slow, a), ('decode_html', fast, b)):
+        right = sum(texts[i] == t for i, t in known)
+        print(f"  {name:<18}: {secs:7.3f}s  {1e3 * secs / len(pages):7.2f} ms/page  {mb / secs:7.1f} MB/s"
+              + (f"  correct {right}/{len(known)} synthetic" if known else ''))
+    same = sum(x == y for x, y in zip(a, b))
+    print(f"  speed-up {slow / fast:.1f}x, identical text on {same}/{len(pages)} pages")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,189 @@
+#!/usr/bin/env python3
+"""
+End-to-end crawler benchmark against the synthetic site farm (sitefarm.py).
+
+Each tool runs in a child process with HTTP_PROXY pointing at the farm, so
+the numbers cover the whole crawl (robots, sitemaps, fetch, parse, output)
+and CPU / peak RSS belong to the tool alone:
+
+    python bench_crawl.py                          # 300 sites, both tools
+    python bench_crawl.py --sites 2000 --tools enrich --no-delay
+
+maps_enrich.py is benchmarked from its enrichment stage: the Google Maps
+stage needs a browser and live Google, so the farm leads stand in for it.
+'maps' is its threaded requests crawler, 'maps-async' the aiohttp engine.
+--no-delay zeroes the per-domain politeness delays (the farm is local),
+which turns the run into a CPU / concurrency benchmark.
+"""
+
+import argparse
+import csv
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sitefarm import FarmConfig, SiteFarm, run_in_thread, site_number
+
+HERE  = os.path.dirname(os.path.abspath(__file__))
+TOOLS = ('enrich', 'maps', 'maps-async')
+
+
+# ─────────────────────────────────────────────
+# CHILD: run one tool on the farm leads
+# ─────────────────────────────────────────────
+
+def child_enrich(input_csv: str, state_dir: str, no_delay: bool):
+    import enrich
+    # learned crawl state must not leak from synthetic sites into real runs
+    enrich.PATH_STATS_FILE = os.path.join(state_dir, 'crawl_path_stats.json')
+    enrich.DNS_CACHE_FILE  = os.path.join(state_dir, 'dns_cache.json')
+    enrich.PAGE_CACHE_DIR  = os.path.join(state_dir, 'page_cache')
+    enrich.ROBOTS_CACHE_FILE = os.path.join(state_dir, 'robots_cache.json')
+    if no_delay:
+        enrich.DOMAIN_DELAY = 0
+    sys.argv = ['enrich.py', input_csv]
+    enrich.main()
+
+
+def child_maps(input_csv: str, state_dir: str, no_delay: bool, engine: str = 'threads'):
+    import checkpoint
+    import maps_enrich
+    import page_cache
+    import robots
+    page_cache.PAGE_CACHE_DIR = os.path.join(state_dir, 'page_cache')
+    robots.ROBOTS_CACHE_FILE  = os.path.join(state_dir, 'robots_cache.json')
+    maps_enrich.PATH_STATS_FILE = os.path.join(state_dir, 'crawl_path_stats.json')
+    if no_delay:
+        maps_enrich.DOMAIN_REQUEST_DELAY = 0
+        maps_enrich.REQUEST_DELAY_MIN = maps_enrich.REQUEST_DELAY_MAX = 0
+    with open(input_csv, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    out = find_output('maps-' + engine if engine != 'threads' else 'maps', input_csv)
+    cp  = checkpoint.checkpoint_path(out)
+    with checkpoint.JsonlCheckpoint(cp) as c:
+        maps_enrich.enrich_rows(rows, c, total=len(rows), engine=engine)
+    checkpoint.write_csv_from_checkpoint(cp, out, maps_enrich.OUTPUT_COLUMNS)
+
+
+# ─────────────────────────────────────────────
+# PARENT: farm + measurement
+# ─────────────────────────────────────────────
+
+def run_child(tool: str, input_csv: str, state_dir: str, proxy: str, no_delay: bool, log_path: str):
+    """Run one tool; returns (wall seconds, cpu seconds, peak RSS MB or None, exit status)."""
+    env = dict(os.environ, HTTP_PROXY=proxy, http_proxy=proxy, NO_PROXY='', no_proxy='')
+    cmd = [sys.executable, os.path.abspath(__file__), '--child', tool, input_csv, state_dir]
+    if no_delay:
+        cmd.append('--no-delay')
+    t0 = time.perf_counter()
+    with open(log_path, 'w', encoding='utf-8') as log:
+        proc = subprocess.Popen(cmd, cwd=state_dir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        if hasattr(os, 'wait4'):
+            _, status, ru = os.wait4(proc.pid, 0)
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            cpu = ru.ru_utime + ru.ru_stime
+            rss = ru.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+        else:                                   # Windows: no rusage for children
+            proc.wait()
+            cpu, rss = None, None
+    return time.perf_counter() - t0, cpu, rss, proc.returncode
+
+
+def score_output(path: str, farm: SiteFarm) -> dict:
+    """Leads written and how many of the discoverable farm emails were found."""
+    leads = found = discoverable = correct = 0
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            leads += 1
+            n = site_number(row.get('website', '').split('//')[-1].split('/')[0])
+            if n is None:
+                continue
+            spec = farm.spec(n)
+            discoverable += spec.email_discoverable
+            found        += bool(row.get('email_primary'))
+            correct      += spec.email in (row.get('email') or '').split('; ')
+    return {'leads': leads, 'found': found, 'correct': correct, 'discoverable': discoverable}
+
+
+def find_output(tool: str, input_csv: str) -> str:
+    base = os.path.splitext(input_csv)[0]
+    if tool.startswith('maps'):
+        return base + '_enriched_' + tool.replace('-', '_') + '.csv'
+    outs = [p for p in glob.glob(base + '_enriched_*.csv')]
+    return max(outs, key=os.path.getmtime) if outs else ''
+
+
+def bench(args):
+    cfg  = FarmConfig(sites=args.sites, seed=args.seed, latency_ms=args.latency_ms,
+                      error_rate=args.error_rate, page_kb=args.page_kb)
+    farm = SiteFarm(cfg)
+    _, stop = run_in_thread(farm)
+    print(f"🌐 Farm: {cfg.sites} sites via {farm.proxy_url}  latency≈{cfg.latency_ms:.0f}ms  "
+          f"errors={cfg.error_rate:.0%}  delays={'off' if args.no_delay else 'on'}")
+
+    results = []
+    try:
+        for tool in args.tools:
+            work = tempfile.mkdtemp(prefix=f'bench_{tool}_')
+            input_csv = os.path.join(work, 'farm_leads.csv')
+            farm.write_leads_csv(input_csv)
+            farm.reset_counters()
+            wall, cpu, rss, code = run_child(tool, input_csv, work, farm.proxy_url, args.no_delay,
+                                             os.path.join(work, 'run.log'))
+            out = find_output(tool, input_csv)
+            if code != 0 or not out:
+                print(f"❌ {tool}: exit {code}, see {os.path.join(work, 'run.log')}")
+                continue
+            q = score_output(out, farm)
+            results.append((tool, wall, cpu, rss, farm.requests, farm.pages, farm.bytes, q, work))
+    finally:
+        stop()
+
+    print(f"\n{'tool':<8} {'leads/min':>10} {'pages/s':>8} {'req/s':>7} {'MB/s':>6} "
+          f"{'CPU s':>7} {'CPU%':>5} {'peak RSS':>9} {'emails':>14}")
+    for tool, wall, cpu, rss, reqs, pages, nbytes, q, work in results:
+        cpu_s   = f"{cpu:7.1f}" if cpu is not None else '    n/a'
+        cpu_pct = f"{100 * cpu / wall:4.0f}%" if cpu is not None else '  n/a'
+        rss_s   = f"{rss:6.0f} MB" if rss is not None else '      n/a'
+        print(f"{tool:<8} {60 * q['leads'] / wall:10.1f} {pages / wall:8.1f} {reqs / wall:7.1f} "
+              f"{nbytes / 1e6 / wall:6.2f} {cpu_s} {cpu_pct} {rss_s} "
+              f"{q['correct']:>5}/{q['discoverable']:<5} ({wall:.0f}s)")
+    print("\nemails = correct farm emails found / emails a crawler could find "
+          "(not JS-only, not robots-blocked, site up)")
+    for tool, *_, work in results:
+        print(f"  {tool}: {work}")
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Benchmark the crawlers against a synthetic site farm')
+    ap.add_argument('--sites', type=int, default=300)
+    ap.add_argument('--tools', default=','.join(TOOLS), help='comma list of: ' + ', '.join(TOOLS))
+    ap.add_argument('--seed', type=int, default=7)
+    ap.add_argument('--latency-ms', type=float, default=40.0)
+    ap.add_argument('--error-rate', type=float, default=0.02)
+    ap.add_argument('--page-kb', type=int, default=25)
+    ap.add_argument('--no-delay', action='store_true', help='zero per-domain politeness delays')
+    ap.add_argument('--child', nargs=3, metavar=('TOOL', 'CSV', 'STATE_DIR'), help=argparse.SUPPRESS)
+    args = ap.parse_args()
+
+    if args.child:
+        tool, input_csv, state_dir = args.child
+        if tool == 'enrich':
+            child_enrich(input_csv, state_dir, args.no_delay)
+        else:
+            child_maps(input_csv, state_dir, args.no_delay, 'async' if tool == 'maps-async' else 'threads')
+        return
+
+    args.tools = [t.strip() for t in args.tools.split(',') if t.strip()]
+    unknown = set(args.tools) - set(TOOLS)
+    if unknown:
+        ap.error(f"unknown tools: {', '.join(sorted(unknown))}")
+    bench(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Keyword classifier benchmark: the `any(kw in text)` loops vs. the compiled KeywordMatcher (keywords.py).
+
+    python bench_keywords.py                  # 2,000 careers-page anchors, 200 site texts of 60 KB
+    python bench_keywords.py --kb 300 --texts 50
+
+Careers-page anchors are short (job titles and navigation links), so
+they show the per-call cost of classify_role() / looks_like_job_title().
+Site texts are whole crawled sites, where detect_tech_stack(),
+estimate_company_size() and has_decision_maker() scan the text once per
+keyword. Every answer is checked against the loops. Only
+looks_like_job_title() uses the matcher: classify_role and the site
+signals measured no faster with it, so they kept their loops and the
+matcher side of those rows is what they would cost.
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import enrich
+import job_scraper
+from keywords import KeywordMatcher
+
+WORDS = ('the we our team and clients services contact about home news solutions customers quality '
+         'support delivery projects partners mission values apply today read more privacy terms').split()
+NAV   = ['Home', 'About us', 'Contact', 'Blog', 'Privacy policy', 'Our team', 'Apply now', 'Read more']
+
+
+ROLE_KEYWORDS    = [kw for kws in job_scraper.ROLE_CATEGORIES.values() for kw in kws]
+TECH_MATCHER     = KeywordMatcher(enrich.TECH_STACK)
+SIZE_MATCHER     = KeywordMatcher(enrich.COMPANY_SIZE)
+DECISION_MATCHER = KeywordMatcher.of(enrich.DECISION_MAKER_TITLES)
+
+
+# ── the loops vs. the matcher ─────────────────
+
+def matcher_classify_role(title):
+    hits = job_scraper.ROLE_MATCHER.hits(title.lower())
+    return next(iter(hits), ''), [kw for kws in hits.values() for kw in kws]
+
+
+def loop_looks_like_job_title(text):
+    text = text.strip()
+    return 4 <= len(text) <= 100 and any(kw in text.lower() for kw in ROLE_KEYWORDS)
+
+
+def loop_site(text_lower):
+    tech = [t for t, inds in enrich.TECH_STACK.items() if any(i in text_lower for i in inds)]
+    size = next((s for s, kws in enrich.COMPANY_SIZE.items() if any(k in text_lower for k in kws)), '')
+    return tech, size, any(t in text_lower for t in enrich.DECISION_MAKER_TITLES)
+
+
+def matcher_site(text_lower):
+    return (TECH_MATCHER.categories_in(text_lower), SIZE_MATCHER.first(text_lower),
+            DECISION_MATCHER.search(text_lower))
+
+
+# ── inputs ────────────────────────────────────
+
+def make_anchors(n, rng):
+    roles = ROLE_KEYWORDS
+    out = []
+    for _ in range(n):
+        r = rng.random()
+        if r < 0.6:
+            out.append(rng.choice(NAV))
+        elif r < 0.8:
+            out.append(f"Senior {rng.choice(roles).title()} ({rng.choice(['Colombo', 'Remote'])})")
+        else:
+            out.append(' '.join(rng.choice(WORDS) for _ in range(rng.randint(2, 6))).title())
+    return out
+
+
+def make_texts(n, kb, rng):
+    extras = [k for kws in enrich.TECH_STACK.values() for k in kws] + list(enrich.DECISION_MAKER_TITLES)
+    texts = []
+    for i in range(n):
+        words, size = [], 0
+        while size < kb * 1024:
+            w = rng.choice(extras) if rng.random() < 0.0005 else rng.choice(WORDS)
+            words.append(w)
+            size += len(w) + 1
+        texts.append(' '.join(words))
+    return texts
+
+
+def timed(fn, items, repeat):
+    best, out = float('inf'), None
+    for _ in range(repeat):
+        t = time.perf_counter()
+        out = [fn(x) for x in items]
+        best = min(best, time.perf_counter() - t)
+    return best, out
+
+
+def report(label, items, old, new, repeat):
+    t_old, a = timed(old, items, repeat)
+    t_new, b = timed(new, items, repeat)
+    assert a == b, f"{label}: answers differ"
+    n = len(items)
+    print(f"  {label:<22} loops {1e6 * t_old / n:9.1f} µs/call   matcher {1e6 * t_new / n:9.1f} µs/call   "
+          f"speed-up {t_old / t_new:5.1f}x")
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--anchors', type=int, default=2000)
+    ap.add_argument('--texts', type=int, default=200)
+    ap.add_argument('--kb', type=int, default=60, help='size of each site text')
+    ap.add_argument('--repeat', type=int, default=3)
+    args = ap.parse_args()
+
+    rng = random.Random(5)
+    anchors = make_anchors(args.anchors, rng)
+    texts   = make_texts(args.texts, args.kb, rng)
+    print(f"{args.anchors:,} anchors, {args.texts} site texts of {args.kb} KB, best of {args.repeat}")
+    report('classify_role', anchors, job_scraper.classify_role, matcher_classify_role, args.repeat)
+    report('looks_like_job_title', anchors, loop_looks_like_job_title, job_scraper.looks_like_job_title,
+           args.repeat)
+    report('site signals', texts, loop_site, matcher_site, args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: lead scoring per row (score_row) vs whole columns (score_columns).
+Usage: python bench_lead_scoring.py [rows] [distinct_emails]
+"""
+
+import os
+import sys
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from lead_scoring import RULES, Columns, best_contact, best_contact_columns, score_columns, score_row
+
+SAMPLE_ROWS = 50_000   # per-row timing is extrapolated from this many rows
+
+
+def make_columns(n: int, emails: int, seed: int = 1) -> dict:
+    rng = np.random.default_rng(seed)
+    locals_ = np.array(['info', 'sales', 'jane.doe', 'noreply', 'support', 'owner'])
+    pool = np.char.add(np.char.add(locals_[rng.integers(0, len(locals_), emails)], '@biz'),
+                       np.char.add(np.arange(emails).astype(str), '.lk'))
+    pool[rng.random(emails) < 0.3] = ''
+    def pick(choices):
+        return np.asarray(choices)[rng.integers(0, len(choices), n)]
+    return {
+        'email_primary':        pool[rng.integers(0, emails, n)],
+        'phone_primary':        pick(['', '+94 11 234 5678']),
+        'social_media_score':   pick(['0', '1', '2', '4', '6']),
+        'decision_maker_found': pick(['Yes', 'No']),
+        'linkedin_company':     pick(['', 'https://linkedin.com/company/acme']),
+        'linkedin_ceo':         pick(['', '', '', 'https://linkedin.com/in/ceo']),
+        'contact_page_found':   pick(['Yes', 'No']),
+        'instagram':            pick(['', 'https://instagram.com/acme']),
+        'facebook':             pick(['', 'https://facebook.com/acme']),
+        'youtube':              pick(['', '', 'https://youtube.com/@acme']),
+    }
+
+
+def main():
+    n      = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    emails = int(sys.argv[2]) if len(sys.argv) > 2 else n // 2
+    cols   = make_columns(n, emails)
+    sets   = ('contact_score', 'contact_confidence', 'contact_methods')
+    print(f"Scoring {n:,} leads ({emails:,} distinct emails) with {', '.join(sets)}")
+
+    start = time.perf_counter()
+    shared = Columns(cols, n)          # email_primary etc. are normalised once for all three rule sets
+    score = score_columns(RULES['contact_score'], shared)['score']
+    conf  = score_columns(RULES['contact_confidence'], shared)['tier']
+    best  = best_contact_columns(RULES['contact_methods'], shared)
+    batch = time.perf_counter() - start
+
+    k = min(n, SAMPLE_ROWS)
+    rows = [{f: c[i] for f, c in cols.items()} for i in range(k)]
+    start = time.perf_counter()
+    for i, row in enumerate(rows):
+        s = score_row(RULES['contact_score'], row)[0]
+        c = score_row(RULES['contact_confidence'], row)[1]
+        b = best_contact(RULES['contact_methods'], row)
+        assert (s, c, b) == (score[i], conf[i], best[i])
+    per_row = (time.perf_counter() - start) * n / k
+
+    print(f"  per row  : {per_row:8.2f}s  ({n / per_row:12,.0f} leads/s, extrapolated from {k:,})")
+    print(f"  columns  : {batch:8.2f}s  ({n / batch:12,.0f} leads/s)")
+    print(f"  speed-up : {per_row / batch:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Google Maps stage benchmark: maps_browser.BrowserPool against the site
+farm's Maps stand-in (sitefarm.py), one child process per run so
+CPU time covers Python, the Playwright driver and Chromium.
+
+    python bench_maps.py                        # 120 places, classic, then pools of 2, 4 and 8 pages, both modes
+    python bench_maps.py --places 300 --pages 4 --modes network --queries 3
+
+Reports businesses per minute and per CPU-minute (businesses / minute /
+core) and KB transferred per business. A pool of 2 pages is one feed tab
+plus one detail tab, i.e. the old one-card-at-a-time scrape without its
+fixed sleeps; the classic run is that scrape itself (mode='classic',
+outside the pool), as the baseline. --profiles full,lean compares the
+default browser with the lean profile (classic has neither and reports
+no traffic); each run starts with an empty asset cache, so with
+--queries 2 or more the later queries show its disk-cache hits.
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from sitefarm import FarmConfig, SiteFarm, run_in_thread
+
+
+def child(pages: int, mode: str, profile: str, places: int, queries: int, proxy: str, maps_url: str):
+    from maps_browser import BrowserPool
+    pool = BrowserPool(size=pages, proxy=proxy, base_url=maps_url, lean=profile == 'lean',
+                       asset_cache=os.path.join(tempfile.mkdtemp(), 'browser_cache'))
+    t0, rows, laps = time.perf_counter(), 0, []
+    for q in range(queries):
+        t = time.perf_counter()
+        rows += len(pool.scrape(f'farm query {q}', max_results=places, mode=mode))
+        laps.append(time.perf_counter() - t)
+    wall = time.perf_counter() - t0
+    pool.close()                                     # reaps the driver, so its CPU lands in RUSAGE_CHILDREN
+    own, kids = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    cpu = own.ru_utime + own.ru_stime + kids.ru_utime + kids.ru_stime
+    print(json.dumps({'pages': pages, 'mode': mode, 'rows': rows, 'wall': wall, 'cpu': cpu, 'queries': laps,
+                      'contexts': pool.contexts_created, 'bytes': pool.traffic.bytes,
+                      'blocked': pool.traffic.blocked, 'from_disk': pool.traffic.from_disk}))
+
+
+def main():
+    ap = argparse.ArgumentParser(description=__doc__.split('\n')[1])
+    ap.add_argument('--places', type=int, default=120)
+    ap.add_argument('--pages', default='2,4,8')
+    ap.add_argument('--modes', default='classic,dom,network')
+    ap.add_argument('--profiles', default='lean', help='full,lean to measure what the lean profile saves')
+    ap.add_argument('--queries', type=int, default=2, help='queries per pool (later ones reuse its contexts)')
+    ap.add_argument('--latency-ms', type=float, default=40.0)
+    ap.add_argument('--child', type=int, help=argparse.SUPPRESS)
+    ap.add_argument('--mode', help=argparse.SUPPRESS)
+    ap.add_argument('--profile', help=argparse.SUPPRESS)
+    ap.add_argument('--proxy', help=argparse.SUPPRESS)
+    ap.add_argument('--maps-url', help=argparse.SUPPRESS)
+    args = ap.parse_args()
+    if args.child:
+        return child(args.child, args.mode, args.profile, args.places, args.queries, args.proxy, args.maps_url)
+
+    farm = SiteFarm(FarmConfig(sites=args.places, latency_ms=args.latency_ms, error_rate=0))
+    _, stop = run_in_thread(farm)
+    print(f"{args.places} places on the farm's Maps, {args.queries} queries per pool, {os.cpu_count()} CPUs")
+    modes = args.modes.split(',')
+    runs  = [('classic', 1)] if 'classic' in modes else []     # its own browser, one tab
+    runs += [('dom', int(p)) for p in args.pages.split(',') if 'dom' in modes]
+    runs += [('network', 2)] if 'network' in modes else []      # network mode only uses the feed page
+    profiles = args.profiles.split(',')
+    runs  = [(m, p, prof) for prof in profiles for m, p in runs if m != 'classic' or prof == profiles[0]]
+    try:
+        for mode, pages, profile in runs:
+            label = f"{mode:<7} {profile:<4} {pages} pages"
+            out = subprocess.run([sys.executable, __file__, '--child', str(pages), '--mode', mode,
+                                  '--profile', profile, '--places', str(args.places),
+                                  '--queries', str(args.queries), '--proxy', farm.proxy_url,
+                                  '--maps-url', farm.maps_url], capture_output=True, text=True)
+            if out.returncode:
+                print(f"  {label}: failed\n{out.stderr[-2000:]}")
+                continue
+            r = json.loads(out.stdout.strip().splitlines()[-1])
+            per_min = 60 * r['rows'] / r['wall']
+            per_cpu = 60 * r['rows'] / r['cpu']
+            laps    = ' / '.join(f"{q:.1f}s" for q in r['queries'])
+            per_biz = r['bytes'] / 1024 / r['rows'] if r['rows'] else 0
+            print(f"  {label}: {r['rows']} businesses in {r['wall']:.1f}s ({laps})  "
+                  f"{per_min:6.0f}/min  {per_cpu:6.0f}/CPU-min  {per_biz:6.0f} KB/business  "
+                  f"cpu {r['cpu']:.1f}s  blocked {r['blocked']}  from disk {r['from_disk']}")
+    finally:
+        stop()
+
+
+if __name__ == '__main__':
+    main()
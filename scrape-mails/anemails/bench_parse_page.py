@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Throughput benchmark: parse_page 'stream' engine vs 'soup' engine.
+Usage: python bench_parse_page.py [pages] [paragraphs_per_page]
+"""
+
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+from enrich import parse_page_soup, parse_page_stream
+
+
+def make_page(rng: random.Random, paragraphs: int) -> str:
+    words = ['growing', 'team', 'services', 'colombo', 'digital', 'marketing', 'clients', 'award']
+    body = []
+    for i in range(paragraphs):
+        text = ' '.join(rng.choice(words) for _ in range(40))
+        body.append(f'<div class="row-{i}"><p>{text}</p><a href="/page-{i}">more</a></div>')
+    return f"""<!DOCTYPE html><html><head><title>Acme</title>
+<script>{'var a=1;' * 500}</script><style>{'.c{{color:red}}' * 300}</style></head>
+<body><header><nav>{''.join(f'<a href="/n{i}">n{i}</a>' for i in range(30))}</nav></header>
+{''.join(body)}
+<p>Contact info@acme.lk or +94 11 234 5678</p>
+<a href="mailto:sales@acme.lk">mail</a><a href="tel:+94112345679">call</a>
+<a href="https://www.linkedin.com/company/acme/">li</a><a href="https://instagram.com/acme">ig</a>
+<footer>© Acme</footer></body></html>"""
+
+
+def bench(fn, pages):
+    start = time.perf_counter()
+    for html in pages:
+        fn(html, 'https://acme.lk/', 'acme.lk')
+    return time.perf_counter() - start
+
+
+def main():
+    n          = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    paragraphs = int(sys.argv[2]) if len(sys.argv) > 2 else 150
+    rng   = random.Random(42)
+    pages = [make_page(rng, paragraphs) for _ in range(n)]
+    mb    = sum(len(p) for p in pages) / 1e6
+
+    print(f"{n} pages, {mb:.1f} MB total ({mb * 1000 / n:.0f} KB/page)")
+    results = {}
+    for name, fn in (('soup', parse_page_soup), ('stream', parse_page_stream)):
+        bench(fn, pages[:5])   # warm-up
+        t = bench(fn, pages)
+        results[name] = t
+        print(f"  {name:<7} {t:6.2f}s  {n / t:7.1f} pages/s  {mb / t:6.1f} MB/s")
+    print(f"  speed-up: {results['soup'] / results['stream']:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Per-company careers discovery cache for job_scraper.py.
+
+Finding a company's careers page means fetching its homepage, ranking
+career-looking links and trying up to six candidates with pauses between
+them, and the answer (careers URL, ATS platform and board token, whether
+the page is a JS-rendered shell) almost never changes. It is kept here,
+keyed by company (checkpoint.row_key of its website), so a warm run goes
+straight to the ATS API or the careers page:
+
+    {"web:acme.lk": ["https://acme.lk/careers", "greenhouse", "acme", false, <expires_at>]}
+
+Entries are trusted for DISCOVERY_TTL, after which the company is
+crawled again; a company where no careers page was found is retried
+after DISCOVERY_MISS_TTL. job_scraper forgets an entry whose board or
+page has gone (404) and rediscovers it in the same run.
+"""
+
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+DISCOVERY_CACHE_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'careers_cache.json')
+DISCOVERY_TTL        = 7 * 24 * 3600     # careers URL / ATS found: rediscover weekly
+DISCOVERY_MISS_TTL   = 24 * 3600         # no careers page found: look again sooner
+
+
+class Discovery(NamedTuple):
+    careers_url: str          # '' when no careers page was found
+    platform:    str          # ATS platform ('' for a plain careers page)
+    token:       str          # ATS board token
+    js_rendered: bool         # careers page is an SPA shell (manual check)
+
+
+class DiscoveryCache:
+    """company -> [careers_url, platform, token, js_rendered, expires_at]; safe to share between threads."""
+
+    def __init__(self, path: Optional[str] = DISCOVERY_CACHE_FILE):
+        self.path = path
+        self._entries: Dict[str, list] = {}
+        self._lock  = threading.Lock()
+        self._dirty = False
+        self.hits = self.misses = 0
+
+    @classmethod
+    def load(cls, path: str = DISCOVERY_CACHE_FILE) -> 'DiscoveryCache':
+        cache = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache._entries = {k: [str(v[0]), str(v[1]), str(v[2]), bool(v[3]), float(v[4])]
+                                  for k, v in json.load(f).items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        return cache
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            now  = time.time()
+            live = {k: v for k, v in self._entries.items() if v[4] > now}
+            tmp  = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(live, f, separators=(',', ':'), sort_keys=True)
+            os.replace(tmp, self.path)
+            self._entries = live
+            self._dirty   = False
+
+    def lookup(self, company: str, now: Optional[float] = None) -> Optional[Discovery]:
+        """The unexpired discovery for a company, or None when it has to be crawled."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            e = self._entries.get(company) if company else None
+            if e is None or e[4] <= now:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return Discovery(*e[:4])
+
+    def record(self, company: str, found: Discovery, now: Optional[float] = None):
+        if not company:
+            return
+        now = now if now is not None else time.time()
+        ttl = DISCOVERY_TTL if found.careers_url else DISCOVERY_MISS_TTL
+        with self._lock:
+            self._entries[company] = [*found, now + ttl]
+            self._dirty = True
+
+    def boards(self, companies: Iterable[str], platforms: Iterable[str],
+               now: Optional[float] = None) -> List[Tuple[str, str]]:
+        """(platform, token) of each cached board on one of `platforms`; not counted as lookups."""
+        now, platforms = now if now is not None else time.time(), set(platforms)
+        with self._lock:
+            entries = [self._entries.get(c) for c in companies if c]
+        return list(dict.fromkeys((e[1], e[2]) for e in entries
+                                  if e is not None and e[4] > now and e[1] in platforms and e[2]))
+
+    def forget(self, company: str):
+        with self._lock:
+            if self._entries.pop(company, None) is not None:
+                self._dirty = True
+
+    def summary(self) -> str:
+        return f"careers discovery: {self.hits} from cache, {self.misses} crawled"
+
+
+# ─────────────────────────────────────────────
+# SHARED INSTANCE
+# ─────────────────────────────────────────────
+
+_shared: Optional[DiscoveryCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> DiscoveryCache:
+    """Process-wide cache in DISCOVERY_CACHE_FILE, loaded on first use and saved at exit."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = DiscoveryCache.load(DISCOVERY_CACHE_FILE)
+            atexit.register(_shared.save)
+        return _shared
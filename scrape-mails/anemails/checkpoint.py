@@ -0,0 +1,126 @@
+"""
+Append-only JSONL checkpoints shared by enrich.py, maps_enrich.py and job_scraper.py.
+
+Each finished row is appended as one JSON line (flushed immediately, fsynced
+in batches), so checkpointing is O(1) per row instead of rewriting the whole
+result set. A run started with --resume finds the newest checkpoint for the
+same input, skips rows whose key is already in it, and keeps appending. The
+final CSV is written by streaming the checkpoint back out.
+"""
+
+import csv
+import glob
+import json
+import os
+from typing import Callable, Dict, Iterator, List, Optional, Set
+
+CHECKPOINT_SUFFIX     = '_checkpoint.jsonl'
+CHECKPOINT_FSYNC_EVERY = 10   # rows between fsyncs; every row is flushed regardless
+
+
+def checkpoint_path(output_path: str) -> str:
+    return output_path[:-4] + CHECKPOINT_SUFFIX if output_path.endswith('.csv') else output_path + CHECKPOINT_SUFFIX
+
+
+def output_path_for(cp_path: str) -> str:
+    return cp_path[:-len(CHECKPOINT_SUFFIX)] + '.csv'
+
+
+def find_latest_checkpoint(pattern_prefix: str) -> Optional[str]:
+    """Newest `<prefix>*_checkpoint.jsonl`, e.g. prefix 'leads_enriched_' for leads.csv runs."""
+    matches = glob.glob(glob.escape(pattern_prefix) + '*' + CHECKPOINT_SUFFIX)
+    return max(matches, key=os.path.getmtime) if matches else None
+
+
+def row_key(row: Dict) -> str:
+    """Resume key for lead rows: place_id if present, else the normalised website."""
+    pid = (row.get('place_id') or '').strip()
+    if pid:
+        return 'pid:' + pid
+    site = (row.get('website') or '').strip().lower()
+    for prefix in ('https://', 'http://'):
+        site = site.removeprefix(prefix)
+    site = site.removeprefix('www.').rstrip('/')
+    return 'web:' + site if site else ''
+
+
+def iter_checkpoint(path: str) -> Iterator[Dict]:
+    """Stream rows back; a torn last line (crash mid-write) is skipped."""
+    try:
+        f = open(path, 'r', encoding='utf-8')
+    except OSError:
+        return
+    with f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def done_keys(path: str, key_fn: Callable[[Dict], str] = row_key) -> Set[str]:
+    return {k for k in (key_fn(r) for r in iter_checkpoint(path)) if k}
+
+
+class JsonlCheckpoint:
+    """Append-only writer. Use as a context manager; close() does a final fsync."""
+    def __init__(self, path: str, fsync_every: int = CHECKPOINT_FSYNC_EVERY):
+        self.path        = path
+        self.fsync_every = max(1, fsync_every)
+        self.rows        = 0
+        self._pending    = 0
+        self._f          = open(path, 'a', encoding='utf-8')
+        # a crash can leave a torn last line; make sure we start on a fresh one
+        if self._f.tell() > 0:
+            with open(path, 'rb') as r:
+                r.seek(-1, os.SEEK_END)
+                if r.read(1) != b'\n':
+                    self._f.write('\n')
+
+    def append(self, row: Dict):
+        self._f.write(json.dumps(row, ensure_ascii=False, separators=(',', ':'), default=str) + '\n')
+        self._f.flush()
+        self.rows     += 1
+        self._pending += 1
+        if self._pending >= self.fsync_every:
+            self.sync()
+
+    def extend(self, rows: List[Dict]):
+        for r in rows:
+            self.append(r)
+
+    def sync(self):
+        if self._f.closed:
+            return
+        self._f.flush()
+        os.fsync(self._f.fileno())
+        self._pending = 0
+
+    def close(self):
+        if not self._f.closed:
+            self.sync()
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_csv_from_checkpoint(cp_path: str, output_path: str, columns: List[str],
+                              on_row: Optional[Callable[[Dict], None]] = None) -> int:
+    """Stream the checkpoint into the final CSV; `on_row` sees each row (for summaries)."""
+    n = 0
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=columns, restval='', extrasaction='ignore')
+        w.writeheader()
+        for row in iter_checkpoint(cp_path):
+            w.writerow(row)
+            if on_row:
+                on_row(row)
+            n += 1
+    return n
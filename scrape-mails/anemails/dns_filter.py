@@ -0,0 +1,156 @@
+"""
+Pre-flight DNS resolution and dead-domain filter.
+
+Scraped `website` values often point at expired domains, and each of those
+otherwise costs several full request timeouts before the crawl gives up.
+Every distinct host is resolved up front, concurrently, and the answers are
+kept in a persistent cache with separate positive / negative TTLs, so rows
+on hosts that do not exist can be failed fast before any HTTP work.
+
+Only a definite "no such host" counts as dead. Timeouts and temporary
+resolver failures are reported as unknown and the row is crawled as usual.
+"""
+
+import asyncio
+import json
+import os
+import socket
+import time
+from typing import Dict, Iterable, List, Optional
+
+from pipeline import stream_map
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+DNS_CACHE_FILE   = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dns_cache.json')
+DNS_POSITIVE_TTL = 24 * 3600   # seconds a resolving host is trusted
+DNS_NEGATIVE_TTL = 6 * 3600    # seconds a dead host stays dead (domains do get re-registered)
+DNS_CONCURRENCY  = 100
+DNS_TIMEOUT      = 5           # seconds per lookup
+
+# getaddrinfo errors that mean the name definitely does not exist
+_NXDOMAIN_ERRNOS = {getattr(socket, n) for n in ('EAI_NONAME', 'EAI_NODATA') if hasattr(socket, n)}
+
+
+# ─────────────────────────────────────────────
+# RESOLVERS
+# ─────────────────────────────────────────────
+
+class SystemResolver:
+    """Resolves with the event loop's getaddrinfo (thread pool, honours /etc/hosts)."""
+    def __init__(self, timeout: float = DNS_TIMEOUT):
+        self.timeout = timeout
+
+    async def resolve(self, host: str) -> Optional[bool]:
+        """True = resolves, False = NXDOMAIN, None = could not tell (timeout, SERVFAIL...)."""
+        loop = asyncio.get_running_loop()
+        try:
+            infos = await asyncio.wait_for(
+                loop.getaddrinfo(host, 443, type=socket.SOCK_STREAM), self.timeout)
+            return bool(infos)
+        except socket.gaierror as e:
+            return False if e.errno in _NXDOMAIN_ERRNOS else None
+        except (asyncio.TimeoutError, OSError, UnicodeError):
+            return None
+
+
+class StubResolver:
+    """Table-driven resolver for tests; unknown hosts resolve to `default`."""
+    def __init__(self, table: Optional[Dict[str, Optional[bool]]] = None,
+                 default: Optional[bool] = True, delay: float = 0.0):
+        self.table   = dict(table or {})
+        self.default = default
+        self.delay   = delay
+        self.calls: List[str] = []
+
+    async def resolve(self, host: str) -> Optional[bool]:
+        self.calls.append(host)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.table.get(host, self.default)
+
+
+# ─────────────────────────────────────────────
+# PERSISTENT CACHE
+# ─────────────────────────────────────────────
+
+class DnsCache:
+    """host -> [alive, expires_at], saved as JSON between runs."""
+    def __init__(self, path: str = DNS_CACHE_FILE,
+                 positive_ttl: float = DNS_POSITIVE_TTL, negative_ttl: float = DNS_NEGATIVE_TTL):
+        self.path         = path
+        self.positive_ttl = positive_ttl
+        self.negative_ttl = negative_ttl
+        self._entries: Dict[str, list] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = DNS_CACHE_FILE, **kw) -> 'DnsCache':
+        cache = cls(path, **kw)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                cache._entries = {h: [bool(v[0]), float(v[1])] for h, v in json.load(f).items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        return cache
+
+    def save(self):
+        if not self._dirty:
+            return
+        now  = time.time()
+        live = {h: v for h, v in self._entries.items() if v[1] > now}
+        tmp  = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(live, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, self.path)
+        self._entries = live
+        self._dirty   = False
+
+    def get(self, host: str, now: Optional[float] = None) -> Optional[bool]:
+        entry = self._entries.get(host)
+        if entry is None or entry[1] <= (now if now is not None else time.time()):
+            return None
+        return entry[0]
+
+    def put(self, host: str, alive: bool, now: Optional[float] = None):
+        now = now if now is not None else time.time()
+        ttl = self.positive_ttl if alive else self.negative_ttl
+        self._entries[host] = [alive, now + ttl]
+        self._dirty = True
+
+
+# ─────────────────────────────────────────────
+# BULK PRE-FLIGHT
+# ─────────────────────────────────────────────
+
+async def resolve_hosts(
+    hosts:       Iterable[str],
+    resolver,
+    cache:       Optional[DnsCache] = None,
+    concurrency: int = DNS_CONCURRENCY,
+) -> Dict[str, Optional[bool]]:
+    """
+    Resolve every distinct host concurrently; cached answers are reused and
+    definite answers are written back. Returns host -> True / False / None.
+    """
+    results: Dict[str, Optional[bool]] = {}
+    todo = []
+    for h in set(hosts):
+        hit = cache.get(h) if cache is not None else None
+        if hit is None:
+            todo.append(h)
+        else:
+            results[h] = hit
+
+    async for host, alive, err in stream_map(todo, resolver.resolve, workers=concurrency):
+        if err is not None:
+            alive = None
+        results[host] = alive
+        if alive is not None and cache is not None:
+            cache.put(host, alive)
+    return results
+
+
+def dead_hosts(results: Dict[str, Optional[bool]]) -> set:
+    return {h for h, alive in results.items() if alive is False}
@@ -4,30 +4,60 @@ Lead Enrichment Tool — async rewrite
 Dependencies: pip install aiohttp beautifulsoup4 lxml
 """
 
+import argparse
 import asyncio
 import aiohttp
-import csv
 import re
 import random
 import os
 import time
 import logging
-from collections import deque
+import math
+from contextlib import nullcontext
 from datetime import datetime
-from typing import Dict, List, Optional, Set, Tuple
+from functools import partial
+from typing import Callable, Dict, List, Optional, Set, Tuple
 from urllib.parse import urlparse, urljoin
-from urllib.robotparser import RobotFileParser
+from urllib.request import getproxies
+
+from aimd import AIMD_MAX_WINDOW, AIMD_MIN_WINDOW, NEUTRAL, OK, TIMEOUT, AimdController, classify_status
+from checkpoint import (
+    JsonlCheckpoint, checkpoint_path, done_keys, find_latest_checkpoint,
+    output_path_for, row_key, write_csv_from_checkpoint,
+)
+from dns_filter import DNS_CACHE_FILE, DnsCache, SystemResolver, dead_hosts, resolve_hosts
+from fetch_guard import decode_html, read_html
+from frontier import (
+    MAX_GUESSES_BLIND, MAX_GUESSES_LINKED, MAX_LINKS_PER_PAGE, PATH_STATS_FILE,
+    PathStats, SiteFrontier,
+)
+from lead_scoring import RULES, Columns, best_contact, best_contact_columns, score_columns, score_email, score_row
+from page_cache import PAGE_CACHE_DIR, PageCache
+from pipeline import count_csv_rows, csv_header, iter_csv_rows, stream_map
+from robots import ROBOTS_CACHE_FILE, AsyncRobots, RobotsStore
+from sitemaps import discover_async
+from telemetry import (
+    INPUT_SOURCE, SiteTelemetry, TelemetryReport, format_summary, summarize, telemetry_path,
+)
 
 # ─────────────────────────────────────────────
 # CONFIG
 # ─────────────────────────────────────────────
 MAX_PAGES_PER_SITE   = 12
-MAX_CONCURRENT_SITES = 20   # global async cap
+MAX_CONCURRENT_SITES = 20   # global async cap (starting window when ADAPTIVE_CONCURRENCY)
+ADAPTIVE_CONCURRENCY = True # AIMD: grow/shrink global in-flight requests from latency, timeouts, 429/5xx
 DOMAIN_CONCURRENCY   = 2    # per-host cap (aiohttp connector)
 REQUEST_TIMEOUT      = 8    # seconds
 DOMAIN_DELAY         = 1.5  # seconds between requests to same host
+MAX_DOMAIN_DELAY     = 30   # per-host delay ceiling after repeated 429s
 MAX_RETRIES          = 2
+DNS_PREFLIGHT        = True  # resolve every host up front; rows on NXDOMAIN hosts skip HTTP
+USE_SITEMAPS         = True  # rank contact/about/team URLs from sitemap.xml before crawling
+PAGE_CACHE           = True  # reuse pages from earlier runs; stale ones cost a conditional GET (page_cache.py)
 CHECKPOINT_EVERY     = 10   # rows
+STREAM_WINDOW        = MAX_CONCURRENT_SITES * 4  # rows read ahead / in flight / awaiting reorder
+ORDERED_OUTPUT       = False  # keep input order in the output (slow rows hold back later ones)
+PARSE_ENGINE         = 'stream'  # 'stream' (lxml SAX, no DOM) or 'soup' (BeautifulSoup)
 
 OUTPUT_COLUMNS = [
     'place_id','business_name','rating','reviews','category','address',
@@ -76,11 +106,7 @@ COMPANY_SIZE: Dict[str, frozenset] = {
     'large':  frozenset(['enterprise','global','multinational','fortune','industry leader']),
 }
 
-EMAIL_SCORE_MAP = {
-    'high': frozenset(['contact','info','hello','hi','sales','inquiries']),
-    'mid':  frozenset(['support','help','service','admin']),
-    'low':  frozenset(['noreply','no-reply','donotreply','mailer-daemon']),
-}
+NOISE_TAGS = frozenset(['script','style','noscript','svg','iframe','nav','footer','header'])
 
 SOCIAL_SKIP_PATHS = frozenset(['pages','groups','events','sharer','share','intent','search','watch','feed','results'])
 
@@ -133,23 +159,21 @@ def normalize_url(url: str) -> Optional[str]:
     return url.rstrip('/')
 
 
+def site_host(url: str) -> str:
+    """Hostname the crawl would connect to, '' if the website is unusable."""
+    url = normalize_url(url)
+    try:
+        return (urlparse(url).hostname or '') if url else ''
+    except ValueError:
+        return ''
+
+
 def base_domain(netloc: str) -> str:
     netloc = netloc.lower().replace('www.','').split(':')[0]
     parts = netloc.split('.')
     return '.'.join(parts[-2:]) if len(parts) >= 2 else netloc
 
 
-def score_email(email: str) -> int:
-    local = email.split('@')[0].lower()
-    for kw in EMAIL_SCORE_MAP['low']:
-        if kw in local: return 2
-    for kw in EMAIL_SCORE_MAP['high']:
-        if kw in local: return 9
-    for kw in EMAIL_SCORE_MAP['mid']:
-        if kw in local: return 6
-    return 7 if '.' in local else 5
-
-
 def is_valid_email(email: str, domain: str) -> bool:
     if SPAM_EMAIL_RE.search(email):
         return False
@@ -191,37 +215,142 @@ def has_decision_maker(text_lower: str) -> bool:
     return any(t in text_lower for t in DECISION_MAKER_TITLES)
 
 
-def calc_lead_score(row: Dict) -> int:
-    s = 0
-    if row.get('email_primary'):
-        s += (score_email(row['email_primary']) / 10) * 35
-    if row.get('phone_primary'):
-        s += 20
-    s += min(int(row.get('social_media_score', 0)) * 2.5, 15)
-    if row.get('decision_maker_found') == 'Yes': s += 15
-    if row.get('linkedin_company'):               s += 10
-    if row.get('contact_page_found') == 'Yes':    s += 5
-    return min(int(s), 100)
+class SiteSignals:
+    """
+    Incremental form of detect_tech_stack / estimate_company_size /
+    has_decision_maker: fed one page at a time, so a site never holds more
+    than the current page. Each detector stops scanning once its answer
+    can no longer change.
+    """
+    __slots__ = ('_techs', '_size_rank', '_employees', 'decision_maker')
 
+    _SIZES = tuple(COMPANY_SIZE)          # keyword priority: small > medium > large
+
+    def __init__(self):
+        self._techs: Set[str]   = set()
+        self._size_rank         = len(self._SIZES)
+        self._employees         = -1       # first "N employees" seen, in page order
+        self.decision_maker     = False
+
+    def feed(self, text_lower: str, html_lower: str):
+        if len(self._techs) < len(TECH_STACK):
+            for t, inds in TECH_STACK.items():
+                if t not in self._techs and any(i in html_lower for i in inds):
+                    self._techs.add(t)
+        if self._size_rank:
+            for rank in range(self._size_rank):
+                if any(kw in text_lower for kw in COMPANY_SIZE[self._SIZES[rank]]):
+                    self._size_rank = rank
+                    break
+        if self._employees < 0 and self._size_rank == len(self._SIZES):
+            m = EMPLOYEE_RE.search(text_lower)
+            if m:
+                self._employees = int(m.group(1))
+        if not self.decision_maker:
+            self.decision_maker = has_decision_maker(text_lower)
 
-def calc_confidence(row: Dict) -> str:
-    s = 0
-    if row.get('email_primary'):    s += score_email(row['email_primary'])
-    if row.get('phone_primary'):    s += 8
-    if row.get('contact_page_found') == 'Yes': s += 5
-    if row.get('linkedin_company'): s += 4
-    return 'High' if s >= 18 else 'Medium' if s >= 10 else 'Low'
+    @property
+    def tech_stack(self) -> List[str]:
+        return [t for t in TECH_STACK if t in self._techs]
 
+    @property
+    def company_size(self) -> str:
+        if self._size_rank < len(self._SIZES):
+            return self._SIZES[self._size_rank]
+        if self._employees >= 0:
+            n = self._employees
+            return 'small' if n < 50 else 'medium' if n < 250 else 'large'
+        return 'unknown'
 
-def best_contact(row: Dict) -> str:
-    methods = []
-    if row.get('email_primary') and score_email(row['email_primary']) >= 7:
-        methods.append('Email')
-    if row.get('phone_primary'):          methods.append('Phone')
-    if row.get('linkedin_company') or row.get('linkedin_ceo'): methods.append('LinkedIn')
-    if row.get('instagram'):              methods.append('Instagram DM')
-    if row.get('facebook'):               methods.append('Facebook Message')
-    return ' → '.join(methods[:2]) if methods else 'Website Form'
+
+# ─────────────────────────────────────────────
+# LEAD SCORING  (rules live in lead_scoring.py)
+# ─────────────────────────────────────────────
+
+class EnrichmentConfig:
+    """Rule sets the enrichment scorer applies; defaults are lead_scoring.RULES."""
+    def __init__(self, rules: Optional[Dict] = None):
+        rules = rules or RULES
+        self.score_rules      = rules['contact_score']
+        self.confidence_rules = rules['contact_confidence']
+        self.contact_rules    = rules['contact_methods']
+
+
+class QuantumLeadScorer:
+    """
+    Scores enriched rows: lead_quality_score, contact_confidence and
+    best_contact_method, plus a few derived hints for outreach. score_lead()
+    handles one row as it is written; score_batch() scores whole columns
+    with numpy and gives the same three values.
+    """
+    COMPLETENESS_FIELDS = ('email_primary', 'phone_primary', 'website', 'linkedin_company',
+                           'decision_maker_found', 'tech_stack_detected', 'company_size_indicator')
+    STRATEGIES = {
+        'Email':            'Personalised cold email',
+        'Phone':            'Call or WhatsApp',
+        'LinkedIn':         'LinkedIn connection + message',
+        'Instagram DM':     'Instagram DM',
+        'Facebook Message': 'Facebook page message',
+        'YouTube Comment':  'Engage on YouTube first',
+    }
+
+    def __init__(self, config: Optional[EnrichmentConfig] = None):
+        self.config = config or EnrichmentConfig()
+
+    def score_lead(self, row: Dict) -> Dict:
+        cfg = self.config
+        score, _, _ = score_row(cfg.score_rules, row)
+        _, confidence, _ = score_row(cfg.confidence_rules, row)
+        action = best_contact(cfg.contact_rules, row)
+        filled = [f for f in self.COMPLETENESS_FIELDS
+                  if row.get(f) not in (None, '', 'No', 'unknown', [])]
+        intent = row.get('intent_keywords_found') or []
+        if isinstance(intent, str):
+            intent = [k.strip() for k in intent.split(',') if k.strip()]
+        engagement = min(100, 10 * int(row.get('social_media_score') or 0) + 15 * len(intent)
+                         + (20 if row.get('decision_maker_found') == 'Yes' else 0))
+        return {
+            'score':            score,
+            'confidence':       confidence,
+            'completeness':     round(100 * len(filled) / len(self.COMPLETENESS_FIELDS)),
+            'next_best_action': action,
+            'recommendations':  self._recommendations(row, filled, intent),
+            'predictive_insights': {
+                # logistic over the score: 50 → 50%, 80 → ~92%, 20 → ~8%
+                'conversion_probability': round(100 / (1 + math.exp(-(score - 50) / 12))),
+            },
+            'behavioral_analysis': {
+                'engagement_score':     engagement,
+                'recommended_strategy': self.STRATEGIES.get(action.split(' → ')[0], 'Website contact form'),
+            },
+        }
+
+    def score_batch(self, columns) -> Dict:
+        """lead_quality_score / contact_confidence / best_contact_method arrays for whole columns."""
+        cfg, cols = self.config, Columns(columns)
+        return {
+            'lead_quality_score':  score_columns(cfg.score_rules, cols)['score'],
+            'contact_confidence':  score_columns(cfg.confidence_rules, cols)['tier'],
+            'best_contact_method': best_contact_columns(cfg.contact_rules, cols),
+        }
+
+    @staticmethod
+    def _recommendations(row: Dict, filled: List[str], intent: List[str]) -> List[str]:
+        recs = []
+        if 'email_primary' not in filled:
+            recs.append('No email found: try the contact form or a named role address')
+        elif score_email(row['email_primary']) < 7:
+            recs.append('Primary email is unlikely to reach a buyer: look for a named sales or owner address')
+        if 'phone_primary' not in filled:
+            recs.append('No phone: reach out on LinkedIn or social instead')
+        if row.get('decision_maker_found') != 'Yes':
+            recs.append('Identify the decision maker before outreach')
+        if intent:
+            recs.append('Buying signals: ' + ', '.join(intent))
+        return recs
+
+
+QUANTUM_SCORER = QuantumLeadScorer(EnrichmentConfig())
 
 
 def make_output_path(input_path: str) -> str:
@@ -240,103 +369,101 @@ def make_output_path(input_path: str) -> str:
 # HTML PARSING  (CPU-bound; runs in executor)
 # ─────────────────────────────────────────────
 
-def parse_page(html: str, page_url: str, site_dom: str) -> Dict:
-    """Single-pass extraction of all data from one page's HTML."""
-    from bs4 import BeautifulSoup
-    try:
-        soup = BeautifulSoup(html, 'lxml')
-    except Exception:
-        soup = BeautifulSoup(html, 'html.parser')
-
-    out: Dict = {
+def _new_page_out(page_url: str) -> Dict:
+    return {
         'emails': set(), 'phones': set(),
         'instagram':'', 'twitter':'', 'linkedin_company':'',
         'linkedin_ceo':'', 'linkedin_founder':'', 'facebook':'', 'youtube':'',
         'is_contact': any(kw in page_url.lower() for kw in CONTACT_KEYWORDS),
         'text_lower': '', 'html_lower': '',
+        'links': [],   # same-site (url, anchor_text) pairs for the frontier
     }
 
-    # ── single pass over <a> tags ──
-    for a in soup.find_all('a', href=True):
-        href: str = (a.get('href') or '').strip()
-        if not href:
-            continue
-        hl = href.lower()
-
-        # mailto
-        if hl.startswith('mailto:'):
-            em = href[7:].split('?')[0].strip().lower()
-            if EMAIL_RE.fullmatch(em) and is_valid_email(em, site_dom):
-                out['emails'].add(em)
-            continue
-
-        # tel
-        if hl.startswith('tel:'):
-            c = clean_phone(href[4:])
-            if c:
-                out['phones'].add(c)
-            continue
-
-        full = urljoin(page_url, href)
-        fl   = full.lower()
-
-        # Instagram
-        if 'instagram.com' in fl and not out['instagram']:
-            m = INSTAGRAM_RE.search(full)
-            if m:
-                u = m.group(1).rstrip('/')
-                if 2 <= len(u) <= 30 and u not in SOCIAL_SKIP_PATHS:
-                    out['instagram'] = f"https://www.instagram.com/{u}/"
 
-        # Twitter / X
-        elif ('twitter.com' in fl or 'x.com' in fl) and not out['twitter']:
-            m = TWITTER_RE.search(full)
-            if m:
-                u = m.group(1).rstrip('/')
-                if 1 <= len(u) <= 15 and u not in SOCIAL_SKIP_PATHS:
-                    out['twitter'] = f"https://x.com/{u}/"
-
-        # LinkedIn company
-        elif 'linkedin.com/company' in fl and not out['linkedin_company']:
-            m = LINKEDIN_CO_RE.search(full)
-            if m:
-                cid = m.group(1)
-                if len(cid) > 1 and not cid.isdigit():
-                    out['linkedin_company'] = f"https://www.linkedin.com/company/{cid}/"
-
-        # LinkedIn personal
-        elif 'linkedin.com/in/' in fl:
-            m = LINKEDIN_IN_RE.search(full)
-            if m:
-                pid = m.group(1)
-                if len(pid) > 2:
-                    anchor = a.get_text(strip=True).lower()
-                    if not out['linkedin_ceo'] and any(t in anchor for t in ('ceo','chief executive')):
-                        out['linkedin_ceo'] = f"https://www.linkedin.com/in/{pid}/"
-                    elif not out['linkedin_founder'] and any(t in anchor for t in ('founder','co-founder')):
-                        out['linkedin_founder'] = f"https://www.linkedin.com/in/{pid}/"
-
-        # Facebook
-        elif 'facebook.com' in fl and not out['facebook']:
-            m = FACEBOOK_RE.search(full)
-            if m:
-                pid = m.group(1)
-                if pid not in SOCIAL_SKIP_PATHS:
-                    out['facebook'] = f"https://www.facebook.com/{pid}/"
+def _apply_link(out: Dict, href: str, page_url: str, site_dom: str,
+                anchor_text: Callable[[], str]) -> None:
+    """Fold one <a href> into `out`. `anchor_text` is only called for LinkedIn profiles."""
+    href = (href or '').strip()
+    if not href:
+        return
+    hl = href.lower()
 
-        # YouTube
-        elif 'youtube.com' in fl and not out['youtube']:
-            m = YOUTUBE_RE.search(full)
-            if m:
-                cid = m.group(2) if len(m.groups()) > 1 else m.group(1)
-                if cid and cid not in SOCIAL_SKIP_PATHS:
-                    out['youtube'] = f"https://www.youtube.com/@{cid}/"
+    # mailto
+    if hl.startswith('mailto:'):
+        em = href[7:].split('?')[0].strip().lower()
+        if EMAIL_RE.fullmatch(em) and is_valid_email(em, site_dom):
+            out['emails'].add(em)
+        return
 
-    # ── strip noise before text extraction ──
-    for tag in soup(['script','style','noscript','svg','iframe','nav','footer','header']):
-        tag.decompose()
+    # tel
+    if hl.startswith('tel:'):
+        c = clean_phone(href[4:])
+        if c:
+            out['phones'].add(c)
+        return
 
-    text       = soup.get_text(separator=' ', strip=True)
+    full = urljoin(page_url, href)
+    fl   = full.lower()
+
+    # same-site link → frontier candidate
+    if (len(out['links']) < MAX_LINKS_PER_PAGE and fl.startswith(('http://','https://'))
+            and base_domain(urlparse(full).netloc) == site_dom):
+        out['links'].append((full, anchor_text()))
+
+    # Instagram
+    if 'instagram.com' in fl and not out['instagram']:
+        m = INSTAGRAM_RE.search(full)
+        if m:
+            u = m.group(1).rstrip('/')
+            if 2 <= len(u) <= 30 and u not in SOCIAL_SKIP_PATHS:
+                out['instagram'] = f"https://www.instagram.com/{u}/"
+
+    # Twitter / X
+    elif ('twitter.com' in fl or 'x.com' in fl) and not out['twitter']:
+        m = TWITTER_RE.search(full)
+        if m:
+            u = m.group(1).rstrip('/')
+            if 1 <= len(u) <= 15 and u not in SOCIAL_SKIP_PATHS:
+                out['twitter'] = f"https://x.com/{u}/"
+
+    # LinkedIn company
+    elif 'linkedin.com/company' in fl and not out['linkedin_company']:
+        m = LINKEDIN_CO_RE.search(full)
+        if m:
+            cid = m.group(1)
+            if len(cid) > 1 and not cid.isdigit():
+                out['linkedin_company'] = f"https://www.linkedin.com/company/{cid}/"
+
+    # LinkedIn personal
+    elif 'linkedin.com/in/' in fl:
+        m = LINKEDIN_IN_RE.search(full)
+        if m:
+            pid = m.group(1)
+            if len(pid) > 2:
+                anchor = anchor_text().lower()
+                if not out['linkedin_ceo'] and any(t in anchor for t in ('ceo','chief executive')):
+                    out['linkedin_ceo'] = f"https://www.linkedin.com/in/{pid}/"
+                elif not out['linkedin_founder'] and any(t in anchor for t in ('founder','co-founder')):
+                    out['linkedin_founder'] = f"https://www.linkedin.com/in/{pid}/"
+
+    # Facebook
+    elif 'facebook.com' in fl and not out['facebook']:
+        m = FACEBOOK_RE.search(full)
+        if m:
+            pid = m.group(1)
+            if pid not in SOCIAL_SKIP_PATHS:
+                out['facebook'] = f"https://www.facebook.com/{pid}/"
+
+    # YouTube
+    elif 'youtube.com' in fl and not out['youtube']:
+        m = YOUTUBE_RE.search(full)
+        if m:
+            cid = m.group(2) if len(m.groups()) > 1 else m.group(1)
+            if cid and cid not in SOCIAL_SKIP_PATHS:
+                out['youtube'] = f"https://www.youtube.com/@{cid}/"
+
+
+def _apply_visible_text(out: Dict, text: str, html: str, site_dom: str) -> Dict:
     text_lower = text.lower()
 
     # emails from visible text
@@ -355,59 +482,162 @@ def parse_page(html: str, page_url: str, site_dom: str) -> Dict:
     return out
 
 
-# ─────────────────────────────────────────────
-# ASYNC INFRASTRUCTURE
-# ─────────────────────────────────────────────
+def parse_page_soup(html: str, page_url: str, site_dom: str) -> Dict:
+    """Reference engine: full BeautifulSoup tree. Used as the fallback for malformed pages."""
+    from bs4 import BeautifulSoup
+    try:
+        soup = BeautifulSoup(html, 'lxml')
+    except Exception:
+        soup = BeautifulSoup(html, 'html.parser')
+
+    out = _new_page_out(page_url)
+
+    # ── single pass over <a> tags ──
+    for a in soup.find_all('a', href=True):
+        _apply_link(out, a.get('href'), page_url, site_dom,
+                    lambda a=a: a.get_text(strip=True))
+
+    # ── strip noise before text extraction ──
+    for tag in soup(list(NOISE_TAGS)):
+        tag.decompose()
+
+    text = soup.get_text(separator=' ', strip=True)
+    return _apply_visible_text(out, text, html, site_dom)
+
+
+class _StreamExtractor:
+    """
+    lxml parser target: receives start/end/data events straight from libxml2,
+    so no tree is ever built. Collects anchors (in document order) and the
+    visible text outside NOISE_TAGS, mirroring BeautifulSoup's get_text().
+    """
+    __slots__ = ('anchors', 'open_anchors', 'texts', '_buf', '_noise', '_raw')
 
-class RobotsCache:
-    """Async robots.txt cache."""
     def __init__(self):
-        self._cache: Dict[str, Optional[RobotFileParser]] = {}
-        self._lock  = asyncio.Lock()
-
-    async def allowed(self, session: aiohttp.ClientSession, url: str) -> bool:
-        p    = urlparse(url)
-        base = f"{p.scheme}://{p.netloc}"
-        async with self._lock:
-            if base in self._cache:
-                rp = self._cache[base]
-                return rp.can_fetch('*', url) if rp else True
-
-        # Fetch robots.txt outside the lock to avoid blocking other coroutines
-        rp = RobotFileParser()
-        rp.set_url(f"{base}/robots.txt")
+        self.anchors: List[Tuple[str, List[str]]] = []
+        self.open_anchors: List[List[str]] = []
+        self.texts: List[str] = []
+        self._buf: List[str] = []
+        self._noise = 0      # depth inside NOISE_TAGS
+        self._raw   = 0      # depth inside script/style (excluded from anchor text too)
+
+    def _flush(self):
+        if not self._buf:
+            return
+        s = ''.join(self._buf).strip()
+        self._buf = []
+        if not s:
+            return
+        if not self._noise:
+            self.texts.append(s)
+        if self.open_anchors and not self._raw:
+            for parts in self.open_anchors:
+                if parts is not None:
+                    parts.append(s)
+
+    def start(self, tag, attrib):
+        self._flush()
+        if tag == 'a' and 'href' in attrib:
+            parts: List[str] = []
+            self.anchors.append((attrib['href'], parts))
+            self.open_anchors.append(parts)
+        elif tag == 'a':
+            self.open_anchors.append(None)  # type: ignore[arg-type]
+        if tag in NOISE_TAGS:
+            self._noise += 1
+        if tag in ('script', 'style'):
+            self._raw += 1
+
+    def end(self, tag):
+        self._flush()
+        if tag == 'a' and self.open_anchors:
+            self.open_anchors.pop()
+        if tag in NOISE_TAGS and self._noise:
+            self._noise -= 1
+        if tag in ('script', 'style') and self._raw:
+            self._raw -= 1
+
+    def data(self, data):
+        self._buf.append(data)
+
+    def comment(self, text):
+        self._flush()
+
+    def pi(self, target, data=None):
+        self._flush()
+
+    def doctype(self, *args):
+        self._flush()
+
+    def close(self):
+        self._flush()
+        return self
+
+
+def parse_page_stream(html: str, page_url: str, site_dom: str) -> Dict:
+    """
+    Fast engine: one streaming pass over libxml2 SAX events (no DOM).
+    Raises on anything libxml2 can't cope with; parse_page() then falls back to soup.
+    """
+    from lxml import etree
+    if '\x00' in html:
+        raise ValueError('NUL bytes in markup')   # libxml2 truncates at NUL
+
+    target = _StreamExtractor()
+    parser = etree.HTMLParser(target=target, recover=True, no_network=True)
+    parser.feed(html)
+    parser.close()
+
+    out = _new_page_out(page_url)
+    for href, parts in target.anchors:
+        _apply_link(out, href, page_url, site_dom, lambda parts=parts: ''.join(parts))
+
+    return _apply_visible_text(out, ' '.join(target.texts), html, site_dom)
+
+
+def parse_page(html: str, page_url: str, site_dom: str, engine: str = '') -> Dict:
+    """Single-pass extraction of all data from one page's HTML."""
+    engine = engine or PARSE_ENGINE
+    if engine == 'stream':
         try:
-            async with session.get(
-                f"{base}/robots.txt",
-                timeout=aiohttp.ClientTimeout(total=5),
-            ) as resp:
-                if resp.status == 200:
-                    rp.parse((await resp.text(errors='replace')).splitlines())
-                else:
-                    rp = None  # type: ignore[assignment]
-        except Exception:
-            rp = None  # type: ignore[assignment]
+            return parse_page_stream(html, page_url, site_dom)
+        except Exception as e:
+            logger.debug(f"stream parse fell back to soup for {page_url}: {e}")
+    return parse_page_soup(html, page_url, site_dom)
 
-        async with self._lock:
-            self._cache[base] = rp
-        return rp.can_fetch('*', url) if rp else True
 
+# ─────────────────────────────────────────────
+# ASYNC INFRASTRUCTURE
+# ─────────────────────────────────────────────
 
 class DomainLimiter:
-    """Per-domain rate limiter using asyncio."""
+    """
+    Per-domain rate limiter using asyncio. A host that answers 429 gets a
+    longer delay; one whose robots.txt sets Crawl-delay never gets less.
+    """
     def __init__(self, delay: float = DOMAIN_DELAY):
         self._delay   = delay
+        self._delays: Dict[str, float] = {}
+        self._floors: Dict[str, float] = {}
         self._last:   Dict[str, float] = {}
         self._locks:  Dict[str, asyncio.Lock] = {}
         self._global  = asyncio.Lock()
 
+    def backoff(self, domain: str):
+        self._delays[domain] = min(MAX_DOMAIN_DELAY, max(1.0, 2 * self._delays.get(domain, self._delay)))
+
+    def respect(self, domain: str, crawl_delay: float):
+        if crawl_delay > self._floors.get(domain, 0):
+            self._floors[domain] = min(crawl_delay, MAX_DOMAIN_DELAY)
+
     async def wait(self, domain: str):
         async with self._global:
             if domain not in self._locks:
                 self._locks[domain] = asyncio.Lock()
         async with self._locks[domain]:
             now  = asyncio.get_event_loop().time()
-            wait = self._delay - (now - self._last.get(domain, 0))
+            gap  = max(self._delays.get(domain, self._delay), self._floors.get(domain, 0))
+            wait = gap - (now - self._last.get(domain, 0))
             if wait > 0:
                 await asyncio.sleep(wait)
             self._last[domain] = asyncio.get_event_loop().time()
@@ -421,40 +651,100 @@ async def fetch_and_parse(
     session:  aiohttp.ClientSession,
     url:      str,
     site_dom: str,
-    robots:   RobotsCache,
+    robots:   AsyncRobots,
     limiter:  DomainLimiter,
     loop:     asyncio.AbstractEventLoop,
+    controller: Optional[AimdController] = None,
+    tel:      Optional[SiteTelemetry] = None,
+    cache:    Optional[PageCache] = None,
 ) -> Optional[Dict]:
-    """Fetch a single URL, parse in thread-pool, return structured data."""
-    if not await robots.allowed(session, url):
+    """
+    Fetch a single URL, parse in thread-pool, return structured data.
+    With a page cache, fresh pages skip the network and stale ones are
+    revalidated with a conditional GET.
+    """
+    dom = base_domain(urlparse(url).netloc)
+    tel = tel if tel is not None else SiteTelemetry(dom)
+
+    rules = await robots.rules(session, url)
+    if not rules.allowed(url):
+        tel.robots_blocked += 1
         return None
 
-    dom = base_domain(urlparse(url).netloc)
+    cached = await loop.run_in_executor(None, cache.get, url) if cache is not None else None
+    if cached is not None and cached.fresh:
+        tel.status('cache')
+        if cached.status != 200:
+            return None
+        return await _parse_into(tel, loop, cached.body, cached.headers.get('content-type', ''), url, site_dom)
+
+    limiter.respect(dom, rules.crawl_delay())
     await limiter.wait(dom)
 
     headers = {'User-Agent': random.choice(USER_AGENTS)}
+    if cached is not None:
+        headers.update(cache.validators(cached))
 
     for attempt in range(MAX_RETRIES + 1):
+        body, ctype, status, store, final_url = None, '', 0, None, ''
+        tel.requests += 1
+        tel.retries  += attempt > 0
         try:
-            async with session.get(
-                url,
-                headers=headers,
-                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
-                allow_redirects=True,
-                ssl=False,
-            ) as resp:
-                if resp.status == 200:
-                    html = await resp.text(errors='replace')
-                    # CPU-bound parsing → thread-pool so event loop stays free
-                    return await loop.run_in_executor(None, parse_page, html, url, site_dom)
-                if resp.status in (403, 404, 410, 429):
-                    return None
+            async with (controller.slot() if controller else nullcontext()):
+                t0, outcome = time.monotonic(), NEUTRAL
+                try:
+                    async with session.get(
+                        url,
+                        headers=headers,
+                        timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT),
+                        allow_redirects=True,
+                        ssl=False,
+                    ) as resp:
+                        tel.ttfb(time.monotonic() - t0)
+                        status, final_url = resp.status, str(resp.url)
+                        outcome = classify_status(status)
+                        tel.status(status)
+                        if status == 200:
+                            # PDFs, images, huge or endless bodies are skipped / cut off unread
+                            body, note = await read_html(resp)
+                            if body is None:
+                                tel.skipped += 1
+                            else:
+                                tel.bytes     += len(body)
+                                tel.truncated += note == 'truncated'
+                                ctype = resp.headers.get('Content-Type', '')
+                                store = (status, dict(resp.headers), body)
+                        elif status == 304 and cached is not None:
+                            # confirms whatever was cached, a 404 included
+                            cache.refresh(url, resp.headers)
+                            if cached.status != 200:
+                                return None
+                            body, ctype = cached.body, cached.headers.get('content-type', '')
+                        elif status in (404, 410):
+                            store = (status, dict(resp.headers), b'')
+                except asyncio.TimeoutError:
+                    outcome = TIMEOUT
+                    raise
+                finally:
+                    if controller:
+                        controller.record(outcome, time.monotonic() - t0 if outcome == OK else None)
+            if cache is not None and store is not None:
+                try:
+                    await loop.run_in_executor(None, partial(cache.put, url, *store, final_url=final_url))
+                except OSError as e:
+                    logger.debug(f"Page cache write failed for {url}: {e}")
+            if body is not None:
+                return await _parse_into(tel, loop, body, ctype, url, site_dom)
+            if status == 429:
+                limiter.backoff(dom)
+            if status in (200, 403, 404, 410, 429):     # 200 here = not a page, no point retrying
+                return None
         except asyncio.TimeoutError:
-            pass
+            tel.status('timeout')
         except aiohttp.ClientError:
-            pass
+            tel.status('error')
         except Exception:
-            pass
+            tel.status('error')
 
         if attempt < MAX_RETRIES:
             await asyncio.sleep(0.5 * (attempt + 1))
@@ -462,15 +752,59 @@ async def fetch_and_parse(
     return None
 
 
+async def _parse_into(tel: SiteTelemetry, loop: asyncio.AbstractEventLoop,
+                      body: bytes, content_type: str, url: str, site_dom: str) -> Dict:
+    # CPU-bound decoding + parsing → thread-pool so event loop stays free
+    page, parse_s = await loop.run_in_executor(None, _timed_parse, body, content_type, url, site_dom)
+    tel.parse_s      += parse_s
+    tel.pages_parsed += 1
+    return page
+
+
+def _timed_parse(body: bytes, content_type: str, page_url: str, site_dom: str) -> Tuple[Dict, float]:
+    t0 = time.perf_counter()
+    return parse_page(decode_html(body, content_type), page_url, site_dom), time.perf_counter() - t0
+
+
+def _absorb_page(agg: Dict, page_data: Dict, url: str = ''):
+    sources = agg['sources']
+    if page_data['emails'] and not agg['emails']:
+        sources['emails'] = url
+    # agg['phones'] may hold the row's own phone (INPUT_SOURCE): credit the first page that adds another
+    if sources.get('phones', INPUT_SOURCE) == INPUT_SOURCE and not page_data['phones'] <= agg['phones']:
+        sources['phones'] = url
+    agg['emails'].update(page_data['emails'])
+    agg['phones'].update(page_data['phones'])
+
+    if page_data['is_contact']:
+        agg['contact_page_found'] = True
+
+    for field in ('instagram','twitter','linkedin_company','linkedin_ceo',
+                  'linkedin_founder','facebook','youtube'):
+        if page_data[field] and not agg[field]:
+            agg[field] = page_data[field]
+            sources[field] = url
+
+    agg['signals'].feed(page_data['text_lower'], page_data['html_lower'])
+
+
 async def scrape_site(
     session:  aiohttp.ClientSession,
     root_url: str,
-    robots:   RobotsCache,
+    robots:   AsyncRobots,
     limiter:  DomainLimiter,
     loop:     asyncio.AbstractEventLoop,
     existing_phone: str = '',
+    stats:    Optional[PathStats] = None,
+    controller: Optional[AimdController] = None,
+    tel:      Optional[SiteTelemetry] = None,
+    cache:    Optional[PageCache] = None,
 ) -> Dict:
-    """Crawl a website and return all enrichment data."""
+    """
+    Crawl a website and return all enrichment data.
+    Homepage first; further pages come from the adaptive frontier, which ranks
+    homepage links (plus a few learned path guesses) and stops at low scores.
+    """
 
     EMPTY: Dict = {
         'emails': set(), 'phones': set(), 'instagram': '', 'twitter': '',
@@ -482,71 +816,87 @@ async def scrape_site(
 
     root_url = normalize_url(root_url)
     if not root_url:
+        if tel is not None:
+            tel.outcome = 'invalid_url'
         return EMPTY
 
     parsed   = urlparse(root_url)
     site_dom = base_domain(parsed.netloc)
-    site_netloc = parsed.netloc
+    stats    = stats if stats is not None else PathStats()
+    tel      = tel if tel is not None else SiteTelemetry(site_dom, root_url)
 
     agg: Dict = {
         'emails': set(), 'phones': set(),
         'instagram':'', 'twitter':'', 'linkedin_company':'',
         'linkedin_ceo':'', 'linkedin_founder':'', 'facebook':'', 'youtube':'',
         'contact_page_found': False,
-        'texts': [], 'htmls': [],
+        'signals': SiteSignals(),
+        'sources': {},   # field -> page it first came from (telemetry)
     }
 
     if existing_phone:
         c = clean_phone(existing_phone)
         if c:
             agg['phones'].add(c)
-
-    # Build prioritised URL queue (deque for O(1) popleft)
-    visited: Set[str] = set()
-    queue: deque = deque(
-        [root_url] + [urljoin(root_url, p) for p in PRIORITY_PATHS]
-    )
-    pages_done = 0
-
-    while queue and pages_done < MAX_PAGES_PER_SITE:
-        # pull a small concurrent batch
+            agg['sources']['phones'] = INPUT_SOURCE
+
+    # ── homepage first: its links seed the frontier ──
+    # (sitemap discovery runs alongside; it reuses the robots.txt fetched here
+    # and takes turns with the page fetches in the site's limiter)
+    frontier = SiteFrontier(stats)
+    frontier.mark_visited(root_url)
+    sitemap_urls: List[str] = []
+    if USE_SITEMAPS:
+        rules = await robots.rules(session, root_url)
+        limiter.respect(site_dom, rules.crawl_delay())
+        home, sitemap_urls = await asyncio.gather(
+            fetch_and_parse(session, root_url, site_dom, robots, limiter, loop, controller, tel, cache),
+            discover_async(session, root_url, rules.sitemaps(),
+                           headers={'User-Agent': random.choice(USER_AGENTS)}, controller=controller,
+                           before_request=partial(limiter.wait, site_dom), allowed=rules.allowed),
+        )
+    else:
+        home = await fetch_and_parse(session, root_url, site_dom, robots, limiter, loop, controller, tel, cache)
+    pages_done = 1
+    if home:
+        _absorb_page(agg, home, root_url)
+        for link, anchor in home['links']:
+            frontier.add_link(link, anchor)
+    for u in sitemap_urls:
+        frontier.add_sitemap_url(u)
+    if not sitemap_urls:
+        frontier.add_guesses(root_url, PRIORITY_PATHS,
+                             MAX_GUESSES_LINKED if home and home['links'] else MAX_GUESSES_BLIND)
+
+    while pages_done < MAX_PAGES_PER_SITE:
+        # pull a small concurrent batch of the best-ranked URLs
         batch: List[str] = []
-        while queue and len(batch) < DOMAIN_CONCURRENCY:
-            url = queue.popleft()
-            if url in visited:
-                continue
+        while len(batch) < min(DOMAIN_CONCURRENCY, MAX_PAGES_PER_SITE - pages_done):
+            url = frontier.pop()
+            if url is None:
+                break
             path_lower = urlparse(url).path.lower()
             if any(path_lower.endswith(ext) for ext in SKIP_EXTENSIONS):
                 continue
             batch.append(url)
-            visited.add(url)
 
         if not batch:
             break
 
         tasks = [
-            fetch_and_parse(session, u, site_dom, robots, limiter, loop)
+            fetch_and_parse(session, u, site_dom, robots, limiter, loop, controller, tel, cache)
             for u in batch
         ]
         pages_done += len(batch)
 
-        for page_data in await asyncio.gather(*tasks, return_exceptions=True):
+        for url, page_data in zip(batch, await asyncio.gather(*tasks, return_exceptions=True)):
             if not page_data or isinstance(page_data, Exception):
+                stats.record(url, hit=False)
                 continue
-
-            agg['emails'].update(page_data['emails'])
-            agg['phones'].update(page_data['phones'])
-
-            if page_data['is_contact']:
-                agg['contact_page_found'] = True
-
-            for field in ('instagram','twitter','linkedin_company','linkedin_ceo',
-                          'linkedin_founder','facebook','youtube'):
-                if page_data[field] and not agg[field]:
-                    agg[field] = page_data[field]
-
-            agg['texts'].append(page_data['text_lower'])
-            agg['htmls'].append(page_data['html_lower'])
+            stats.record(url, hit=bool(page_data['emails'] or page_data['phones']))
+            _absorb_page(agg, page_data, url)
+            for link, anchor in page_data['links']:
+                frontier.add_link(link, anchor)
 
         # early-exit once we have enough data
         if (pages_done >= 3
@@ -556,8 +906,8 @@ async def scrape_site(
                 and agg['instagram']):
             break
 
-    combined_text = ' '.join(agg['texts'])
-    combined_html = ' '.join(agg['htmls'])
+    signals       = agg['signals']
+    tel.field_sources = agg['sources']
     social_score  = sum(1 for f in ('instagram','twitter','linkedin_company','facebook','youtube') if agg[f])
 
     return {
@@ -572,9 +922,9 @@ async def scrape_site(
         'youtube':            agg['youtube'],
         'contact_page_found': agg['contact_page_found'],
         'social_media_score': social_score,
-        'decision_maker_found': has_decision_maker(combined_text),
-        'tech_stack':         detect_tech_stack(combined_html),
-        'company_size':       estimate_company_size(combined_text),
+        'decision_maker_found': signals.decision_maker,
+        'tech_stack':         signals.tech_stack,
+        'company_size':       signals.company_size,
     }
 
 
@@ -585,17 +935,23 @@ async def scrape_site(
 async def process_row(
     row:      Dict,
     session:  aiohttp.ClientSession,
-    robots:   RobotsCache,
+    robots:   AsyncRobots,
     limiter:  DomainLimiter,
     loop:     asyncio.AbstractEventLoop,
+    stats:    Optional[PathStats] = None,
+    controller: Optional[AimdController] = None,
+    report:   Optional[TelemetryReport] = None,
+    cache:    Optional[PageCache] = None,
 ) -> Dict:
     row = row.copy()
     website        = row.get('website','')
     existing_phone = row.get('whatsapp_number','')
     name           = row.get('business_name','Unknown')
+    tel            = SiteTelemetry(site_host(website), website)
 
     try:
-        data = await scrape_site(session, website, robots, limiter, loop, existing_phone)
+        data = await scrape_site(session, website, robots, limiter, loop, existing_phone, stats, controller, tel,
+                                 cache)
 
         primary_email = max(data['emails'], key=score_email) if data['emails'] else ''
         primary_phone = (
@@ -627,17 +983,24 @@ async def process_row(
             row['whatsapp_number'] = ''
             row['phone_primary']   = ''
 
-        row['lead_quality_score'] = str(calc_lead_score(row))
-        row['contact_confidence'] = calc_confidence(row)
-        row['best_contact_method'] = best_contact(row)
+        scored = QUANTUM_SCORER.score_lead(row)
+        row['lead_quality_score']  = str(scored['score'])
+        row['contact_confidence']  = scored['confidence']
+        row['best_contact_method'] = scored['next_best_action']
 
         logger.info(f"✓ {name}: Q={row['lead_quality_score']} C={row['contact_confidence']} "
                     f"E={bool(primary_email)} P={bool(primary_phone)}")
 
+        if tel.outcome == 'ok' and not (data['emails'] or data['phones']):
+            tel.outcome = 'no_contact'
+
     except Exception as e:
         logger.warning(f"✗ {name}: {str(e)[:80]}")
         _blank_row(row, existing_phone)
+        tel.outcome = 'error'
 
+    if report is not None:
+        report.record(tel)
     row['website'] = website
     return row
 
@@ -656,33 +1019,72 @@ def _blank_row(row: Dict, existing_phone: str):
         row['whatsapp_number'] = ''
 
 
+def dead_domain_row(row: Dict, report: Optional[TelemetryReport] = None) -> Dict:
+    """Fast-fail a row whose host did not resolve in the DNS pre-flight."""
+    row = row.copy()
+    logger.info(f"✗ {row.get('business_name','Unknown')}: domain does not resolve — skipped")
+    _blank_row(row, row.get('whatsapp_number',''))
+    if report is not None:
+        report.record(SiteTelemetry(site_host(row.get('website','')), row.get('website','')), 'nxdomain')
+    return row
+
+
 # ─────────────────────────────────────────────
 # CHECKPOINT + OUTPUT
 # ─────────────────────────────────────────────
 
-def save_checkpoint(results: List[Dict], path: str, cols: List[str]):
-    cp = path.replace('.csv','_checkpoint.csv')
+def resolve_output(input_file: str, resume: bool) -> Tuple[str, str, Set[str]]:
+    """(output_path, checkpoint_path, keys already done). Resume reuses the newest checkpoint."""
+    if resume:
+        base = os.path.splitext(os.path.basename(input_file))[0]
+        d    = os.path.dirname(input_file) or '.'
+        cp   = find_latest_checkpoint(os.path.join(d, f'{base}_enriched_'))
+        if cp:
+            return output_path_for(cp), cp, done_keys(cp)
+        logger.info("No checkpoint found to resume — starting fresh.")
+    output_path = make_output_path(input_file)
+    return output_path, checkpoint_path(output_path), set()
+
+
+async def preflight_dns(input_file: str, skip: Optional[Callable[[Dict], bool]],
+                        resolver=None) -> Set[str]:
+    """Resolve every distinct host in the input concurrently; return the dead ones."""
+    t0    = time.time()
+    hosts = {h for h in (site_host(r.get('website','')) for r in iter_csv_rows(input_file, skip)) if h}
+    cache = DnsCache.load(DNS_CACHE_FILE)
+    results = await resolve_hosts(hosts, resolver or SystemResolver(), cache)
+    try:
+        cache.save()
+    except Exception as e:
+        logger.error(f"DNS cache save failed: {e}")
+    dead    = dead_hosts(results)
+    unknown = sum(1 for v in results.values() if v is None)
+    logger.info(f"DNS pre-flight: {len(hosts)} hosts, {len(dead)} dead, {unknown} unresolved "
+                f"({time.time() - t0:.1f}s)")
+    return dead
+
+
+def _proxy_configured() -> bool:
+    proxies = getproxies()
+    return bool(proxies.get('http') or proxies.get('https'))
+
+
+def _save_stats(stats: PathStats):
     try:
-        with open(cp, 'w', newline='', encoding='utf-8') as f:
-            w = csv.DictWriter(f, fieldnames=cols, restval='', extrasaction='ignore')
-            w.writeheader()
-            w.writerows(results)
-        logger.info(f"💾 Checkpoint: {len(results)} rows")
+        stats.save()
     except Exception as e:
-        logger.error(f"Checkpoint failed: {e}")
+        logger.error(f"Path stats save failed: {e}")
 
 
 # ─────────────────────────────────────────────
 # MAIN ASYNC ENTRYPOINT
 # ─────────────────────────────────────────────
 
-async def run(input_file: str):
-    # ── read input ──
+async def run(input_file: str, resume: bool = False, ordered: bool = ORDERED_OUTPUT,
+              resolver=None):
+    # ── read input header (rows are streamed below) ──
     try:
-        with open(input_file, 'r', encoding='utf-8-sig') as f:
-            reader = csv.DictReader(f)
-            rows   = list(reader)
-            in_cols: List[str] = list(reader.fieldnames or [])
+        in_cols: List[str] = csv_header(input_file)
     except Exception as e:
         logger.error(f"Cannot read input: {e}")
         return
@@ -704,98 +1106,155 @@ async def run(input_file: str):
         if f not in out_cols:
             out_cols.append(f)
 
-    output_path = make_output_path(input_file)
-    total       = len(rows)
+    output_path, cp_path, done = resolve_output(input_file, resume)
+    is_done = (lambda r: row_key(r) in done) if done else None
+    try:
+        total, skipped = count_csv_rows(input_file, is_done)
+    except Exception as e:
+        logger.error(f"Cannot read input: {e}")
+        return
+    if done:
+        logger.info(f"↻ Resuming {cp_path}: skipping {skipped} finished leads")
     logger.info(f"Loaded {total} leads  →  {output_path}")
 
     # ── shared async objects ──
-    robots  = RobotsCache()
+    # AIMD window over all in-flight requests; fixed at MAX_CONCURRENT_SITES when not adaptive
+    controller = (AimdController(MAX_CONCURRENT_SITES, AIMD_MIN_WINDOW, AIMD_MAX_WINDOW)
+                  if ADAPTIVE_CONCURRENCY else
+                  AimdController(MAX_CONCURRENT_SITES, MAX_CONCURRENT_SITES, MAX_CONCURRENT_SITES))
+    workers = controller.max_window   # enough sites in progress to fill the largest window
+    robot_store = RobotsStore.load(ROBOTS_CACHE_FILE)
+    robots  = AsyncRobots(controller, robot_store)
     limiter = DomainLimiter(DOMAIN_DELAY)
+    stats   = PathStats.load(PATH_STATS_FILE)
+    pages   = PageCache.load(PAGE_CACHE_DIR) if PAGE_CACHE else None
     loop    = asyncio.get_event_loop()
 
+    # ── DNS pre-flight: dead domains never reach the HTTP stage ──
+    # (behind an HTTP proxy the proxy resolves names, so there is nothing to pre-check)
+    dead: Set[str] = set()
+    if DNS_PREFLIGHT and not _proxy_configured():
+        try:
+            dead = await preflight_dns(input_file, is_done, resolver)
+        except Exception as e:
+            logger.error(f"DNS pre-flight failed, crawling everything: {e}")
+
     connector = aiohttp.TCPConnector(
-        limit=MAX_CONCURRENT_SITES,
+        limit=controller.max_window,
         limit_per_host=DOMAIN_CONCURRENCY,
         ttl_dns_cache=300,
         ssl=False,
         enable_cleanup_closed=True,
     )
 
-    results: List[Dict] = []
     start = time.time()
 
-    async with aiohttp.ClientSession(connector=connector) as session:
-        sem = asyncio.Semaphore(MAX_CONCURRENT_SITES)
+    tel_path = telemetry_path(output_path)
+
+    with JsonlCheckpoint(cp_path, CHECKPOINT_EVERY) as checkpoint, TelemetryReport(tel_path) as report:
+        async with aiohttp.ClientSession(connector=connector, trust_env=True) as session:
+            async def enrich(row: Dict) -> Dict:
+                if dead and site_host(row.get('website','')) in dead:
+                    return dead_domain_row(row, report)
+                return await process_row(row, session, robots, limiter, loop, stats, controller, report, pages)
+
+            i = 0
+            async for _, result, err in stream_map(
+                iter_csv_rows(input_file, is_done), enrich,
+                workers=workers, ordered=ordered, window=max(STREAM_WINDOW, 2 * workers),
+            ):
+                i += 1
+                if err is not None:
+                    logger.error(f"Task error: {err}")
+                else:
+                    checkpoint.append(result)
 
-        async def bounded(row: Dict) -> Dict:
-            async with sem:
-                return await process_row(row, session, robots, limiter, loop)
+                if i % CHECKPOINT_EVERY == 0:
+                    elapsed = time.time() - start
+                    rate    = i / elapsed if elapsed else 1
+                    eta     = (total - i) / rate
+                    logger.info(f"Progress {i}/{total} ({100*i//total}%)  ETA {int(eta//60)}m{int(eta%60)}s"
+                                f"  [{controller.status()}]")
+                    _save_stats(stats)
 
-        tasks = [asyncio.create_task(bounded(r)) for r in rows]
+    _save_stats(stats)
+    try:
+        robot_store.save()
+    except Exception as e:
+        logger.error(f"robots.txt cache save failed: {e}")
+    if pages is not None:
+        try:
+            pages.save()
+        except Exception as e:
+            logger.error(f"Page cache save failed: {e}")
 
-        for i, task in enumerate(asyncio.as_completed(tasks), 1):
-            try:
-                result = await task
-                results.append(result)
-            except Exception as e:
-                logger.error(f"Task error: {e}")
+    # ── write final CSV by streaming the checkpoint ──
+    counts = dict.fromkeys(('total','hq','email','phone','li','dm'), 0)
 
-            if i % CHECKPOINT_EVERY == 0:
-                elapsed = time.time() - start
-                rate    = i / elapsed if elapsed else 1
-                eta     = (total - i) / rate
-                logger.info(f"Progress {i}/{total} ({100*i//total}%)  ETA {int(eta//60)}m{int(eta%60)}s")
-                save_checkpoint(results, output_path, out_cols)
+    def tally(r: Dict):
+        counts['total'] += 1
+        counts['hq']    += int(r.get('lead_quality_score') or 0) >= 70
+        counts['email'] += bool(r.get('email_primary'))
+        counts['phone'] += bool(r.get('phone_primary'))
+        counts['li']    += bool(r.get('linkedin_company'))
+        counts['dm']    += r.get('decision_maker_found') == 'Yes'
 
-    # ── write final CSV ──
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            w = csv.DictWriter(f, fieldnames=out_cols, restval='', extrasaction='ignore')
-            w.writeheader()
-            w.writerows(results)
+        write_csv_from_checkpoint(cp_path, output_path, out_cols, on_row=tally)
     except Exception as e:
-        logger.error(f"Write failed: {e}")
+        logger.error(f"Write failed: {e}  (checkpoint kept: {cp_path})")
         return
 
     # ── clean up checkpoint ──
-    cp = output_path.replace('.csv','_checkpoint.csv')
-    if os.path.exists(cp):
-        os.remove(cp)
+    if os.path.exists(cp_path):
+        os.remove(cp_path)
 
     # ── summary ──
     elapsed  = time.time() - start
-    n        = len(results) or 1
-    hq       = sum(1 for r in results if int(r.get('lead_quality_score',0)) >= 70)
-    w_email  = sum(1 for r in results if r.get('email_primary'))
-    w_phone  = sum(1 for r in results if r.get('phone_primary'))
-    w_li     = sum(1 for r in results if r.get('linkedin_company'))
-    w_dm     = sum(1 for r in results if r.get('decision_maker_found') == 'Yes')
+    n        = counts['total'] or 1
 
     print(f"""
 {'='*60}
 ✅  ENRICHMENT COMPLETE
 {'='*60}
   Output : {output_path}
-  Time   : {int(elapsed//60)}m {int(elapsed%60)}s  ({elapsed/n:.1f}s/lead)
-  Total  : {len(results)}
-  High quality (70+) : {hq} ({100*hq//n}%)
-  With email         : {w_email} ({100*w_email//n}%)
-  With phone         : {w_phone} ({100*w_phone//n}%)
-  With LinkedIn      : {w_li} ({100*w_li//n}%)
-  Decision makers    : {w_dm} ({100*w_dm//n}%)
+  Time   : {int(elapsed//60)}m {int(elapsed%60)}s  ({elapsed/max(total, 1):.1f}s/lead)
+  Total  : {counts['total']}
+  High quality (70+) : {counts['hq']} ({100*counts['hq']//n}%)
+  With email         : {counts['email']} ({100*counts['email']//n}%)
+  With phone         : {counts['phone']} ({100*counts['phone']//n}%)
+  With LinkedIn      : {counts['li']} ({100*counts['li']//n}%)
+  Decision makers    : {counts['dm']} ({100*counts['dm']//n}%)
 {'='*60}""")
 
+    # ── per-domain telemetry ──
+    try:
+        print(f"  Telemetry : {tel_path}\n{format_summary(summarize(tel_path))}\n{'='*60}")
+    except Exception as e:
+        logger.error(f"Telemetry summary failed: {e}")
+    print(f"  {robot_store.summary()}")
+    if pages is not None:
+        print(f"  {pages.summary()}")
+
 
 def main():
+    ap = argparse.ArgumentParser(description='Lead enrichment tool (async edition)')
+    ap.add_argument('input', nargs='?', help='CSV with a website column (prompted if omitted)')
+    ap.add_argument('--resume', action='store_true',
+                    help='continue the newest checkpoint for this input, skipping finished leads')
+    ap.add_argument('--ordered', action='store_true', default=ORDERED_OUTPUT,
+                    help='write rows in input order (buffers rows finished ahead of slower ones)')
+    args = ap.parse_args()
+
     print("\n" + "="*60)
     print("🚀  LEAD ENRICHMENT TOOL  (async edition)")
     print("="*60)
-    f = input("\n📁 CSV file path: ").strip().strip('"').strip("'")
+    f = args.input or input("\n📁 CSV file path: ").strip().strip('"').strip("'")
     if not os.path.exists(f):
         logger.error(f"File not found: {f}")
         return
-    asyncio.run(run(f))
+    asyncio.run(run(f, resume=args.resume, ordered=args.ordered))
 
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,260 @@
+"""
+Size- and type-guarded response reads for the crawlers.
+
+Links found on small business sites point at PDFs, images, videos and the
+odd endless stream as often as at pages. Reading those in full and
+decoding them as text wastes bandwidth and CPU for nothing, so before any
+body is read the Content-Type is checked: HTML is read, known non-HTML
+types are dropped unread, and missing / generic types (text/plain,
+application/octet-stream) are judged from their first bytes. Bodies are
+streamed in READ_CHUNK pieces and cut at MAX_PAGE_BYTES, so no single
+page costs more than that however large it claims (or turns out) to be.
+
+decode_html() picks the charset the way browsers do: BOM, then the HTTP
+header, then <meta charset> near the top, then UTF-8. Only a body that
+declares nothing and is not UTF-8 pays for statistical detection, and
+then over ~1 KB of its non-ASCII text rather than the whole page (which is
+what requests' apparent_encoding does).
+
+    body, note = await read_html(resp)      # aiohttp, note: ok / truncated / not_html / too_large
+    resp = guarded_get(url, **kwargs)       # requests; resp.content is capped, resp.guard = note
+    html = response_html(resp)              # instead of resp.encoding = resp.apparent_encoding
+"""
+
+import codecs
+import re
+from functools import lru_cache
+from typing import Optional, Tuple
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+MAX_PAGE_BYTES = 2 * 1024 * 1024   # body cap per page; longer HTML is parsed up to here
+READ_CHUNK     = 64 * 1024
+META_SNIFF     = 4096              # bytes searched for <meta charset>
+DETECT_SAMPLE  = 1024              # bytes of non-ASCII text given to charset detection
+DETECT_SCAN    = 256 * 1024        # how far into the body to look for them
+DETECT_MIN_HIGH = 8                # fewer non-ASCII bytes than this are too little to go on
+DETECT_CP1252_SLACK = 0.15         # chaos margin within which Windows-1252 wins over other Latin guesses
+HTML_TYPES     = frozenset(['text/html', 'application/xhtml+xml'])
+SNIFF_TYPES    = frozenset(['', 'text/plain', 'application/octet-stream', 'application/unknown',
+                            'unknown/unknown', '*/*'])
+
+# leading bytes of formats that are never HTML
+_BINARY_MAGIC = (b'%PDF', b'\x89PNG', b'GIF8', b'\xff\xd8\xff', b'PK\x03\x04', b'\x1f\x8b',
+                 b'RIFF', b'ID3', b'OggS', b'Rar!', b'7z\xbc\xaf', b'\x00\x00\x00', b'BM', b'%!PS')
+_BOMS = ((codecs.BOM_UTF8, 'utf-8-sig'), (codecs.BOM_UTF16_LE, 'utf-16'), (codecs.BOM_UTF16_BE, 'utf-16'))
+_META_CHARSET = re.compile(rb'<meta[^>]{0,200}?charset\s*=\s*["\']?\s*([A-Za-z0-9_:.\-]{1,40})', re.I)
+_HIGH       = bytes(range(0x80, 0x100))
+_HIGH_BYTES = re.compile(rb'[\x80-\xff]+')
+_LATIN_BLOCKS = ('Basic Latin', 'Latin', 'Control character', 'General Punctuation', 'Currency Symbols')
+# what browsers actually decode these labels as (WHATWG Encoding Standard)
+_BROWSER_ALIASES = {'ascii': 'cp1252', 'latin-1': 'cp1252', 'iso8859-1': 'cp1252'}
+
+
+# ─────────────────────────────────────────────
+# CONTENT TYPE
+# ─────────────────────────────────────────────
+
+def page_kind(content_type: str) -> str:
+    """'html', 'sniff' (decide from the first bytes) or 'other' (skip unread)."""
+    mime = (content_type or '').split(';', 1)[0].strip().lower()
+    if mime in HTML_TYPES:
+        return 'html'
+    return 'sniff' if mime in SNIFF_TYPES else 'other'
+
+
+def looks_like_html(head: bytes) -> bool:
+    """False for bodies that start like a binary file; unknown text is given the benefit of the doubt."""
+    for bom, _ in _BOMS:
+        if head.startswith(bom):
+            return True
+    start = head.lstrip()[:16]
+    return not start.startswith(_BINARY_MAGIC) and b'\x00' not in head[:1024]
+
+
+def content_length(headers) -> Optional[int]:
+    try:
+        return int(headers.get('Content-Length'))
+    except (TypeError, ValueError):
+        return None
+
+
+# ─────────────────────────────────────────────
+# CHARSET
+# ─────────────────────────────────────────────
+
+def normalize_charset(label) -> Optional[str]:
+    """Python codec name for a charset label, None if unknown."""
+    if isinstance(label, bytes):
+        label = label.decode('ascii', 'ignore')
+    try:
+        name = codecs.lookup(label.strip().strip('"\'')).name
+    except (LookupError, AttributeError):
+        return None
+    return _BROWSER_ALIASES.get(name, name)
+
+
+def charset_from_header(content_type: str) -> Optional[str]:
+    if 'charset=' not in (content_type or '').lower():
+        return None
+    label = re.split('charset=', content_type, maxsplit=1, flags=re.I)[1].split(';', 1)[0]
+    return normalize_charset(label)
+
+
+def charset_from_bom(body: bytes) -> Optional[str]:
+    for bom, name in _BOMS:
+        if body.startswith(bom):
+            return name
+    return None
+
+
+def charset_from_meta(body: bytes) -> Optional[str]:
+    m = _META_CHARSET.search(body[:META_SNIFF])
+    return normalize_charset(m.group(1)) if m else None
+
+
+def detection_sample(body: bytes, limit: int = DETECT_SAMPLE, scan: int = DETECT_SCAN) -> bytes:
+    """
+    Non-ASCII runs with a little context, up to `limit` bytes. ASCII markup
+    says nothing about the charset and only dilutes the signal; a small
+    sample also keeps charset_normalizer on its fast path.
+    """
+    out, size, last = [], 0, 0
+    for m in _HIGH_BYTES.finditer(body, 0, scan):
+        start = max(m.start() - 24, last)
+        last  = min(m.end() + 24, len(body))
+        out.append(body[start:last])
+        size += last - start
+        if size >= limit:
+            break
+    return b' '.join(out)[:limit]
+
+
+@lru_cache(maxsize=None)
+def _ascii_compatible(encoding: str) -> bool:
+    try:
+        return '<a href="x">'.encode(encoding) == b'<a href="x">'
+    except (LookupError, UnicodeError):
+        return False
+
+
+def detect_charset(body: bytes) -> Optional[str]:
+    """
+    Statistical guess from detection_sample() (charset_normalizer, shipped
+    with requests). When the best guess is a Latin-script code page,
+    Windows-1252, the web's default for undeclared pages, wins over ones
+    that are barely better.
+    """
+    try:
+        from charset_normalizer import from_bytes
+    except ImportError:
+        return None
+    sample = detection_sample(body)
+    if len(sample) - len(sample.translate(None, _HIGH)) < DETECT_MIN_HIGH:
+        return None                     # a stray accent or two: not worth a guess, cp1252 it is
+    # without a BOM an HTML page is in an ASCII-compatible charset (no UTF-16/32, EBCDIC...)
+    results = [r for r in from_bytes(sample) if _ascii_compatible(r.encoding)]
+    if not results:
+        return None
+    best = results[0]
+    if all(a.startswith(_LATIN_BLOCKS) for a in best.alphabets):
+        for r in results:
+            if 'cp1252' in r.could_be_from_charset and r.chaos <= best.chaos + DETECT_CP1252_SLACK:
+                return 'cp1252'
+    return normalize_charset(best.encoding)
+
+
+def decode_html(body: bytes, content_type: str = '') -> str:
+    """
+    Text of an HTML body: BOM, Content-Type charset, <meta charset>, then
+    UTF-8, then detection over a bounded sample, then Windows-1252.
+    """
+    charset = charset_from_bom(body) or charset_from_header(content_type) or charset_from_meta(body)
+    if charset:
+        return body.decode(charset, errors='replace')
+    try:
+        return body.decode('utf-8')
+    except UnicodeDecodeError as e:
+        # UTF-8 cut mid-character by the byte cap (a lone high byte after pure ASCII proves nothing)
+        if e.reason == 'unexpected end of data' and not body[:e.start].isascii():
+            return body.decode('utf-8', errors='replace')
+    return body.decode(detect_charset(body) or 'cp1252', errors='replace')
+
+
+def response_html(resp) -> str:
+    """decode_html() for a requests.Response (its own .text guesses over the whole body)."""
+    return decode_html(resp.content, resp.headers.get('Content-Type', ''))
+
+
+# ─────────────────────────────────────────────
+# GUARDED READS
+# ─────────────────────────────────────────────
+
+def _precheck(headers, max_bytes: int) -> Tuple[str, Optional[str]]:
+    """(kind, reason to skip without reading or None)."""
+    kind = page_kind(headers.get('Content-Type', ''))
+    if kind == 'other':
+        return kind, 'not_html'
+    length = content_length(headers)
+    if kind == 'sniff' and length is not None and length > max_bytes:
+        return kind, 'too_large'      # an untyped download this big is not a page
+    return kind, None
+
+
+def _accept(chunks: list, chunk: bytes, kind: str, size: int, max_bytes: int) -> Tuple[int, Optional[str]]:
+    """Add a chunk; returns (new size, 'not_html' / 'truncated' when reading should stop)."""
+    if not chunks and kind == 'sniff' and not looks_like_html(chunk):
+        return size, 'not_html'
+    chunks.append(chunk)
+    size += len(chunk)
+    return size, 'truncated' if size >= max_bytes else None
+
+
+async def read_html(resp, max_bytes: int = MAX_PAGE_BYTES) -> Tuple[Optional[bytes], str]:
+    """
+    Body of an aiohttp response if it is (or may be) HTML, at most
+    max_bytes of it. Returns (None, reason) when it was skipped.
+    """
+    kind, skip = _precheck(resp.headers, max_bytes)
+    if skip:
+        return None, skip
+    chunks, size = [], 0
+    async for chunk in resp.content.iter_chunked(READ_CHUNK):
+        size, stop = _accept(chunks, chunk, kind, size, max_bytes)
+        if stop == 'not_html':
+            return None, stop
+        if stop:
+            return b''.join(chunks)[:max_bytes], stop
+    return b''.join(chunks), 'ok'
+
+
+def guarded_get(url: str, get=None, max_bytes: int = MAX_PAGE_BYTES, **kwargs):
+    """
+    requests.get() that streams the body through the same guard. A skipped
+    body comes back empty; `resp.guard` says ok / truncated / not_html /
+    too_large. `get` replaces requests.get (e.g. a Session's).
+    """
+    import requests
+    get  = get or requests.get
+    resp = get(url, stream=True, **kwargs)
+    body, note = b'', 'ok'
+    try:
+        kind, skip = _precheck(resp.headers, max_bytes)
+        if skip:
+            note = skip
+        else:
+            chunks, size = [], 0
+            for chunk in resp.iter_content(READ_CHUNK):
+                size, stop = _accept(chunks, chunk, kind, size, max_bytes)
+                if stop:
+                    note = stop
+                    break
+            if note != 'not_html':
+                body = b''.join(chunks)[:max_bytes]
+    finally:
+        resp.close()
+    resp._content = body
+    resp._content_consumed = True
+    resp.guard = note
+    return resp
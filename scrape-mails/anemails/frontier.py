@@ -0,0 +1,180 @@
+"""
+Adaptive crawl frontier for the enrichers.
+
+Instead of queueing every PRIORITY_PATHS guess blind, a site is crawled
+homepage-first and the links found there are ranked by anchor text, path
+signals and a global per-path hit rate (did this path yield an email or
+phone on other sites?). The hit-rate table is persisted between runs.
+"""
+
+import heapq
+import json
+import os
+import re
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urljoin, urlparse, urlunparse
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+PATH_STATS_FILE  = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'crawl_path_stats.json')
+MIN_LINK_SCORE   = 1.0    # frontier stops handing out URLs below this score
+GUESS_PENALTY    = 3.0    # unlinked guesses must earn their request
+LEARNED_WEIGHT   = 6.0    # weight of the smoothed global hit rate
+PRIOR_HITS       = 1      # Beta prior: (hits + 1) / (tries + 4)
+PRIOR_TRIES      = 4
+MAX_LINKS_PER_PAGE = 300
+MAX_GUESSES_LINKED = 2    # homepage gave us links: guesses are only a safety net
+MAX_GUESSES_BLIND  = 6    # homepage failed or is a JS shell with no links
+SITEMAP_BONUS      = 2.0  # sitemap URLs are known to exist, unlike guesses
+
+ANCHOR_SIGNALS: Dict[str, float] = {
+    'contact': 5, 'get in touch': 5, 'reach us': 4, 'impressum': 4, 'imprint': 4,
+    'about': 3, 'team': 3, 'leadership': 3, 'who we are': 3, 'people': 2,
+    'company': 2, 'locations': 2, 'offices': 2, 'support': 2, 'careers': 1,
+}
+
+PATH_SIGNALS: Dict[str, float] = {
+    'contact': 5, 'get-in-touch': 5, 'reach-us': 4, 'impressum': 4, 'imprint': 4,
+    'about': 3, 'about-us': 3, 'team': 3, 'our-team': 3, 'meet-the-team': 3,
+    'leadership': 3, 'people': 2, 'company': 2, 'locations': 2, 'offices': 2,
+    'support': 2, 'info': 1, 'careers': 1, 'privacy': 0.5,
+    'blog': -2, 'news': -2, 'tag': -3, 'category': -3, 'product': -2, 'products': -2,
+    'shop': -3, 'cart': -4, 'checkout': -4, 'login': -4, 'account': -4, 'wp-content': -5,
+}
+
+_DIGITS_RE  = re.compile(r'\d+')
+_WORD_RE    = re.compile(r'[a-z]+')
+
+# ─────────────────────────────────────────────
+# PURE HELPERS
+# ─────────────────────────────────────────────
+
+def canonical_url(url: str) -> str:
+    """Drop fragment and trailing slash so /contact and /contact/ share one slot."""
+    p = urlparse(url)
+    path = p.path.rstrip('/') or '/'
+    return urlunparse((p.scheme.lower(), p.netloc.lower(), path, '', p.query, ''))
+
+
+def path_key(url: str) -> str:
+    """Site-independent key for hit-rate stats: first two path segments, numbers folded."""
+    segs = [s for s in urlparse(url).path.lower().split('/') if s][:2]
+    return '/' + '/'.join(_DIGITS_RE.sub(':n', s) for s in segs)
+
+
+def _signal(text: str, table: Dict[str, float]) -> float:
+    return max((w for kw, w in table.items() if kw in text), default=0.0)
+
+
+def static_score(url: str, anchor_text: str = '') -> float:
+    """Score from anchor text + path tokens + shape of the URL (no learning)."""
+    p      = urlparse(url)
+    path   = p.path.lower()
+    segs   = [s for s in path.split('/') if s]
+    tokens = set(segs) | set(_WORD_RE.findall(path))   # 'get-in-touch' and 'contact-desk' → 'contact'
+    path_s = max((PATH_SIGNALS.get(t, 0.0) for t in tokens), default=0.0)
+    neg    = min((PATH_SIGNALS.get(t, 0.0) for t in tokens), default=0.0)
+    score  = max(_signal(anchor_text.lower(), ANCHOR_SIGNALS), path_s) + min(neg, 0.0)
+    depth  = len(segs)
+    if depth > 2:
+        score -= 0.5 * (depth - 2)
+    if p.query:
+        score -= 1.0
+    return score
+
+
+# ─────────────────────────────────────────────
+# GLOBAL PATH STATISTICS (persisted)
+# ─────────────────────────────────────────────
+
+class PathStats:
+    """Per-path-key [tries, hits] across all sites, saved as JSON between runs."""
+    def __init__(self, path: str = PATH_STATS_FILE):
+        self.path = path
+        self._stats: Dict[str, List[int]] = {}
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = PATH_STATS_FILE) -> 'PathStats':
+        st = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                st._stats = {k: [int(v[0]), int(v[1])] for k, v in json.load(f).items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        return st
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp = self.path + '.tmp'
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(self._stats, f, separators=(',', ':'), sort_keys=True)
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+    def record(self, url: str, hit: bool):
+        s = self._stats.setdefault(path_key(url), [0, 0])
+        s[0] += 1
+        s[1] += int(hit)
+        self._dirty = True
+
+    def hit_rate(self, url: str) -> float:
+        tries, hits = self._stats.get(path_key(url), (0, 0))
+        return (hits + PRIOR_HITS) / (tries + PRIOR_TRIES)
+
+
+# ─────────────────────────────────────────────
+# PER-SITE FRONTIER
+# ─────────────────────────────────────────────
+
+class SiteFrontier:
+    """Max-priority queue of same-site URLs; stale heap entries are skipped lazily."""
+    def __init__(self, stats: PathStats, min_score: float = MIN_LINK_SCORE):
+        self.stats     = stats
+        self.min_score = min_score
+        self.visited: Set[str] = set()
+        self._best: Dict[str, float] = {}
+        self._heap: List[Tuple[float, int, str]] = []
+        self._seq  = 0
+
+    def score(self, url: str, anchor_text: str = '', guessed: bool = False) -> float:
+        s = static_score(url, anchor_text) + LEARNED_WEIGHT * self.stats.hit_rate(url)
+        return s - GUESS_PENALTY if guessed else s
+
+    def push(self, url: str, score: float):
+        key = canonical_url(url)
+        if key in self.visited or score <= self._best.get(key, float('-inf')):
+            return
+        self._best[key] = score
+        self._seq += 1
+        heapq.heappush(self._heap, (-score, self._seq, key))
+
+    def add_link(self, url: str, anchor_text: str = ''):
+        self.push(url, self.score(url, anchor_text))
+
+    def add_sitemap_url(self, url: str):
+        self.push(url, self.score(url) + SITEMAP_BONUS)
+
+    def add_guesses(self, root_url: str, paths: Iterable[str], limit: int):
+        """Queue only the `limit` best-scoring blind guesses (learned rate + path signal)."""
+        urls   = [urljoin(root_url, p) for p in paths]
+        scored = sorted(((self.score(u, guessed=True), u) for u in urls), key=lambda t: -t[0])
+        for score, url in scored[:limit]:
+            self.push(url, score)
+
+    def mark_visited(self, url: str):
+        self.visited.add(canonical_url(url))
+
+    def pop(self) -> Optional[str]:
+        while self._heap:
+            neg, _, key = heapq.heappop(self._heap)
+            if key in self.visited or -neg < self._best.get(key, float('-inf')):
+                continue
+            if -neg < self.min_score:
+                self._heap.clear()
+                return None
+            self.visited.add(key)
+            return key
+        return None
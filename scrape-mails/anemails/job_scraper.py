@@ -1,18 +1,31 @@
+import argparse
 import csv
+import json
 import re
 import time
 import random
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
-from urllib.robotparser import RobotFileParser
 import os
 import logging
 from concurrent.futures import ThreadPoolExecutor, as_completed
-from collections import defaultdict
+from collections import Counter, defaultdict
 from datetime import datetime
+from itertools import groupby
 from threading import Lock
 
+from ats_client import ATS_APIS, ATS_CONCURRENCY, shared_client as ats_client
+from careers_cache import Discovery, shared_cache as discovery_cache
+from checkpoint import (
+    JsonlCheckpoint, checkpoint_path, done_keys, find_latest_checkpoint,
+    iter_checkpoint, output_path_for, row_key,
+)
+from fetch_guard import response_html
+from keywords import KeywordMatcher
+from page_cache import cached_get
+from postings_index import BOARD_UNCHANGED, CHANGE_COLUMNS, INDEX_FILE, PostingsIndex, posting_key
+from robots import shared_store as robots_store
+
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
@@ -59,7 +72,7 @@ ROLE_CATEGORIES = {
         'erp', 'warehouse', 'fleet', 'shipping', 'freight'
     ]
 }
-ALL_ROLE_KEYWORDS = [kw for kws in ROLE_CATEGORIES.values() for kw in kws]
+ROLE_MATCHER = KeywordMatcher(ROLE_CATEGORIES)
 
 # ATS detection patterns -> (regex, platform name)
 ATS_PATTERNS = {
@@ -75,8 +88,6 @@ ATS_PATTERNS = {
 domain_locks = defaultdict(Lock)
 domain_last_request = {}
 domain_lock_manager = Lock()
-robots_cache = {}
-robots_cache_lock = Lock()
 
 logging.basicConfig(
     level=logging.INFO,
@@ -135,26 +146,14 @@ def extract_base_domain(netloc):
 
 def can_fetch_url(url):
     try:
-        parsed = urlparse(url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
-        with robots_cache_lock:
-            if base_url not in robots_cache:
-                rp = RobotFileParser()
-                rp.set_url(urljoin(base_url, '/robots.txt'))
-                try:
-                    rp.read()
-                    robots_cache[base_url] = rp
-                except Exception:
-                    robots_cache[base_url] = None
-            rp = robots_cache.get(base_url)
-            if rp is None:
-                return True
-            return rp.can_fetch("*", url)
+        return robots_store().allowed(url)
     except Exception:
         return True
 
 
-def rate_limit_domain(domain):
+def rate_limit_domain(domain, crawl_delay=0):
+    """Space requests to a domain by DOMAIN_REQUEST_DELAY, or its robots.txt Crawl-delay if longer."""
+    delay = max(DOMAIN_REQUEST_DELAY, crawl_delay)
     with domain_lock_manager:
         if domain not in domain_locks:
             domain_locks[domain] = Lock()
@@ -163,32 +162,28 @@ def rate_limit_domain(domain):
         now = time.time()
         if domain in domain_last_request:
             elapsed = now - domain_last_request[domain]
-            if elapsed < DOMAIN_REQUEST_DELAY:
-                time.sleep(DOMAIN_REQUEST_DELAY - elapsed)
+            if elapsed < delay:
+                time.sleep(delay - elapsed)
         domain_last_request[domain] = time.time()
 
 
-def polite_get(url, timeout=REQUEST_TIMEOUT, as_json=False):
-    """Robots-aware, rate-limited GET. Returns (BeautifulSoup or dict, status_note)."""
+def polite_get(url, timeout=REQUEST_TIMEOUT):
+    """Robots-aware, rate-limited GET through the shared page cache. Returns (BeautifulSoup, status_note)."""
     if not can_fetch_url(url):
         return None, 'blocked_by_robots'
 
     parsed = urlparse(url)
     domain = extract_base_domain(parsed.netloc)
-    rate_limit_domain(domain)
+    crawl_delay = robots_store().crawl_delay(url)
 
+    # job-board JSON APIs go through ats_client instead (per-host budgets, no domain lock)
     headers = {'User-Agent': random.choice(USER_AGENTS)}
     for attempt in range(MAX_RETRIES + 1):
         try:
-            resp = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+            resp = cached_get(url, before_request=lambda: rate_limit_domain(domain, crawl_delay),
+                              timeout=timeout, headers=headers, allow_redirects=True)
             if resp.status_code == 200:
-                if as_json:
-                    try:
-                        return resp.json(), 'ok'
-                    except Exception:
-                        return None, 'invalid_json'
-                resp.encoding = resp.apparent_encoding or 'utf-8'
-                return BeautifulSoup(resp.text, 'html.parser'), 'ok'
+                return BeautifulSoup(response_html(resp), 'html.parser'), 'ok'
             elif resp.status_code == 404:
                 return None, 'not_found'
         except Exception:
@@ -217,67 +212,7 @@ def looks_like_job_title(text):
     text = text.strip()
     if len(text) < 4 or len(text) > 100:
         return False
-    return any(kw in text.lower() for kw in ALL_ROLE_KEYWORDS)
-
-
-# -----------------------------
-# ATS-SPECIFIC FETCHERS (public job board APIs — no robots.txt issues, meant for embedding)
-# -----------------------------
-def fetch_greenhouse_jobs(token):
-    url = f"https://boards-api.greenhouse.io/v1/boards/{token}/jobs?content=false"
-    data, note = polite_get(url, as_json=True)
-    jobs = []
-    if data and isinstance(data, dict):
-        for j in data.get('jobs', []):
-            jobs.append({
-                'job_title': j.get('title', ''),
-                'job_url': j.get('absolute_url', ''),
-                'location': (j.get('location') or {}).get('name', ''),
-                'department': ', '.join(d.get('name', '') for d in j.get('departments', [])),
-                'posted_date': j.get('updated_at', '')
-            })
-    return jobs
-
-
-def fetch_lever_jobs(site):
-    url = f"https://api.lever.co/v0/postings/{site}?mode=json"
-    data, note = polite_get(url, as_json=True)
-    jobs = []
-    if data and isinstance(data, list):
-        for j in data:
-            categories = j.get('categories', {}) or {}
-            jobs.append({
-                'job_title': j.get('text', ''),
-                'job_url': j.get('hostedUrl', ''),
-                'location': categories.get('location', ''),
-                'department': categories.get('team', ''),
-                'posted_date': j.get('createdAt', '')
-            })
-    return jobs
-
-
-def fetch_smartrecruiters_jobs(company):
-    url = f"https://api.smartrecruiters.com/v1/companies/{company}/postings"
-    data, note = polite_get(url, as_json=True)
-    jobs = []
-    if data and isinstance(data, dict):
-        for j in data.get('content', []):
-            loc = j.get('location', {}) or {}
-            jobs.append({
-                'job_title': j.get('name', ''),
-                'job_url': f"https://jobs.smartrecruiters.com/{company}/{j.get('id', '')}",
-                'location': loc.get('city', ''),
-                'department': (j.get('department') or {}).get('label', ''),
-                'posted_date': j.get('releasedDate', '')
-            })
-    return jobs
-
-
-ATS_FETCHERS = {
-    'greenhouse': fetch_greenhouse_jobs,
-    'lever': fetch_lever_jobs,
-    'smartrecruiters': fetch_smartrecruiters_jobs,
-}
+    return ROLE_MATCHER.search(text.lower())
 
 
 def detect_ats(html_text):
@@ -348,7 +283,88 @@ def page_looks_js_rendered(soup):
     return len(visible_text) < 200
 
 
-def process_company(row):
+def discover_careers(base_url):
+    """(Discovery or None, careers page soup, status note): find_careers_page() plus the ATS and SPA checks."""
+    careers_url, page_soup, homepage_or_note = find_careers_page(base_url)
+    if careers_url is None:
+        if isinstance(homepage_or_note, str):
+            return None, None, homepage_or_note  # homepage unreachable: nothing learned
+        return Discovery('', '', '', False), None, 'careers_page_not_found'
+
+    # Check both the careers page and homepage for ATS fingerprints
+    combined_html = str(page_soup)
+    if isinstance(homepage_or_note, BeautifulSoup):
+        combined_html += str(homepage_or_note)
+
+    platform, token = detect_ats(combined_html)
+    js_rendered = not platform and page_looks_js_rendered(page_soup)
+    return Discovery(careers_url, platform or '', token or '', js_rendered), page_soup, 'ok'
+
+
+def company_jobs(base_row, found, page_soup, index=None, company=''):
+    """
+    Postings for a discovered company; page_soup is None when `found` came
+    from the discovery cache and the careers page has not been fetched.
+    Sets base_row['status'] when there is nothing to list, and returns None
+    when a cached discovery has gone stale (board or careers page now 404s).
+    """
+    if not found.careers_url:
+        base_row['status'] = 'careers_page_not_found'
+        return []
+    base_row['careers_page_url'] = found.careers_url
+    platform, token = found.platform, found.token
+
+    if platform and token and platform in ATS_APIS:
+        # public job-board APIs (meant for embedding): no robots.txt, own rate budget per API host
+        known = index.board_hash(company) if index is not None else ''
+        jobs, note, board_hash = ats_client().board(platform, token, known)
+        if note == 'not_found' and page_soup is None:
+            return None
+        base_row['ats_platform'] = platform
+        base_row['board_hash'] = board_hash
+        if jobs is None:
+            base_row['status'] = BOARD_UNCHANGED
+        elif not jobs and not board_hash:
+            base_row['status'] = f'{platform}_detected_no_jobs_returned'
+        return jobs or []
+    if platform:
+        # Detected an ATS we don't have an API integration for (e.g. Workday — JS-rendered)
+        base_row['ats_platform'] = platform
+        base_row['status'] = f'{platform}_detected_manual_check_needed'
+        return []
+    if found.js_rendered:
+        base_row['status'] = 'likely_js_rendered_manual_check_needed'
+        return []
+    if page_soup is None:
+        page_soup, note = polite_get(found.careers_url)
+        if page_soup is None:
+            if note == 'not_found':
+                return None
+            base_row['status'] = note
+            return []
+    return scrape_generic_jobs(found.careers_url, page_soup)
+
+
+def prefetch_boards(rows, discovery) -> int:
+    """
+    Fetch the ATS boards of companies whose discovery is cached,
+    ATS_CONCURRENCY at a time, into the ATS cache, so process_company()
+    reads them from disk instead of one per company behind the workers.
+    Returns the number of boards fetched.
+    """
+    boards = discovery.boards([company_key(r.get('website')) for r in rows], ATS_APIS)
+    if boards:
+        logger.info(f"📥 Prefetching {len(boards)} known job boards ({ATS_CONCURRENCY} at a time)")
+        ats_client().fetch_many(boards)
+    return len(boards)
+
+
+def process_company(row, index=None, discovery=None):
+    """
+    Rows for one company. With a PostingsIndex, an ATS board whose payload
+    is unchanged is not parsed; with a DiscoveryCache, a company whose
+    careers page is known goes straight to its ATS board or careers page.
+    """
     business_name = row.get('business_name', 'Unknown').strip()
     website = row.get('website', '')
     base_url = normalize_url(website)
@@ -378,42 +394,27 @@ def process_company(row):
         base_row['status'] = 'blocked_by_robots'
         return [base_row]
 
+    company = company_key(website)
     try:
-        result = find_careers_page(base_url)
-        careers_url, page_soup, homepage_or_note = result
-
-        if careers_url is None:
-            note = homepage_or_note if isinstance(homepage_or_note, str) else 'careers_page_not_found'
-            base_row['status'] = note
+        found = discovery.lookup(company) if discovery is not None else None
+        while True:
+            page_soup = None
+            if found is None:
+                found, page_soup, note = discover_careers(base_url)
+                if found is None:
+                    base_row['status'] = note
+                    return [base_row]
+                if discovery is not None:
+                    discovery.record(company, found)
+            jobs = company_jobs(base_row, found, page_soup, index, company)
+            if jobs is not None or page_soup is not None:
+                break
+            # the cached board or careers page has gone: discover the company again
+            discovery.forget(company)
+            found, base_row['careers_page_url'] = None, ''
+
+        if base_row['status']:
             return [base_row]
-
-        base_row['careers_page_url'] = careers_url
-
-        # Check both the careers page and homepage for ATS fingerprints
-        combined_html = str(page_soup)
-        if isinstance(homepage_or_note, BeautifulSoup):
-            combined_html += str(homepage_or_note)
-
-        platform, token = detect_ats(combined_html)
-
-        jobs = []
-        if platform and token and platform in ATS_FETCHERS:
-            jobs = ATS_FETCHERS[platform](token)
-            base_row['ats_platform'] = platform
-            if not jobs:
-                base_row['status'] = f'{platform}_detected_no_jobs_returned'
-                return [base_row]
-        elif platform:
-            # Detected an ATS we don't have an API integration for (e.g. Workday — JS-rendered)
-            base_row['ats_platform'] = platform
-            base_row['status'] = f'{platform}_detected_manual_check_needed'
-            return [base_row]
-        else:
-            if page_looks_js_rendered(page_soup):
-                base_row['status'] = 'likely_js_rendered_manual_check_needed'
-                return [base_row]
-            jobs = scrape_generic_jobs(careers_url, page_soup)
-
         if not jobs:
             base_row['status'] = 'no_jobs_listed'
             return [base_row]
@@ -426,6 +427,7 @@ def process_company(row):
                 continue  # skip postings that don't match your three target role buckets
             any_match = True
             new_row = base_row.copy()
+            new_row['job_id'] = job.get('job_id', '')
             new_row['job_title'] = job['job_title']
             new_row['job_url'] = job['job_url']
             new_row['location'] = job.get('location', '')
@@ -449,28 +451,81 @@ def process_company(row):
         return [base_row]
 
 
-def save_checkpoint(results, output_path, columns):
-    checkpoint_path = output_path.replace('.csv', '_checkpoint.csv')
-    try:
-        with open(checkpoint_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=columns, restval='')
-            writer.writeheader()
-            for row in results:
-                writer.writerow({k: v for k, v in row.items() if k in columns})
-        logger.info(f"💾 Checkpoint saved: {len(results)} rows")
-    except Exception as e:
-        logger.error(f"Failed to save checkpoint: {e}")
+def company_key(website):
+    """Resume key shared by input rows ('website') and output rows ('company_website')."""
+    return row_key({'website': website or ''})
+
+
+def diff_against_index(cp_path, index, output_path, full=False, on_row=None):
+    """
+    Fold the checkpoint into `index` and write the run's CSV as it goes:
+    the postings added, changed or removed since the last run, or with
+    `full` every row of the run, the change marked on postings that have
+    one. Returns {change: count}.
+
+    A company's rows are written to the checkpoint together (one extend()
+    per company), so they are diffed one company at a time; only the
+    removed postings are held back, to go at the end of the file.
+    """
+    now = datetime.now().strftime('%Y-%m-%d %H:%M')
+    counts, removed = Counter(), []
+    with open(output_path, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS + CHANGE_COLUMNS, restval='', extrasaction='ignore')
+        w.writeheader()
+        def rows():
+            for r in iter_checkpoint(cp_path):
+                if on_row:
+                    on_row(r)
+                yield r
+
+        for company, group in groupby(rows(), key=lambda r: company_key(r.get('company_website'))):
+            company_rows = list(group)
+            changes = index.diff(company, company_rows, now)
+            counts.update(c['change'] for c in changes)
+            removed += [c for c in changes if c['change'] == 'removed']
+            if not full:
+                w.writerows(c for c in changes if c['change'] != 'removed')
+                continue
+            marked = {posting_key(c): c for c in changes if c['change'] != 'removed'}
+            w.writerows(marked.get(posting_key(r), r) if r.get('status') == 'match_found' else r
+                        for r in company_rows)
+        w.writerows(removed)
+    return counts
+
+
+def resolve_output(input_path, resume):
+    """(output_path, checkpoint_path, companies already done) — resume picks the newest checkpoint."""
+    if resume:
+        base_name = os.path.splitext(os.path.basename(input_path))[0]
+        output_dir = os.path.dirname(input_path) or '.'
+        cp = find_latest_checkpoint(os.path.join(output_dir, f"{base_name}_jobs_"))
+        if cp:
+            return output_path_for(cp), cp, done_keys(cp, lambda r: company_key(r.get('company_website')))
+        logger.info("No checkpoint found to resume — starting fresh.")
+    output_path = create_output_filename(input_path)
+    return output_path, checkpoint_path(output_path), set()
 
 
 # -----------------------------
 # MAIN
 # -----------------------------
 def main():
+    parser = argparse.ArgumentParser(description='Target-company job scraper')
+    parser.add_argument('input', nargs='?', help='companies CSV with a website column (prompted if omitted)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the newest checkpoint for this input, skipping finished companies')
+    parser.add_argument('--full', action='store_true',
+                        help='write every row of this run (not only postings added, changed or removed '
+                             'since the last run) and parse every board')
+    parser.add_argument('--rediscover', action='store_true',
+                        help='crawl every company for its careers page again instead of using the discovery cache')
+    args = parser.parse_args()
+
     print("\n" + "=" * 70)
     print("🎯 TARGET-COMPANY JOB SCRAPER")
     print("=" * 70 + "\n")
 
-    input_file = input("📁 Enter path to your companies CSV: ").strip().strip('"').strip("'")
+    input_file = args.input or input("📁 Enter path to your companies CSV: ").strip().strip('"').strip("'")
 
     if not os.path.exists(input_file):
         logger.error(f"❌ File not found: {input_file}")
@@ -482,11 +537,11 @@ def main():
     ).strip()
 
     if query:
-        global ROLE_CATEGORIES, ALL_ROLE_KEYWORDS
+        global ROLE_CATEGORIES, ROLE_MATCHER
         keywords = [k.strip().lower() for k in query.split(',') if k.strip()]
         if keywords:
             ROLE_CATEGORIES = {f"Custom Search: {query}": keywords}
-            ALL_ROLE_KEYWORDS = keywords
+            ROLE_MATCHER = KeywordMatcher(ROLE_CATEGORIES)
             logger.info(f"🔍 Searching for: {', '.join(keywords)}")
 
     try:
@@ -504,26 +559,37 @@ def main():
         logger.info(f"Available columns: {', '.join(input_columns)}")
         return
 
+    index = PostingsIndex.load(INDEX_FILE, signature=json.dumps(ROLE_CATEGORIES, sort_keys=True))
+    output_path, cp_path, done = resolve_output(input_file, args.resume)
+    if done:
+        before = len(rows)
+        rows = [r for r in rows if not company_key(r.get('website')) or company_key(r.get('website')) not in done]
+        logger.info(f"↻ Resuming {cp_path}: skipping {before - len(rows)} finished companies")
+
     total_companies = len(rows)
+    discovery = discovery_cache()
+    if args.rediscover:
+        for r in rows:
+            discovery.forget(company_key(r.get('website')))
     logger.info(f"✅ Loaded {total_companies} companies from {input_file}")
+    prefetch_boards(rows, discovery)
 
-    output_path = create_output_filename(input_file)
     logger.info(f"📄 Output will be saved to: {output_path}")
     print(f"\n⚙️  Processing with {MAX_WORKERS} workers")
     print("⏳ Starting job scrape...\n")
 
-    results = []
     completed = 0
     start_time = time.time()
 
     try:
-        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-            future_to_row = {executor.submit(process_company, row): row for row in rows}
+        with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor, \
+                JsonlCheckpoint(cp_path, CHECKPOINT_INTERVAL) as checkpoint:
+            future_to_row = {executor.submit(process_company, row, None if args.full else index, discovery): row
+                             for row in rows}
 
             for future in as_completed(future_to_row):
                 try:
-                    company_rows = future.result()
-                    results.extend(company_rows)
+                    checkpoint.extend(future.result())
                     completed += 1
 
                     elapsed = time.time() - start_time
@@ -531,60 +597,63 @@ def main():
                     eta = (total_companies - completed) / rate if rate > 0 else 0
                     logger.info(f"📊 Progress: {completed}/{total_companies} ({100*completed//total_companies}%) | ETA: {int(eta//60)}m {int(eta%60)}s")
 
-                    if completed % CHECKPOINT_INTERVAL == 0:
-                        save_checkpoint(results, output_path, OUTPUT_COLUMNS)
-
                 except Exception as e:
                     logger.error(f"❌ Error processing company: {str(e)[:100]}")
 
     except KeyboardInterrupt:
-        logger.warning("\n⚠️  Interrupted. Saving progress...")
-        save_checkpoint(results, output_path, OUTPUT_COLUMNS)
+        logger.warning(f"\n⚠️  Interrupted. Progress kept in {cp_path} (rerun with --resume)")
         return
     except Exception as e:
-        logger.error(f"❌ Critical error: {e}")
-        save_checkpoint(results, output_path, OUTPUT_COLUMNS)
+        logger.error(f"❌ Critical error: {e} — progress kept in {cp_path}")
         return
 
-    if not results:
-        logger.error("❌ No results to write")
-        return
+    counts = {'rows': 0, 'matches': 0, 'manual': 0, 'not_found': 0, 'blocked': 0, 'unchanged': 0,
+              'added': 0, 'changed': 0, 'removed': 0}
 
-    try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS, restval='')
-            writer.writeheader()
-            for row in results:
-                writer.writerow({k: v for k, v in row.items() if k in OUTPUT_COLUMNS})
-
-        total_matches = sum(1 for r in results if r['status'] == 'match_found')
-        manual_check = sum(1 for r in results if 'manual_check_needed' in r['status'])
-        not_found = sum(1 for r in results if r['status'] == 'careers_page_not_found')
-        blocked = sum(1 for r in results if r['status'] == 'blocked_by_robots')
-        total_time = time.time() - start_time
-
-        print("\n" + "=" * 70)
-        print("✅ JOB SCRAPE COMPLETE!")
-        print("=" * 70)
-        print(f"\n📁 Output File: {output_path}")
-        print(f"⏱️  Total Time: {int(total_time//60)}m {int(total_time%60)}s")
-        print(f"\n📊 RESULTS SUMMARY:")
-        print(f"   • Companies Processed: {total_companies}")
-        print(f"   • Matching Job Postings Found: {total_matches}")
-        print(f"   • Companies Needing Manual Check (JS-rendered/unsupported ATS): {manual_check}")
-        print(f"   • Careers Page Not Found: {not_found}")
-        print(f"   • Blocked by robots.txt: {blocked}")
-        print("\n" + "=" * 70 + "\n")
-
-        checkpoint_path = output_path.replace('.csv', '_checkpoint.csv')
-        if os.path.exists(checkpoint_path):
-            os.remove(checkpoint_path)
-            logger.info("🧹 Checkpoint file cleaned up")
+    def tally(r):
+        status = r.get('status', '')
+        counts['rows'] += 1
+        counts['matches'] += status == 'match_found'
+        counts['manual'] += 'manual_check_needed' in status
+        counts['not_found'] += status == 'careers_page_not_found'
+        counts['blocked'] += status == 'blocked_by_robots'
+        counts['unchanged'] += status == BOARD_UNCHANGED
 
+    try:
+        counts.update(diff_against_index(cp_path, index, output_path, full=args.full, on_row=tally))
+        index.save()
     except Exception as e:
-        logger.error(f"❌ Failed to write output file: {e}")
+        logger.error(f"❌ Failed to write output file: {e} (checkpoint kept: {cp_path})")
         return
 
+    if not counts['rows']:
+        logger.error("❌ No results to write")
+        return
+
+    total_time = time.time() - start_time
+
+    print("\n" + "=" * 70)
+    print("✅ JOB SCRAPE COMPLETE!")
+    print("=" * 70)
+    print(f"\n📁 Output File: {output_path}")
+    print(f"⏱️  Total Time: {int(total_time//60)}m {int(total_time%60)}s")
+    print(f"\n📊 RESULTS SUMMARY:")
+    print(f"   • Companies Processed: {total_companies}")
+    print(f"   • Matching Job Postings Found: {counts['matches']}")
+    print(f"   • Companies Needing Manual Check (JS-rendered/unsupported ATS): {counts['manual']}")
+    print(f"   • Careers Page Not Found: {counts['not_found']}")
+    print(f"   • Blocked by robots.txt: {counts['blocked']}")
+    print(f"   • {ats_client().summary()}")
+    print(f"   • {discovery.summary()}")
+    print(f"\n🆕 SINCE LAST RUN: {counts['added']} added, {counts['changed']} changed, {counts['removed']} removed "
+          f"({counts['unchanged']} boards unchanged, not parsed)")
+    print(f"   • {index.summary()}")
+    print("\n" + "=" * 70 + "\n")
+
+    if os.path.exists(cp_path):
+        os.remove(cp_path)
+        logger.info("🧹 Checkpoint file cleaned up")
+
 
 if __name__ == "__main__":
     main()
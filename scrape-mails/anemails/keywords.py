@@ -0,0 +1,122 @@
+"""
+Compiled keyword matching for the short-text classifiers: the job-title
+filter (job_scraper.looks_like_job_title) and the B2B category check
+(scrape-leads/lean_business_scraper.categorize_business).
+
+Those checks were written as `any(kw in text for kw in keywords)` per
+category. KeywordMatcher takes all of a classifier's categories at once
+and answers every question about a text (which keywords, which
+categories, the first category in priority order, any hit at all) with
+the same semantics as those loops: plain substring containment, so
+'co-founder' also counts as 'founder'.
+
+It only pays where most texts match nothing. bench_keywords.py measured
+classify_role (most titles it sees do match) and the site signals
+(detect_tech_stack, estimate_company_size, has_decision_maker) at no
+gain, so those keep their loops. How it scans depends on the text:
+
+  - short texts (anchor texts, job titles; up to SHORT_TEXT chars) go
+    through one regex compiled from a trie of every keyword, so shared
+    prefixes ('software engineer', 'software developer') are tried once.
+    Most anchors on a careers page match nothing and are settled by that
+    single pass;
+  - longer texts (whole pages and sites) use one C substring scan per
+    keyword, stopping at the first hit where the question allows. CPython's
+    regex engine costs more per character than a dozen memchr-speed scans
+    do, so a single regex pass (or a pure-Python Aho-Corasick automaton)
+    is slower there for keyword sets of this size.
+
+    ROLES = KeywordMatcher({'Data': ['data engineer', 'etl'], 'Ops': ['logistics']})
+    ROLES.hits('senior data engineer, logistics')    # {'Data': ['data engineer'], 'Ops': ['logistics']}
+    ROLES.first('senior data engineer')              # 'Data' (categories keep their order as priority)
+    ROLES.search('warehouse lead')                   # False
+
+Matching is case-sensitive like `in`; callers pass lower-cased text and
+keywords as before.
+"""
+
+import re
+from typing import Dict, Iterable, List, Set
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+SHORT_TEXT = 48     # chars; up to here one trie-regex pass beats a substring scan per keyword
+
+
+def trie_pattern(keywords: Iterable[str]) -> str:
+    """Regex matching any of the keywords, with common prefixes factored out."""
+    trie: Dict[str, dict] = {}
+    for word in keywords:
+        node = trie
+        for ch in word:
+            node = node.setdefault(ch, {})
+        node[''] = {}
+
+    def build(node: Dict[str, dict]) -> str:
+        alts = [re.escape(ch) + build(sub) for ch, sub in sorted(node.items()) if ch]
+        if not alts:
+            return ''
+        body = alts[0] if len(alts) == 1 else '(?:' + '|'.join(alts) + ')'
+        return f'(?:{body})?' if '' in node else body
+
+    return build(trie)
+
+
+class KeywordMatcher:
+    """Substring keywords grouped by category; see the module docstring."""
+
+    def __init__(self, categories: Dict[str, Iterable[str]]):
+        self.categories: Dict[str, tuple] = {c: tuple(dict.fromkeys(k for k in kws if k))
+                                             for c, kws in categories.items()}
+        self._keywords = tuple(dict.fromkeys(k for kws in self.categories.values() for k in kws))
+        owner = {k: c for c, kws in self.categories.items() for k in kws}
+        # keyword -> its category, in category order; None when a keyword is listed under two categories
+        self._owned = (tuple((k, owner[k]) for k in self._keywords)
+                       if len(owner) == sum(map(len, self.categories.values())) else None)
+        self._re = re.compile(trie_pattern(self._keywords)) if self._keywords else None
+
+    @classmethod
+    def of(cls, keywords: Iterable[str], category: str = 'match') -> 'KeywordMatcher':
+        """A matcher over one flat keyword list."""
+        return cls({category: keywords})
+
+    def search(self, text: str) -> bool:
+        """Any keyword in text."""
+        if len(text) <= SHORT_TEXT:
+            return self._re is not None and self._re.search(text) is not None
+        return any(k in text for k in self._keywords)
+
+    def _none_in(self, text: str) -> bool:
+        """True when a short text has been shown to hold no keyword at all."""
+        return len(text) <= SHORT_TEXT and not self.search(text)
+
+    def keywords(self, text: str) -> Set[str]:
+        """Every keyword that occurs in text."""
+        if self._none_in(text):
+            return set()
+        return {k for k in self._keywords if k in text}
+
+    def hits(self, text: str) -> Dict[str, List[str]]:
+        """category -> its keywords found in text (keyword order), for categories with a hit, in category order."""
+        if self._none_in(text):
+            return {}
+        if self._owned is not None:
+            out: Dict[str, List[str]] = {}
+            for k, c in self._owned:
+                if k in text:
+                    out.setdefault(c, []).append(k)
+            return out
+        found = {k for k in self._keywords if k in text}
+        return {c: hit for c, kws in self.categories.items() if (hit := [k for k in kws if k in found])}
+
+    def categories_in(self, text: str) -> List[str]:
+        if self._none_in(text):
+            return []
+        return [c for c, kws in self.categories.items() if any(k in text for k in kws)]
+
+    def first(self, text: str) -> str:
+        """The first category (in the order given) with a keyword in text, '' if none."""
+        if self._none_in(text):
+            return ''
+        return next((c for c, kws in self.categories.items() if any(k in text for k in kws)), '')
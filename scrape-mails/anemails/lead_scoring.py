@@ -0,0 +1,439 @@
+"""
+Lead scoring shared by enrich.py, maps_enrich.py and the scrape-leads tools.
+
+Every score is a rule set: a list of terms, each reading one field and
+adding points, summed in order, truncated to int, capped at 'max' and
+optionally mapped to a tier label. The same rule set is evaluated two ways:
+
+    score_row(rules, row)          one dict, pure Python (crawlers, per lead)
+    score_columns(rules, columns)  whole columns with numpy (re-scoring stores)
+
+Both give identical results. Term kinds (by key):
+
+    points            field present (not '', 'N/A', 'nan', ...)
+    equals + points   field equals a value
+    unless            ...and this other field is not present
+    email_quality     (score_email(field) / 10) * weight
+    per_unit + cap    min(int(field) * per_unit, cap)
+    steps             first [threshold, points] with field >= threshold
+    labels            first [[substrings], points] found in upper(field), else 'otherwise'
+
+DEFAULT_RULES can be overridden per rule set from a JSON file named by
+LEAD_SCORING_RULES. Stored CSVs are re-scored in place of their score
+columns with:
+
+    python lead_scoring.py leads.csv [-o rescored.csv]
+"""
+
+import argparse
+import copy
+import csv
+import json
+import os
+import sys
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+RULES_ENV        = 'LEAD_SCORING_RULES'
+RESCORE_CHUNK    = 100_000   # rows per numpy batch when re-scoring a CSV
+MISSING_TEXT     = frozenset(['', 'N/A', 'nan', 'NaN', 'None', 'False', '[]'])
+
+EMAIL_SCORE_MAP = {
+    'high': frozenset(['contact','info','hello','hi','sales','inquiries']),
+    'mid':  frozenset(['support','help','service','admin']),
+    'low':  frozenset(['noreply','no-reply','donotreply','mailer-daemon']),
+}
+
+DEFAULT_RULES = {
+    # enrich.py / maps_enrich.py: lead_quality_score
+    'contact_score': {
+        'score_column': 'lead_quality_score',
+        'max': 100,
+        'terms': [
+            {'field': 'email_primary',        'email_quality': 35},
+            {'field': 'phone_primary',        'points': 20},
+            {'field': 'social_media_score',   'per_unit': 2.5, 'cap': 15},
+            {'field': 'decision_maker_found', 'equals': 'Yes', 'points': 15},
+            {'field': 'linkedin_company',     'points': 10},
+            {'field': 'contact_page_found',   'equals': 'Yes', 'points': 5},
+        ],
+    },
+    # enrich.py / maps_enrich.py: contact_confidence
+    'contact_confidence': {
+        'tier_column': 'contact_confidence',
+        'terms': [
+            {'field': 'email_primary',      'email_quality': 10},
+            {'field': 'phone_primary',      'points': 8},
+            {'field': 'contact_page_found', 'equals': 'Yes', 'points': 5},
+            {'field': 'linkedin_company',   'points': 4},
+        ],
+        'tiers': [[18, 'High'], [10, 'Medium']],
+        'default_tier': 'Low',
+    },
+    # enrich.py / maps_enrich.py: best_contact_method (first `take` channels that apply)
+    'contact_methods': {
+        'column': 'best_contact_method',
+        'methods': [
+            {'label': 'Email',            'fields': ['email_primary'], 'min_email_quality': 7},
+            {'label': 'Phone',            'fields': ['phone_primary']},
+            {'label': 'LinkedIn',         'fields': ['linkedin_company', 'linkedin_ceo']},
+            {'label': 'Instagram DM',     'fields': ['instagram']},
+            {'label': 'Facebook Message', 'fields': ['facebook']},
+            {'label': 'YouTube Comment',  'fields': ['youtube']},
+        ],
+        'take': 2,
+        'joiner': ' → ',
+        'default': 'Website Form',
+    },
+    # lean_business_scraper.py: score / lead_quality / tags from Places data
+    'places_lead': {
+        'score_column': 'score',
+        'tier_column': 'lead_quality',
+        'terms': [
+            {'field': 'rating',       'steps': [[4.7, 35], [4.5, 30], [4.3, 25], [4.0, 15]]},
+            {'field': 'review_count', 'steps': [[150, 25], [75, 20], [30, 15], [10, 10]]},
+            {'field': 'email',        'points': 30, 'tag': 'Email✓'},
+            {'field': 'phone',        'points': 15, 'tag': 'Phone✓'},
+            {'field': 'website',      'points': 5, 'unless': 'email', 'tag': 'Website'},
+            {'field': 'category',     'equals': 'B2B', 'points': 15, 'tag': 'B2B'},
+        ],
+        'tiers': [[85, '🔥 HOT'], [65, '⭐ WARM'], [45, '💼 POTENTIAL']],
+        'default_tier': '❄️ COLD',
+    },
+    # whatsapp_lead_preparer.py: outreach_score / priority
+    'outreach': {
+        'score_column': 'outreach_score',
+        'tier_column': 'priority',
+        'max': 100,
+        'terms': [
+            {'field': 'lead_quality', 'labels': [[['HOT', '🔥'], 40], [['WARM', '⭐'], 30],
+                                                 [['POTENTIAL', '💼'], 20]], 'otherwise': 10},
+            {'field': 'email',        'points': 20},
+            {'field': 'website',      'points': 10},
+            {'field': 'e164_phone',   'points': 10},
+            {'field': 'rating',       'steps': [[4.5, 15], [4.0, 10]]},
+            {'field': 'review_count', 'steps': [[100, 5], [30, 3]]},
+        ],
+        'tiers': [[80, '🔥 PRIORITY 1'], [60, '⭐ PRIORITY 2'], [40, '💼 PRIORITY 3']],
+        'default_tier': '📋 PRIORITY 4',
+    },
+}
+
+
+def load_rules(path: Optional[str] = None) -> Dict:
+    """DEFAULT_RULES with whole rule sets replaced from a JSON file, if given."""
+    rules = copy.deepcopy(DEFAULT_RULES)
+    if path:
+        with open(path, 'r', encoding='utf-8') as f:
+            rules.update(json.load(f))
+    return rules
+
+
+RULES = load_rules(os.getenv(RULES_ENV))
+_MISSING_LEN = max(map(len, MISSING_TEXT))
+
+
+def rule_fields(rules: Dict) -> List[str]:
+    fields = []
+    for t in rules.get('terms', ()):
+        fields += [t['field']] + ([t['unless']] if 'unless' in t else [])
+    for m in rules.get('methods', ()):
+        fields += m['fields']
+    return list(dict.fromkeys(fields))
+
+
+# ─────────────────────────────────────────────
+# ONE ROW
+# ─────────────────────────────────────────────
+
+def score_email(email: str) -> int:
+    local = email.split('@')[0].lower()
+    for kw in EMAIL_SCORE_MAP['low']:
+        if kw in local: return 2
+    for kw in EMAIL_SCORE_MAP['high']:
+        if kw in local: return 9
+    for kw in EMAIL_SCORE_MAP['mid']:
+        if kw in local: return 6
+    return 7 if '.' in local else 5
+
+
+def _text(value) -> str:
+    s = str(value).strip()
+    return '' if s in MISSING_TEXT else s
+
+
+def _number(value) -> float:
+    try:
+        x = float(_text(value) or 0)
+    except ValueError:
+        return 0.0
+    return 0.0 if x != x else x
+
+
+def _term_row(t: Dict, row: Dict) -> Tuple[float, bool]:
+    v = row.get(t['field'])
+    if 'steps' in t:
+        x = _number(v)
+        return next((p for th, p in t['steps'] if x >= th), 0), False
+    if 'per_unit' in t:
+        return min(int(_number(v)) * t['per_unit'], t.get('cap', float('inf'))), False
+    s = _text(v)
+    if 'labels' in t:
+        u = s.upper()
+        return next((p for subs, p in t['labels'] if any(x in u for x in subs)), t.get('otherwise', 0)), False
+    hit = s == t['equals'] if 'equals' in t else bool(s)
+    if hit and 'unless' in t:
+        hit = not _text(row.get(t['unless']))
+    if not hit:
+        return 0, False
+    if 'email_quality' in t:
+        return (score_email(s) / 10) * t['email_quality'], True
+    return t['points'], True
+
+
+def score_row(rules: Dict, row: Dict) -> Tuple[int, Optional[str], List[str]]:
+    """(score, tier label or None, tags of the terms that fired)."""
+    total, tags = 0.0, []
+    for t in rules['terms']:
+        pts, hit = _term_row(t, row)
+        total += pts
+        if hit and 'tag' in t:
+            tags.append(t['tag'])
+    score = int(total)
+    if 'max' in rules:
+        score = min(score, rules['max'])
+    tier = None
+    if 'tiers' in rules:
+        tier = next((label for th, label in rules['tiers'] if score >= th), rules.get('default_tier'))
+    return score, tier, tags
+
+
+def best_contact(rules: Dict, row: Dict) -> str:
+    picked = []
+    for m in rules['methods']:
+        vals = [_text(row.get(f)) for f in m['fields']]
+        ok = any(vals)
+        if ok and 'min_email_quality' in m:
+            ok = score_email(vals[0]) >= m['min_email_quality']
+        if ok:
+            picked.append(m['label'])
+    return rules['joiner'].join(picked[:rules['take']]) if picked else rules['default']
+
+
+# ─────────────────────────────────────────────
+# WHOLE COLUMNS (numpy)
+# ─────────────────────────────────────────────
+
+def _text_col(col, n: int) -> np.ndarray:
+    if col is None:
+        return np.full(n, '', dtype='<U1')
+    a = np.asarray(col)
+    a = np.char.strip(a if a.dtype.kind == 'U' else a.astype(str))
+    short = np.flatnonzero(np.char.str_len(a) <= _MISSING_LEN)    # only short cells can be a missing marker
+    a[short[np.isin(a[short], list(MISSING_TEXT))]] = ''
+    return a
+
+
+def _number_col(col, n: int) -> np.ndarray:
+    if col is None:
+        return np.zeros(n)
+    a = np.asarray(col)
+    if a.dtype.kind in 'iuf':
+        x = a.astype(float)
+    else:
+        s = _text_col(a, n)
+        try:
+            x = np.where(s == '', '0', s).astype(float)
+        except ValueError:              # stray text in a numeric column: slow path
+            x = np.fromiter((_number(v) for v in s), float, n)
+    return np.where(np.isnan(x), 0.0, x)
+
+
+def _email_quality(s: np.ndarray) -> np.ndarray:
+    """score_email() for every cell of normalised text (0 where there is no email)."""
+    local = np.char.lower(np.char.partition(s, '@')[:, 0]) if len(s) else s
+    def has(words):
+        return np.logical_or.reduce([np.char.find(local, w) >= 0 for w in words])
+    q = np.select([has(EMAIL_SCORE_MAP['low']), has(EMAIL_SCORE_MAP['high']), has(EMAIL_SCORE_MAP['mid']),
+                   np.char.find(local, '.') >= 0], [2, 9, 6, 7], 5)
+    return np.where(s == '', 0, q)
+
+
+class Columns:
+    """
+    Columns as the numpy evaluators read them: a dict of equal-length
+    sequences or a DataFrame, with each field's text / number / email
+    quality conversion done once and shared by every rule set scored on it.
+    Missing fields read as empty.
+    """
+    def __init__(self, columns, n: Optional[int] = None):
+        self.raw = columns
+        self.n   = n if n is not None else len(next(iter(columns[f] for f in columns)))
+        self._cache: Dict[Tuple[str, str], np.ndarray] = {}
+
+    def _get(self, kind: str, field: str, convert) -> np.ndarray:
+        key = (kind, field)
+        if key not in self._cache:
+            self._cache[key] = convert()
+        return self._cache[key]
+
+    def _raw(self, field: str):
+        return self.raw[field] if field in self.raw else None
+
+    def text(self, field: str) -> np.ndarray:
+        return self._get('text', field, lambda: _text_col(self._raw(field), self.n))
+
+    def number(self, field: str) -> np.ndarray:
+        return self._get('number', field, lambda: _number_col(self._raw(field), self.n))
+
+    def email_quality(self, field: str) -> np.ndarray:
+        return self._get('email', field, lambda: _email_quality(self.text(field)))
+
+    def set(self, field: str, values):
+        self.raw[field] = values
+        for kind in ('text', 'number', 'email'):
+            self._cache.pop((kind, field), None)
+
+
+def _as_columns(columns, n: Optional[int]) -> Columns:
+    return columns if isinstance(columns, Columns) else Columns(columns, n)
+
+
+def _term_col(t: Dict, cols: Columns) -> np.ndarray:
+    f = t['field']
+    if 'steps' in t:
+        x = cols.number(f)
+        return np.select([x >= th for th, _ in t['steps']], [p for _, p in t['steps']], 0).astype(float)
+    if 'per_unit' in t:
+        return np.minimum(np.trunc(cols.number(f)) * t['per_unit'], t.get('cap', np.inf))
+    s = cols.text(f)
+    if 'labels' in t:
+        u = np.char.upper(s)
+        conds = [np.logical_or.reduce([np.char.find(u, x) >= 0 for x in subs]) for subs, _ in t['labels']]
+        return np.select(conds, [p for _, p in t['labels']], t.get('otherwise', 0)).astype(float)
+    hit = s == t['equals'] if 'equals' in t else s != ''
+    if 'unless' in t:
+        hit &= cols.text(t['unless']) == ''
+    if 'email_quality' in t:
+        return np.where(hit, (cols.email_quality(f) / 10) * t['email_quality'], 0.0)
+    return np.where(hit, float(t['points']), 0.0)
+
+
+def score_columns(rules: Dict, columns, n: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    Score every row of `columns` (a dict of equal-length sequences, a
+    DataFrame or a Columns). Returns {'score': int64 array, 'tier': str
+    array or None}.
+    """
+    cols  = _as_columns(columns, n)
+    total = np.zeros(cols.n)
+    for t in rules['terms']:
+        total += _term_col(t, cols)
+    score = np.trunc(total).astype(np.int64)
+    if 'max' in rules:
+        score = np.minimum(score, rules['max'])
+    tier = None
+    if 'tiers' in rules:
+        tier = np.select([score >= th for th, _ in rules['tiers']],
+                         [label for _, label in rules['tiers']], rules.get('default_tier'))
+    return {'score': score, 'tier': tier}
+
+
+def best_contact_columns(rules: Dict, columns, n: Optional[int] = None) -> np.ndarray:
+    cols  = _as_columns(columns, n)
+    fired = np.zeros((cols.n, len(rules['methods'])), dtype=bool)
+    for j, m in enumerate(rules['methods']):
+        ok = np.logical_or.reduce([cols.text(f) != '' for f in m['fields']])
+        if 'min_email_quality' in m:
+            ok &= cols.email_quality(m['fields'][0]) >= m['min_email_quality']
+        fired[:, j] = ok
+    picked = fired & (np.cumsum(fired, axis=1) <= rules['take'])
+    # one label per distinct combination of channels, not per row
+    code = picked.astype(np.int64) @ (1 << np.arange(len(rules['methods']), dtype=np.int64))
+    codes, inv = np.unique(code, return_inverse=True)
+    labels = [rules['joiner'].join(m['label'] for j, m in enumerate(rules['methods']) if c >> j & 1)
+              or rules['default'] for c in codes.tolist()]
+    return np.array(labels, dtype=object)[inv.ravel()]
+
+
+# ─────────────────────────────────────────────
+# RE-SCORING STORED LEADS
+# ─────────────────────────────────────────────
+
+def applicable_rules(header: Iterable[str], rules: Optional[Dict] = None) -> List[str]:
+    """Rule sets whose input fields are all columns of `header`, in RULES order."""
+    rules = RULES if rules is None else rules
+    have = set(header)
+    return [name for name, r in rules.items() if set(rule_fields(r)) <= have]
+
+
+def rescore_chunk(columns: Dict[str, np.ndarray], names: List[str], rules: Optional[Dict] = None):
+    """Recompute the output columns of each named rule set in place; later sets see earlier outputs."""
+    rules = RULES if rules is None else rules
+    cols  = Columns(columns)
+    for name in names:
+        r = rules[name]
+        if 'methods' in r:
+            cols.set(r['column'], best_contact_columns(r, cols))
+            continue
+        res = score_columns(r, cols)
+        if 'score_column' in r:
+            cols.set(r['score_column'], res['score'])
+        if 'tier_column' in r:
+            cols.set(r['tier_column'], res['tier'])
+
+
+def rescore_csv(input_path: str, output_path: str, names: Optional[List[str]] = None,
+                rules: Optional[Dict] = None, chunk_rows: int = RESCORE_CHUNK) -> Tuple[int, List[str]]:
+    """Stream a CSV through the rule sets RESCORE_CHUNK rows at a time; returns (rows, rule sets used)."""
+    rules = RULES if rules is None else rules
+    with open(input_path, 'r', newline='', encoding='utf-8') as fin, \
+         open(output_path, 'w', newline='', encoding='utf-8') as fout:
+        reader = csv.reader(fin)
+        header = next(reader, [])
+        names  = applicable_rules(header, rules) if names is None else names
+        outs   = [c for name in names for c in (rules[name].get('score_column'), rules[name].get('tier_column'),
+                                                 rules[name].get('column')) if c]
+        fields = header + [c for c in dict.fromkeys(outs) if c not in header]
+        writer = csv.writer(fout)
+        writer.writerow(fields)
+        total = 0
+        while True:
+            rows = [r for _, r in zip(range(chunk_rows), reader)]
+            if not rows:
+                break
+            width = len(header)
+            cols  = list(zip(*(r[:width] + [''] * (width - len(r)) for r in rows)))
+            columns = {h: np.array(c) for h, c in zip(header, cols)}
+            rescore_chunk(columns, names, rules)
+            writer.writerows(zip(*(columns[f] if f in columns else [''] * len(rows) for f in fields)))
+            total += len(rows)
+    return total, names
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Re-score stored leads with the shared scoring rules')
+    ap.add_argument('input', help='CSV of leads')
+    ap.add_argument('-o', '--output', help='output CSV (default: <input>_rescored.csv)')
+    ap.add_argument('--rules', help='comma list of rule sets (default: every set whose fields the CSV has)')
+    args = ap.parse_args()
+
+    names = [n.strip() for n in args.rules.split(',') if n.strip()] if args.rules else None
+    unknown = set(names or ()) - set(RULES)
+    if unknown:
+        ap.error(f"unknown rule sets: {', '.join(sorted(unknown))}")
+    output = args.output or os.path.splitext(args.input)[0] + '_rescored.csv'
+    t0 = time.perf_counter()
+    rows, used = rescore_csv(args.input, output, names)
+    if not used:
+        sys.exit(f"❌ no rule set matches the columns of {args.input}")
+    print(f"✅ {rows} rows re-scored with {', '.join(used)} in {time.perf_counter() - t0:.1f}s → {output}")
+
+
+if __name__ == '__main__':
+    main()
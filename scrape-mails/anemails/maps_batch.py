@@ -0,0 +1,125 @@
+"""
+Query batches for maps_enrich.py (--queries FILE).
+
+Overlapping searches ('digital marketing Colombo', 'marketing agency
+Colombo') list many of the same businesses. A batch runs its queries one
+after another through the same browser pool and enriches every business
+once: a row is kept only if neither its place_id nor its website came up
+earlier in the batch (branches of a chain sharing one site are enriched
+once, under the first query that found them).
+
+Progress is journaled next to the output, one JSON line per event, in
+the append-only format of checkpoint.py:
+
+    {"query": q, "place": {...}}                  a listing captured for q
+    {"query": q, "done": true, "skipped": n}      q's feed was scrolled to its end or cap
+
+A batch resumed with --resume replays the journal. Finished queries are
+not searched again; an unfinished one scrolls its feed again with every
+captured place_id passed to BrowserPool.scrape(skip=...), so no listing
+is opened twice. Captured rows that never reached the enrichment
+checkpoint are enriched straight from the journal.
+
+    batch = MapsBatch(journal_path(output_path))
+    for row in batch.captured():                  # from an interrupted run
+        ...
+    for query in batch.pending(read_queries('queries.txt')):
+        for row in scrape(query, skip=batch.place_ids):
+            if batch.add(query, row):             # False: a duplicate
+                ...
+        batch.finish(query, skipped)
+    batch.close()
+"""
+
+import os
+from typing import Dict, Iterator, List, Set
+
+from checkpoint import CHECKPOINT_FSYNC_EVERY, JsonlCheckpoint, iter_checkpoint, row_key
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+JOURNAL_SUFFIX = '_maps.jsonl'
+
+
+def journal_path(output_path: str) -> str:
+    return (output_path[:-4] if output_path.endswith('.csv') else output_path) + JOURNAL_SUFFIX
+
+
+def read_queries(path: str) -> List[str]:
+    """One query per line; blank lines, '#' comments and repeats (ignoring case and spacing) are dropped."""
+    queries, seen = [], set()
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            query = ' '.join(line.split('#', 1)[0].split())
+            if query and query.lower() not in seen:
+                seen.add(query.lower())
+                queries.append(query)
+    return queries
+
+
+def dedupe_keys(row: Dict) -> Set[str]:
+    """'pid:<place_id>' and 'web:<site>' (checkpoint.row_key's forms) for whichever the row has."""
+    keys = {row_key({'place_id': row.get('place_id')}), row_key({'website': row.get('website')})}
+    keys.discard('')
+    return keys
+
+
+class MapsBatch:
+    """Journal of what each query captured, and the batch-wide dedupe set."""
+
+    def __init__(self, path: str, fsync_every: int = CHECKPOINT_FSYNC_EVERY):
+        self.path       = path
+        self.place_ids: Set[str] = set()       # every listing captured, duplicates included
+        self.finished: Dict[str, int] = {}     # query -> listings it passed over as already captured
+        self.duplicates = 0
+        self._keys: Set[str] = set()
+        self._rows: List[Dict] = []            # unique rows, journal order
+        for event in iter_checkpoint(path):
+            if event.get('done'):
+                self.finished[event['query']] = event.get('skipped', 0)
+            elif event.get('place'):
+                self._claim(event['place'])
+        self._journal = JsonlCheckpoint(path, fsync_every)
+
+    def _claim(self, row: Dict) -> bool:
+        if row.get('place_id'):
+            self.place_ids.add(row['place_id'])
+        keys = dedupe_keys(row)
+        if keys & self._keys:
+            self.duplicates += 1
+            return False
+        self._keys |= keys
+        self._rows.append(row)
+        return True
+
+    def captured(self) -> Iterator[Dict]:
+        """Unique rows journaled by earlier runs (copies)."""
+        return (dict(row) for row in list(self._rows))
+
+    def pending(self, queries: List[str]) -> List[str]:
+        return [q for q in queries if q not in self.finished]
+
+    def add(self, query: str, row: Dict) -> bool:
+        """Journal a captured listing; True if it is new to the batch."""
+        self._journal.append({'query': query, 'place': row})
+        return self._claim(row)
+
+    def finish(self, query: str, skipped: int = 0):
+        self._journal.append({'query': query, 'done': True, 'skipped': skipped})
+        self._journal.sync()
+        self.finished[query] = skipped
+
+    def close(self):
+        self._journal.close()
+
+    def remove(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,1005 @@
+"""
+Reusable Playwright browser for the Google Maps stage of maps_enrich.py.
+
+scrape_google_maps() used to launch a Chromium per query and click every
+result card in one tab, sleeping 0.8 s per card and MAPS_SCROLL_PAUSE per
+scroll. Here one browser lives for the whole process with a pool of
+MAPS_PAGES contexts (one page each) that persist across queries, cookies
+and HTTP cache included. One page scrolls the results feed while the
+others open the place links it finds, so detail panels load in parallel.
+Waits are event driven: a scroll waits until the feed grows or shows its
+end-of-list marker, a place waits for its <h1>.
+
+Playwright objects belong to the thread (event loop) that created them,
+so the pool runs the async API on its own loop thread and exposes a
+blocking scrape() that any thread may call:
+
+    pool = BrowserPool()                                  # or shared_pool()
+    rows = pool.scrape('digital marketing agencies in Colombo', max_results=120)
+    pool.close()
+
+The panel is read with one outerHTML call and parsed here
+(parse_place_panel), not with a dozen element handle round trips.
+
+mode='network' skips the place pages and the DOM altogether: while the
+feed scrolls, the page's own search responses (the XSSI-guarded JSON
+behind /search?tbm=map, and the results inlined in the first HTML) are
+caught with Playwright's response events and decoded by
+places_from_payload(). places_from_har() runs the same decoder over a
+recorded HAR, and BrowserPool(har=...) replays one, so the mode can be
+tested offline; BrowserPool(record_har=...) records new fixtures.
+
+mode='classic' is the scraper this module replaced, kept as a fallback:
+a Chromium launched for the query on the calling thread (sync API), one
+tab clicking each result card, fixed sleeps. It uses none of the pool's
+pages, profiles or traffic accounting.
+
+The lean profile (MAPS_LEAN, on by default) is for pages that are only
+read: images, fonts, media and map tiles are aborted at the route level,
+Chromium runs without GPU, extensions, background networking or service
+workers and with a smaller viewport, and scripts / stylesheets are kept
+in an on-disk PageCache (MAPS_ASSET_CACHE_DIR) so later runs load Maps'
+bundles from disk. Every query reports the bytes its pages transferred
+per business (pool.last_traffic), with either profile, so the two can be
+compared.
+
+scrape(on_row=...) hands every business over the moment it is parsed, so
+maps_enrich.py can enrich websites while the feed is still scrolling.
+"""
+
+import asyncio
+import atexit
+import base64
+import json
+import logging
+import os
+import re
+import threading
+import time
+from collections import Counter
+from contextlib import asynccontextmanager
+from typing import Callable, Dict, Iterable, Iterator, List, Optional
+from urllib.parse import parse_qs, quote_plus, urlsplit
+
+from bs4 import BeautifulSoup
+
+from page_cache import PageCache
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+MAPS_BASE_URL         = 'https://www.google.com/maps'
+MAPS_PAGES            = 4          # pages in the pool: one scrolls the feed, the others open places
+MAPS_MAX_RESULTS      = 120
+MAPS_CONTEXT_MAX_USES = 150        # navigations before a context is replaced (bounds renderer memory)
+MAPS_NAV_TIMEOUT      = 30000      # ms
+MAPS_RESULT_TIMEOUT   = 20000      # ms to wait for the results feed
+MAPS_SCROLL_TIMEOUT   = 6000       # ms to wait for the feed to grow after a scroll
+MAPS_DETAIL_TIMEOUT   = 10000      # ms to wait for a place's <h1>
+MAPS_INFO_TIMEOUT     = 1500       # ms more for its address / phone / website rows
+MAPS_STALE_SCROLLS    = 3          # scrolls without new cards before giving up
+MAPS_MODES            = ('dom', 'network', 'classic')
+MAPS_SCROLL_PAUSE     = 2.5        # classic mode: seconds between scrolls in the results sidebar
+MAPS_LEAN             = True       # block images / fonts / media / tiles, cache scripts on disk
+MAPS_ASSET_CACHE_DIR  = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'browser_cache')
+MAPS_ASSET_TTL        = 7 * 24 * 3600  # Maps' bundles have versioned URLs; revalidated after this
+USER_AGENT = ("Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+              "AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36")
+VIEWPORT   = {"width": 1280, "height": 900}
+LEAN_VIEWPORT = {"width": 960, "height": 720}
+LEAN_ARGS  = ['--disable-gpu', '--disable-extensions', '--disable-background-networking', '--disable-sync',
+              '--disable-default-apps', '--disable-component-update', '--no-first-run', '--mute-audio',
+              '--blink-settings=imagesEnabled=false']
+BLOCKED_TYPES  = frozenset(['image', 'font', 'media'])
+CACHED_TYPES   = frozenset(['script', 'stylesheet'])
+# map tiles, satellite / street view imagery and photos, whatever the request type
+BLOCKED_URLS   = re.compile(r'/maps/vt[/?]|/kh[/?]v=|khms\d*\.google|streetviewpixels|/maps/rpc/vector|'
+                            r'googleusercontent\.com/|\.(?:png|jpe?g|gif|webp|ico|woff2?|ttf|otf|mp4|webm)(?:[?#]|$)',
+                            re.I)
+
+FEED       = 'div[role="feed"]'
+CARD_LINKS = 'div[role="feed"] a[href*="/maps/place/"]'
+PANEL      = 'div[role="main"]'
+
+_LINKS_JS = "els => els.map(a => [a.href, a.getAttribute('aria-label') || ''])"
+_END_JS   = ("() => [...document.querySelectorAll('p.fontBodyMedium > span')]"
+             ".some(s => /end of (the list|results)/i.test(s.innerText))")
+_GREW_JS  = (f"n => document.querySelectorAll('{CARD_LINKS}').length > n || ({_END_JS})()")
+
+# responses that carry listings: feed XHRs, the search document, place previews
+MAPS_PAYLOAD_URLS = re.compile(r'/search\?(?:[^#]*&)?tbm=map|/maps/search/|/maps/preview/place')
+_XSSI       = ")]}'"
+_FEATURE_ID = re.compile(r'0x[0-9a-fA-F]+:0x[0-9a-fA-F]+$')
+_INIT_STATE = re.compile(r'APP_INITIALIZATION_STATE\s*=\s*')
+
+logger = logging.getLogger()
+
+
+# ─────────────────────────────────────────────
+# PARSING
+# ─────────────────────────────────────────────
+
+def search_url(query: str, base_url: str = MAPS_BASE_URL) -> str:
+    return f"{base_url}/search/{quote_plus(query)}"
+
+
+def place_id_from_url(url: str) -> str:
+    """Feature id (!1s0x...:0x...) of a place link, else the path segment after the name."""
+    m = re.search(r'!1s(0x[0-9a-fA-F]+:0x[0-9a-fA-F]+)', url or '') or re.search(r'!1s([^!?&]+)', url or '')
+    if m:
+        return m.group(1)
+    m = re.search(r'place/[^/]+/([^/?]+)', url or '')
+    return m.group(1) if m else ''
+
+
+def _text(el) -> str:
+    return el.get_text(' ', strip=True) if el else ''
+
+
+def parse_place_panel(html: str, url: str, fallback_name: str = '') -> Optional[Dict]:
+    """Row fields from a place's detail panel HTML (None if it has no title)."""
+    soup  = BeautifulSoup(html, 'html.parser')
+    name  = _text(soup.select_one('h1')) or fallback_name
+    if not name:
+        return None
+    rating  = _text(soup.select_one('div.F7nice span[aria-hidden="true"]'))
+    reviews = ''
+    rev_el  = soup.select_one('div.F7nice span[aria-label]')
+    if rev_el:
+        m = re.search(r'[\d,]+', rev_el.get('aria-label', ''))
+        reviews = m.group().replace(',', '') if m else ''
+
+    address = next((t for t in map(_text, soup.select('button[data-item-id="address"]')) if t), '')
+    if not address:
+        el = soup.select_one('[data-tooltip="Copy address"]')
+        address = el.get('aria-label', '') if el else ''
+
+    phone = next((t for t in map(_text, soup.select('button[data-item-id^="phone"]')) if t), '')
+    if not phone:
+        el = soup.select_one('[data-tooltip="Copy phone number"]')
+        phone = re.sub(r'[^\d+\s()-]', '', el.get('aria-label', '')).strip() if el else ''
+
+    website = ''
+    for el in soup.select('a[data-item-id="authority"]') or soup.select('a[href^="http"]'):
+        href = el.get('href', '')
+        if href.startswith('http') and 'google.com' not in href:
+            website = href.rstrip('/')
+            break
+
+    return {
+        'place_id': place_id_from_url(url),
+        'business_name': name,
+        'rating': rating,
+        'reviews': reviews,
+        'category': _text(soup.select_one('button.DkEaL')),
+        'address': address,
+        'whatsapp_number': phone,
+        'website': website,
+    }
+
+
+# ─────────────────────────────────────────────
+# NETWORK PAYLOADS
+# ─────────────────────────────────────────────
+#
+# Maps answers searches with nested JSON arrays, not objects. A place is
+# an array with its feature id ("0x...:0x...") at [10] and its name at
+# [11]; the rest sits at fixed offsets (rating [4][7], reviews [4][8],
+# website [7][0], category [13][0], address [39], phone [178][0][0]).
+# Places are found by that shape wherever they sit in the payload, so a
+# reshuffle of the wrapping arrays does not break decoding.
+
+def _at(node, *path):
+    for i in path:
+        try:
+            node = node[i]
+        except (IndexError, KeyError, TypeError):
+            return None
+    return node
+
+
+def _xssi_json(text: str):
+    text = text.strip()
+    if text.endswith('/*""*/'):
+        text = text[:-6].rstrip()
+    if text.startswith(_XSSI):
+        text = text[len(_XSSI):]
+    return json.loads(text)
+
+
+def payload_documents(text: str) -> list:
+    """JSON roots of a response body: XSSI JSON, a {"c","d"} envelope, or an HTML page's inline state."""
+    text = (text or '').lstrip()
+    try:
+        if text.startswith('<'):
+            m = _INIT_STATE.search(text)
+            return [json.JSONDecoder().raw_decode(text, m.end())[0]] if m else []
+        return [_xssi_json(text)]
+    except ValueError:
+        return []
+
+
+def _place_arrays(root) -> Iterator[list]:
+    """Place arrays in document order, descending into XSSI strings nested in the JSON."""
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, list):
+            if (len(node) > 11 and isinstance(node[11], str) and isinstance(node[10], str)
+                    and _FEATURE_ID.match(node[10])):
+                yield node
+            else:
+                stack.extend(reversed(node))
+        elif isinstance(node, dict):
+            stack.extend(reversed(list(node.values())))
+        elif isinstance(node, str) and node.startswith(_XSSI):
+            try:
+                stack.append(_xssi_json(node))
+            except ValueError:
+                pass
+
+
+def _website(url) -> str:
+    if not isinstance(url, str) or not url.startswith(('http', '/url?')):
+        return ''
+    if url.startswith('/url?'):                       # Google redirect: the target is in q=
+        url = parse_qs(urlsplit(url).query).get('q', [''])[0]
+    return '' if 'google.com' in url else url.rstrip('/')
+
+
+def place_from_array(info: list) -> Dict:
+    rating, reviews = _at(info, 4, 7), _at(info, 4, 8)
+    address = _at(info, 39)
+    if not isinstance(address, str):
+        address = ', '.join(p for p in (_at(info, 2) or []) if isinstance(p, str))
+    phone    = _at(info, 178, 0, 0)
+    category = _at(info, 13, 0)
+    return {
+        'place_id': info[10],
+        'business_name': info[11].strip(),
+        'rating': f'{rating:.1f}' if isinstance(rating, (int, float)) else '',
+        'reviews': str(int(reviews)) if isinstance(reviews, (int, float)) else '',
+        'category': category if isinstance(category, str) else '',
+        'address': address,
+        'whatsapp_number': phone if isinstance(phone, str) else '',
+        'website': _website(_at(info, 7, 0)),
+    }
+
+
+def places_from_payload(text: str) -> List[Dict]:
+    """Every place in a Maps response body (duplicates included, in payload order)."""
+    return [place_from_array(a) for root in payload_documents(text) for a in _place_arrays(root)]
+
+
+def _har_text(entry: dict, har_dir: str) -> str:
+    content = entry.get('response', {}).get('content', {})
+    if content.get('_file'):                          # record_har_content='attach'
+        with open(os.path.join(har_dir, content['_file']), 'rb') as f:
+            return f.read().decode('utf-8', errors='replace')
+    text = content.get('text') or ''
+    if content.get('encoding') == 'base64':
+        text = base64.b64decode(text).decode('utf-8', errors='replace')
+    return text
+
+
+def places_from_har(path: str) -> List[Dict]:
+    """Distinct places in the Maps responses of a HAR file, in the order they were received."""
+    with open(path, 'r', encoding='utf-8') as f:
+        entries = json.load(f)['log']['entries']
+    rows: Dict[str, Dict] = {}
+    for entry in entries:
+        if MAPS_PAYLOAD_URLS.search(entry.get('request', {}).get('url', '')):
+            for row in places_from_payload(_har_text(entry, os.path.dirname(path))):
+                rows.setdefault(row['place_id'], row)
+    return list(rows.values())
+
+
+# ─────────────────────────────────────────────
+# LEAN PROFILE AND TRAFFIC
+# ─────────────────────────────────────────────
+
+def lean_action(resource_type: str, url: str, method: str = 'GET') -> str:
+    """'block', 'cache' (serve from / store in the asset cache) or 'pass' for a request in the lean profile."""
+    if resource_type in BLOCKED_TYPES or BLOCKED_URLS.search(url):
+        return 'block'
+    if method == 'GET' and resource_type in CACHED_TYPES:
+        return 'cache'
+    return 'pass'
+
+
+class Traffic:
+    """Bytes pulled over the network by the pool's pages; blocked and disk-cached requests cost none."""
+    __slots__ = ('bytes', 'requests', 'blocked', 'from_disk')
+
+    def __init__(self, bytes: int = 0, requests: int = 0, blocked: int = 0, from_disk: int = 0):
+        self.bytes, self.requests, self.blocked, self.from_disk = bytes, requests, blocked, from_disk
+
+    def __sub__(self, other: 'Traffic') -> 'Traffic':
+        return Traffic(*(getattr(self, k) - getattr(other, k) for k in self.__slots__))
+
+    def copy(self) -> 'Traffic':
+        return self - Traffic()
+
+    def summary(self, businesses: int) -> str:
+        per = self.bytes / 1024 / businesses if businesses else 0
+        return (f"📶 {self.bytes / 1e6:.1f} MB over {self.requests} requests, {per:.0f} KB/business "
+                f"({self.blocked} blocked, {self.from_disk} from disk cache)")
+
+
+# ─────────────────────────────────────────────
+# BROWSER POOL
+# ─────────────────────────────────────────────
+
+class ScrapeCancelled(Exception):
+    """Raised by an on_row callback whose consumer has gone: the scrape stops and frees its pages."""
+
+
+class _Slot:
+    """One browser context and its page, reused until MAPS_CONTEXT_MAX_USES navigations."""
+    __slots__ = ('context', 'page', 'uses')
+
+    def __init__(self, context, page):
+        self.context, self.page, self.uses = context, page, 0
+
+
+class BrowserPool:
+    """
+    One Chromium with `size` persistent contexts, driven from a private
+    event-loop thread. Queries run one at a time, each using every page.
+    """
+    def __init__(self, size: int = MAPS_PAGES, headless: bool = True, proxy: Optional[str] = None,
+                 base_url: str = MAPS_BASE_URL, har: Optional[str] = None, record_har: Optional[str] = None,
+                 lean: bool = MAPS_LEAN, asset_cache: Optional[str] = MAPS_ASSET_CACHE_DIR):
+        self.size     = max(2, size)
+        self.headless = headless
+        self.proxy    = proxy
+        self.base_url = base_url
+        self.har        = har            # replay responses from this HAR (offline runs)
+        self.record_har = record_har     # record the first context's traffic here (saved on close)
+        self.lean       = lean
+        self.asset_cache = asset_cache if lean else None
+        self.contexts_created = self.places_opened = 0
+        self.traffic      = Traffic()
+        self.last_traffic = Traffic()    # what the latest scrape() transferred
+        self.last_skipped = 0            # listings of the latest scrape() passed over as `skip`
+        self._assets: Optional[PageCache] = None
+        self._fulfilled: Counter = Counter()   # URLs answered by the route handler, not the network
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock    = threading.Lock()
+        self._pw = self._browser = None
+        self._slots: Optional[asyncio.Queue] = None
+        self._starting = self._query = None      # asyncio.Locks, made on the pool's loop
+
+    # ── blocking API ─────────────────────────
+
+    def scrape(self, query: str, max_results: int = MAPS_MAX_RESULTS, mode: str = 'dom',
+               on_row: Optional[Callable[[Dict], None]] = None, skip: Iterable[str] = ()) -> List[Dict]:
+        """
+        Businesses listed for a Maps search, in feed order (at most
+        max_results). mode 'dom' opens every place page; 'network' decodes
+        the feed's own responses and opens none; 'classic' runs
+        scrape_classic() outside the pool. on_row(row) is called with
+        a copy of each business as soon as it is parsed (in completion
+        order, from a worker thread); it may block, e.g. on a full queue,
+        which holds back only the place tab that produced the row. If it
+        raises (ScrapeCancelled, say) the scrape stops and re-raises it.
+
+        Listings whose place_id is in `skip` (captured by an earlier run)
+        are neither opened nor returned, but count towards max_results and
+        as feed progress; pool.last_skipped says how many were met.
+        """
+        if mode not in MAPS_MODES:
+            raise ValueError(f"mode must be one of {MAPS_MODES}, not {mode!r}")
+        if mode == 'classic':
+            self.last_traffic = Traffic()
+            rows, self.last_skipped = scrape_classic(query, max_results, on_row, frozenset(skip),
+                                                     self.base_url, self.headless, self.proxy)
+            return rows
+        scrape = self._scrape if mode == 'dom' else self._scrape_network
+        before = self.traffic.copy()
+        try:
+            return self._run(scrape(query, max_results, on_row, frozenset(skip)))
+        finally:
+            self.last_traffic = self.traffic - before
+
+    def close(self):
+        with self._lock:
+            loop, thread, self._loop = self._loop, self._thread, None
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(30)
+        except Exception as e:
+            logger.debug(f"Browser shutdown: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        loop.close()
+
+    def _run(self, coro):
+        with self._lock:
+            if self._loop is None:
+                self._loop   = asyncio.new_event_loop()
+                self._thread = threading.Thread(target=self._loop.run_forever, name='maps-browser', daemon=True)
+                self._thread.start()
+            loop = self._loop
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    # ── browser and contexts ─────────────────
+
+    async def _start(self):
+        if self._starting is None:
+            self._starting, self._query = asyncio.Lock(), asyncio.Lock()
+        async with self._starting:
+            if self._browser is not None:
+                return
+            from playwright.async_api import async_playwright
+            self._pw = await async_playwright().start()
+            launch = {'headless': self.headless, 'args': ['--no-sandbox'] + (LEAN_ARGS if self.lean else [])}
+            if self.proxy:
+                launch['proxy'] = {'server': self.proxy}
+            self._browser = await self._pw.chromium.launch(**launch)
+            if self.asset_cache:
+                self._assets = PageCache.load(self.asset_cache, ttl=MAPS_ASSET_TTL)
+            self._slots   = asyncio.Queue()
+            for _ in range(self.size):
+                self._slots.put_nowait(None)        # contexts are opened on first use
+
+    async def _new_slot(self) -> _Slot:
+        options = {'user_agent': USER_AGENT, 'locale': "en-US", 'viewport': VIEWPORT}
+        if self.lean:
+            # service workers would answer requests before the route handler sees them
+            options.update(viewport=LEAN_VIEWPORT, service_workers='block', reduced_motion='reduce')
+        if self.record_har and not self.contexts_created:
+            options.update(record_har_path=self.record_har, record_har_content='embed')
+        context = await self._browser.new_context(**options)
+        if self.har:
+            await context.route_from_har(self.har, not_found='abort')
+        if self.lean:
+            await context.route('**/*', self._lean_route)     # added last, so it runs before the HAR
+        page    = await context.new_page()
+        page.set_default_timeout(MAPS_NAV_TIMEOUT)
+        await self._count_traffic(context, page)
+        self.contexts_created += 1
+        return _Slot(context, page)
+
+    async def _lean_route(self, route):
+        request = route.request
+        action  = lean_action(request.resource_type, request.url, request.method)
+        if action == 'block':
+            self.traffic.blocked += 1
+            return await route.abort('blockedbyclient')
+        if action == 'pass' or self._assets is None or self.har:
+            return await route.fallback()
+        cached = self._assets.get(request.url)
+        if cached is None or not cached.fresh:
+            headers = dict(request.headers, **(self._assets.validators(cached) if cached else {}))
+            try:
+                resp = await route.fetch(headers=headers)
+                body = await resp.body() if resp.status != 304 else b''
+            except Exception:
+                return await route.fallback()
+            self.traffic.requests += 1
+            self.traffic.bytes += len(body) + sum(len(k) + len(v) + 4 for k, v in resp.headers.items())
+            if resp.status == 304 and cached is not None:
+                self._assets.refresh(request.url, resp.headers)
+            else:
+                self._assets.put(request.url, resp.status, resp.headers, body)
+                self._fulfilled[request.url] += 1
+                return await route.fulfill(response=resp, body=body)
+        else:
+            self.traffic.from_disk += 1
+        self._fulfilled[request.url] += 1
+        await route.fulfill(status=cached.status, headers=cached.headers, body=cached.body)
+
+    async def _count_traffic(self, context, page):
+        """Add each finished network load's encoded size (headers included) to self.traffic."""
+        cdp  = await context.new_cdp_session(page)
+        urls: Dict[str, str] = {}
+
+        def sent(event):
+            urls[event['requestId']] = event['request']['url']
+
+        def finished(event):
+            url = urls.pop(event['requestId'], None)
+            if url is None:
+                return
+            if self._fulfilled[url]:                # answered by _lean_route, already counted there
+                self._fulfilled[url] -= 1
+                return
+            self.traffic.requests += 1
+            self.traffic.bytes += int(event.get('encodedDataLength') or 0)
+
+        cdp.on('Network.requestWillBeSent', sent)
+        cdp.on('Network.loadingFinished', finished)
+        cdp.on('Network.loadingFailed', lambda event: urls.pop(event['requestId'], None))
+        await cdp.send('Network.enable')
+
+    @asynccontextmanager
+    async def page(self):
+        """Check a page out of the pool, replacing its context when worn out or crashed."""
+        await self._start()
+        slot = await self._slots.get()
+        try:
+            if slot is None or slot.uses >= MAPS_CONTEXT_MAX_USES or slot.page.is_closed():
+                old, slot = slot, None
+                if old is not None:
+                    await _close_quietly(old.context)
+                slot = await self._new_slot()
+            slot.uses += 1
+            yield slot.page
+        finally:
+            self._slots.put_nowait(slot)
+
+    async def _shutdown(self):
+        if self._slots is not None:
+            while not self._slots.empty():
+                slot = self._slots.get_nowait()
+                if slot is not None:
+                    await _close_quietly(slot.context)
+        if self._browser is not None:
+            await _close_quietly(self._browser)
+        if self._pw is not None:
+            await self._pw.stop()
+        if self._assets is not None:
+            self._assets.save()
+        self._pw = self._browser = self._slots = self._assets = None
+
+    # ── scraping ─────────────────────────────
+
+    async def _scrape(self, query: str, max_results: int, on_row=None, skip=frozenset()) -> List[Dict]:
+        await self._start()
+        async with self._query:
+            found: asyncio.Queue = asyncio.Queue()
+            rows: Dict[int, Dict] = {}
+            seen, known = set(), set()
+            failed: List[BaseException] = []        # on_row errors: the consumer has gone
+            pending = [0]                           # places queued or being opened, this query only
+            self.last_skipped = 0
+            workers = [asyncio.ensure_future(self._detail_worker(found, rows, pending, on_row, failed))
+                       for _ in range(self.size - 1)]
+
+            async def queue_links(links) -> Optional[int]:
+                """Queue new place links until max_results are (being) scraped."""
+                if failed:
+                    raise failed[0]
+                fresh = 0
+                for href, label in links:
+                    key = place_id_from_url(href) or href
+                    if key in seen or len(rows) + len(known) + pending[0] >= max_results:
+                        continue
+                    seen.add(key)
+                    fresh += 1
+                    if key in skip:
+                        known.add(key)
+                        continue
+                    pending[0] += 1
+                    found.put_nowait((len(seen), href, label))
+                self.last_skipped = len(known)
+                if len(rows) + len(known) + pending[0] >= max_results:
+                    await found.join()              # some places may fail: then top up from the feed
+                    if failed:
+                        raise failed[0]
+                    if len(rows) + len(known) >= max_results:
+                        return None
+                return fresh
+
+            try:
+                async with self.page() as page:
+                    await self._scroll_feed(page, query, queue_links)
+                await found.join()
+                if failed:
+                    raise failed[0]
+            finally:
+                for w in workers:
+                    w.cancel()
+                await asyncio.gather(*workers, return_exceptions=True)
+            return [rows[i] for i in sorted(rows)][:max_results]
+
+    async def _scrape_network(self, query: str, max_results: int, on_row=None, skip=frozenset()) -> List[Dict]:
+        await self._start()
+        async with self._query:
+            rows: Dict[str, Dict] = {}              # new businesses, plus a None for each skipped one
+            reads: set = set()
+            failed: List[BaseException] = []
+            self.last_skipped = 0
+
+            def on_response(resp):
+                if MAPS_PAYLOAD_URLS.search(resp.url) and not failed:
+                    task = asyncio.ensure_future(self._read_payload(resp, rows, max_results, on_row, skip, failed))
+                    reads.add(task)
+                    task.add_done_callback(reads.discard)
+
+            counted = [0]
+
+            async def count_rows(links) -> Optional[int]:
+                """New businesses decoded since the last scroll (the cards themselves are not read)."""
+                if reads:
+                    await asyncio.gather(*reads, return_exceptions=True)
+                if failed:
+                    raise failed[0]
+                if len(rows) >= max_results:
+                    return None
+                fresh, counted[0] = len(rows) - counted[0], len(rows)
+                return fresh
+
+            async with self.page() as page:
+                page.on('response', on_response)
+                try:
+                    await self._scroll_feed(page, query, count_rows)
+                    if reads:
+                        await asyncio.gather(*reads, return_exceptions=True)
+                finally:
+                    page.remove_listener('response', on_response)
+            if failed:
+                raise failed[0]
+            if not rows:
+                logger.warning("⚠️  No listings decoded from Maps responses — the payload format may have "
+                               "changed; try --maps-mode dom.")
+            self.last_skipped = sum(row is None for row in rows.values())
+            return [row for row in rows.values() if row is not None][:max_results]
+
+    async def _read_payload(self, resp, rows: Dict, max_results: int, on_row=None, skip=frozenset(),
+                            failed: Optional[List] = None):
+        try:
+            text = await resp.text()
+        except Exception as e:                      # redirects, evicted bodies
+            logger.debug(f"Unreadable response {resp.url}: {e}")
+            return
+        for row in places_from_payload(text):
+            if len(rows) >= max_results or failed:
+                break
+            if row['place_id'] in skip:
+                rows.setdefault(row['place_id'], None)
+            elif row['place_id'] not in rows:
+                rows[row['place_id']] = row
+                logger.info(f"  [{len(rows)}] {row['business_name']} | ⭐{row['rating']} | "
+                            f"🌐 {row['website'] or 'no website'}")
+                await _hand_off(on_row, row, failed)
+
+    async def _scroll_feed(self, page, query: str, step):
+        """
+        Open the search and scroll its results feed. After each scroll
+        `step(card links)` returns how many new businesses it got, or None
+        when it has enough.
+        """
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+        url = search_url(query, self.base_url)
+        logger.info(f"🌐 Loading: {url}")
+        await page.goto(url, wait_until="domcontentloaded", timeout=MAPS_NAV_TIMEOUT)
+        try:
+            await page.wait_for_selector(FEED, timeout=MAPS_RESULT_TIMEOUT)
+        except PlaywrightTimeout:
+            logger.warning("⚠️  Could not find results feed — Google Maps layout may have changed.")
+            return
+
+        stale = 0
+        while True:
+            links = await page.eval_on_selector_all(CARD_LINKS, _LINKS_JS)
+            fresh = await step(links)
+            if fresh is None:
+                break
+            if await page.evaluate(_END_JS):
+                logger.info("🏁 Google Maps returned 'end of results'.")
+                break
+            stale = 0 if fresh else stale + 1
+            if stale >= MAPS_STALE_SCROLLS:
+                logger.info(f"🏁 No new results found after {MAPS_STALE_SCROLLS} scrolls — done.")
+                break
+            try:
+                await page.eval_on_selector(FEED, "el => { el.scrollTop = el.scrollHeight; }")
+                await page.wait_for_function(_GREW_JS, arg=len(links), timeout=MAPS_SCROLL_TIMEOUT)
+            except PlaywrightTimeout:
+                pass                                # counted as a stale scroll on the next pass
+            except Exception as e:
+                logger.debug(f"Feed scroll error: {e}")
+                break
+
+    async def _detail_worker(self, found: asyncio.Queue, rows: Dict, pending: List[int], on_row=None,
+                             failed: Optional[List] = None):
+        while True:
+            order, href, label = await found.get()
+            try:
+                if failed:
+                    continue                        # the scrape is stopping: drain the queue unopened
+                row = None
+                try:
+                    row = await self._open_place(href, label)
+                except Exception as e:
+                    logger.debug(f"Place parse error ({href}): {e}")
+                if row:
+                    rows[order] = row
+                    logger.info(f"  [{len(rows)}] {row['business_name']} | ⭐{row['rating']} | "
+                                f"🌐 {row['website'] or 'no website'}")
+                    await _hand_off(on_row, row, failed)
+            finally:
+                pending[0] -= 1
+                found.task_done()
+
+    async def _open_place(self, href: str, label: str) -> Optional[Dict]:
+        from playwright.async_api import TimeoutError as PlaywrightTimeout
+        async with self.page() as page:
+            await page.goto(href, wait_until="domcontentloaded", timeout=MAPS_NAV_TIMEOUT)
+            self.places_opened += 1
+            try:
+                await page.wait_for_selector(f'{PANEL} h1', timeout=MAPS_DETAIL_TIMEOUT)
+            except PlaywrightTimeout:
+                return None
+            try:
+                await page.wait_for_selector(f'{PANEL} [data-item-id]', timeout=MAPS_INFO_TIMEOUT)
+            except PlaywrightTimeout:
+                pass                                # a listing without address / phone / website
+            html = await page.eval_on_selector(PANEL, "el => el.outerHTML")
+            url  = page.url
+        row = parse_place_panel(html, url, fallback_name=label)
+        if row and not row['place_id']:
+            row['place_id'] = place_id_from_url(href)
+        return row
+
+
+async def _hand_off(on_row, row: Dict, failed: Optional[List] = None):
+    """
+    on_row(copy of row) on a worker thread, so a blocking consumer never
+    stalls the event loop. Its error goes into `failed` (if given), where
+    the scrape picks it up and stops.
+    """
+    if on_row is None or failed:
+        return
+    try:
+        await asyncio.to_thread(on_row, dict(row))
+    except Exception as e:
+        if failed is None:
+            raise
+        failed.append(e)
+
+
+async def _close_quietly(closable):
+    try:
+        await closable.close()
+    except Exception:
+        pass
+
+
+# ─────────────────────────────────────────────
+# CLASSIC SCRAPER
+# ─────────────────────────────────────────────
+
+def scrape_classic(query: str, max_results: int = MAPS_MAX_RESULTS,
+                   on_row: Optional[Callable[[Dict], None]] = None, skip: Iterable[str] = (),
+                   base_url: str = MAPS_BASE_URL, headless: bool = True,
+                   proxy: Optional[str] = None) -> tuple:
+    """
+    (rows, listings skipped) the way scrape_google_maps() worked before
+    the pool: its own Chromium, one tab clicking each result card in turn,
+    MAPS_SCROLL_PAUSE after every scroll. Must not be called from a thread
+    running an event loop (Playwright's sync API).
+    """
+    from playwright.sync_api import sync_playwright
+
+    results, skipped = [], 0
+    with sync_playwright() as p:
+        browser = p.chromium.launch(headless=headless, args=["--no-sandbox"],
+                                    proxy={'server': proxy} if proxy else None)
+        context = browser.new_context(user_agent=USER_AGENT, locale="en-US", viewport=VIEWPORT)
+        page = context.new_page()
+
+        url = search_url(query, base_url)
+        logger.info(f"🌐 Loading: {url}")
+        page.goto(url, wait_until="domcontentloaded", timeout=MAPS_NAV_TIMEOUT)
+
+        # Wait for results sidebar to appear
+        try:
+            page.wait_for_selector(FEED, timeout=MAPS_RESULT_TIMEOUT)
+        except Exception:
+            logger.warning("⚠️  Could not find results feed — Google Maps layout may have changed.")
+            browser.close()
+            return results, skipped
+
+        seen_names = set()
+        no_new_count = 0
+
+        while len(results) + skipped < max_results:
+            # Collect all currently visible result cards
+            cards = page.query_selector_all(f'{FEED} > div')
+            new_this_round = 0
+
+            for card in cards:
+                if len(results) + skipped >= max_results:
+                    break
+
+                try:
+                    # Business name
+                    name_el = card.query_selector('div.fontHeadlineSmall, [aria-label] .fontHeadlineSmall')
+                    if not name_el:
+                        # Try alternative selectors
+                        name_el = card.query_selector('span.fontBodyMedium span')
+                    if not name_el:
+                        continue
+                    name = name_el.inner_text().strip()
+                    if not name or name in seen_names:
+                        continue
+
+                    # Click the card to load the detail panel
+                    card.click()
+                    try:
+                        page.wait_for_selector(f'{PANEL} h1', timeout=5000)
+                    except Exception:
+                        pass
+                    time.sleep(0.8)
+
+                    detail = page.query_selector(PANEL)
+                    if not detail:
+                        continue
+
+                    # --- Extract fields from detail panel ---
+                    biz_name = ""
+                    try:
+                        h1 = detail.query_selector('h1')
+                        if h1:
+                            biz_name = h1.inner_text().strip()
+                    except Exception:
+                        biz_name = name
+
+                    if not biz_name:
+                        biz_name = name
+
+                    if biz_name in seen_names:
+                        continue
+                    seen_names.add(biz_name)
+                    new_this_round += 1
+
+                    # Same ids as the pool, so batch journals and --resume work across modes
+                    place_id = place_id_from_url(page.url)
+                    if place_id and place_id in skip:
+                        skipped += 1
+                        continue
+
+                    # Rating
+                    rating = ""
+                    try:
+                        rating_el = detail.query_selector('div.F7nice span[aria-hidden="true"]')
+                        if rating_el:
+                            rating = rating_el.inner_text().strip()
+                    except Exception:
+                        pass
+
+                    # Reviews count
+                    reviews = ""
+                    try:
+                        reviews_el = detail.query_selector('div.F7nice span[aria-label]')
+                        if reviews_el:
+                            label = reviews_el.get_attribute('aria-label') or ""
+                            m = re.search(r'[\d,]+', label)
+                            if m:
+                                reviews = m.group().replace(',', '')
+                    except Exception:
+                        pass
+
+                    # Category
+                    category = ""
+                    try:
+                        cat_el = detail.query_selector('button.DkEaL')
+                        if cat_el:
+                            category = cat_el.inner_text().strip()
+                    except Exception:
+                        pass
+
+                    # Address
+                    address = ""
+                    try:
+                        addr_els = detail.query_selector_all('button[data-item-id="address"]')
+                        for el in addr_els:
+                            txt = el.inner_text().strip()
+                            if txt:
+                                address = txt
+                                break
+                        if not address:
+                            # fallback: look for aria-label containing address
+                            addr_el = detail.query_selector('[data-tooltip="Copy address"]')
+                            if addr_el:
+                                address = addr_el.get_attribute('aria-label') or ""
+                    except Exception:
+                        pass
+
+                    # Phone
+                    phone = ""
+                    try:
+                        phone_els = detail.query_selector_all('button[data-item-id^="phone"]')
+                        for el in phone_els:
+                            txt = el.inner_text().strip()
+                            if txt:
+                                phone = txt
+                                break
+                        if not phone:
+                            phone_el = detail.query_selector('[data-tooltip="Copy phone number"]')
+                            if phone_el:
+                                phone = phone_el.get_attribute('aria-label') or ""
+                                phone = re.sub(r'[^\d+\s()-]', '', phone).strip()
+                    except Exception:
+                        pass
+
+                    # Website
+                    website = ""
+                    try:
+                        web_els = detail.query_selector_all('a[data-item-id="authority"]')
+                        for el in web_els:
+                            href = el.get_attribute('href') or ""
+                            if href and href.startswith('http') and 'google.com' not in href:
+                                website = href.rstrip('/')
+                                break
+                        if not website:
+                            web_el = detail.query_selector('a[href^="http"]:not([href*="google.com"])')
+                            if web_el:
+                                href = web_el.get_attribute('href') or ""
+                                if href:
+                                    website = href.rstrip('/')
+                    except Exception:
+                        pass
+
+                    row = {
+                        'place_id': place_id,
+                        'business_name': biz_name,
+                        'rating': rating,
+                        'reviews': reviews,
+                        'category': category,
+                        'address': address,
+                        'whatsapp_number': phone,
+                        'website': website,
+                    }
+                    results.append(row)
+                    logger.info(f"  [{len(results)}] {biz_name} | ⭐{rating} | 🌐 {website or 'no website'}")
+                    if on_row is not None:
+                        on_row(dict(row))
+
+                except ScrapeCancelled:
+                    raise
+                except Exception as e:
+                    logger.debug(f"Card parse error: {e}")
+                    continue
+
+            if new_this_round == 0:
+                no_new_count += 1
+                if no_new_count >= MAPS_STALE_SCROLLS:
+                    logger.info(f"🏁 No new results found after {MAPS_STALE_SCROLLS} scrolls — done.")
+                    break
+            else:
+                no_new_count = 0
+
+            # Check for end-of-results marker
+            end_marker = page.query_selector("p.fontBodyMedium > span")
+            if end_marker:
+                txt = end_marker.inner_text()
+                if "end of results" in txt.lower():
+                    logger.info("🏁 Google Maps returned 'end of results'.")
+                    break
+
+            # Scroll the sidebar to load more
+            try:
+                feed = page.query_selector(FEED)
+                if feed:
+                    feed.evaluate("el => el.scrollTop += 1200")
+                    time.sleep(MAPS_SCROLL_PAUSE)
+            except Exception:
+                break
+
+        browser.close()
+
+    return results, skipped
+
+
+# ─────────────────────────────────────────────
+# SHARED INSTANCE
+# ─────────────────────────────────────────────
+
+_shared: Optional[BrowserPool] = None
+_shared_lock = threading.Lock()
+
+
+def shared_pool(**options) -> BrowserPool:
+    """Process-wide pool, started on first scrape and closed at exit (options apply on first call)."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = BrowserPool(**options)
+            atexit.register(_shared.close)
+        return _shared
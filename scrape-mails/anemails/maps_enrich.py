@@ -1,18 +1,33 @@
-import csv
+import argparse
+import asyncio
 import re
 import time
 import random
-import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
-from urllib.robotparser import RobotFileParser
 import os
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import queue
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import closing
 from collections import deque, defaultdict
 from datetime import datetime
-from threading import Lock
-from playwright.sync_api import sync_playwright
+from threading import BoundedSemaphore, Event, Lock, Thread
+
+from aimd import AIMD_MAX_WINDOW, AIMD_MIN_WINDOW, AimdController
+from checkpoint import (
+    JsonlCheckpoint, checkpoint_path, done_keys, find_latest_checkpoint,
+    output_path_for, row_key, write_csv_from_checkpoint,
+)
+from fetch_guard import guarded_get, response_html
+from frontier import PATH_STATS_FILE, PathStats
+from lead_scoring import RULES as SCORING_RULES, best_contact, score_email, score_row
+from maps_batch import MapsBatch, journal_path, read_queries
+from maps_browser import MAPS_MODES, ScrapeCancelled, shared_pool
+from page_cache import cached_get, shared_cache
+from pipeline import stream_map
+from robots import AsyncRobots, shared_store as robots_store
+from sitemaps import discover_sync
 
 # ----------------------------- 
 # CONFIGURATION
@@ -34,14 +49,22 @@ MAX_PAGES_PER_SITE = 12
 MAX_WORKERS = 6
 REQUEST_DELAY_MIN = 0.5
 REQUEST_DELAY_MAX = 1.0
-BATCH_SIZE = 50
 CHECKPOINT_INTERVAL = 10
 DOMAIN_REQUEST_DELAY = 2.0
+USE_SITEMAPS = True  # go straight to contact/about/team URLs listed in sitemap.xml
 
-# Google Maps scraper settings
-MAPS_SCROLL_PAUSE = 2.5      # seconds between scrolls in the results sidebar
+# Google Maps scraper settings (browser pool size and waits: maps_browser.py)
 MAPS_MAX_RESULTS = 120       # hard cap on businesses scraped per query
-MAPS_RESULT_TIMEOUT = 20000  # ms to wait for results panel
+MAPS_MODE = 'dom'            # 'network': decode listings from Maps' own search responses, open no place pages
+MAPS_STREAM = True           # enrich each business while the Maps scrape is still running (--no-stream: one after the other)
+MAPS_STREAM_QUEUE = 2 * MAX_WORKERS   # scraped businesses waiting for an enrichment worker; a full queue slows the scrape
+MAPS_STREAM_POLL = 0.5       # seconds a scrape blocked on a full queue waits before checking the consumer is still there
+ENRICH_IN_FLIGHT = 2 * MAX_WORKERS    # rows submitted to the enrichment pool and not yet finished
+
+# Website crawl engine
+CRAWL_ENGINES = ('async', 'threads')
+CRAWL_ENGINE = 'async'       # 'async': enrich.py's aiohttp crawler; 'threads': requests on MAX_WORKERS threads
+ASYNC_WINDOW = 20            # starting AIMD window of in-flight requests for the async engine
 
 domain_locks = defaultdict(Lock)
 domain_last_request = {}
@@ -89,15 +112,6 @@ COMPANY_SIZE_KEYWORDS = {
     'large': ['enterprise', 'global', 'multinational', 'fortune', 'leading', 'industry leader']
 }
 
-EMAIL_QUALITY_SCORES = {
-    'high': ['contact', 'info', 'hello', 'hi', 'sales', 'inquiries'],
-    'medium': ['support', 'help', 'service', 'admin'],
-    'low': ['noreply', 'no-reply', 'donotreply', 'mailer-daemon']
-}
-
-robots_cache = {}
-robots_cache_lock = Lock()
-
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s | %(levelname)s | %(message)s',
@@ -110,243 +124,98 @@ logger = logging.getLogger()
 # GOOGLE MAPS SCRAPER
 # =============================
 
-def scrape_google_maps(query: str, max_results: int = MAPS_MAX_RESULTS) -> list[dict]:
+def scrape_google_maps(query: str, max_results: int = MAPS_MAX_RESULTS, pool=None, mode: str = None,
+                       on_row=None, skip=()) -> list[dict]:
     """
-    Use Playwright to scrape business listings from Google Maps for a given query.
-    Returns a list of dicts matching the expected row format.
+    Scrape business listings from Google Maps for a given query with the
+    shared browser pool (see maps_browser.py), which stays open across queries.
+    mode 'dom' reads each place page, 'network' decodes the feed's own
+    responses (default MAPS_MODE); 'classic' is the single-tab scraper that
+    predates the pool, kept as a fallback. Returns a list of dicts matching the
+    expected row format; on_row(row) also gets each one as soon as it is parsed.
+    Listings whose place_id is in `skip` are not opened or returned.
     """
-    logger.info(f"🗺️  Starting Google Maps scrape for: '{query}'")
-    results = []
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True, args=["--no-sandbox"])
-        context = browser.new_context(
-            user_agent=(
-                "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-                "AppleWebKit/537.36 (KHTML, like Gecko) "
-                "Chrome/120.0.0.0 Safari/537.36"
-            ),
-            locale="en-US",
-            viewport={"width": 1280, "height": 900},
-        )
-        page = context.new_page()
-
-        encoded_query = query.replace(" ", "+")
-        url = f"https://www.google.com/maps/search/{encoded_query}"
-        logger.info(f"🌐 Loading: {url}")
-        page.goto(url, wait_until="domcontentloaded", timeout=30000)
-
-        # Wait for results sidebar to appear
-        try:
-            page.wait_for_selector('div[role="feed"]', timeout=MAPS_RESULT_TIMEOUT)
-        except Exception:
-            logger.warning("⚠️  Could not find results feed — Google Maps layout may have changed.")
-            browser.close()
-            return results
-
-        seen_names = set()
-        no_new_count = 0
-
-        while len(results) < max_results:
-            # Collect all currently visible result cards
-            cards = page.query_selector_all('div[role="feed"] > div')
-            new_this_round = 0
-
-            for card in cards:
-                if len(results) >= max_results:
-                    break
-
-                try:
-                    # Business name
-                    name_el = card.query_selector('div.fontHeadlineSmall, [aria-label] .fontHeadlineSmall')
-                    if not name_el:
-                        # Try alternative selectors
-                        name_el = card.query_selector('span.fontBodyMedium span')
-                    if not name_el:
-                        continue
-                    name = name_el.inner_text().strip()
-                    if not name or name in seen_names:
-                        continue
-
-                    # Click the card to load the detail panel
-                    card.click()
-                    try:
-                        page.wait_for_selector('div[role="main"] h1', timeout=5000)
-                    except Exception:
-                        pass
-                    time.sleep(0.8)
-
-                    detail = page.query_selector('div[role="main"]')
-                    if not detail:
-                        continue
-
-                    # --- Extract fields from detail panel ---
-                    biz_name = ""
-                    try:
-                        h1 = detail.query_selector('h1')
-                        if h1:
-                            biz_name = h1.inner_text().strip()
-                    except Exception:
-                        biz_name = name
+    mode = mode or MAPS_MODE
+    logger.info(f"🗺️  Starting Google Maps scrape for: '{query}' ({mode} mode)")
+    pool = pool or shared_pool()
+    start = time.time()
+    results = pool.scrape(query, max_results=max_results, mode=mode, on_row=on_row, skip=skip)
+    elapsed = time.time() - start
+    rate = 60 * len(results) / elapsed if elapsed > 0 else 0
+    known = f", {pool.last_skipped} already captured" if pool.last_skipped else ""
+    pages = "1 tab, classic" if mode == 'classic' else f"{pool.size} pages"
+    logger.info(f"✅ Google Maps scrape complete: {len(results)} businesses found{known} "
+                f"in {elapsed:.0f}s ({rate:.0f}/min, {pages})")
+    if mode != 'classic':
+        logger.info(pool.last_traffic.summary(len(results)) + ("" if pool.lean else " — full browser profile"))
+    return results
 
-                    if not biz_name:
-                        biz_name = name
 
-                    if biz_name in seen_names:
-                        continue
-                    seen_names.add(biz_name)
-                    new_this_round += 1
-
-                    # Rating
-                    rating = ""
-                    try:
-                        rating_el = detail.query_selector('div.F7nice span[aria-hidden="true"]')
-                        if rating_el:
-                            rating = rating_el.inner_text().strip()
-                    except Exception:
-                        pass
-
-                    # Reviews count
-                    reviews = ""
-                    try:
-                        reviews_el = detail.query_selector('div.F7nice span[aria-label]')
-                        if reviews_el:
-                            label = reviews_el.get_attribute('aria-label') or ""
-                            m = re.search(r'[\d,]+', label)
-                            if m:
-                                reviews = m.group().replace(',', '')
-                    except Exception:
-                        pass
-
-                    # Category
-                    category = ""
-                    try:
-                        cat_el = detail.query_selector('button.DkEaL')
-                        if cat_el:
-                            category = cat_el.inner_text().strip()
-                    except Exception:
-                        pass
-
-                    # Address
-                    address = ""
-                    try:
-                        addr_els = detail.query_selector_all('button[data-item-id="address"]')
-                        for el in addr_els:
-                            txt = el.inner_text().strip()
-                            if txt:
-                                address = txt
-                                break
-                        if not address:
-                            # fallback: look for aria-label containing address
-                            addr_el = detail.query_selector('[data-tooltip="Copy address"]')
-                            if addr_el:
-                                address = addr_el.get_attribute('aria-label') or ""
-                    except Exception:
-                        pass
-
-                    # Phone
-                    phone = ""
-                    try:
-                        phone_els = detail.query_selector_all('button[data-item-id^="phone"]')
-                        for el in phone_els:
-                            txt = el.inner_text().strip()
-                            if txt:
-                                phone = txt
-                                break
-                        if not phone:
-                            phone_el = detail.query_selector('[data-tooltip="Copy phone number"]')
-                            if phone_el:
-                                phone = phone_el.get_attribute('aria-label') or ""
-                                phone = re.sub(r'[^\d+\s()-]', '', phone).strip()
-                    except Exception:
-                        pass
-
-                    # Website
-                    website = ""
-                    try:
-                        web_els = detail.query_selector_all('a[data-item-id="authority"]')
-                        for el in web_els:
-                            href = el.get_attribute('href') or ""
-                            if href and href.startswith('http') and 'google.com' not in href:
-                                website = href.rstrip('/')
-                                break
-                        if not website:
-                            web_el = detail.query_selector('a[href^="http"]:not([href*="google.com"])')
-                            if web_el:
-                                href = web_el.get_attribute('href') or ""
-                                if href:
-                                    website = href.rstrip('/')
-                    except Exception:
-                        pass
-
-                    # Place ID from URL
-                    place_id = ""
-                    try:
-                        current_url = page.url
-                        m = re.search(r'place/[^/]+/([^/]+)', current_url)
-                        if m:
-                            place_id = m.group(1)
-                        else:
-                            m2 = re.search(r'!1s([^!]+)!', current_url)
-                            if m2:
-                                place_id = m2.group(1)
-                    except Exception:
-                        pass
-
-                    row = {
-                        'place_id': place_id,
-                        'business_name': biz_name,
-                        'rating': rating,
-                        'reviews': reviews,
-                        'category': category,
-                        'address': address,
-                        'whatsapp_number': phone,
-                        'website': website,
-                    }
-                    results.append(row)
-                    logger.info(f"  [{len(results)}] {biz_name} | ⭐{rating} | 🌐 {website or 'no website'}")
-
-                except Exception as e:
-                    logger.debug(f"Card parse error: {e}")
-                    continue
-
-            if new_this_round == 0:
-                no_new_count += 1
-                if no_new_count >= 3:
-                    logger.info("🏁 No new results found after 3 scrolls — done.")
-                    break
-            else:
-                no_new_count = 0
+def stream_google_maps(query: str, max_results: int = MAPS_MAX_RESULTS, pool=None, mode: str = None,
+                       maxsize: int = MAPS_STREAM_QUEUE, scrape=None, skip=()):
+    """
+    scrape_google_maps() as a generator: the scrape runs on its own thread
+    and each business is yielded as soon as its listing is parsed, through
+    a queue of at most `maxsize` rows (a consumer that falls behind holds
+    the browser back rather than letting rows pile up). Errors from the
+    scrape are raised once the rows before them are consumed. A consumer
+    that stops early (an error, Ctrl-C, close()) cancels the scrape: its
+    next hand-off raises ScrapeCancelled instead of waiting on the queue.
+    `scrape` replaces scrape_google_maps (same signature).
+    """
+    scrape = scrape or scrape_google_maps
+    rows, end, failed, stop = queue.Queue(maxsize=maxsize), object(), [], Event()
 
-            # Check for end-of-results marker
-            end_marker = page.query_selector("p.fontBodyMedium > span")
-            if end_marker:
-                txt = end_marker.inner_text()
-                if "end of results" in txt.lower():
-                    logger.info("🏁 Google Maps returned 'end of results'.")
-                    break
+    def put(item):
+        while not stop.is_set():
+            try:
+                return rows.put(item, timeout=MAPS_STREAM_POLL)
+            except queue.Full:
+                pass
+        raise ScrapeCancelled(query)
 
-            # Scroll the sidebar to load more
+    def produce():
+        try:
+            scrape(query, max_results=max_results, pool=pool, mode=mode, on_row=put, skip=skip)
+        except ScrapeCancelled:
+            pass
+        except BaseException as e:
+            failed.append(e)
+        finally:
             try:
-                feed = page.query_selector('div[role="feed"]')
-                if feed:
-                    feed.evaluate("el => el.scrollTop += 1200")
-                    time.sleep(MAPS_SCROLL_PAUSE)
-            except Exception:
-                break
+                put(end)
+            except ScrapeCancelled:
+                pass
 
-        browser.close()
+    def get():
+        # timed, so a stream whose scrape thread died without sending `end` cannot wait forever
+        while True:
+            try:
+                return rows.get(timeout=MAPS_STREAM_POLL)
+            except queue.Empty:
+                if not producer.is_alive() and rows.empty():
+                    return end
 
-    logger.info(f"✅ Google Maps scrape complete: {len(results)} businesses found")
-    return results
+    producer = Thread(target=produce, name='maps-scrape', daemon=True)
+    producer.start()
+    try:
+        for row in iter(get, end):
+            yield row
+    finally:
+        stop.set()
+    if failed:
+        raise failed[0]
 
 
 # =============================
 # UTILITY FUNCTIONS (unchanged)
 # =============================
 
+def safe_query_name(query: str) -> str:
+    return re.sub(r'[^\w\s-]', '', query).strip().replace(' ', '_')[:40]
+
 def create_output_filename(query: str) -> str:
-    safe_query = re.sub(r'[^\w\s-]', '', query).strip().replace(' ', '_')[:40]
+    safe_query = safe_query_name(query)
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
     output_name = f"{safe_query}_enriched_{timestamp}.csv"
     output_dir = '.'
@@ -385,25 +254,20 @@ def extract_base_domain(netloc):
 
 def can_fetch_url(url):
     try:
-        parsed = urlparse(url)
-        base_url = f"{parsed.scheme}://{parsed.netloc}"
-        with robots_cache_lock:
-            if base_url not in robots_cache:
-                rp = RobotFileParser()
-                rp.set_url(urljoin(base_url, '/robots.txt'))
-                try:
-                    rp.read()
-                    robots_cache[base_url] = rp
-                except Exception:
-                    robots_cache[base_url] = None
-            rp = robots_cache.get(base_url)
-            if rp is None:
-                return True
-            return rp.can_fetch("*", url)
+        return robots_store().allowed(url)
     except Exception:
         return True
 
-def rate_limit_domain(domain):
+def get_robots_sitemaps(url):
+    """`Sitemap:` entries from the shared robots.txt store (fetches it if needed)."""
+    try:
+        return robots_store().sitemaps(url)
+    except Exception:
+        return []
+
+def rate_limit_domain(domain, crawl_delay=0):
+    """Space requests to a domain by DOMAIN_REQUEST_DELAY, or its robots.txt Crawl-delay if longer."""
+    delay = max(DOMAIN_REQUEST_DELAY, crawl_delay)
     with domain_lock_manager:
         if domain not in domain_locks:
             domain_locks[domain] = Lock()
@@ -412,8 +276,8 @@ def rate_limit_domain(domain):
         now = time.time()
         if domain in domain_last_request:
             elapsed = now - domain_last_request[domain]
-            if elapsed < DOMAIN_REQUEST_DELAY:
-                time.sleep(DOMAIN_REQUEST_DELAY - elapsed)
+            if elapsed < delay:
+                time.sleep(delay - elapsed)
         domain_last_request[domain] = time.time()
 
 def is_relevant_email(email, base_domain):
@@ -430,21 +294,6 @@ def is_relevant_email(email, base_domain):
     except Exception:
         return False
 
-def score_email_quality(email):
-    email_lower = email.lower()
-    for low_keyword in EMAIL_QUALITY_SCORES['low']:
-        if low_keyword in email_lower:
-            return 2
-    for high_keyword in EMAIL_QUALITY_SCORES['high']:
-        if high_keyword in email_lower:
-            return 9
-    for med_keyword in EMAIL_QUALITY_SCORES['medium']:
-        if med_keyword in email_lower:
-            return 6
-    if '.' in email.split('@')[0]:
-        return 7
-    return 5
-
 def clean_phone_number(phone_str):
     if not phone_str:
         return None
@@ -562,13 +411,17 @@ def get_soup(url, timeout=EMAIL_TIMEOUT):
         return None
     parsed = urlparse(url)
     domain = extract_base_domain(parsed.netloc)
-    rate_limit_domain(domain)
+    crawl_delay = robots_store().crawl_delay(url)
     for attempt in range(MAX_RETRIES + 1):
         try:
-            response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+            # guarded_get streams at most MAX_PAGE_BYTES and skips PDFs/images (empty content)
+            response = cached_get(url, get=guarded_get,
+                                  before_request=lambda: rate_limit_domain(domain, crawl_delay),
+                                  timeout=timeout, headers=headers, allow_redirects=True)
             if response.status_code == 200:
-                response.encoding = response.apparent_encoding or 'utf-8'
-                return BeautifulSoup(response.text, 'html.parser')
+                if not response.content:
+                    return None
+                return BeautifulSoup(response_html(response), 'html.parser')
         except Exception as e:
             if attempt < MAX_RETRIES:
                 time.sleep(random.uniform(0.5, 1.0))
@@ -576,53 +429,6 @@ def get_soup(url, timeout=EMAIL_TIMEOUT):
             logger.debug(f"Failed to fetch {url}: {str(e)[:50]}")
     return None
 
-def calculate_lead_quality_score(data):
-    score = 0
-    if data.get('email_primary'):
-        score += (score_email_quality(data['email_primary']) / 10) * 35
-    if data.get('phone_primary'):
-        score += 20
-    score += min(int(data.get('social_media_score', 0)) * 2.5, 15)
-    if data.get('decision_maker_found') == 'Yes':
-        score += 15
-    if data.get('linkedin_company'):
-        score += 10
-    if data.get('contact_page_found') == 'Yes':
-        score += 5
-    return min(int(score), 100)
-
-def calculate_contact_confidence(data):
-    s = 0
-    if data.get('email_primary'):
-        s += score_email_quality(data['email_primary'])
-    if data.get('phone_primary'):
-        s += 8
-    if data.get('contact_page_found') == 'Yes':
-        s += 5
-    if data.get('linkedin_company'):
-        s += 4
-    if s >= 18:
-        return 'High'
-    elif s >= 10:
-        return 'Medium'
-    return 'Low'
-
-def determine_best_contact_method(data):
-    methods = []
-    if data.get('email_primary') and score_email_quality(data['email_primary']) >= 7:
-        methods.append('Email')
-    if data.get('phone_primary'):
-        methods.append('Phone')
-    if data.get('linkedin_company') or data.get('linkedin_ceo'):
-        methods.append('LinkedIn')
-    if data.get('instagram'):
-        methods.append('Instagram DM')
-    if data.get('facebook'):
-        methods.append('Facebook Message')
-    if data.get('youtube'):
-        methods.append('YouTube Comment')
-    return ' → '.join(methods[:2]) if methods else 'Website Form'
-
 def scrape_all_data_from_site(root_url, existing_phone=""):
     root_url = normalize_url(root_url)
     empty = {
@@ -652,9 +458,16 @@ def scrape_all_data_from_site(root_url, existing_phone=""):
             result['phones'].add(cleaned)
 
     visited = set()
-    priority_urls = [urljoin(root_url, path) for path in PRIORITY_PATHS]
+    # Sitemap hits replace the blind PRIORITY_PATHS guesses when available
+    sitemap_urls = []
+    if USE_SITEMAPS:
+        crawl_delay = robots_store().crawl_delay(root_url)
+        sitemap_urls = discover_sync(root_url, get_robots_sitemaps(root_url), allowed=can_fetch_url,
+                                     before_request=lambda: rate_limit_domain(base_domain, crawl_delay))
+    priority_urls = sitemap_urls or [urljoin(root_url, path) for path in PRIORITY_PATHS]
     urls_to_check = deque(priority_urls)
     urls_to_check.appendleft(root_url)
+    queued = set(urls_to_check)
 
     pages_scraped = 0
     all_text = ""
@@ -699,9 +512,10 @@ def scrape_all_data_from_site(root_url, existing_phone=""):
                     if u and 1 <= len(u) <= 15:
                         result['twitter'] = f"https://x.com/{u}/"
             if urlparse(full_url).netloc == parsed.netloc and len(visited) < MAX_PAGES_PER_SITE:
-                if full_url not in visited and full_url not in urls_to_check:
+                if full_url not in visited and full_url not in queued:
                     if any(keyword in full_url.lower() for keyword in ['contact', 'about', 'team', 'services', 'products', 'blog', 'news', 'company']):
                         urls_to_check.appendleft(full_url)
+                        queued.add(full_url)
 
         html_text = str(soup)
         all_html += " " + html_text
@@ -734,87 +548,255 @@ def scrape_all_data_from_site(root_url, existing_phone=""):
     result['emails'] = clean_emails
     return result
 
-def process_row(row):
+def fill_row(row, data):
+    """Write a site's crawl results (scrape_all_data_from_site() or enrich.scrape_site()) into its row."""
     business_name = row.get('business_name', 'Unknown')
-    website = row.get('website', '')
     existing_phone = row.get('whatsapp_number', '')
 
-    try:
-        data = scrape_all_data_from_site(website, existing_phone)
-
-        primary_email = ""
-        primary_phone = ""
-
-        if data['emails']:
-            scored = sorted([(e, score_email_quality(e)) for e in data['emails']], key=lambda x: x[1], reverse=True)
-            primary_email = scored[0][0]
-
-        if data['phones']:
-            sorted_phones = sorted(data['phones'], key=lambda p: (not p.startswith('+'), len(p), p))
-            primary_phone = sorted_phones[0]
-
-        row['email'] = '; '.join(sorted(data['emails'])) if data['emails'] else ''
-        row['email_primary'] = primary_email
-        row['instagram'] = data['instagram']
-        row['twitter'] = data['twitter']
-        row['linkedin_company'] = data['linkedin_company']
-        row['linkedin_ceo'] = data['linkedin_ceo']
-        row['linkedin_founder'] = data['linkedin_founder']
-        row['facebook'] = data['facebook']
-        row['youtube'] = data['youtube']
-        row['contact_page_found'] = 'Yes' if data['contact_page_found'] else 'No'
-        row['social_media_score'] = str(data['social_media_score'])
-        row['decision_maker_found'] = 'Yes' if data['decision_maker_found'] else 'No'
-        row['tech_stack_detected'] = ', '.join(data['tech_stack']) if data['tech_stack'] else ''
-        row['company_size_indicator'] = data['company_size']
-
-        if data['phones']:
-            sorted_phones = sorted(data['phones'], key=lambda p: (not p.startswith('+'), p))
-            row['whatsapp_number'] = '; '.join(sorted_phones)
-            row['phone_primary'] = primary_phone
-        elif existing_phone:
-            row['phone_primary'] = existing_phone
-        else:
-            row['whatsapp_number'] = ''
-            row['phone_primary'] = ''
+    primary_email = ""
+    primary_phone = ""
+
+    if data['emails']:
+        scored = sorted([(e, score_email(e)) for e in data['emails']], key=lambda x: x[1], reverse=True)
+        primary_email = scored[0][0]
+
+    if data['phones']:
+        sorted_phones = sorted(data['phones'], key=lambda p: (not p.startswith('+'), len(p), p))
+        primary_phone = sorted_phones[0]
+
+    row['email'] = '; '.join(sorted(data['emails'])) if data['emails'] else ''
+    row['email_primary'] = primary_email
+    row['instagram'] = data['instagram']
+    row['twitter'] = data['twitter']
+    row['linkedin_company'] = data['linkedin_company']
+    row['linkedin_ceo'] = data['linkedin_ceo']
+    row['linkedin_founder'] = data['linkedin_founder']
+    row['facebook'] = data['facebook']
+    row['youtube'] = data['youtube']
+    row['contact_page_found'] = 'Yes' if data['contact_page_found'] else 'No'
+    row['social_media_score'] = str(data['social_media_score'])
+    row['decision_maker_found'] = 'Yes' if data['decision_maker_found'] else 'No'
+    row['tech_stack_detected'] = ', '.join(data['tech_stack']) if data['tech_stack'] else ''
+    row['company_size_indicator'] = data['company_size']
+
+    if data['phones']:
+        sorted_phones = sorted(data['phones'], key=lambda p: (not p.startswith('+'), p))
+        row['whatsapp_number'] = '; '.join(sorted_phones)
+        row['phone_primary'] = primary_phone
+    elif existing_phone:
+        row['phone_primary'] = existing_phone
+    else:
+        row['whatsapp_number'] = ''
+        row['phone_primary'] = ''
+
+    row['lead_quality_score'] = str(score_row(SCORING_RULES['contact_score'], row)[0])
+    row['contact_confidence'] = score_row(SCORING_RULES['contact_confidence'], row)[1]
+    row['best_contact_method'] = best_contact(SCORING_RULES['contact_methods'], row)
+
+    logger.info(f"✓ {business_name}: Quality={row['lead_quality_score']}, Confidence={row['contact_confidence']}")
+    return row
 
-        row['lead_quality_score'] = str(calculate_lead_quality_score(row))
-        row['contact_confidence'] = calculate_contact_confidence(row)
-        row['best_contact_method'] = determine_best_contact_method(row)
+def failed_row(row, error):
+    """Blank enrichment columns for a site that could not be crawled."""
+    business_name = row.get('business_name', 'Unknown')
+    existing_phone = row.get('whatsapp_number', '')
+    logger.warning(f"Failed to scrape {business_name}: {str(error)[:100]}")
+    for field in ['email', 'email_primary', 'instagram', 'twitter', 'linkedin_company',
+                  'linkedin_ceo', 'linkedin_founder', 'facebook', 'youtube', 'tech_stack_detected']:
+        row[field] = ''
+    row['contact_page_found'] = 'No'
+    row['social_media_score'] = '0'
+    row['decision_maker_found'] = 'No'
+    row['company_size_indicator'] = 'unknown'
+    row['lead_quality_score'] = '0'
+    row['contact_confidence'] = 'Low'
+    row['best_contact_method'] = 'Unknown'
+    if not existing_phone:
+        row['whatsapp_number'] = ''
+        row['phone_primary'] = ''
+    else:
+        row['phone_primary'] = existing_phone
+    return row
 
-        logger.info(f"✓ {business_name}: Quality={row['lead_quality_score']}, Confidence={row['contact_confidence']}")
+def process_row(row):
+    try:
+        return fill_row(row, scrape_all_data_from_site(row.get('website', ''), row.get('whatsapp_number', '')))
+    except Exception as e:
+        return failed_row(row, e)
 
+async def process_row_async(row, session, robots, limiter, stats, controller, pages):
+    """process_row() on enrich.py's crawler (see enrich_rows_async)."""
+    from enrich import scrape_site
+    try:
+        data = await scrape_site(session, row.get('website', ''), robots, limiter, asyncio.get_running_loop(),
+                                 row.get('whatsapp_number', ''), stats, controller, None, pages)
+        return fill_row(row, data)
     except Exception as e:
-        logger.warning(f"Failed to scrape {business_name}: {str(e)[:100]}")
-        for field in ['email', 'email_primary', 'instagram', 'twitter', 'linkedin_company',
-                      'linkedin_ceo', 'linkedin_founder', 'facebook', 'youtube', 'tech_stack_detected']:
-            row[field] = ''
-        row['contact_page_found'] = 'No'
-        row['social_media_score'] = '0'
-        row['decision_maker_found'] = 'No'
-        row['company_size_indicator'] = 'unknown'
-        row['lead_quality_score'] = '0'
-        row['contact_confidence'] = 'Low'
-        row['best_contact_method'] = 'Unknown'
-        if not existing_phone:
-            row['whatsapp_number'] = ''
-            row['phone_primary'] = ''
-        else:
-            row['phone_primary'] = existing_phone
+        return failed_row(row, e)
 
-    return row
+def log_progress(completed, total, start_time, note):
+    if completed % 10:
+        return
+    if total:
+        elapsed = time.time() - start_time
+        rate = completed / elapsed if elapsed > 0 else 0
+        eta = (total - completed) / rate if rate > 0 else 0
+        logger.info(f"📊 {completed}/{total} ({100*completed//total}%) | ETA: {int(eta//60)}m {int(eta%60)}s | {note}")
+    else:
+        logger.info(f"📊 {completed} enriched | {note}")
+
+
+def enrich_rows(rows, checkpoint, total: int = None, engine: str = None) -> int:
+    """
+    Run process_row() over `rows` (a list, or a generator such as
+    stream_google_maps()) and append each result to the checkpoint as it
+    finishes. Returns the number of rows enriched.
+
+    engine 'async' (default CRAWL_ENGINE) crawls with enrich_rows_async();
+    'threads' runs the requests crawler on MAX_WORKERS threads. At most
+    ENRICH_IN_FLIGHT rows are submitted at a time, so the iterable is only
+    drawn from as workers free up.
+    """
+    engine = engine or CRAWL_ENGINE
+    if engine not in CRAWL_ENGINES:
+        raise ValueError(f"engine must be one of {CRAWL_ENGINES}, not {engine!r}")
+    if engine == 'async':
+        return asyncio.run(enrich_rows_async(rows, checkpoint, total))
 
-def save_checkpoint(results, output_path, columns):
-    checkpoint_path = output_path.replace('.csv', '_checkpoint.csv')
+    lock, slots = Lock(), BoundedSemaphore(ENRICH_IN_FLIGHT)
+    start_time, counts = time.time(), {'submitted': 0, 'completed': 0}
+
+    def finished(future):
+        slots.release()
+        try:
+            row = future.result()
+        except Exception as e:
+            logger.error(f"❌ Row error: {str(e)[:100]}")
+            return
+        with lock:
+            checkpoint.append(row)
+            counts['completed'] += 1
+            completed, submitted = counts['completed'], counts['submitted']
+        log_progress(completed, total, start_time, f"{submitted - completed} in progress")
+
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
+        for row in rows:
+            slots.acquire()
+            with lock:
+                counts['submitted'] += 1
+            executor.submit(process_row, row.copy()).add_done_callback(finished)
+    return counts['completed']
+
+
+async def _drain(rows, executor):
+    """
+    Async view of a row iterable that may block (a Maps stream): each next()
+    runs on `executor`. Closing it closes the iterable there too, once the
+    next() in flight returns, so a Maps stream cancels its scrape.
+    """
+    loop, it, end = asyncio.get_running_loop(), iter(rows), object()
     try:
-        with open(checkpoint_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=columns, restval='')
-            writer.writeheader()
-            for row in results:
-                writer.writerow({k: v for k, v in row.items() if k in columns})
-        logger.info(f"💾 Checkpoint saved: {len(results)} rows")
-    except Exception as e:
-        logger.error(f"Failed to save checkpoint: {e}")
+        while (row := await loop.run_in_executor(executor, next, it, end)) is not end:
+            yield row
+    finally:
+        if hasattr(it, 'close'):
+            await loop.run_in_executor(executor, it.close)
+
+
+async def enrich_rows_async(rows, checkpoint, total: int = None) -> int:
+    """
+    enrich_rows() on enrich.py's aiohttp crawler: one event loop keeps
+    sites in flight up to an AIMD window (starting at ASYNC_WINDOW) instead
+    of MAX_WORKERS threads. Politeness is per domain (DomainLimiter:
+    DOMAIN_REQUEST_DELAY, longer for robots.txt Crawl-delay or after a 429)
+    rather than a sleep after every page; the frontier tracks its URLs in
+    sets, and each page is parsed once, in a single lxml pass, off the
+    loop. robots.txt and pages come from the same shared stores as the
+    threaded crawler; learned path stats are saved at the end.
+
+    aiohttp and enrich.py (lxml) are imported here rather than at module
+    level, so --engine threads runs without them.
+    """
+    import aiohttp
+    from enrich import DOMAIN_CONCURRENCY, DomainLimiter
+
+    controller = AimdController(ASYNC_WINDOW, AIMD_MIN_WINDOW, AIMD_MAX_WINDOW)
+    robots  = AsyncRobots(controller, robots_store())
+    limiter = DomainLimiter(DOMAIN_REQUEST_DELAY)
+    stats   = PathStats.load(PATH_STATS_FILE)
+    pages   = shared_cache()
+    workers = controller.max_window          # enough sites in progress to fill the largest window
+    connector = aiohttp.TCPConnector(limit=controller.max_window, limit_per_host=DOMAIN_CONCURRENCY,
+                                     ttl_dns_cache=300, ssl=False, enable_cleanup_closed=True)
+    reader = ThreadPoolExecutor(max_workers=1, thread_name_prefix='rows')
+    start_time, completed = time.time(), 0
+    try:
+        async with aiohttp.ClientSession(connector=connector, trust_env=True) as session:
+            async def enrich(row):
+                return await process_row_async(row.copy(), session, robots, limiter, stats, controller, pages)
+
+            results = stream_map(_drain(rows, reader), enrich, workers=workers,
+                                 window=max(ENRICH_IN_FLIGHT, 2 * workers))
+            try:
+                async for _, row, err in results:
+                    if err is not None:
+                        logger.error(f"❌ Row error: {str(err)[:100]}")
+                        continue
+                    checkpoint.append(row)
+                    completed += 1
+                    log_progress(completed, total, start_time, controller.status())
+            finally:
+                await results.aclose()       # stops the reader, closing `rows` on its thread
+    finally:
+        reader.shutdown(wait=False)
+        try:
+            stats.save()
+        except Exception as e:
+            logger.error(f"Path stats save failed: {e}")
+    logger.info(f"🌐 Async crawl: {completed} sites [{controller.status()}]")
+    return completed
+
+
+def batch_rows(queries, batch, max_results: int = MAPS_MAX_RESULTS, pool=None, mode: str = None,
+               stream: bool = MAPS_STREAM, scrape=None):
+    """
+    Businesses for a list of queries, each once (see maps_batch.py): first
+    the rows an interrupted run captured, then every unfinished query's
+    new listings, journaled in `batch` as they arrive. Listings captured
+    before are not opened again and duplicates never reach enrichment.
+    Closing the generator cancels a streaming scrape. `scrape` replaces
+    scrape_google_maps (same signature).
+    """
+    pool, scrape = pool or shared_pool(), scrape or scrape_google_maps
+    yield from batch.captured()
+    todo = batch.pending(queries)
+    for n, query in enumerate(todo, 1):
+        if len(todo) > 1:
+            logger.info(f"🔎 Query {n}/{len(todo)}: '{query}'")
+        skip = frozenset(batch.place_ids)
+        if stream:
+            rows = stream_google_maps(query, max_results, pool=pool, mode=mode, scrape=scrape, skip=skip)
+        else:
+            rows = scrape(query, max_results=max_results, pool=pool, mode=mode, skip=skip)
+        try:
+            for row in rows:
+                if batch.add(query, row):
+                    yield row
+        finally:
+            if stream:
+                rows.close()                    # the consumer stopped early: let go of the browser
+        batch.finish(query, pool.last_skipped)
+
+
+def resolve_output(query, resume):
+    """(output_path, checkpoint_path, keys already done) — resume picks the newest checkpoint for the query."""
+    if resume:
+        cp = find_latest_checkpoint(os.path.join('.', f"{safe_query_name(query)}_enriched_"))
+        if cp:
+            return output_path_for(cp), cp, done_keys(cp)
+        logger.info("No checkpoint found to resume — starting fresh.")
+    output_path = create_output_filename(query)
+    return output_path, checkpoint_path(output_path), set()
 
 
 # =============================
@@ -822,116 +804,152 @@ def save_checkpoint(results, output_path, columns):
 # =============================
 
 def main():
+    parser = argparse.ArgumentParser(description='Google Maps → lead enrichment tool')
+    parser.add_argument('query', nargs='?', help='Google Maps search query (prompted if omitted)')
+    parser.add_argument('--queries', metavar='FILE',
+                        help='run every query in FILE (one per line) into one CSV, each business enriched once')
+    parser.add_argument('--max-results', type=int, default=None)
+    parser.add_argument('--maps-mode', choices=MAPS_MODES, default=MAPS_MODE,
+                        help="dom: open every place page; network: decode Maps' search responses (faster); "
+                             "classic: the previous one-tab scraper, without the browser pool")
+    parser.add_argument('--full-browser', action='store_true',
+                        help='load images, fonts and map tiles too (the lean profile blocks them)')
+    parser.add_argument('--resume', action='store_true',
+                        help='continue the newest checkpoint for this query (or batch), skipping captured '
+                             'listings and enriched businesses')
+    parser.add_argument('--engine', choices=CRAWL_ENGINES, default=CRAWL_ENGINE,
+                        help='website crawler: async (aiohttp, per-domain politeness) or threads (requests)')
+    parser.add_argument('--no-stream', dest='stream', action='store_false', default=MAPS_STREAM,
+                        help='finish the Maps scrape before enriching (default: enrich while scraping)')
+    args = parser.parse_args()
+
     print("\n" + "="*70)
     print("🚀 GOOGLE MAPS → LEAD ENRICHMENT TOOL")
     print("="*70 + "\n")
 
-    query = input("🔍 Enter your Google Maps search query\n   (e.g. 'digital marketing agencies in Colombo'): ").strip()
-    if not query:
-        logger.error("❌ No query entered. Exiting.")
-        return
-
-    max_results_input = input(f"📊 Max businesses to scrape (default {MAPS_MAX_RESULTS}): ").strip()
-    max_results = int(max_results_input) if max_results_input.isdigit() else MAPS_MAX_RESULTS
-
-    # Step 1: Scrape Google Maps
-    rows = scrape_google_maps(query, max_results=max_results)
-
-    if not rows:
-        logger.error("❌ No businesses found on Google Maps. Check your query.")
-        return
-
-    total_leads = len(rows)
-    logger.info(f"✅ {total_leads} businesses scraped — starting enrichment...\n")
+    if args.queries:
+        queries = read_queries(args.queries)
+        name = os.path.splitext(os.path.basename(args.queries))[0]
+        if not queries:
+            logger.error(f"❌ No queries in {args.queries}. Exiting.")
+            return
+    else:
+        query = args.query or input("🔍 Enter your Google Maps search query\n   (e.g. 'digital marketing agencies in Colombo'): ").strip()
+        if not query:
+            logger.error("❌ No query entered. Exiting.")
+            return
+        queries, name = [query], query
+
+    max_results = args.max_results
+    if max_results is None and not args.queries:
+        max_results_input = input(f"📊 Max businesses to scrape (default {MAPS_MAX_RESULTS}): ").strip()
+        max_results = int(max_results_input) if max_results_input.isdigit() else MAPS_MAX_RESULTS
+    max_results = max_results or MAPS_MAX_RESULTS
+
+    # Step 1: Scrape Google Maps (streamed: rows reach the enrichment workers as they are parsed)
+    start_time = time.time()
+    pool = shared_pool(lean=not args.full_browser)
+    output_path, cp_path, done = resolve_output(name, args.resume)
+    batch = MapsBatch(journal_path(output_path))
+    if batch.finished or batch.place_ids:
+        logger.info(f"↻ Resuming batch: {len(batch.finished)}/{len(queries)} queries finished, "
+                    f"{len(batch.place_ids)} listings captured")
+    elif len(queries) > 1:
+        logger.info(f"🗂️  Batch of {len(queries)} queries from {args.queries}")
+    seen = {'scraped': 0, 'skipped': 0, 'scrape_done': None}
+
+    def pending(rows):
+        """Rows not enriched yet (resume), with every OUTPUT_COLUMNS key present."""
+        for row in rows:
+            seen['scraped'] += 1
+            if done and row_key(row) and row_key(row) in done:
+                seen['skipped'] += 1
+                continue
+            for col in OUTPUT_COLUMNS:
+                row.setdefault(col, '')
+            yield row
+        seen['scrape_done'] = time.time()
 
-    output_path = create_output_filename(query)
+    scraped = batch_rows(queries, batch, max_results, pool=pool, mode=args.maps_mode, stream=args.stream)
+    rows = pending(scraped)
     logger.info(f"📄 Output: {output_path}")
 
-    # Ensure all OUTPUT_COLUMNS present in rows
-    for row in rows:
-        for col in OUTPUT_COLUMNS:
-            if col not in row:
-                row[col] = ''
-
-    # Step 2: Enrich websites
-    results = []
-    completed = 0
-    start_time = time.time()
-
+    # Step 2: Enrich websites (each finished row is appended to the JSONL checkpoint)
     try:
-        for batch_start in range(0, total_leads, BATCH_SIZE):
-            batch_end = min(batch_start + BATCH_SIZE, total_leads)
-            batch = rows[batch_start:batch_end]
-            logger.info(f"📦 Batch {batch_start // BATCH_SIZE + 1}: rows {batch_start+1}–{batch_end}")
-
-            with ThreadPoolExecutor(max_workers=MAX_WORKERS) as executor:
-                future_to_row = {executor.submit(process_row, row.copy()): row for row in batch}
-                for future in as_completed(future_to_row):
-                    try:
-                        result = future.result()
-                        results.append(result)
-                        completed += 1
-                        if completed % 10 == 0:
-                            elapsed = time.time() - start_time
-                            rate = completed / elapsed if elapsed > 0 else 0
-                            eta = (total_leads - completed) / rate if rate > 0 else 0
-                            logger.info(f"📊 {completed}/{total_leads} ({100*completed//total_leads}%) | ETA: {int(eta//60)}m {int(eta%60)}s")
-                        if completed % CHECKPOINT_INTERVAL == 0:
-                            save_checkpoint(results, output_path, OUTPUT_COLUMNS)
-                    except Exception as e:
-                        logger.error(f"❌ Row error: {str(e)[:100]}")
-
-            save_checkpoint(results, output_path, OUTPUT_COLUMNS)
+        with batch, JsonlCheckpoint(cp_path, CHECKPOINT_INTERVAL) as checkpoint, closing(scraped):
+            if args.stream:
+                total_leads = None
+                logger.info("✅ Enriching businesses as Google Maps returns them...\n")
+            else:
+                rows = list(rows)
+                total_leads = len(rows)
+                logger.info(f"✅ {total_leads} businesses to enrich — starting enrichment...\n")
+            enrich_rows(rows, checkpoint, total=total_leads, engine=args.engine)
 
     except KeyboardInterrupt:
-        logger.warning("\n⚠️  Interrupted — saving progress...")
-        save_checkpoint(results, output_path, OUTPUT_COLUMNS)
+        logger.warning(f"\n⚠️  Interrupted — progress kept in {cp_path} (rerun with --resume)")
         return
 
     except Exception as e:
-        logger.error(f"❌ Critical error: {e}")
-        save_checkpoint(results, output_path, OUTPUT_COLUMNS)
+        logger.error(f"❌ Critical error: {e} — progress kept in {cp_path}")
         return
 
-    if not results:
-        logger.error("❌ No results to write.")
+    if seen['skipped']:
+        logger.info(f"↻ Resumed {cp_path}: skipped {seen['skipped']} already-enriched businesses")
+    if batch.duplicates:
+        logger.info(f"🔁 {batch.duplicates} businesses listed by more than one query were enriched once")
+    if not seen['scraped']:
+        logger.error("❌ No businesses found on Google Maps. Check your query.")
+        if not done and os.path.exists(cp_path) and not os.path.getsize(cp_path):
+            os.remove(cp_path)
+            batch.remove()
         return
+    if args.stream:
+        tail = time.time() - (seen['scrape_done'] or time.time())
+        logger.info(f"⏱️  Maps scrape and enrichment overlapped: {seen['scraped']} businesses, "
+                    f"enrichment finished {tail:.0f}s after the scrape")
+
+    # Write final CSV by streaming the checkpoint
+    counts = dict.fromkeys(('total', 'hq', 'email', 'phone', 'li', 'dm'), 0)
+
+    def tally(r):
+        counts['total'] += 1
+        counts['hq'] += int(r.get('lead_quality_score') or 0) >= 70
+        counts['email'] += bool(r.get('email_primary'))
+        counts['phone'] += bool(r.get('phone_primary'))
+        counts['li'] += bool(r.get('linkedin_company'))
+        counts['dm'] += r.get('decision_maker_found') == 'Yes'
 
-    # Write final CSV
     try:
-        with open(output_path, 'w', newline='', encoding='utf-8') as f:
-            writer = csv.DictWriter(f, fieldnames=OUTPUT_COLUMNS, restval='')
-            writer.writeheader()
-            for row in results:
-                writer.writerow({k: v for k, v in row.items() if k in OUTPUT_COLUMNS})
-
-        high_quality = sum(1 for r in results if int(r.get('lead_quality_score', 0)) >= 70)
-        has_email    = sum(1 for r in results if r.get('email_primary'))
-        has_phone    = sum(1 for r in results if r.get('phone_primary'))
-        has_linkedin = sum(1 for r in results if r.get('linkedin_company'))
-        has_dm       = sum(1 for r in results if r.get('decision_maker_found') == 'Yes')
-        total_time   = time.time() - start_time
-
-        print("\n" + "="*70)
-        print("✅ ENRICHMENT COMPLETE!")
-        print("="*70)
-        print(f"\n📁 Output File: {output_path}")
-        print(f"⏱️  Total Time: {int(total_time//60)}m {int(total_time%60)}s")
-        print(f"\n📊 RESULTS SUMMARY:")
-        print(f"   • Total Leads Processed : {len(results)}")
-        print(f"   • High Quality (70+)    : {high_quality} ({100*high_quality//len(results) if results else 0}%)")
-        print(f"   • With Email            : {has_email} ({100*has_email//len(results) if results else 0}%)")
-        print(f"   • With Phone            : {has_phone} ({100*has_phone//len(results) if results else 0}%)")
-        print(f"   • With LinkedIn         : {has_linkedin} ({100*has_linkedin//len(results) if results else 0}%)")
-        print(f"   • Decision Makers Found : {has_dm} ({100*has_dm//len(results) if results else 0}%)")
-        print("\n" + "="*70 + "\n")
-
-        checkpoint_path = output_path.replace('.csv', '_checkpoint.csv')
-        if os.path.exists(checkpoint_path):
-            os.remove(checkpoint_path)
-
+        write_csv_from_checkpoint(cp_path, output_path, OUTPUT_COLUMNS, on_row=tally)
     except Exception as e:
-        logger.error(f"❌ Failed to write output: {e}")
+        logger.error(f"❌ Failed to write output: {e} (checkpoint kept: {cp_path})")
+        return
+
+    if not counts['total']:
+        logger.error("❌ No results to write.")
+        return
+
+    n = counts['total']
+    total_time = time.time() - start_time
+
+    print("\n" + "="*70)
+    print("✅ ENRICHMENT COMPLETE!")
+    print("="*70)
+    print(f"\n📁 Output File: {output_path}")
+    print(f"⏱️  Total Time: {int(total_time//60)}m {int(total_time%60)}s")
+    print(f"\n📊 RESULTS SUMMARY:")
+    print(f"   • Total Leads Processed : {n}")
+    print(f"   • High Quality (70+)    : {counts['hq']} ({100*counts['hq']//n}%)")
+    print(f"   • With Email            : {counts['email']} ({100*counts['email']//n}%)")
+    print(f"   • With Phone            : {counts['phone']} ({100*counts['phone']//n}%)")
+    print(f"   • With LinkedIn         : {counts['li']} ({100*counts['li']//n}%)")
+    print(f"   • Decision Makers Found : {counts['dm']} ({100*counts['dm']//n}%)")
+    print("\n" + "="*70 + "\n")
+
+    if os.path.exists(cp_path):
+        os.remove(cp_path)
+    batch.remove()
 
 
 if __name__ == "__main__":
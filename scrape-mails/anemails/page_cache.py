@@ -0,0 +1,367 @@
+"""
+Persistent on-disk HTTP page cache shared by the crawlers.
+
+Bodies are zlib-compressed and stored by content hash under objects/, so
+the same page reached through several URLs is kept once. index.json maps
+each normalised URL to its status, a few response headers, the body hash
+and when it was fetched / last used. Within PAGE_CACHE_TTL an entry is
+served without touching the network; after that it is revalidated with a
+conditional GET (If-None-Match / If-Modified-Since) when the server gave
+a validator, so a repeat crawl of a known site costs a 304 instead of a
+full download. 404/410 answers are cached too, which saves the guessed
+contact paths that do not exist. When the objects outgrow
+PAGE_CACHE_MAX_BYTES the least recently used entries are evicted.
+
+Thread-based tools call cached_get(url, **requests_kwargs), which returns
+a requests.Response either way. enrich.py uses PageCache directly.
+
+    python page_cache.py            # size and entry counts
+    python page_cache.py clear
+"""
+
+import atexit
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+import zlib
+from typing import Dict, Iterator, NamedTuple, Optional
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+PAGE_CACHE_DIR        = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'page_cache')
+PAGE_CACHE_TTL        = 3 * 24 * 3600     # seconds an entry is used without revalidation
+PAGE_CACHE_MAX_AGE    = 30 * 24 * 3600    # entries older than this are dropped on load
+PAGE_CACHE_MAX_BYTES  = 512 * 1024 * 1024 # compressed bodies on disk
+PAGE_CACHE_MAX_ENTRY  = 4 * 1024 * 1024   # bodies larger than this are not cached
+PAGE_CACHE_SAVE_EVERY = 500               # stores between index saves
+CACHEABLE_STATUSES    = frozenset([200, 404, 410])
+KEPT_HEADERS          = ('content-type', 'etag', 'last-modified')
+
+_DEFAULT_PORTS = {'http': 80, 'https': 443}
+
+
+def cache_key(url: str) -> str:
+    """Normalised URL: lower-case scheme/host, no default port, fragment or trailing slash; sorted query."""
+    p = urlsplit(url.strip())
+    scheme = p.scheme.lower() or 'http'
+    host   = (p.hostname or '').lower()
+    if p.port and p.port != _DEFAULT_PORTS.get(scheme):
+        host += f':{p.port}'
+    path  = p.path.rstrip('/') or '/'
+    query = urlencode(sorted(parse_qsl(p.query, keep_blank_values=True)))
+    return urlunsplit((scheme, host, path, query, ''))
+
+
+class CachedPage(NamedTuple):
+    url:     str
+    status:  int
+    headers: Dict[str, str]
+    body:    bytes
+    fresh:   bool           # inside the TTL: use as is, no request needed
+    final_url: str = ''     # where the request ended up after redirects
+
+
+class PageCache:
+    """
+    key -> {'s': status, 'h': body hash, 'hd': headers, 't': fetched_at,
+    'u': last_used, 'f': final URL, only when redirected}. Safe to share
+    between threads.
+    """
+    def __init__(self, root: str = PAGE_CACHE_DIR, ttl: float = PAGE_CACHE_TTL,
+                 max_bytes: int = PAGE_CACHE_MAX_BYTES):
+        self.root      = root
+        self.ttl       = ttl
+        self.max_bytes = max_bytes
+        self._entries: Dict[str, Dict] = {}
+        self._sizes:   Dict[str, int]  = {}   # body hash -> compressed bytes on disk
+        self._refs:    Dict[str, int]  = {}   # body hash -> entries pointing at it
+        self._total    = 0                    # sum of _sizes
+        self._lock     = threading.Lock()
+        self._dirty    = 0
+        self.hits = self.revalidated = self.misses = self.stores = self.evicted = 0
+
+    @property
+    def index_path(self) -> str:
+        return os.path.join(self.root, 'index.json')
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.root, 'objects', digest[:2], digest + '.z')
+
+    @classmethod
+    def load(cls, root: str = PAGE_CACHE_DIR, **kw) -> 'PageCache':
+        cache = cls(root, **kw)
+        try:
+            with open(cache.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            entries, sizes = data['entries'], data['sizes']
+        except (OSError, ValueError, TypeError, KeyError):
+            return cache
+        cutoff = time.time() - PAGE_CACHE_MAX_AGE
+        for key, e in entries.items():
+            usable = e['t'] > cutoff and (e['h'] in sizes or not e['h'])
+            stale_no_validator = e['t'] + cache.ttl <= time.time() and not _validators(e['hd'])
+            if usable and not stale_no_validator:
+                cache._add(key, e, sizes.get(e['h'], 0))
+        cache._collect_garbage()
+        return cache
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            os.makedirs(self.root, exist_ok=True)
+            tmp = self.index_path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'entries': self._entries, 'sizes': self._sizes}, f, separators=(',', ':'))
+            os.replace(tmp, self.index_path)
+            self._dirty = 0
+
+    # ── lookups ──────────────────────────────
+
+    def get(self, url: str, now: Optional[float] = None) -> Optional[CachedPage]:
+        now = now if now is not None else time.time()
+        key = cache_key(url)
+        with self._lock:
+            e = self._entries.get(key)
+            if e is None:
+                self.misses += 1
+                return None
+            e['u'] = now
+        body = b''
+        if e['h']:
+            try:
+                with open(self._object_path(e['h']), 'rb') as f:
+                    body = zlib.decompress(f.read())
+            except (OSError, zlib.error):
+                with self._lock:
+                    self._drop(key)
+                    self.misses += 1
+                return None
+        fresh = now < e['t'] + self.ttl
+        if fresh:
+            self.hits += 1
+        return CachedPage(url, e['s'], dict(e['hd']), body, fresh, e.get('f') or url)
+
+    def pages(self) -> Iterator[CachedPage]:
+        """Every cached 200 page (bodies are read one at a time)."""
+        with self._lock:
+            keys = [k for k, e in self._entries.items() if e['s'] == 200]
+        for key in keys:
+            page = self.get(key)
+            if page is not None:
+                yield page
+
+    def validators(self, page: CachedPage) -> Dict[str, str]:
+        """Conditional request headers for revalidating a stale page."""
+        return _validators(page.headers)
+
+    # ── updates ──────────────────────────────
+
+    def put(self, url: str, status: int, headers, body: bytes, now: Optional[float] = None,
+            final_url: str = '') -> bool:
+        """
+        Store a response; returns False when it is not cacheable (an empty
+        200 is a skipped download). final_url is where redirects led.
+        """
+        lower = {k.lower(): v for k, v in headers.items()}
+        if (status not in CACHEABLE_STATUSES or 'no-store' in lower.get('cache-control', '').lower()
+                or len(body) > PAGE_CACHE_MAX_ENTRY or (status == 200 and not body)):
+            return False
+        now    = now if now is not None else time.time()
+        kept   = {k: lower[k] for k in KEPT_HEADERS if k in lower}
+        digest = hashlib.sha256(body).hexdigest() if status == 200 else ''
+        size   = 0
+        if digest:
+            path = self._object_path(digest)
+            with self._lock:
+                size = self._sizes.get(digest, 0)
+            if not size:
+                blob = zlib.compress(body, 6)
+                os.makedirs(os.path.dirname(path), exist_ok=True)
+                tmp = f'{path}.{threading.get_ident()}.tmp'
+                with open(tmp, 'wb') as f:
+                    f.write(blob)
+                os.replace(tmp, path)
+                size = len(blob)
+        key   = cache_key(url)
+        entry = {'s': status, 'h': digest, 'hd': kept, 't': now, 'u': now}
+        if final_url and final_url != url:
+            entry['f'] = final_url
+        with self._lock:
+            old = self._entries.get(key)
+            self._add(key, entry, size)
+            if old:
+                self._release(old['h'])
+            self.stores += 1
+            self._dirty += 1
+            if self._total > self.max_bytes:
+                self._evict()
+            autosave = self._dirty >= PAGE_CACHE_SAVE_EVERY
+        if autosave:
+            self.save()
+        return True
+
+    def refresh(self, url: str, headers=None, now: Optional[float] = None):
+        """A 304 confirmed the cached body: it is fresh again (new validators are kept)."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            e = self._entries.get(cache_key(url))
+            if e is None:
+                return
+            e['t'] = e['u'] = now
+            for k, v in (headers or {}).items():
+                if k.lower() in ('etag', 'last-modified'):
+                    e['hd'][k.lower()] = v
+            self.revalidated += 1
+            self._dirty += 1
+
+    def clear(self):
+        with self._lock:
+            for digest in list(self._sizes):
+                _remove(self._object_path(digest))
+            self._entries, self._sizes, self._refs, self._total = {}, {}, {}, 0
+            self._dirty += 1
+        self.save()
+
+    def summary(self) -> str:
+        return (f"page cache: {self.hits} fresh, {self.revalidated} revalidated (304), "
+                f"{self.stores} stored, {len(self._entries)} entries, "
+                f"{self._total / 1e6:.1f} MB")
+
+    # ── internals (caller holds the lock) ─────
+
+    def _add(self, key: str, e: Dict, size: int):
+        self._entries[key] = e
+        if e['h']:
+            if e['h'] not in self._sizes:
+                self._sizes[e['h']] = size
+                self._total += size
+            self._refs[e['h']] = self._refs.get(e['h'], 0) + 1
+
+    def _drop(self, key: str):
+        e = self._entries.pop(key, None)
+        if e:
+            self._release(e['h'])
+
+    def _release(self, digest: str):
+        if not digest:
+            return
+        self._refs[digest] -= 1
+        if not self._refs[digest]:
+            del self._refs[digest]
+            self._total -= self._sizes.pop(digest)
+            _remove(self._object_path(digest))
+
+    def _evict(self):
+        """Least recently used first, down to 90% of the budget so eviction is not run on every store."""
+        target = 0.9 * self.max_bytes
+        for key, _ in sorted(self._entries.items(), key=lambda kv: kv[1]['u']):
+            if self._total <= target:
+                break
+            self._drop(key)
+            self.evicted += 1
+
+    def _collect_garbage(self):
+        """
+        Objects no entry points at, left behind by a crashed run. Young ones
+        are kept: they may belong to another crawler that has not saved yet.
+        """
+        objects = os.path.join(self.root, 'objects')
+        if not os.path.isdir(objects):
+            return
+        cutoff = time.time() - 24 * 3600
+        for sub in os.listdir(objects):
+            for name in os.listdir(os.path.join(objects, sub)):
+                path = os.path.join(objects, sub, name)
+                if name.endswith('.z') and name[:-2] not in self._sizes and os.path.getmtime(path) < cutoff:
+                    _remove(path)
+
+
+def _validators(headers: Dict[str, str]) -> Dict[str, str]:
+    out = {}
+    if headers.get('etag'):
+        out['If-None-Match'] = headers['etag']
+    if headers.get('last-modified'):
+        out['If-Modified-Since'] = headers['last-modified']
+    return out
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+# ─────────────────────────────────────────────
+# SHARED INSTANCE + requests HELPER
+# ─────────────────────────────────────────────
+
+_shared: Optional[PageCache] = None
+_shared_lock = threading.Lock()
+
+
+def shared_cache() -> PageCache:
+    """Process-wide cache in PAGE_CACHE_DIR, loaded on first use and saved at exit."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = PageCache.load(PAGE_CACHE_DIR)
+            atexit.register(_shared.save)
+        return _shared
+
+
+def cached_get(url: str, cache: Optional[PageCache] = None, get=None, before_request=None, **kwargs):
+    """
+    requests.get() through the page cache. A fresh entry is returned without
+    a request; a stale one is revalidated with a conditional GET. The result
+    is always a requests.Response (`from_cache` tells which). `get` replaces
+    requests.get (e.g. a Session's), and `before_request` runs only when
+    the network is actually used, so per-domain delays skip cache hits.
+    """
+    import requests
+    cache = cache if cache is not None else shared_cache()
+    get   = get or requests.get
+    page  = cache.get(url)
+    if page is not None and page.fresh:
+        return _response(page)
+    if before_request is not None:
+        before_request()
+    headers = dict(kwargs.pop('headers', None) or {})
+    if page is not None:
+        headers.update(cache.validators(page))
+    resp = get(url, headers=headers, **kwargs)
+    if resp.status_code == 304 and page is not None:
+        cache.refresh(url, resp.headers)
+        return _response(page)
+    cache.put(url, resp.status_code, resp.headers, resp.content, final_url=resp.url)
+    resp.from_cache = False
+    return resp
+
+
+def _response(page: CachedPage):
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    from requests.utils import get_encoding_from_headers
+    r = Response()
+    r.status_code = page.status
+    r.url         = page.final_url or page.url
+    r.headers     = CaseInsensitiveDict(page.headers)
+    r.encoding    = get_encoding_from_headers(r.headers)
+    r._content    = page.body
+    r.from_cache  = True
+    return r
+
+
+if __name__ == '__main__':
+    cache = PageCache.load(PAGE_CACHE_DIR)
+    if sys.argv[1:] == ['clear']:
+        cache.clear()
+        print(f"🗑️  cleared {PAGE_CACHE_DIR}")
+    else:
+        print(f"{PAGE_CACHE_DIR}: {cache.summary()}")
@@ -0,0 +1,149 @@
+"""
+Bounded producer/consumer streaming for the async enricher.
+
+Rows are read lazily from the CSV and pushed through a bounded queue to a
+fixed pool of workers; finished rows come back through an (optional)
+reorder buffer. At most `window` rows are ever in flight or buffered, so
+memory stays flat no matter how large the input file is.
+"""
+
+import asyncio
+import csv
+from typing import (
+    Any, AsyncIterable, AsyncIterator, Awaitable, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union,
+)
+
+_DONE = object()
+
+
+# ─────────────────────────────────────────────
+# INPUT
+# ─────────────────────────────────────────────
+
+def iter_csv_rows(path: str, skip: Optional[Callable[[Dict], bool]] = None) -> Iterator[Dict]:
+    """Lazily yield CSV rows; rows for which `skip(row)` is true are dropped."""
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            if skip is None or not skip(row):
+                yield row
+
+
+def csv_header(path: str) -> List[str]:
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        return list(csv.DictReader(f).fieldnames or [])
+
+
+def count_csv_rows(path: str, skip: Optional[Callable[[Dict], bool]] = None) -> Tuple[int, int]:
+    """(rows to process, rows skipped) — one streaming pass, nothing kept."""
+    todo = skipped = 0
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        for row in csv.DictReader(f):
+            if skip is not None and skip(row):
+                skipped += 1
+            else:
+                todo += 1
+    return todo, skipped
+
+
+# ─────────────────────────────────────────────
+# REORDER BUFFER
+# ─────────────────────────────────────────────
+
+class ReorderBuffer:
+    """Holds out-of-order results until every earlier sequence number has arrived."""
+    def __init__(self):
+        self._next = 0
+        self._held: Dict[int, Any] = {}
+
+    def __len__(self) -> int:
+        return len(self._held)
+
+    def push(self, seq: int, value: Any) -> List[Any]:
+        """Store `value`; return everything that is now releasable, in input order."""
+        self._held[seq] = value
+        ready = []
+        while self._next in self._held:
+            ready.append(self._held.pop(self._next))
+            self._next += 1
+        return ready
+
+
+# ─────────────────────────────────────────────
+# STREAMING MAP
+# ─────────────────────────────────────────────
+
+async def _aiter(items):
+    if hasattr(items, '__aiter__'):
+        async for item in items:
+            yield item
+    else:
+        for item in items:
+            yield item
+
+
+async def stream_map(
+    items:   Union[Iterable, AsyncIterable],
+    fn:      Callable[[Any], Awaitable[Any]],
+    workers: int,
+    ordered: bool = False,
+    window:  int = 0,
+) -> AsyncIterator[Tuple[Any, Any, Optional[BaseException]]]:
+    """
+    Run `fn` over `items` (an iterable or async iterable) with `workers`
+    concurrent workers and yield (item, result, error) as rows finish — or
+    in input order if `ordered`.
+
+    A row holds one of `window` slots from the moment it is read until it
+    is yielded, which bounds the queue, the workers and the reorder buffer
+    together. `items` is only advanced when a slot is free.
+    """
+    workers = max(1, workers)
+    window  = max(window or workers * 4, workers)
+    slots   = asyncio.Semaphore(window)
+    in_q: asyncio.Queue  = asyncio.Queue(maxsize=workers)
+    out_q: asyncio.Queue = asyncio.Queue()
+    failure: List[BaseException] = []
+
+    async def producer():
+        try:
+            seq = 0
+            async for item in _aiter(items):
+                await slots.acquire()
+                await in_q.put((seq, item))
+                seq += 1
+        except Exception as e:
+            failure.append(e)
+        finally:
+            for _ in range(workers):
+                await in_q.put(_DONE)
+
+    async def worker():
+        while True:
+            job = await in_q.get()
+            if job is _DONE:
+                break
+            seq, item = job
+            try:
+                out_q.put_nowait((seq, item, await fn(item), None))
+            except Exception as e:
+                out_q.put_nowait((seq, item, None, e))
+        out_q.put_nowait(_DONE)
+
+    tasks   = [asyncio.create_task(producer())] + [asyncio.create_task(worker()) for _ in range(workers)]
+    reorder = ReorderBuffer() if ordered else None
+    live    = workers
+    try:
+        while live:
+            msg = await out_q.get()
+            if msg is _DONE:
+                live -= 1
+                continue
+            for seq, item, result, err in (reorder.push(msg[0], msg) if reorder is not None else (msg,)):
+                slots.release()
+                yield item, result, err
+        if failure:
+            raise failure[0]
+    finally:
+        for t in tasks:
+            t.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,146 @@
+"""
+Persistent index of the job postings job_scraper.py has seen, so a run
+reports what changed instead of re-listing every posting.
+
+Postings are keyed by company (checkpoint.row_key of its website) and by
+the ATS posting id, else the job URL, else the title. Each entry keeps a
+hash of the posting's content and when it was first and last seen:
+
+    {"signature": <role keywords>, "companies": {
+        "web:acme.com": {"board": <payload hash>, "postings": {
+            "id:4012": {"hash": ..., "first_seen": ..., "last_seen": ..., "row": {...}}}}}}
+
+diff() folds one company's rows from a run into the index and returns the
+postings that were added, changed or removed (removals only when the run
+saw the company's full list of openings, never after a failed fetch).
+"board" is the hash of the company's ATS payload last time; job_scraper
+passes it to AtsClient.board(), and an unchanged board is not parsed at
+all (the company's row says 'board_unchanged' and its postings stay as
+they were). Board hashes are dropped when the role keywords change, since
+the same payload can then match different postings.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, List
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+INDEX_FILE      = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'postings_index.json')
+CHANGE_COLUMNS  = ['change', 'first_seen', 'last_seen']
+POSTING_FIELDS  = ('job_title', 'job_url', 'location', 'department', 'posted_date')   # hashed for 'changed'
+BOARD_UNCHANGED = 'board_unchanged'
+
+
+def posting_key(row: Dict) -> str:
+    if row.get('job_id'):
+        return 'id:' + str(row['job_id'])
+    url = (row.get('job_url') or '').strip().split('#')[0].rstrip('/')
+    if url:
+        return 'url:' + url
+    return 'title:' + ' '.join((row.get('job_title') or '').lower().split())
+
+
+def content_hash(row: Dict) -> str:
+    return hashlib.sha1(json.dumps([str(row.get(f, '')) for f in POSTING_FIELDS]).encode()).hexdigest()
+
+
+def lists_every_posting(status: str) -> bool:
+    """True for rows from a company whose openings were all read, so a missing posting was removed."""
+    return (status in ('match_found', 'no_jobs_listed', BOARD_UNCHANGED)
+            or status.endswith('_none_matched_role_keywords'))
+
+
+class PostingsIndex:
+    """company -> board hash and postings; see the module docstring."""
+
+    def __init__(self, path: str = INDEX_FILE, signature: str = ''):
+        self.path      = path
+        self.signature = signature
+        self._companies: Dict[str, Dict] = {}
+        self._lock  = threading.Lock()
+        self._dirty = False
+
+    @classmethod
+    def load(cls, path: str = INDEX_FILE, signature: str = '') -> 'PostingsIndex':
+        index = cls(path, signature)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            index._companies = dict(data['companies'])
+            if data.get('signature') != signature:
+                for entry in index._companies.values():
+                    entry['board'] = ''
+                index._dirty = True
+        except (OSError, ValueError, TypeError, KeyError):
+            pass
+        return index
+
+    def save(self):
+        if not self._dirty:
+            return
+        tmp = self.path + '.tmp'
+        with self._lock:
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump({'signature': self.signature, 'companies': self._companies}, f,
+                          separators=(',', ':'), sort_keys=True)
+            os.replace(tmp, self.path)
+            self._dirty = False
+
+    def board_hash(self, company: str) -> str:
+        with self._lock:
+            return (self._companies.get(company) or {}).get('board', '')
+
+    def postings(self, company: str) -> List[Dict]:
+        with self._lock:
+            return [dict(p['row']) for p in (self._companies.get(company) or {}).get('postings', {}).values()]
+
+    def diff(self, company: str, rows: List[Dict], now: str) -> List[Dict]:
+        """
+        Fold one company's rows from this run into the index. Returns the
+        added and changed postings (this run's row) and the removed ones
+        (the last row seen), each with CHANGE_COLUMNS filled in.
+        """
+        if not company or not rows:
+            return []
+        with self._lock:
+            entry = self._companies.setdefault(company, {'board': '', 'postings': {}})
+            known = entry['postings']
+            self._dirty = True
+            if any(r.get('status') == BOARD_UNCHANGED for r in rows):
+                for p in known.values():
+                    p['last_seen'] = now
+                return []
+            boards = [r['board_hash'] for r in rows if r.get('board_hash')]
+            entry['board'] = boards[0] if boards else ''
+
+            changes, seen = [], set()
+            for row in rows:
+                if row.get('status') != 'match_found':
+                    continue
+                key, digest = posting_key(row), content_hash(row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                old = known.get(key)
+                kept = {k: v for k, v in row.items() if k != 'board_hash'}
+                known[key] = {'hash': digest, 'first_seen': old['first_seen'] if old else now,
+                              'last_seen': now, 'row': kept}
+                if old is None or old['hash'] != digest:
+                    changes.append(dict(kept, change='added' if old is None else 'changed',
+                                        first_seen=known[key]['first_seen'], last_seen=now))
+
+            if all(lists_every_posting(r.get('status', '')) for r in rows):
+                for key in [k for k in known if k not in seen]:
+                    gone = known.pop(key)
+                    changes.append(dict(gone['row'], change='removed', first_seen=gone['first_seen'],
+                                        last_seen=gone['last_seen']))
+            return changes
+
+    def summary(self) -> str:
+        with self._lock:
+            return (f"postings index: {sum(len(e['postings']) for e in self._companies.values())} postings "
+                    f"at {len(self._companies)} companies")
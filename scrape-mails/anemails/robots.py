@@ -0,0 +1,284 @@
+"""
+Shared robots.txt store for the crawlers.
+
+Every origin's robots.txt is fetched once, even when many workers reach a
+new host at the same moment: the first caller downloads it and the others
+wait for that answer (single-flight, per origin). The raw text is kept in
+a persistent JSON cache whose lifetime follows the response's
+Cache-Control max-age / Expires (clamped to ROBOTS_MIN_TTL..ROBOTS_MAX_TTL),
+so repeat runs do not refetch it. `Crawl-delay` / `Request-rate` are
+exposed as a per-origin delay for the domain limiters.
+
+Status handling follows RFC 9309 for 2xx and 4xx (4xx = no rules). A 5xx
+or a network error is treated as "no rules" like before, but only for
+ROBOTS_ERROR_TTL.
+
+Thread-based tools use RobotsStore.allowed() / sitemaps() / crawl_delay()
+(see shared_store()); enrich.py wraps a store in AsyncRobots.
+"""
+
+import asyncio
+import atexit
+import json
+import os
+import re
+import threading
+import time
+from contextlib import nullcontext
+from email.utils import parsedate_to_datetime
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+from urllib.robotparser import RobotFileParser
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+ROBOTS_CACHE_FILE  = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'robots_cache.json')
+ROBOTS_DEFAULT_TTL = 24 * 3600      # no caching headers
+ROBOTS_MIN_TTL     = 3600
+ROBOTS_MAX_TTL     = 7 * 24 * 3600
+ROBOTS_ERROR_TTL   = 3600           # 5xx / unreachable: retry sooner
+ROBOTS_TIMEOUT     = 5              # seconds
+ROBOTS_MAX_BYTES   = 512 * 1024     # longer files are cut (Google reads the first 500 KiB)
+MAX_CRAWL_DELAY    = 30             # seconds; a larger Crawl-delay is capped
+ROBOTS_AGENT       = '*'
+
+_MAX_AGE = re.compile(r'max-age\s*=\s*(\d+)')
+
+
+def origin_of(url: str) -> str:
+    p = urlsplit(url)
+    return f"{p.scheme.lower() or 'http'}://{p.netloc.lower()}"
+
+
+def robots_ttl(status: int, headers, now: Optional[float] = None) -> float:
+    """How long a robots.txt answer is trusted, from Cache-Control max-age or Expires."""
+    if status == 0 or status >= 500:
+        return ROBOTS_ERROR_TTL
+    h   = {k.lower(): v for k, v in (headers or {}).items()}
+    ttl = ROBOTS_DEFAULT_TTL
+    m   = _MAX_AGE.search(h.get('cache-control', '').lower())
+    if m:
+        ttl = int(m.group(1))
+    elif h.get('expires'):
+        try:
+            base = parsedate_to_datetime(h['date']).timestamp() if h.get('date') else (now or time.time())
+            ttl  = parsedate_to_datetime(h['expires']).timestamp() - base
+        except (TypeError, ValueError, IndexError):
+            pass                                # malformed or "0": keep the default
+    return min(max(ttl, ROBOTS_MIN_TTL), ROBOTS_MAX_TTL)
+
+
+class RobotsRules:
+    """Parsed robots.txt of one origin; text None means no rules (everything allowed)."""
+    __slots__ = ('parser', 'expires')
+
+    def __init__(self, text: Optional[str], expires: float):
+        self.expires = expires
+        self.parser  = None
+        if text is not None:
+            rp = RobotFileParser()
+            rp.parse(text.splitlines())
+            self.parser = rp
+
+    def allowed(self, url: str, agent: str = ROBOTS_AGENT) -> bool:
+        return self.parser.can_fetch(agent, url) if self.parser else True
+
+    def crawl_delay(self, agent: str = ROBOTS_AGENT) -> float:
+        """Seconds between requests asked for by Crawl-delay / Request-rate (0 if none)."""
+        if not self.parser:
+            return 0.0
+        delay = self.parser.crawl_delay(agent) or 0
+        rate  = self.parser.request_rate(agent)
+        if rate and rate.requests:
+            delay = max(delay, rate.seconds / rate.requests)
+        return float(min(delay, MAX_CRAWL_DELAY))
+
+    def sitemaps(self) -> List[str]:
+        return list(self.parser.site_maps() or []) if self.parser else []
+
+
+# ─────────────────────────────────────────────
+# PERSISTENT STORE (thread-safe, sync fetches)
+# ─────────────────────────────────────────────
+
+class RobotsStore:
+    """
+    origin -> [robots text or None, expires_at], saved as JSON between
+    runs. Safe to share between threads; parsed rules are kept in memory.
+    """
+    def __init__(self, path: Optional[str] = ROBOTS_CACHE_FILE):
+        self.path = path
+        self._entries:  Dict[str, list] = {}
+        self._parsed:   Dict[str, RobotsRules] = {}
+        self._inflight: Dict[str, threading.Event] = {}
+        self._lock  = threading.Lock()
+        self._dirty = False
+        self.fetches = self.hits = 0
+
+    @classmethod
+    def load(cls, path: str = ROBOTS_CACHE_FILE) -> 'RobotsStore':
+        store = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                store._entries = {o: [v[0], float(v[1])] for o, v in json.load(f).items()}
+        except (OSError, ValueError, TypeError, IndexError):
+            pass
+        return store
+
+    def save(self):
+        with self._lock:
+            if not self._dirty or not self.path:
+                return
+            now  = time.time()
+            live = {o: v for o, v in self._entries.items() if v[1] > now}
+            tmp  = self.path + '.tmp'
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(live, f, separators=(',', ':'), sort_keys=True)
+            os.replace(tmp, self.path)
+            self._entries = live
+            self._dirty   = False
+
+    def lookup(self, origin: str, now: Optional[float] = None) -> Optional[RobotsRules]:
+        """Unexpired rules for an origin, or None when it has to be (re)fetched."""
+        now = now if now is not None else time.time()
+        with self._lock:
+            rules = self._parsed.get(origin)
+            if rules is None and origin in self._entries:
+                text, expires = self._entries[origin]
+                rules = self._parsed[origin] = RobotsRules(text, expires)
+            if rules is None or rules.expires <= now:
+                return None
+            self.hits += 1
+            return rules
+
+    def record(self, origin: str, status: int, text: Optional[str], headers=None,
+               now: Optional[float] = None) -> RobotsRules:
+        """Store a fetch result (status 0 = network error) and return its rules."""
+        now   = now if now is not None else time.time()
+        text  = text if 200 <= status < 300 else None
+        rules = RobotsRules(text, now + robots_ttl(status, headers, now))
+        with self._lock:
+            self._entries[origin] = [text, rules.expires]
+            self._parsed[origin]  = rules
+            self._dirty = True
+            self.fetches += 1
+        return rules
+
+    # ── thread-based crawlers ────────────────
+
+    def rules(self, url: str, get=None) -> RobotsRules:
+        """Rules for url's origin; concurrent callers for a new origin share one fetch."""
+        origin = origin_of(url)
+        rules  = self.lookup(origin)
+        if rules is not None:
+            return rules
+        with self._lock:
+            event = self._inflight.get(origin)
+            owner = event is None
+            if owner:
+                event = self._inflight[origin] = threading.Event()
+        if not owner:
+            event.wait(ROBOTS_TIMEOUT * 2)
+            return self.lookup(origin) or RobotsRules(None, 0)
+        try:
+            return self.record(origin, *_fetch_sync(origin, get))
+        finally:
+            with self._lock:
+                del self._inflight[origin]
+            event.set()
+
+    def allowed(self, url: str, get=None) -> bool:
+        return self.rules(url, get).allowed(url)
+
+    def sitemaps(self, url: str, get=None) -> List[str]:
+        return self.rules(url, get).sitemaps()
+
+    def crawl_delay(self, url: str, get=None) -> float:
+        return self.rules(url, get).crawl_delay()
+
+    def summary(self) -> str:
+        return f"robots.txt: {self.fetches} fetched, {self.hits} lookups answered from cache"
+
+
+def _fetch_sync(origin: str, get=None):
+    import requests
+    get = get or requests.get
+    try:
+        resp = get(f"{origin}/robots.txt", timeout=ROBOTS_TIMEOUT, allow_redirects=True)
+        text = resp.content[:ROBOTS_MAX_BYTES].decode('utf-8', errors='replace')
+        return resp.status_code, text, resp.headers
+    except Exception:
+        return 0, None, None
+
+
+# ─────────────────────────────────────────────
+# ASYNCIO ADAPTER
+# ─────────────────────────────────────────────
+
+class AsyncRobots:
+    """
+    asyncio front end of a RobotsStore (in-memory if none is given).
+    Fetches take a slot from `controller` (if any) like page fetches.
+    """
+    def __init__(self, controller=None, store: Optional[RobotsStore] = None):
+        self.store       = store if store is not None else RobotsStore(path=None)
+        self._controller = controller
+        self._inflight: Dict[str, asyncio.Future] = {}
+
+    async def rules(self, session, url: str) -> RobotsRules:
+        origin = origin_of(url)
+        rules  = self.store.lookup(origin)
+        if rules is not None:
+            return rules
+        fut = self._inflight.get(origin)
+        if fut is None:
+            fut = self._inflight[origin] = asyncio.ensure_future(self._fetch(session, origin))
+            fut.add_done_callback(lambda _: self._inflight.pop(origin, None))
+        return await asyncio.shield(fut)     # one waiter being cancelled must not cancel the fetch
+
+    async def allowed(self, session, url: str) -> bool:
+        return (await self.rules(session, url)).allowed(url)
+
+    def sitemaps(self, url: str) -> List[str]:
+        """`Sitemap:` lines of an already-fetched robots.txt (empty if none/unknown)."""
+        rules = self.store.lookup(origin_of(url))
+        return rules.sitemaps() if rules else []
+
+    def crawl_delay(self, url: str) -> float:
+        """Crawl-delay of an already-fetched robots.txt (0 if none/unknown)."""
+        rules = self.store.lookup(origin_of(url))
+        return rules.crawl_delay() if rules else 0.0
+
+    async def _fetch(self, session, origin: str) -> RobotsRules:
+        import aiohttp
+        status, text, headers = 0, None, None
+        try:
+            async with (self._controller.slot() if self._controller else nullcontext()), session.get(
+                f"{origin}/robots.txt",
+                timeout=aiohttp.ClientTimeout(total=ROBOTS_TIMEOUT),
+            ) as resp:
+                status, headers = resp.status, resp.headers
+                if status == 200:
+                    text = (await resp.read())[:ROBOTS_MAX_BYTES].decode('utf-8', errors='replace')
+        except Exception:
+            status = 0
+        return self.store.record(origin, status, text, headers)
+
+
+# ─────────────────────────────────────────────
+# SHARED INSTANCE
+# ─────────────────────────────────────────────
+
+_shared: Optional[RobotsStore] = None
+_shared_lock = threading.Lock()
+
+
+def shared_store() -> RobotsStore:
+    """Process-wide store in ROBOTS_CACHE_FILE, loaded on first use and saved at exit."""
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = RobotsStore.load(ROBOTS_CACHE_FILE)
+            atexit.register(_shared.save)
+        return _shared
@@ -0,0 +1,507 @@
+#!/usr/bin/env python3
+"""
+Synthetic website farm for offline crawler benchmarks.
+
+One local aiohttp server impersonates thousands of small business sites
+(site0.invalid, site1.invalid, ...). The crawlers reach it as a plain
+HTTP forward proxy, so hostnames, robots.txt, sitemaps and same-site link
+handling all behave as they would on the real web:
+
+    python sitefarm.py --sites 2000 --port 8900 --csv farm_leads.csv
+    HTTP_PROXY=http://127.0.0.1:8900 python enrich.py farm_leads.csv
+
+Each site is generated deterministically from (seed, site number): page
+count, latency, error rate, robots rules, homepage redirects, sitemap and
+the way its contact details are written (plain, mailto, HTML entities,
+"info [at] x [dot] test", or JavaScript-only).
+
+The farm also plays Google Maps at http://maps.farm.invalid/maps: a search
+page whose results feed loads more cards (over XHR, in Google's payload
+format) as it is scrolled, and one place page per farm site, for
+benchmarking the browser stage of maps_enrich.py.
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import random
+import threading
+import zlib
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import quote, quote_plus
+
+from aiohttp import web
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+FARM_TLD        = 'invalid'   # reserved TLD: never resolves, and each site is its own registrable domain
+DEFAULT_SITES   = 1000
+DEFAULT_SEED    = 7
+
+MAPS_HOST       = f'maps.farm.{FARM_TLD}'
+MAPS_FEED_PAGE  = 20          # result cards added to the feed per scroll
+MAPS_NO_WEBSITE = 0.15        # share of places listed without a website
+MAPS_TILES      = 12          # map tiles on every Maps page
+MAPS_TILE_KB    = 24
+MAPS_PHOTO_KB   = 90          # place photo
+MAPS_BUNDLE_KB  = 400         # script bundle (plus a stylesheet and a font) shared by all Maps pages
+
+CONTACT_STYLES  = ('plain', 'mailto', 'entities', 'at_dot', 'js')
+CONTACT_WEIGHTS = (0.35, 0.25, 0.15, 0.15, 0.10)
+
+_ADJ   = ('Lanka', 'Ceylon', 'Island', 'Blue', 'Harbour', 'Summit', 'Golden', 'Urban', 'Coastal', 'Prime')
+_NOUN  = ('Digital', 'Media', 'Design', 'Marketing', 'Creative', 'Web', 'Brand', 'Growth', 'Pixel', 'Signal')
+_KIND  = ('Studio', 'Agency', 'Labs', 'Partners', 'Works', 'Collective', 'Group', 'Co')
+_WORDS = ('strategy', 'clients', 'campaign', 'results', 'colombo', 'brand', 'social', 'content',
+          'search', 'growth', 'creative', 'digital', 'award', 'local', 'partners', 'quality')
+_TECH  = ('<link rel="stylesheet" href="/wp-content/themes/x/style.css">',
+          '<script src="https://cdn.shopify.com/s/files/app.js"></script>',
+          '<script src="/_next/static/chunks/main.js"></script>',
+          '<meta name="generator" content="Wix.com Website Builder">', '')
+_SIZE  = ('a boutique team', 'a growing agency', 'an established regional partner',
+          'a team of 35 employees', 'a global multinational', 'a local shop')
+
+
+class FarmConfig:
+    """Knobs for the generated sites (all per-site values are drawn around these)."""
+    def __init__(self, sites: int = DEFAULT_SITES, seed: int = DEFAULT_SEED,
+                 min_pages: int = 3, max_pages: int = 15, page_kb: int = 25,
+                 latency_ms: float = 40.0, slow_site_rate: float = 0.05,
+                 error_rate: float = 0.02, broken_site_rate: float = 0.03,
+                 robots_block_rate: float = 0.10, redirect_rate: float = 0.20,
+                 sitemap_rate: float = 0.50, download_rate: float = 0.30, download_kb: int = 2048):
+        self.sites             = sites
+        self.seed              = seed
+        self.min_pages         = min_pages
+        self.max_pages         = max(min_pages, max_pages)
+        self.page_kb           = page_kb
+        self.latency_ms        = latency_ms
+        self.slow_site_rate    = slow_site_rate       # sites 10x slower than latency_ms
+        self.error_rate        = error_rate           # per-request 503s (retries may succeed)
+        self.broken_site_rate  = broken_site_rate     # sites that answer 500 to everything
+        self.robots_block_rate = robots_block_rate    # sites disallowing their contact page
+        self.redirect_rate     = redirect_rate        # homepage 301 → /home
+        self.sitemap_rate      = sitemap_rate
+        self.download_rate     = download_rate        # sites linking an extensionless PDF from every page
+        self.download_kb       = download_kb
+
+
+class SiteSpec:
+    __slots__ = ('n', 'host', 'name', 'email', 'phone', 'contact_path', 'contact_style', 'pages',
+                 'latency', 'broken', 'robots_block', 'redirect', 'sitemap', 'socials', 'tech',
+                 'size', 'ceo', 'download', 'seed')
+
+    @property
+    def email_discoverable(self) -> bool:
+        return not self.broken and self.contact_style != 'js' and not self.robots_block
+
+
+def site_host(n: int) -> str:
+    return f'site{n}.{FARM_TLD}'
+
+
+def site_number(host: str) -> Optional[int]:
+    host = host.split(':')[0].lower().removeprefix('www.')
+    if not host.endswith('.' + FARM_TLD) or not host.startswith('site'):
+        return None
+    num = host[4:-len(FARM_TLD) - 1]
+    return int(num) if num.isdigit() else None
+
+
+def make_spec(cfg: FarmConfig, n: int) -> SiteSpec:
+    rng  = random.Random(cfg.seed * 1_000_003 + n)
+    s    = SiteSpec()
+    s.n, s.host, s.seed = n, site_host(n), rng.random()
+    s.name          = f"{rng.choice(_ADJ)} {rng.choice(_NOUN)} {rng.choice(_KIND)}"
+    s.email         = f"{rng.choice(('info', 'hello', 'contact', 'sales'))}@{s.host}"
+    s.phone         = rng.choice(('+94 11 {} {}', '011 {} {}', '+94-77-{}-{}')).format(
+        rng.randint(200, 799), rng.randint(1000, 9999))
+    s.contact_path  = rng.choice(('/contact', '/contact-us', '/get-in-touch'))
+    s.contact_style = rng.choices(CONTACT_STYLES, CONTACT_WEIGHTS)[0]
+    extra           = rng.randint(cfg.min_pages, cfg.max_pages)
+    s.pages         = [f'/services/{i}' if i % 2 else f'/blog/post-{i}' for i in range(extra)]
+    slow            = rng.random() < cfg.slow_site_rate
+    s.latency       = cfg.latency_ms / 1000 * (10 if slow else 1)
+    s.broken        = rng.random() < cfg.broken_site_rate
+    s.robots_block  = rng.random() < cfg.robots_block_rate
+    s.redirect      = rng.random() < cfg.redirect_rate
+    s.sitemap       = rng.random() < cfg.sitemap_rate
+    slug            = s.name.lower().replace(' ', '')
+    s.socials       = [u for u, p in ((f'https://www.instagram.com/{slug}/', 0.6),
+                                      (f'https://www.linkedin.com/company/{slug}/', 0.5),
+                                      (f'https://www.facebook.com/{slug}', 0.6),
+                                      (f'https://twitter.com/{slug[:15]}', 0.3)) if rng.random() < p]
+    s.tech          = rng.choice(_TECH)
+    s.size          = rng.choice(_SIZE)
+    s.ceo           = rng.random() < 0.4
+    s.download      = '/downloads/company-profile' if rng.random() < cfg.download_rate else ''
+    return s
+
+
+# ─────────────────────────────────────────────
+# PAGE RENDERING
+# ─────────────────────────────────────────────
+
+def _filler(rng: random.Random, kb: int) -> str:
+    out, size = [], 0
+    while size < kb * 1000:
+        p = '<p>' + ' '.join(rng.choice(_WORDS) for _ in range(60)) + '</p>'
+        out.append(p)
+        size += len(p)
+    return '\n'.join(out)
+
+
+def _contact_block(s: SiteSpec) -> str:
+    local, domain = s.email.split('@')
+    if s.contact_style == 'plain':
+        mail = f'<p>Email: {s.email}</p>'
+    elif s.contact_style == 'mailto':
+        mail = f'<p><a href="mailto:{s.email}?subject=Enquiry">Email us</a></p>'
+    elif s.contact_style == 'entities':
+        mail = '<p>Email: ' + ''.join(f'&#{ord(c)};' for c in s.email) + '</p>'
+    elif s.contact_style == 'at_dot':
+        mail = f'<p>Email: {local} [at] {domain.replace(".", " [dot] ")}</p>'
+    else:
+        mail = (f'<p id="m"></p><script>document.getElementById("m").textContent='
+                f'["{local}","{domain}"].join("@");</script>')
+    return f'{mail}\n<p>Call us: {s.phone}</p>'
+
+
+def render_page(cfg: FarmConfig, s: SiteSpec, path: str) -> str:
+    rng   = random.Random(f"{s.seed}:{path}")
+    nav   = ''.join(f'<a href="{p}">{t}</a>' for p, t in
+                    (('/', 'Home'), ('/about', 'About us'), ('/team', 'Our team'),
+                     (s.contact_path, 'Contact')))
+    links = ''.join(f'<li><a href="{p}">{p.rsplit("/", 1)[-1].replace("-", " ")}</a></li>'
+                    for p in rng.sample(s.pages, min(6, len(s.pages))))
+    body  = [f'<h1>{s.name}</h1>']
+    if path == s.contact_path:
+        body.append(_contact_block(s))
+    elif path == '/about':
+        body.append(f'<p>{s.name} is {s.size} based in Colombo.</p>')
+    elif path == '/team':
+        body.append('<p>Meet our founder and CEO, Nimal Perera.</p>' if s.ceo else '<p>Meet the team.</p>')
+    elif path in ('/', '/home'):
+        body.append(f'<p>Welcome to {s.name}. Reach us on {s.phone}.</p>')
+    body.append(_filler(rng, cfg.page_kb))
+    social = ''.join(f'<a href="{u}">social</a>' for u in s.socials)
+    if s.download:
+        social += f'<a href="{s.download}">Company profile</a>'
+    return (f'<!DOCTYPE html><html><head><title>{s.name}</title>{s.tech}</head><body>'
+            f'<header><nav>{nav}</nav></header><main>{"".join(body)}<ul>{links}</ul></main>'
+            f'<footer>© {s.name} {social}</footer></body></html>')
+
+
+def render_robots(s: SiteSpec) -> str:
+    lines = ['User-agent: *', 'Disallow: /wp-admin/']
+    if s.robots_block:
+        lines.append(f'Disallow: {s.contact_path}')
+    if s.sitemap:
+        lines.append(f'Sitemap: http://{s.host}/sitemap.xml')
+    return '\n'.join(lines) + '\n'
+
+
+def render_sitemap(s: SiteSpec) -> str:
+    paths = ['/', '/about', '/team', s.contact_path] + s.pages
+    urls  = ''.join(f'<url><loc>http://{s.host}{p}</loc></url>' for p in paths)
+    return ('<?xml version="1.0" encoding="UTF-8"?>'
+            f'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">{urls}</urlset>')
+
+
+# ─────────────────────────────────────────────
+# GOOGLE MAPS STAND-IN
+# ─────────────────────────────────────────────
+
+# what a browser has to fetch besides the HTML: versioned bundles, a web font, map tiles
+_MAPS_ASSETS = ('<link rel="stylesheet" href="/maps/_/css/k=maps.m.en.v1/app.css">'
+                '<script src="/maps/_/js/k=maps.m.en.v1/app.js"></script>'
+                '<style>@font-face{font-family:Roboto;src:url(/maps/_/fonts/roboto-v1.woff2)}'
+                'body{font-family:Roboto}</style>')
+_MAPS_TILES  = '<div class="map">' + ''.join(
+    f'<img src="/maps/vt?pb=!1m5!1m4!1i13!2i{5940 + i % 4}!3i{3944 + i // 4}!4i256">' for i in range(MAPS_TILES)
+) + '</div>'
+
+_MAPS_SEARCH = """<!DOCTYPE html><html><head><title>QUERY - Google Maps</title>ASSETS</head><body>TILES
+<div role="main"><div role="feed" aria-label="Results for QUERY" style="height:860px;width:400px;overflow-y:scroll">
+</div></div>
+<script>
+const feed = document.querySelector('div[role="feed"]');
+let next = 0, loading = false, done = false;
+async function more() {
+  if (loading || done) return;
+  loading = true;
+  // same wire format as Google: an XSSI-guarded JSON string in {"c","d"}, places at [0][1][1:][14]
+  const raw  = await (await fetch('/search?tbm=map&q=QUERY&start=' + next)).text();
+  const data = JSON.parse(JSON.parse(raw.replace('/*""*/', '')).d.slice(5));
+  for (const r of data[0][1].slice(1)) {
+    const p = r[14], href = '/maps/place/' + encodeURIComponent(p[11]).replace(/%20/g, '+')
+      + '/data=!4m2!3m1!1s' + p[10];
+    const card = document.createElement('div');
+    card.innerHTML = '<a class="hfpxzc" aria-label="' + p[11] + '" href="' + href + '"></a>'
+      + '<div class="fontHeadlineSmall">' + p[11] + '</div>'
+      + '<div style="height:120px">' + p[13][0] + ' · ' + p[39] + '</div>';
+    feed.appendChild(card);
+  }
+  next = data[1];
+  if (next === null) {
+    done = true;
+    feed.insertAdjacentHTML('beforeend',
+      '<div><p class="fontBodyMedium"><span>You&#39;ve reached the end of the list.</span></p></div>');
+  }
+  loading = false;
+}
+feed.addEventListener('scroll', () => {
+  if (feed.scrollTop + feed.clientHeight >= feed.scrollHeight - 200) more();
+});
+more();
+</script></body></html>"""
+
+
+def maps_listing(s: SiteSpec) -> Dict:
+    """What the farm's Maps shows for a site (the fields scrape_google_maps() extracts, plus its link)."""
+    rng = random.Random(f"{s.seed}:maps")
+    fid = f'0x{s.n:x}:0x{zlib.crc32(s.host.encode()):x}'
+    return {
+        'place_id': fid,
+        'business_name': s.name,
+        'rating': f'{rng.uniform(3.5, 5.0):.1f}',
+        'reviews': str(rng.randint(1, 900)),
+        'category': rng.choice(('Marketing agency', 'Advertising agency', 'Website designer',
+                                'Internet marketing service', 'Graphic designer')),
+        'address': f'{rng.randint(1, 400)} {rng.choice(_ADJ)} Road, Colombo {rng.randint(1, 15):02d}',
+        'whatsapp_number': s.phone,
+        'website': '' if rng.random() < MAPS_NO_WEBSITE else f'http://{s.host}',
+        'href': f'http://{MAPS_HOST}/maps/place/{quote_plus(s.name)}/data=!4m2!3m1!1s{fid}',
+    }
+
+
+def maps_place_info(p: Dict) -> list:
+    """A maps_listing() as the place array of Google's search payloads (the indices real responses use)."""
+    info = [None] * 179
+    info[2]  = p['address'].split(', ')
+    info[4]  = [None] * 7 + [float(p['rating']), int(p['reviews'])]
+    info[7]  = [p['website'] + '/', p['website'].split('//', 1)[1]] if p['website'] else None
+    info[10] = p['place_id']
+    info[11] = p['business_name']
+    info[13] = [p['category']]
+    info[39] = p['address']
+    info[178] = [[p['whatsapp_number'], [[p['whatsapp_number'], 1]]]]
+    return info
+
+
+def render_maps_payload(query: str, listings: List[Dict], next_start: Optional[int]) -> str:
+    """Body of a /search?tbm=map response: XSSI-guarded JSON inside a {"c","d"} envelope."""
+    data = [[query, [None] + [[None] * 14 + [maps_place_info(p)] for p in listings]], next_start]
+    return json.dumps({'c': 0, 'd': ")]}'\n" + json.dumps(data)}) + '/*""*/'
+
+
+def render_maps_search(query: str) -> str:
+    """Results page: an empty feed that fetches MAPS_FEED_PAGE cards at a time as it is scrolled."""
+    return (_MAPS_SEARCH.replace('QUERY', quote(query, safe=' '))
+            .replace('ASSETS', _MAPS_ASSETS).replace('TILES', _MAPS_TILES))
+
+
+def render_place(s: SiteSpec) -> str:
+    """Place page with Google Maps' detail panel markup (h1, F7nice rating, data-item-id rows)."""
+    p    = maps_listing(s)
+    site = f'<a data-item-id="authority" href="{p["website"]}/">{s.host}</a>' if p['website'] else ''
+    return (f'<!DOCTYPE html><html><head><title>{s.name} - Google Maps</title>{_MAPS_ASSETS}</head><body>'
+            f'{_MAPS_TILES}<div role="main" aria-label="{s.name}"><img src="/maps/photo/{p["place_id"]}=w400">'
+            f'<h1 class="DUwDvf">{s.name}</h1>'
+            f'<div class="F7nice"><span><span aria-hidden="true">{p["rating"]}</span></span>'
+            f'<span><span aria-label="{p["reviews"]} reviews">({p["reviews"]})</span></span></div>'
+            f'<button class="DkEaL">{p["category"]}</button>'
+            f'<button data-item-id="address" aria-label="Address: {p["address"]}">{p["address"]}</button>'
+            f'{site}<button data-item-id="phone:tel:{s.phone.replace(" ", "")}">{s.phone}</button>'
+            f'<a href="https://www.google.com/maps/dir//{quote(s.name)}">Directions</a>'
+            f'</div></body></html>')
+
+
+# ─────────────────────────────────────────────
+# SERVER
+# ─────────────────────────────────────────────
+
+class SiteFarm:
+    """aiohttp app serving every farm site; counts what it served."""
+    def __init__(self, cfg: Optional[FarmConfig] = None):
+        self.cfg      = cfg or FarmConfig()
+        self.requests = 0
+        self.pages    = 0      # 200 text/html responses
+        self.bytes    = 0
+        self.statuses: Dict[int, int] = {}
+        self._rng     = random.Random(self.cfg.seed)
+        self._runner: Optional[web.AppRunner] = None
+        self.port     = 0
+        self.spec     = lru_cache(maxsize=None)(lambda n: make_spec(self.cfg, n))
+        self._download = b'%PDF-1.4\n' + bytes(self.cfg.download_kb * 1024)
+        self._maps_static = {                     # path prefix -> (body, content type)
+            '/maps/_/js/':    (b'/*' + b'x' * (MAPS_BUNDLE_KB * 1024) + b'*/', 'application/javascript'),
+            '/maps/_/css/':   (b'/*' + b'x' * 30 * 1024 + b'*/', 'text/css'),
+            '/maps/_/fonts/': (b'wOF2' + bytes(40 * 1024), 'font/woff2'),
+            '/maps/vt':       (b'\x89PNG\r\n\x1a\n' + bytes(MAPS_TILE_KB * 1024), 'image/png'),
+            '/maps/photo/':   (b'\xff\xd8\xff\xe0' + bytes(MAPS_PHOTO_KB * 1024), 'image/jpeg'),
+        }
+
+    def reset_counters(self):
+        self.requests = self.pages = self.bytes = 0
+        self.statuses = {}
+
+    def leads(self) -> List[Dict]:
+        return [{'place_id': f'farm{n}', 'business_name': self.spec(n).name,
+                 'website': f'http://{site_host(n)}', 'whatsapp_number': ''}
+                for n in range(self.cfg.sites)]
+
+    def write_leads_csv(self, path: str):
+        with open(path, 'w', newline='', encoding='utf-8') as f:
+            w = csv.DictWriter(f, fieldnames=['place_id', 'business_name', 'website', 'whatsapp_number'])
+            w.writeheader()
+            w.writerows(self.leads())
+
+    def _reply(self, status: int, text: str = '', content_type: str = 'text/html', **kw) -> web.Response:
+        self.statuses[status] = self.statuses.get(status, 0) + 1
+        self.bytes += len(text)
+        self.pages += status == 200 and content_type == 'text/html'
+        return web.Response(status=status, text=text, content_type=content_type, **kw)
+
+    async def handle(self, request: web.Request) -> web.Response:
+        self.requests += 1
+        if request.host.split(':')[0].lower() == MAPS_HOST:
+            return await self.handle_maps(request)
+        n = site_number(request.host)
+        if n is None or n >= self.cfg.sites:
+            return self._reply(502, 'unknown farm host', 'text/plain')
+        s    = self.spec(n)
+        path = request.path.rstrip('/') or '/'
+        await asyncio.sleep(s.latency * self._rng.uniform(0.5, 1.5))
+
+        if s.broken:
+            return self._reply(500, 'internal error', 'text/plain')
+        if path == '/robots.txt':
+            return self._reply(200, render_robots(s), 'text/plain')
+        if self._rng.random() < self.cfg.error_rate:
+            return self._reply(503, 'busy', 'text/plain')
+        if path == '/sitemap.xml':
+            return self._reply(200, render_sitemap(s), 'application/xml') if s.sitemap else self._reply(404)
+        if path == '/' and s.redirect:
+            return self._reply(301, headers={'Location': f'http://{s.host}/home'})
+        if path in ('/', '/home', '/about', '/team', s.contact_path) or path in s.pages:
+            html = render_page(self.cfg, s, path)
+            etag = '"%08x"' % zlib.crc32(html.encode())      # pages are deterministic: revalidation → 304
+            if request.headers.get('If-None-Match') == etag:
+                return self._reply(304, headers={'ETag': etag})
+            return self._reply(200, html, headers={'ETag': etag})
+        if path == s.download:
+            self.statuses[200] = self.statuses.get(200, 0) + 1
+            self.bytes += len(self._download)
+            return web.Response(body=self._download, content_type='application/pdf')
+        return self._reply(404, '<h1>Not found</h1>')
+
+    async def handle_maps(self, request: web.Request) -> web.Response:
+        """Google Maps stand-in: every farm site is one place in the results of any query."""
+        await asyncio.sleep(self.cfg.latency_ms / 1000 * self._rng.uniform(0.5, 1.5))
+        path = request.path
+        if path.startswith('/maps/search/'):
+            return self._reply(200, render_maps_search(path[len('/maps/search/'):].replace('+', ' ')))
+        if path == '/search' and request.query.get('tbm') == 'map':
+            start = int(request.query.get('start', 0))
+            end   = min(start + MAPS_FEED_PAGE, self.cfg.sites)
+            body  = render_maps_payload(request.query.get('q', ''), [maps_listing(self.spec(n))
+                                                                     for n in range(start, end)],
+                                        end if end < self.cfg.sites else None)
+            return self._reply(200, body, 'application/json')
+        if path.startswith('/maps/place/') and '!1s0x' in path:
+            n = int(path.split('!1s0x', 1)[1].split(':', 1)[0], 16)
+            if n < self.cfg.sites:
+                return self._reply(200, render_place(self.spec(n)))
+        for prefix, (body, ctype) in self._maps_static.items():
+            if path.startswith(prefix):
+                etag = '"%08x"' % zlib.crc32(body)
+                if request.headers.get('If-None-Match') == etag:
+                    return self._reply(304, headers={'ETag': etag})
+                self.statuses[200] = self.statuses.get(200, 0) + 1
+                self.bytes += len(body)
+                return web.Response(body=body, content_type=ctype,
+                                    headers={'ETag': etag, 'Cache-Control': 'public, max-age=31536000'})
+        return self._reply(404, '<h1>Not found</h1>')
+
+    @property
+    def maps_url(self) -> str:
+        return f'http://{MAPS_HOST}/maps'
+
+    async def start(self, host: str = '127.0.0.1', port: int = 0) -> int:
+        app = web.Application()
+        app.router.add_route('*', '/{tail:.*}', self.handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, host, port, backlog=1024)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def stop(self):
+        if self._runner:
+            await self._runner.cleanup()
+            self._runner = None
+
+    @property
+    def proxy_url(self) -> str:
+        return f'http://127.0.0.1:{self.port}'
+
+
+def run_in_thread(farm: SiteFarm, port: int = 0) -> Tuple[threading.Thread, callable]:
+    """Serve `farm` from a background thread; returns (thread, stop)."""
+    loop    = asyncio.new_event_loop()
+    started = threading.Event()
+
+    def serve():
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(farm.start(port=port))
+        started.set()
+        loop.run_forever()
+        loop.run_until_complete(farm.stop())
+        loop.close()
+
+    t = threading.Thread(target=serve, name='sitefarm', daemon=True)
+    t.start()
+    started.wait()
+
+    def stop():
+        loop.call_soon_threadsafe(loop.stop)
+        t.join(timeout=10)
+
+    return t, stop
+
+
+def main():
+    ap = argparse.ArgumentParser(description='Serve a synthetic website farm (use it as HTTP_PROXY)')
+    ap.add_argument('--sites', type=int, default=DEFAULT_SITES)
+    ap.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    ap.add_argument('--port', type=int, default=8900)
+    ap.add_argument('--latency-ms', type=float, default=40.0)
+    ap.add_argument('--error-rate', type=float, default=0.02)
+    ap.add_argument('--csv', help='write a leads CSV for the farm sites here')
+    args = ap.parse_args()
+
+    farm = SiteFarm(FarmConfig(sites=args.sites, seed=args.seed,
+                               latency_ms=args.latency_ms, error_rate=args.error_rate))
+    if args.csv:
+        farm.write_leads_csv(args.csv)
+        print(f"📄 {args.sites} leads → {args.csv}")
+
+    async def serve():
+        await farm.start(port=args.port)
+        print(f"🌐 Farm of {args.sites} sites on {farm.proxy_url}\n"
+              f"   HTTP_PROXY={farm.proxy_url} python enrich.py {args.csv or '<leads.csv>'}")
+        await asyncio.Event().wait()
+
+    try:
+        asyncio.run(serve())
+    except KeyboardInterrupt:
+        print(f"\n{farm.requests} requests served")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,235 @@
+"""
+Sitemap-driven contact page discovery.
+
+Reads the `Sitemap:` entries from robots.txt (falling back to /sitemap.xml),
+follows sitemap indexes, transparently handles .xml.gz bodies, and stream-
+parses each sitemap chunk by chunk. Every <loc> is scored for
+contact/about/team intent and only the best few same-site URLs are kept,
+so the crawler can go straight to them instead of guessing paths.
+
+Both a sync (requests) and an async (aiohttp) driver are provided; they
+share the incremental parser and the ranking below. Neither throttles on
+its own: callers pass `before_request` to space sitemap fetches like their
+page fetches, and `allowed` to check the guessed /sitemap.xml against
+robots.txt.
+"""
+
+import heapq
+import zlib
+from contextlib import nullcontext
+from typing import Awaitable, Callable, Iterable, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+from xml.etree.ElementTree import ParseError, XMLPullParser
+
+from frontier import static_score
+
+# ─────────────────────────────────────────────
+# CONFIG
+# ─────────────────────────────────────────────
+SITEMAP_FALLBACKS     = ['/sitemap.xml']
+MAX_SITEMAP_FETCHES   = 4           # sitemap documents per site (index + children)
+MAX_SITEMAP_BYTES     = 5_000_000   # decompressed bytes per document
+MAX_SITEMAP_URLS      = 50_000      # <loc> entries scanned per site
+SITEMAP_TOP_K         = 8           # URLs handed to the crawler
+SITEMAP_MIN_SCORE     = 3.0         # static_score() floor: contact/about/team intent
+SITEMAP_TIMEOUT       = 8
+CHUNK_SIZE            = 64 * 1024
+
+# child sitemaps of an index: pages before posts/products
+_CHILD_HINTS = (('page', 2.0), ('contact', 3.0), ('about', 2.0), ('team', 2.0),
+                ('post', -1.0), ('product', -2.0), ('news', -1.0), ('image', -3.0), ('video', -3.0))
+
+
+# ─────────────────────────────────────────────
+# INCREMENTAL PARSER
+# ─────────────────────────────────────────────
+
+class SitemapScanner:
+    """
+    Feed raw body chunks; yields ('sitemap'|'url', loc) as soon as each entry
+    closes. gzip is detected from the magic bytes, so .xml.gz needs no hint.
+    """
+    def __init__(self, max_bytes: int = MAX_SITEMAP_BYTES):
+        self._parser = XMLPullParser(events=('end',))
+        self._gunzip  = None
+        self._sniffed = False
+        self._loc     = ''
+        self.bytes    = 0
+        self.max_bytes = max_bytes
+        self.broken   = False
+
+    @property
+    def exhausted(self) -> bool:
+        return self.broken or self.bytes >= self.max_bytes
+
+    def feed(self, chunk: bytes) -> List[Tuple[str, str]]:
+        if self.exhausted or not chunk:
+            return []
+        if not self._sniffed:
+            self._sniffed = True
+            if chunk[:2] == b'\x1f\x8b':
+                self._gunzip = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._gunzip is not None:
+            try:
+                chunk = self._gunzip.decompress(chunk, self.max_bytes - self.bytes)
+            except zlib.error:
+                self.broken = True
+                return []
+        self.bytes += len(chunk)
+        try:
+            self._parser.feed(chunk)
+            return self._drain()
+        except ParseError:
+            self.broken = True
+            return []
+
+    def _drain(self) -> List[Tuple[str, str]]:
+        found = []
+        for _, el in self._parser.read_events():
+            tag = el.tag.rsplit('}', 1)[-1]
+            if tag == 'loc':
+                if not self._loc:              # ignore nested <image:loc> etc.
+                    self._loc = (el.text or '').strip()
+            elif tag in ('url', 'sitemap'):
+                if self._loc:
+                    found.append((tag, self._loc))
+                self._loc = ''
+                el.clear()
+        return found
+
+
+# ─────────────────────────────────────────────
+# RANKING
+# ─────────────────────────────────────────────
+
+def _host(netloc: str) -> str:
+    return netloc.lower().split(':')[0].removeprefix('www.')
+
+
+def child_score(loc: str) -> float:
+    ll = loc.lower()
+    return sum(w for kw, w in _CHILD_HINTS if kw in ll)
+
+
+class ContactRanker:
+    """Bounded top-K of same-site URLs by contact/about/team intent."""
+    def __init__(self, root_url: str, k: int = SITEMAP_TOP_K, min_score: float = SITEMAP_MIN_SCORE):
+        self.host      = _host(urlparse(root_url).netloc)
+        self.k         = k
+        self.min_score = min_score
+        self.seen      = 0
+        self._heap: List[Tuple[float, str]] = []
+        self._urls: set = set()
+
+    def offer(self, url: str):
+        self.seen += 1
+        if url in self._urls or _host(urlparse(url).netloc) != self.host:
+            return
+        s = static_score(url)
+        if s < self.min_score:
+            return
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, (s, url))
+            self._urls.add(url)
+        elif s > self._heap[0][0]:
+            _, old = heapq.heapreplace(self._heap, (s, url))
+            self._urls.discard(old)
+            self._urls.add(url)
+
+    def best(self) -> List[str]:
+        return [u for _, u in sorted(self._heap, key=lambda t: -t[0])]
+
+
+def _initial_sitemaps(root_url: str, robots_sitemaps: Optional[Iterable[str]],
+                      allowed: Optional[Callable[[str], bool]] = None) -> List[str]:
+    """robots.txt's Sitemap: entries, else the guessed SITEMAP_FALLBACKS that `allowed` lets through."""
+    listed = [u for u in (robots_sitemaps or []) if u]
+    guessed = [urljoin(root_url, p) for p in SITEMAP_FALLBACKS]
+    return listed or [u for u in guessed if allowed is None or allowed(u)]
+
+
+def _handle_entries(entries, ranker: ContactRanker, pending: List[Tuple[float, str]], queued: set):
+    for kind, loc in entries:
+        if kind == 'sitemap':
+            if loc not in queued:
+                queued.add(loc)
+                heapq.heappush(pending, (-child_score(loc), loc))
+        else:
+            ranker.offer(loc)
+
+
+# ─────────────────────────────────────────────
+# DRIVERS
+# ─────────────────────────────────────────────
+
+def discover_sync(root_url: str, robots_sitemaps: Optional[Iterable[str]] = None,
+                  headers: Optional[dict] = None, timeout: float = SITEMAP_TIMEOUT,
+                  before_request: Optional[Callable[[], None]] = None,
+                  allowed: Optional[Callable[[str], bool]] = None) -> List[str]:
+    """requests-based discovery for the thread-pool crawlers; before_request() runs before every fetch."""
+    import requests
+
+    ranker  = ContactRanker(root_url)
+    start   = _initial_sitemaps(root_url, robots_sitemaps, allowed)
+    pending = [(0.0, u) for u in start]
+    queued  = set(start)
+    fetches = 0
+
+    while pending and fetches < MAX_SITEMAP_FETCHES and ranker.seen < MAX_SITEMAP_URLS:
+        _, sm_url = heapq.heappop(pending)
+        fetches += 1
+        scanner = SitemapScanner()
+        try:
+            if before_request is not None:
+                before_request()
+            with requests.get(sm_url, headers=headers, timeout=timeout, stream=True) as resp:
+                if resp.status_code != 200:
+                    continue
+                for chunk in resp.iter_content(CHUNK_SIZE):
+                    _handle_entries(scanner.feed(chunk), ranker, pending, queued)
+                    if scanner.exhausted or ranker.seen >= MAX_SITEMAP_URLS:
+                        break
+        except Exception:
+            continue
+    return ranker.best()
+
+
+async def discover_async(session, root_url: str, robots_sitemaps: Optional[Iterable[str]] = None,
+                         headers: Optional[dict] = None, timeout: float = SITEMAP_TIMEOUT,
+                         controller=None, before_request: Optional[Callable[[], Awaitable]] = None,
+                         allowed: Optional[Callable[[str], bool]] = None) -> List[str]:
+    """
+    aiohttp-based discovery for the async crawler; every fetch first awaits
+    before_request() (the site's limiter turn), then takes a `controller`
+    slot if given.
+    """
+    import aiohttp
+
+    ranker  = ContactRanker(root_url)
+    start   = _initial_sitemaps(root_url, robots_sitemaps, allowed)
+    pending = [(0.0, u) for u in start]
+    queued  = set(start)
+    fetches = 0
+
+    while pending and fetches < MAX_SITEMAP_FETCHES and ranker.seen < MAX_SITEMAP_URLS:
+        _, sm_url = heapq.heappop(pending)
+        fetches += 1
+        scanner = SitemapScanner()
+        try:
+            if before_request is not None:
+                await before_request()
+            async with (controller.slot() if controller else nullcontext()), session.get(
+                sm_url,
+                headers=headers,
+                timeout=aiohttp.ClientTimeout(total=timeout),
+                ssl=False,
+            ) as resp:
+                if resp.status != 200:
+                    continue
+                async for chunk in resp.content.iter_chunked(CHUNK_SIZE):
+                    _handle_entries(scanner.feed(chunk), ranker, pending, queued)
+                    if scanner.exhausted or ranker.seen >= MAX_SITEMAP_URLS:
+                        break
+        except Exception:
+            continue
+    return ranker.best()
@@ -0,0 +1,186 @@
+"""
+Per-domain crawl telemetry for enrichment runs.
+
+scrape_site() fills one SiteTelemetry per website (requests, bytes, status
+histogram, time to first byte, parse time, robots blocks, retries and the
+page each field came from) and hands it to a TelemetryReport, which appends
+it as one compact JSON line. summarize() streams a report back and picks
+out the slowest and most wasteful domains, so it also works on reports
+from earlier runs:
+
+    python telemetry.py leads_enriched_20260101_000000_telemetry.jsonl
+"""
+
+import heapq
+import json
+import sys
+import time
+from typing import Dict, Iterator, List
+
+TELEMETRY_SUFFIX = '_telemetry.jsonl'
+SUMMARY_TOP      = 5
+INPUT_SOURCE     = 'input'   # field_sources value for data the row already had (the Maps phone)
+
+
+def telemetry_path(output_path: str) -> str:
+    base = output_path[:-4] if output_path.endswith('.csv') else output_path
+    return base + TELEMETRY_SUFFIX
+
+
+class SiteTelemetry:
+    """Counters for one website crawl; cheap enough to update on every request."""
+    __slots__ = ('domain', 'website', 'outcome', 'requests', 'retries', 'bytes', 'statuses',
+                 'ttfb_total', 'ttfb_max', 'ttfb_count', 'parse_s', 'robots_blocked',
+                 'skipped', 'truncated', 'pages_parsed', 'field_sources', '_t0', 'wall_s')
+
+    def __init__(self, domain: str, website: str = ''):
+        self.domain         = domain
+        self.website        = website
+        self.outcome        = 'ok'
+        self.requests       = 0
+        self.retries        = 0
+        self.bytes          = 0
+        self.statuses: Dict[str, int] = {}
+        self.ttfb_total     = 0.0
+        self.ttfb_max       = 0.0
+        self.ttfb_count     = 0
+        self.parse_s        = 0.0
+        self.robots_blocked = 0
+        self.skipped        = 0     # 200s not read: not HTML / too large (fetch_guard)
+        self.truncated      = 0     # pages cut at MAX_PAGE_BYTES
+        self.pages_parsed   = 0
+        self.field_sources: Dict[str, str] = {}
+        self._t0            = time.monotonic()
+        self.wall_s         = 0.0
+
+    def status(self, code):
+        """Count an HTTP status, or a failure label such as 'timeout' / 'error'."""
+        key = str(code)
+        self.statuses[key] = self.statuses.get(key, 0) + 1
+
+    def ttfb(self, seconds: float):
+        self.ttfb_total += seconds
+        self.ttfb_count += 1
+        self.ttfb_max    = max(self.ttfb_max, seconds)
+
+    def finish(self, outcome: str = '') -> Dict:
+        self.wall_s = time.monotonic() - self._t0
+        if outcome:
+            self.outcome = outcome
+        useful = len(set(self.field_sources.values()) - {INPUT_SOURCE})
+        return {
+            'domain':         self.domain,
+            'website':        self.website,
+            'outcome':        self.outcome,
+            'wall_s':         round(self.wall_s, 3),
+            'requests':       self.requests,
+            'retries':        self.retries,
+            'bytes':          self.bytes,
+            'statuses':       self.statuses,
+            'ttfb_avg_ms':    round(1000 * self.ttfb_total / self.ttfb_count) if self.ttfb_count else None,
+            'ttfb_max_ms':    round(1000 * self.ttfb_max) if self.ttfb_count else None,
+            'parse_ms':       round(1000 * self.parse_s),
+            'robots_blocked': self.robots_blocked,
+            'skipped':        self.skipped,
+            'truncated':      self.truncated,
+            'pages_parsed':   self.pages_parsed,
+            'useful_pages':   useful,
+            'wasted_requests': max(0, self.requests - useful),
+            'field_sources':  self.field_sources,
+        }
+
+
+class TelemetryReport:
+    """Append-only JSONL sink, one line per website."""
+    def __init__(self, path: str):
+        self.path  = path
+        self.sites = 0
+        self._f    = open(path, 'a', encoding='utf-8')
+
+    def record(self, tel: SiteTelemetry, outcome: str = ''):
+        self._f.write(json.dumps(tel.finish(outcome), separators=(',', ':')) + '\n')
+        self._f.flush()
+        self.sites += 1
+
+    def close(self):
+        if not self._f.closed:
+            self._f.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# ─────────────────────────────────────────────
+# SUMMARY
+# ─────────────────────────────────────────────
+
+def iter_report(path: str) -> Iterator[Dict]:
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            try:
+                yield json.loads(line)
+            except ValueError:
+                continue
+
+
+def summarize(path: str, top: int = SUMMARY_TOP) -> Dict:
+    """Totals plus the `top` slowest and most wasteful domains, in one streaming pass."""
+    totals = dict.fromkeys(('sites', 'requests', 'retries', 'bytes', 'robots_blocked', 'skipped', 'truncated'), 0)
+    totals.update(wall_s=0.0, parse_ms=0)
+    statuses: Dict[str, int] = {}
+    outcomes: Dict[str, int] = {}
+    slowest: List = []
+    wasteful: List = []
+    for i, r in enumerate(iter_report(path)):
+        totals['sites'] += 1
+        for k in ('requests', 'retries', 'bytes', 'robots_blocked', 'skipped', 'truncated', 'parse_ms'):
+            totals[k] += r.get(k) or 0
+        totals['wall_s'] += r.get('wall_s') or 0.0
+        for code, n in (r.get('statuses') or {}).items():
+            statuses[code] = statuses.get(code, 0) + n
+        outcomes[r.get('outcome', '?')] = outcomes.get(r.get('outcome', '?'), 0) + 1
+        brief = {k: r.get(k) for k in ('domain', 'wall_s', 'requests', 'wasted_requests', 'bytes', 'ttfb_avg_ms')}
+        _push_top(slowest, top, (r.get('wall_s') or 0.0, i), brief)
+        _push_top(wasteful, top, (r.get('wasted_requests') or 0, r.get('bytes') or 0, i), brief)
+    totals['wall_s'] = round(totals['wall_s'], 1)
+    return {
+        'totals':   totals,
+        'statuses': dict(sorted(statuses.items())),
+        'outcomes': outcomes,
+        'slowest':  [b for _, b in sorted(slowest, key=lambda t: t[0], reverse=True)],
+        'wasteful': [b for _, b in sorted(wasteful, key=lambda t: t[0], reverse=True)],
+    }
+
+
+def _push_top(heap: List, k: int, key: tuple, item: Dict):
+    if len(heap) < k:
+        heapq.heappush(heap, (key, item))
+    elif key > heap[0][0]:
+        heapq.heapreplace(heap, (key, item))
+
+
+def format_summary(summary: Dict) -> str:
+    t = summary['totals']
+    lines = [
+        f"  Sites {t['sites']}  requests {t['requests']}  retries {t['retries']}  "
+        f"{t['bytes'] / 1e6:.1f} MB  robots-blocked {t['robots_blocked']}  "
+        f"skipped {t['skipped']}  truncated {t['truncated']}  "
+        f"crawl {t['wall_s']:.0f}s  parse {t['parse_ms'] / 1000:.1f}s",
+        f"  Statuses: {', '.join(f'{k}={v}' for k, v in summary['statuses'].items()) or '-'}",
+        "  Slowest domains:",
+    ]
+    lines += [f"    {s['domain']:<32} {s['wall_s']:6.1f}s  {s['requests']:>3} req  ttfb {s['ttfb_avg_ms']} ms"
+              for s in summary['slowest']]
+    lines.append("  Most wasteful (requests that yielded nothing):")
+    lines += [f"    {s['domain']:<32} {s['wasted_requests']:>3}/{s['requests']:<3} req  {s['bytes'] / 1e3:7.0f} KB"
+              for s in summary['wasteful']]
+    return '\n'.join(lines)
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        sys.exit(f"usage: python {sys.argv[0]} <report{TELEMETRY_SUFFIX}>")
+    print(format_summary(summarize(sys.argv[1])))
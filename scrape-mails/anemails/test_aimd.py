@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""Tests for the AIMD concurrency controller and its use in fetch_and_parse."""
+
+import asyncio
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+from aimd import NEUTRAL, OK, SERVER_ERROR, THROTTLED, TIMEOUT, AimdController, classify_status
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_additive_increase_multiplicative_decrease():
+    clock = FakeClock()
+    c = AimdController(10, min_window=2, max_window=12, cooldown=1.0, clock=clock)
+    for _ in range(11):
+        c.record(OK, 0.2)
+    assert c.window == 11                       # ~ +1 per window's worth of successes
+    for _ in range(100):
+        c.record(OK, 0.2)
+    assert c.window == 12                       # capped at max_window
+
+    c.record(TIMEOUT)
+    assert c.window == 6
+    c.record(THROTTLED)                         # same congestion event (cooldown)
+    assert c.window == 6
+    clock.now = 5.0
+    c.record(SERVER_ERROR)
+    assert c.window == 3
+    clock.now = 10.0
+    c.record(TIMEOUT)
+    assert c.window == 2                        # floored at min_window
+    c.record(NEUTRAL)                           # connection refused etc. is not congestion
+    assert c.window == 2 and c.decreases == 3
+
+
+def test_latency_blowup_counts_as_congestion_once():
+    clock = FakeClock()
+    c = AimdController(20, cooldown=0.0, clock=clock)
+    for _ in range(50):
+        c.record(OK, 0.1)
+    before = c.window
+    for _ in range(40):
+        c.record(OK, 5.0)
+    assert c.window < before
+    assert c.decreases <= 2                     # baseline is rebased, no ratchet to min_window
+
+
+def test_classify_status():
+    assert classify_status(200) == OK and classify_status(404) == OK
+    assert classify_status(429) == THROTTLED and classify_status(503) == SERVER_ERROR
+
+
+def test_slots_never_exceed_window():
+    async def go():
+        c = AimdController(3, min_window=1, max_window=3)
+        peak = [0]
+
+        async def job():
+            async with c.slot():
+                peak[0] = max(peak[0], c.in_flight)
+                await asyncio.sleep(0.005)
+
+        await asyncio.gather(*(job() for _ in range(30)))
+        return peak[0], c.in_flight
+
+    assert asyncio.run(go()) == (3, 0)
+
+
+def test_fetch_and_parse_reports_throttling():
+    from aiohttp import ClientSession, web
+    import enrich
+
+    async def go():
+        async def handler(req):
+            return web.Response(status=429 if req.path == '/busy' else 503)
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        c       = AimdController(16, min_window=1, cooldown=0.0)
+        limiter = enrich.DomainLimiter(0)
+        saved   = enrich.MAX_RETRIES
+        enrich.MAX_RETRIES = 0
+        try:
+            async with ClientSession() as session:
+                robots = enrich.AsyncRobots(c)
+                loop   = asyncio.get_running_loop()
+                base   = f'http://127.0.0.1:{port}'
+                assert await enrich.fetch_and_parse(session, base + '/busy', '127.0.0.1', robots, limiter, loop, c) is None
+                assert await enrich.fetch_and_parse(session, base + '/down', '127.0.0.1', robots, limiter, loop, c) is None
+        finally:
+            enrich.MAX_RETRIES = saved
+            await runner.cleanup()
+        return c, limiter
+
+    c, limiter = asyncio.run(go())
+    assert c.counts[THROTTLED] == 1 and c.counts[SERVER_ERROR] == 1
+    assert c.window == 4 and c.in_flight == 0
+    assert limiter._delays[enrich.base_domain('127.0.0.1')] >= 1.0   # the 429 host is slowed down
+
+
+if __name__ == '__main__':
+    test_additive_increase_multiplicative_decrease()
+    test_latency_blowup_counts_as_congestion_once()
+    test_classify_status()
+    test_slots_never_exceed_window()
+    test_fetch_and_parse_reports_throttling()
+    print('✅ AIMD controller OK')
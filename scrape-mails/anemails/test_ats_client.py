@@ -0,0 +1,135 @@
+#!/usr/bin/env python3
+"""Tests for the job-board API client: rate budgets, board payloads, conditional revalidation, concurrency."""
+
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(__file__))
+
+from ats_client import AtsClient, RateBudget, parse_greenhouse, parse_lever, parse_smartrecruiters
+from page_cache import PageCache
+
+BOARDS = {     # token -> Greenhouse payload
+    'acme':   {'jobs': [{'id': 4012, 'title': 'Solutions Engineer',
+                         'absolute_url': 'https://boards.greenhouse.io/acme/jobs/1', 'location': {'name': 'Colombo'},
+                         'departments': [{'name': 'Sales'}, {'name': 'Eng'}], 'updated_at': '2026-01-02'}]},
+    'globex': {'jobs': []},
+}
+
+
+class Board(BaseHTTPRequestHandler):
+    """Greenhouse-shaped board API answering If-None-Match with 304."""
+    hits = []
+
+    def do_GET(self):
+        token = self.path.split('/')[1]
+        Board.hits.append((token, self.headers.get('If-None-Match')))
+        time.sleep(0.05)
+        if token not in BOARDS:
+            self.send_response(404)
+            self.end_headers()
+            return
+        etag = f'"{token}-v1"'
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = json.dumps(BOARDS[token]).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.send_header('ETag', etag)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Board)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def test_rate_budget_spends_burst_then_paces():
+    now, slept = [0.0], []
+
+    def sleep(s):
+        slept.append(round(s, 3))
+        now[0] += s
+
+    budget = RateBudget(rate=4.0, burst=2, clock=lambda: now[0], sleep=sleep)
+    for _ in range(4):
+        budget.acquire()
+    assert slept == [0.25, 0.25]                    # the burst is free, then one request per 1/rate
+    now[0] += 10                                    # idle refills up to the burst, not beyond
+    budget.acquire(), budget.acquire()
+    assert len(slept) == 2
+    budget.pause(1.0)                               # a 429's Retry-After holds back everyone
+    budget.acquire()
+    assert slept[-1] == 1.25 and budget.waited == 1.75
+
+
+def test_board_payloads():
+    [gh] = parse_greenhouse(BOARDS['acme'], 'acme')
+    assert gh == {'job_id': '4012', 'job_title': 'Solutions Engineer',
+                  'job_url': 'https://boards.greenhouse.io/acme/jobs/1', 'location': 'Colombo',
+                  'department': 'Sales, Eng', 'posted_date': '2026-01-02'}
+    [lv] = parse_lever([{'text': 'Data Engineer', 'hostedUrl': 'https://jobs.lever.co/x/1',
+                         'categories': {'location': 'Remote', 'team': 'Data'}, 'createdAt': 1700000000000}], 'x')
+    assert (lv['job_title'], lv['location'], lv['department'], lv['posted_date']) == \
+        ('Data Engineer', 'Remote', 'Data', 1700000000000)
+    [sr] = parse_smartrecruiters({'content': [{'id': '42', 'name': 'ERP Analyst', 'location': {'city': 'Kandy'},
+                                               'department': None}]}, 'initech')
+    assert sr['job_url'] == 'https://jobs.smartrecruiters.com/initech/42' and sr['department'] == ''
+    assert parse_greenhouse(None, 'x') == parse_lever({'jobs': []}, 'x') == parse_smartrecruiters([], 'x') == []
+
+
+def test_boards_revalidate_and_fetch_concurrently():
+    server = serve()
+    host = f'127.0.0.1:{server.server_port}'
+    apis = {'greenhouse': (f'http://{host}/{{token}}/jobs', parse_greenhouse)}
+    root = tempfile.mkdtemp()
+    Board.hits.clear()
+    try:
+        client = AtsClient(PageCache(root, ttl=0), budgets={'127.0.0.1': (100.0, 20)}, apis=apis)
+        jobs, note = client.jobs('greenhouse', 'acme')
+        assert note == 'ok' and jobs[0]['job_title'] == 'Solutions Engineer'
+        jobs, note = client.jobs('greenhouse', 'acme')             # TTL 0: asks again, conditionally
+        assert note == 'not_modified' and jobs[0]['department'] == 'Sales, Eng'
+        assert Board.hits == [('acme', None), ('acme', '"acme-v1"')]
+        jobs, note, digest = client.board('greenhouse', 'acme')
+        assert client.board('greenhouse', 'acme', known_hash=digest) == (None, 'unchanged', digest)
+        assert client.jobs('greenhouse', 'nobody') == ([], 'not_found')
+        assert client.jobs('workday', 'acme') == ([], 'unsupported_ats')
+        client.save()
+
+        # a warm run within the TTL asks nothing
+        warm = AtsClient(PageCache.load(root, ttl=3600), apis=apis)
+        Board.hits.clear()
+        assert warm.jobs('greenhouse', 'acme')[1] == 'cached' and Board.hits == []
+
+        tokens = [f'board{n}' for n in range(16)] + ['acme', 'globex']
+        t = time.perf_counter()
+        got = client.fetch_many([('greenhouse', tok) for tok in tokens], workers=8)
+        wall = time.perf_counter() - t
+        assert got[('greenhouse', 'globex')] == ([], 'ok') and got[('greenhouse', 'board3')] == ([], 'not_found')
+        assert got[('greenhouse', 'acme')][1] == 'not_modified'
+        assert wall < 18 * 0.05 / 2, wall                          # one after the other takes 0.9s
+        assert 'unchanged (304)' in client.summary() and client.failed == 0
+        client.close()
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    test_rate_budget_spends_burst_then_paces()
+    test_board_payloads()
+    test_boards_revalidate_and_fetch_concurrently()
+    print('✅ ats client OK')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tests for the careers discovery cache: TTLs, persistence, and warm job_scraper runs skipping the crawl."""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from bs4 import BeautifulSoup
+
+import job_scraper
+from careers_cache import DISCOVERY_MISS_TTL, DISCOVERY_TTL, Discovery, DiscoveryCache
+
+CAREERS = '<html><body><a href="https://boards.greenhouse.io/acme">Open roles</a></body></html>'
+
+
+def test_entries_expire_and_persist():
+    path = os.path.join(tempfile.mkdtemp(), 'careers_cache.json')
+    cache = DiscoveryCache.load(path)
+    found = Discovery('https://acme.lk/careers', 'greenhouse', 'acme', False)
+    cache.record('web:acme.lk', found, now=1000)
+    cache.record('web:globex.lk', Discovery('', '', '', False), now=1000)
+    cache.record('', found, now=1000)                                   # no website, nothing to key on
+    assert cache.lookup('web:acme.lk', now=1000 + DISCOVERY_TTL - 1) == found
+    assert cache.lookup('web:acme.lk', now=1000 + DISCOVERY_TTL) is None
+    assert cache.lookup('web:globex.lk', now=1000 + DISCOVERY_MISS_TTL - 1).careers_url == ''
+    assert cache.lookup('web:globex.lk', now=1000 + DISCOVERY_MISS_TTL) is None
+    assert (cache.hits, cache.misses) == (2, 2)
+
+    cache.record('web:acme.lk', found._replace(js_rendered=True))
+    cache.record('web:initech.lk', found)
+    cache.forget('web:initech.lk')
+    cache.save()                                                        # expired entries are dropped
+    again = DiscoveryCache.load(path)
+    assert again.lookup('web:acme.lk').js_rendered is True
+    assert again.lookup('web:globex.lk') is again.lookup('web:initech.lk') is None
+
+
+class Boards:
+    """ats_client() stand-in: one board per token, 404 for the rest."""
+    def __init__(self, boards):
+        self.boards, self.asked = boards, []
+
+    def board(self, platform, token, known_hash=''):
+        self.asked.append(token)
+        if token not in self.boards:
+            return [], 'not_found', ''
+        return list(self.boards[token]), 'ok', 'h-' + token
+
+    def fetch_many(self, boards):
+        self.prefetched = list(boards)
+        return {b: (list(self.boards.get(b[1], [])), 'ok') for b in boards}
+
+
+def test_warm_runs_go_straight_to_the_board():
+    crawls, saved, page = [], {}, {'html': CAREERS}
+    boards = Boards({'acme': [{'job_id': '1', 'job_title': 'Solutions Engineer', 'job_url': 'https://x/1'}],
+                     'acme-lk': [{'job_id': '2', 'job_title': 'Data Engineer', 'job_url': 'https://x/2'}]})
+
+    def find_careers_page(base_url):
+        crawls.append(base_url)
+        return base_url + '/careers', BeautifulSoup(page['html'], 'html.parser'), 'homepage'
+
+    for name in ('find_careers_page', 'can_fetch_url', 'ats_client'):
+        saved[name] = getattr(job_scraper, name)
+    job_scraper.find_careers_page = find_careers_page
+    job_scraper.can_fetch_url = lambda url: True
+    job_scraper.ats_client = lambda: boards
+    cache = DiscoveryCache(None)
+    row = {'business_name': 'Acme', 'website': 'acme.lk'}
+    try:
+        cold = job_scraper.process_company(row, discovery=cache)
+        warm = job_scraper.process_company(row, discovery=cache)
+        assert crawls == ['https://acme.lk']                            # the warm run did not crawl
+        assert [r['job_title'] for r in cold] == [r['job_title'] for r in warm] == ['Solutions Engineer']
+        assert warm[0]['careers_page_url'] == 'https://acme.lk/careers' and boards.asked == ['acme', 'acme']
+
+        # the board moved: the stale entry is dropped and the company rediscovered in the same run
+        page['html'] = CAREERS.replace('/acme', '/acme-lk')
+        del boards.boards['acme']
+        moved = job_scraper.process_company(row, discovery=cache)
+        assert [r['job_title'] for r in moved] == ['Data Engineer'] and len(crawls) == 2
+        assert cache.lookup('web:acme.lk').token == 'acme-lk'
+    finally:
+        for name, fn in saved.items():
+            setattr(job_scraper, name, fn)
+
+
+def test_known_boards_are_prefetched_together():
+    cache = DiscoveryCache(None)
+    cache.record('web:acme.lk', Discovery('https://acme.lk/careers', 'greenhouse', 'acme', False))
+    cache.record('web:globex.lk', Discovery('https://globex.lk/jobs', 'workday', 'globex', False))
+    cache.record('web:initech.lk', Discovery('', '', '', False))
+    rows = [{'website': w} for w in ('acme.lk', 'https://www.acme.lk/', 'globex.lk', 'initech.lk', 'hooli.lk', '')]
+    boards, saved = Boards({}), job_scraper.ats_client
+    job_scraper.ats_client = lambda: boards
+    try:
+        assert job_scraper.prefetch_boards(rows, cache) == 1
+    finally:
+        job_scraper.ats_client = saved
+    assert boards.prefetched == [('greenhouse', 'acme')]       # once, and only boards with an API client
+    assert (cache.hits, cache.misses) == (0, 0)                 # the workers' lookups are still the ones counted
+    assert job_scraper.prefetch_boards(rows, DiscoveryCache(None)) == 0
+
+
+if __name__ == '__main__':
+    test_entries_expire_and_persist()
+    test_warm_runs_go_straight_to_the_board()
+    test_known_boards_are_prefetched_together()
+    print('✅ careers cache OK')
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for append-only JSONL checkpoints and resume keys."""
+
+import csv
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from checkpoint import (
+    JsonlCheckpoint, checkpoint_path, done_keys, find_latest_checkpoint,
+    iter_checkpoint, output_path_for, row_key, write_csv_from_checkpoint,
+)
+
+
+def test_row_key_prefers_place_id_then_website():
+    assert row_key({'place_id': 'ChIJ1', 'website': 'https://a.lk'}) == 'pid:ChIJ1'
+    assert row_key({'website': 'https://www.A.lk/'}) == row_key({'website': 'a.lk'}) == 'web:a.lk'
+    assert row_key({'website': ''}) == ''
+
+
+def test_append_resume_and_torn_line():
+    d  = tempfile.mkdtemp()
+    cp = checkpoint_path(os.path.join(d, 'leads_enriched_20260101_000000.csv'))
+    assert output_path_for(cp).endswith('leads_enriched_20260101_000000.csv')
+
+    with JsonlCheckpoint(cp, fsync_every=2) as w:
+        w.append({'place_id': 'p1', 'email': 'a@a.lk'})
+        w.append({'website': 'b.lk', 'email': ''})
+    with open(cp, 'a', encoding='utf-8') as f:
+        f.write('{"place_id": "p3", "ema')          # crash mid-write
+
+    assert done_keys(cp) == {'pid:p1', 'web:b.lk'}
+    with JsonlCheckpoint(cp) as w:                   # resumed run keeps appending
+        w.append({'place_id': 'p4'})
+    assert [r.get('place_id') for r in iter_checkpoint(cp)] == ['p1', None, 'p4']
+    assert find_latest_checkpoint(os.path.join(d, 'leads_enriched_')) == cp
+
+
+def test_final_csv_is_streamed_from_checkpoint():
+    d  = tempfile.mkdtemp()
+    cp = os.path.join(d, 'x_checkpoint.jsonl')
+    with JsonlCheckpoint(cp) as w:
+        for i in range(25):
+            w.append({'place_id': f'p{i}', 'email': f'{i}@a.lk', 'extra': 'dropped'})
+    seen = []
+    out = os.path.join(d, 'x.csv')
+    assert write_csv_from_checkpoint(cp, out, ['place_id', 'email'], on_row=seen.append) == 25
+    with open(out, newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == len(seen) == 25 and set(rows[0]) == {'place_id', 'email'}
+
+
+if __name__ == '__main__':
+    test_row_key_prefers_place_id_then_website()
+    test_append_resume_and_torn_line()
+    test_final_csv_is_streamed_from_checkpoint()
+    print('✅ checkpoint OK')
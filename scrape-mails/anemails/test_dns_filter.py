@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the DNS pre-flight: TTL cache, bulk resolution and dead-row fast-fail."""
+
+import asyncio
+import csv
+import glob
+import os
+import sys
+import tempfile
+import time
+sys.path.insert(0, os.path.dirname(__file__))
+
+import enrich
+from dns_filter import DnsCache, StubResolver, SystemResolver, dead_hosts, resolve_hosts
+
+
+def test_cache_ttls_and_persistence():
+    path  = os.path.join(tempfile.mkdtemp(), 'dns.json')
+    cache = DnsCache(path, positive_ttl=100, negative_ttl=10)
+    now   = time.time()
+    cache.put('alive.lk', True, now)
+    cache.put('dead.lk', False, now)
+    assert cache.get('alive.lk', now + 50) is True
+    assert cache.get('dead.lk', now + 5) is False
+    assert cache.get('dead.lk', now + 11) is None      # negative entry expired
+    assert cache.get('unknown.lk', now) is None
+
+    cache.save()
+    again = DnsCache.load(path)
+    assert again.get('alive.lk') is True and again.get('dead.lk') is False
+
+
+def test_resolve_hosts_dedups_and_uses_cache():
+    cache    = DnsCache(os.path.join(tempfile.mkdtemp(), 'dns.json'))
+    resolver = StubResolver({'dead.lk': False, 'flaky.lk': None})
+    hosts    = ['a.lk', 'a.lk', 'dead.lk', 'flaky.lk']
+
+    res = asyncio.run(resolve_hosts(hosts, resolver, cache, concurrency=2))
+    assert res == {'a.lk': True, 'dead.lk': False, 'flaky.lk': None}
+    assert sorted(resolver.calls) == ['a.lk', 'dead.lk', 'flaky.lk']
+    assert dead_hosts(res) == {'dead.lk'}
+
+    # second run: definite answers come from the cache, unknowns are retried
+    resolver.calls.clear()
+    res = asyncio.run(resolve_hosts(hosts, resolver, cache))
+    assert resolver.calls == ['flaky.lk']
+    assert res['dead.lk'] is False
+
+
+def test_system_resolver_localhost():
+    assert asyncio.run(SystemResolver(timeout=5).resolve('localhost')) is True
+
+
+def test_run_fast_fails_dead_domains_without_http():
+    d     = tempfile.mkdtemp()
+    input = os.path.join(d, 'leads.csv')
+    with open(input, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=['place_id', 'business_name', 'website', 'whatsapp_number'])
+        w.writeheader()
+        w.writerow({'place_id': 'p0', 'business_name': 'Gone', 'website': 'https://www.gone-forever.lk',
+                    'whatsapp_number': '+94771234567'})
+        w.writerow({'place_id': 'p1', 'business_name': 'Also gone', 'website': 'expired.lk'})
+
+    saved = enrich.DNS_CACHE_FILE, enrich.PATH_STATS_FILE
+    enrich.DNS_CACHE_FILE  = os.path.join(d, 'dns.json')
+    enrich.PATH_STATS_FILE = os.path.join(d, 'stats.json')
+    try:
+        resolver = StubResolver(default=False)
+        started  = time.time()
+        asyncio.run(enrich.run(input, resolver=resolver))
+    finally:
+        enrich.DNS_CACHE_FILE, enrich.PATH_STATS_FILE = saved
+
+    assert time.time() - started < enrich.REQUEST_TIMEOUT      # no request timeouts were waited out
+    assert sorted(resolver.calls) == ['expired.lk', 'www.gone-forever.lk']
+    [out] = glob.glob(os.path.join(d, 'leads_enriched_*.csv'))
+    with open(out, newline='', encoding='utf-8') as f:
+        rows = {r['place_id']: r for r in csv.DictReader(f)}
+    assert rows['p0']['phone_primary'] == '+94771234567' and rows['p0']['email'] == ''
+    assert rows['p1']['lead_quality_score'] == '0'
+
+
+if __name__ == '__main__':
+    test_cache_ttls_and_persistence()
+    test_resolve_hosts_dedups_and_uses_cache()
+    test_system_resolver_localhost()
+    test_run_fast_fails_dead_domains_without_http()
+    print('✅ dns pre-flight OK')
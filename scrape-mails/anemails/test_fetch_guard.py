@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""Tests for guarded response reads: type checks, byte caps, charset detection, enrich integration."""
+
+import asyncio
+import os
+import sys
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(__file__))
+
+from fetch_guard import (
+    DETECT_SAMPLE, decode_html, detection_sample, guarded_get, looks_like_html, page_kind, read_html,
+    response_html,
+)
+from telemetry import SiteTelemetry
+
+CAP = 100_000
+PAGE = '<html><head><meta charset="windows-1251"></head><body>Привет info@acme.lk</body></html>'
+
+
+def test_kinds_and_sniffing():
+    assert page_kind('text/html; charset=utf-8') == 'html' and page_kind('application/xhtml+xml') == 'html'
+    assert page_kind('') == page_kind('text/plain') == page_kind('application/octet-stream') == 'sniff'
+    assert page_kind('application/pdf') == page_kind('image/jpeg') == 'other'
+    assert looks_like_html(b'  <!doctype html>') and looks_like_html('﻿<p>'.encode('utf-16'))
+    assert not looks_like_html(b'%PDF-1.7\n') and not looks_like_html(b'\x89PNG\r\n')
+    assert not looks_like_html(b'\x01\x02\x00\x00garbage')
+
+
+def test_decode_html_charset_order():
+    body = PAGE.encode('cp1251')
+    assert decode_html(body) == PAGE                                          # <meta charset>
+    assert decode_html(body, 'text/html; charset="CP1251"') == PAGE           # header
+    assert decode_html(b'\xef\xbb\xbf' + 'Café'.encode(), 'text/html; charset=iso-8859-1') == 'Café'   # BOM wins
+    assert decode_html('Café'.encode('cp1252')) == 'Café'                     # not UTF-8 → Windows-1252
+    assert decode_html('“quoted”'.encode('cp1252'), 'text/html; charset=iso-8859-1') == '“quoted”'
+    assert decode_html('Café'.encode(), 'text/html; charset=bogus') == 'Café'
+
+
+def test_undeclared_charsets_are_detected_from_a_small_sample():
+    markup = '<div class="col-md-6"><a href="/x">link</a></div>\n' * 400      # ASCII noise around the text
+    for text, charset in (('Компания предлагает услуги по всей стране.', 'cp1251'),
+                          ('Zażółć gęślą jaźń, strona firmy w Polsce.', 'cp1250'),
+                          ('Müller & Söhne – Größe, déjà vu, café.', 'cp1252'),
+                          ('Η εταιρεία μας βρίσκεται στην Αθήνα.', 'cp1253')):
+        html = f'<html><body>{markup}<p>{text}</p>{markup}<p>{text}</p></body></html>'
+        assert decode_html(html.encode(charset), 'text/html') == html, charset
+    body = ('<p>' + 'é' * 5000 + '</p>').encode('cp1252') + b'x' * 1_000_000
+    assert len(detection_sample(body)) == DETECT_SAMPLE
+    assert decode_html('<p>né €</p>'.encode()[:-5]) == '<p>né \ufffd'         # UTF-8 cut by the byte cap
+
+    from requests.models import Response
+    from requests.structures import CaseInsensitiveDict
+    r = Response()
+    r._content, r.headers = 'Café'.encode('cp1252'), CaseInsensitiveDict({'Content-Type': 'text/html'})
+    assert response_html(r) == 'Café'           # requests' own .text would say ISO-8859-1 by RFC 2616
+
+
+class _Files(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    sent = {}
+
+    def _send(self, ctype, body, length=None):
+        self.send_response(200)
+        if ctype is not None:
+            self.send_header('Content-Type', ctype)
+        self.send_header('Content-Length', str(length if length is not None else len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except OSError:
+            pass
+
+    def do_GET(self):
+        if self.path == '/page':
+            return self._send('text/html', PAGE.encode('cp1251'))
+        if self.path == '/brochure.pdf':
+            return self._send('application/pdf', b'%PDF-1.7' + b'x' * 3_000_000)
+        if self.path == '/download':                   # no type, binary inside
+            return self._send(None, b'\x89PNG\r\n' + b'x' * 1000)
+        if self.path == '/huge-untyped':
+            return self._send('application/octet-stream', b'<p>hi</p>', length=50_000_000)
+        if self.path == '/endless':                    # chunked HTML that never ends
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html')
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            chunk, sent = b'<p>' + b'a' * 8189 + b'</p>', 0
+            try:
+                while sent < 50_000_000:
+                    self.wfile.write(b'%x\r\n%s\r\n' % (len(chunk), chunk))
+                    sent += len(chunk)
+            except OSError:
+                pass
+            self.sent['/endless'] = sent
+            self.close_connection = True
+            return
+        self.send_response(404)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+def _serve():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _Files)
+    server.handle_error = lambda *args: None          # clients hanging up mid-body is the point
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f'http://127.0.0.1:{server.server_address[1]}'
+
+
+def test_read_html_async():
+    from aiohttp import ClientSession
+    server, base = _serve()
+
+    async def go():
+        out = {}
+        async with ClientSession() as session:
+            for path in ('/page', '/brochure.pdf', '/download', '/huge-untyped', '/endless'):
+                async with session.get(base + path) as resp:
+                    out[path] = await read_html(resp, max_bytes=CAP)
+        return out
+
+    try:
+        got = asyncio.run(go())
+    finally:
+        server.shutdown()
+    assert got['/page'] == (PAGE.encode('cp1251'), 'ok')
+    assert got['/brochure.pdf'] == (None, 'not_html')
+    assert got['/download'] == (None, 'not_html')
+    assert got['/huge-untyped'] == (None, 'too_large')
+    body, note = got['/endless']
+    assert note == 'truncated' and len(body) == CAP
+
+
+def test_guarded_get_sync():
+    server, base = _serve()
+    try:
+        page = guarded_get(base + '/page', max_bytes=CAP, timeout=5)
+        pdf  = guarded_get(base + '/brochure.pdf', max_bytes=CAP, timeout=5)
+        endless = guarded_get(base + '/endless', max_bytes=CAP, timeout=5)
+    finally:
+        server.shutdown()
+    assert page.guard == 'ok' and decode_html(page.content, page.headers['Content-Type']) == PAGE
+    assert pdf.guard == 'not_html' and pdf.content == b'' and pdf.status_code == 200
+    assert endless.guard == 'truncated' and len(endless.content) == CAP
+    assert _Files.sent['/endless'] < 50_000_000                  # the server saw the client hang up
+
+
+def test_fetch_and_parse_skips_non_html():
+    from aiohttp import ClientSession
+    import enrich
+    server, base = _serve()
+
+    async def go():
+        async with ClientSession() as session:
+            robots, limiter = enrich.AsyncRobots(), enrich.DomainLimiter(0)
+            loop = asyncio.get_running_loop()
+            tel  = SiteTelemetry('127.0.0.1')
+            page = await enrich.fetch_and_parse(session, base + '/page', 'acme.lk', robots, limiter, loop, tel=tel)
+            pdf  = await enrich.fetch_and_parse(session, base + '/brochure.pdf', 'acme.lk', robots, limiter, loop,
+                                                tel=tel)
+            return page, pdf, tel.finish()
+
+    try:
+        page, pdf, rec = asyncio.run(go())
+    finally:
+        server.shutdown()
+    assert 'info@acme.lk' in page['emails'] and pdf is None
+    assert rec['skipped'] == 1 and rec['retries'] == 0 and rec['pages_parsed'] == 1
+    assert rec['bytes'] == len(PAGE.encode('cp1251'))
+
+
+if __name__ == '__main__':
+    test_kinds_and_sniffing()
+    test_decode_html_charset_order()
+    test_undeclared_charsets_are_detected_from_a_small_sample()
+    test_read_html_async()
+    test_guarded_get_sync()
+    test_fetch_and_parse_skips_non_html()
+    print('✅ fetch guard OK')
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""Tests for the adaptive crawl frontier and persisted path statistics."""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from frontier import PathStats, SiteFrontier, canonical_url, path_key
+
+
+def test_links_ranked_by_anchor_and_path():
+    f = SiteFrontier(PathStats())
+    f.add_link('https://acme.lk/blog/2024/05/launch', 'Read our launch post')
+    f.add_link('https://acme.lk/reach-out', 'Contact us')
+    f.add_link('https://acme.lk/about-acme', 'About')
+    assert f.pop() == 'https://acme.lk/reach-out'
+    assert f.pop() == 'https://acme.lk/about-acme'
+    assert f.pop() is None   # the blog post scores below MIN_LINK_SCORE
+
+
+def test_duplicates_and_visited_are_skipped():
+    f = SiteFrontier(PathStats())
+    f.mark_visited('https://acme.lk/')
+    f.add_link('https://acme.lk', 'Home')
+    f.add_link('https://acme.lk/contact/', 'Contact')
+    f.add_link('https://acme.lk/contact#form', 'Contact')
+    assert f.pop() == canonical_url('https://acme.lk/contact')
+    assert f.pop() is None
+
+
+def test_learned_hit_rate_promotes_guesses_and_persists():
+    path = os.path.join(tempfile.mkdtemp(), 'stats.json')
+    st = PathStats(path)
+    for _ in range(20):
+        st.record('https://a.lk/offices', hit=True)
+        st.record('https://b.lk/contact', hit=False)
+    st.save()
+
+    loaded = PathStats.load(path)
+    assert loaded.hit_rate('https://c.lk/offices/') > loaded.hit_rate('https://c.lk/contact')
+    f = SiteFrontier(loaded)
+    f.add_guesses('https://c.lk', ['/contact', '/offices', '/blog'], limit=1)
+    assert f.pop() == 'https://c.lk/offices'
+    assert f.pop() is None
+
+
+def test_path_key_folds_numbers():
+    assert path_key('https://x.lk/News/2023/05/post') == '/news/:n'
+    assert path_key('https://x.lk') == '/'
+
+
+if __name__ == '__main__':
+    test_links_ranked_by_anchor_and_path()
+    test_duplicates_and_visited_are_skipped()
+    test_learned_hit_rate_promotes_guesses_and_persists()
+    test_path_key_folds_numbers()
+    print('✅ frontier OK')
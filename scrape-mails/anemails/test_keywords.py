@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""Parity tests: compiled KeywordMatcher vs. the `any(kw in text)` loops it replaced."""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+import job_scraper
+from keywords import KeywordMatcher
+
+CATEGORIES = {    # overlapping, nested and prefix-sharing keywords on purpose
+    'founders': ['co-founder', 'founder', 'found'],
+    'eng':      ['engineer', 'software engineer', 'ng-', 'ng-version', 'e'],
+    'empty':    [],
+    'regex':    ['c++', 'a.b', '(x)'],
+}
+
+
+def loop_hits(categories, text):
+    return {c: [k for k in kws if k in text] for c, kws in categories.items() if any(k in text for k in kws)}
+
+
+def test_examples():
+    m = KeywordMatcher(CATEGORIES)
+    assert m.hits('our co-founder') == {'founders': ['co-founder', 'founder', 'found'], 'eng': ['e']}
+    assert m.hits('ng-version 2, c++ and a.b') == {'eng': ['ng-', 'ng-version', 'e'], 'regex': ['c++', 'a.b']}
+    assert m.hits('axb (x)') == {'regex': ['(x)']}
+    assert m.first('software engineer, founder') == 'founders' and m.first('zzz') == ''
+    assert m.categories_in('c++ engineer') == ['eng', 'regex']
+    assert m.search('(x)') and not m.search('xyz')
+    empty = KeywordMatcher({})
+    assert empty.hits('anything') == {} and not empty.search('anything') and empty.first('x') == ''
+    assert KeywordMatcher.of(['b2b', 'saas']).categories_in('a saas co') == ['match']
+    shared = {'a': ['k2'], 'b': ['z'], 'c': ['k1', 'k2']}             # 'k2' is listed twice
+    assert KeywordMatcher(shared).hits('k1 k2 z') == loop_hits(shared, 'k1 k2 z') == \
+        {'a': ['k2'], 'b': ['z'], 'c': ['k1', 'k2']}
+
+
+def test_random_parity():
+    rng = random.Random(7)
+    pieces = [k for kws in CATEGORIES.values() for k in kws] + ['co-', 'found', 'ng', 'version', ' ', 'x', 'c+']
+    m = KeywordMatcher(CATEGORIES)
+    for _ in range(2000):
+        text = ''.join(rng.choice(pieces) for _ in range(rng.randint(0, 12)))
+        want = loop_hits(CATEGORIES, text)
+        assert m.hits(text) == want, text
+        assert m.search(text) == bool(want) and m.first(text) == next(iter(want), '')
+
+
+def test_call_sites_keep_their_answers():
+    rng = random.Random(11)
+    role_words = [kw for kws in job_scraper.ROLE_CATEGORIES.values() for kw in kws] + ['senior', 'lead', '-', ' ']
+    for _ in range(500):
+        title = ''.join(rng.choice(role_words) for _ in range(rng.randint(0, 5))).title()
+        hits = loop_hits(job_scraper.ROLE_CATEGORIES, title.lower())
+        assert job_scraper.classify_role(title) == (next(iter(hits), ''), [k for ks in hits.values() for k in ks])
+        assert job_scraper.looks_like_job_title(title) == (4 <= len(title.strip()) <= 100 and bool(hits))
+
+
+if __name__ == '__main__':
+    test_examples()
+    test_random_parity()
+    test_call_sites_keep_their_answers()
+    print('✅ keywords OK')
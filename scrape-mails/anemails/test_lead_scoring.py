@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""Tests for the shared lead scoring rules: per-row vs numpy parity, and parity with the old per-tool scorers."""
+
+import csv
+import json
+import os
+import random
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+import numpy as np
+
+from lead_scoring import (
+    RULES, best_contact, best_contact_columns, load_rules, rescore_csv, rule_fields,
+    score_columns, score_email, score_row,
+)
+
+
+# The per-row scorers this module replaced, kept verbatim as the reference.
+def legacy_lead_score(row):
+    s = 0
+    if row.get('email_primary'):
+        s += (score_email(row['email_primary']) / 10) * 35
+    if row.get('phone_primary'):
+        s += 20
+    s += min(int(row.get('social_media_score', 0)) * 2.5, 15)
+    if row.get('decision_maker_found') == 'Yes': s += 15
+    if row.get('linkedin_company'):               s += 10
+    if row.get('contact_page_found') == 'Yes':    s += 5
+    return min(int(s), 100)
+
+
+def legacy_confidence(row):
+    s = 0
+    if row.get('email_primary'):    s += score_email(row['email_primary'])
+    if row.get('phone_primary'):    s += 8
+    if row.get('contact_page_found') == 'Yes': s += 5
+    if row.get('linkedin_company'): s += 4
+    return 'High' if s >= 18 else 'Medium' if s >= 10 else 'Low'
+
+
+def legacy_places(rating, reviews, has_phone, has_email, has_website, category):
+    score = (35 if rating >= 4.7 else 30 if rating >= 4.5 else 25 if rating >= 4.3 else 15 if rating >= 4.0 else 0)
+    score += (25 if reviews >= 150 else 20 if reviews >= 75 else 15 if reviews >= 30 else 10 if reviews >= 10 else 0)
+    score += 30 * has_email + 15 * has_phone + 5 * (has_website and not has_email) + 15 * (category == 'B2B')
+    return score, ('🔥 HOT' if score >= 85 else '⭐ WARM' if score >= 65 else '💼 POTENTIAL' if score >= 45 else '❄️ COLD')
+
+
+def legacy_outreach(row):
+    q = str(row.get('lead_quality', '')).upper()
+    score = 40 if 'HOT' in q else 30 if 'WARM' in q else 20 if 'POTENTIAL' in q else 10
+    score += 20 * (row['email'] not in ('', 'N/A')) + 10 * (row['website'] not in ('', 'N/A'))
+    score += 10 * (row['e164_phone'] is not None)
+    score += 15 if row['rating'] >= 4.5 else 10 if row['rating'] >= 4.0 else 0
+    score += 5 if row['review_count'] >= 100 else 3 if row['review_count'] >= 30 else 0
+    return min(score, 100)
+
+
+def random_rows(n, seed=5):
+    rng = random.Random(seed)
+    pick = rng.choice
+    return [{
+        'email_primary':        pick(['', 'info@acme.lk', 'jane.doe@acme.lk', 'noreply@acme.lk', 'bob@acme.lk', 'support@acme.lk']),
+        'phone_primary':        pick(['', '+94 11 234 5678']),
+        'social_media_score':   pick(['0', '1', '3', '5', '7']),
+        'decision_maker_found': pick(['Yes', 'No']),
+        'linkedin_company':     pick(['', 'https://linkedin.com/company/acme']),
+        'linkedin_ceo':         pick(['', 'https://linkedin.com/in/ceo']),
+        'contact_page_found':   pick(['Yes', 'No']),
+        'instagram':            pick(['', 'https://instagram.com/acme']),
+        'facebook':             pick(['', 'https://facebook.com/acme']),
+        'youtube':              pick(['', 'https://youtube.com/@acme']),
+        'rating':               pick([0, 3.9, 4.0, 4.3, 4.49, 4.5, 4.7, 5.0]),
+        'review_count':         pick([0, 9, 10, 30, 75, 99, 100, 150, 900]),
+        'lead_quality':         pick(['🔥 HOT', '⭐ WARM', '💼 POTENTIAL', '❄️ COLD']),
+        'email':                pick(['', 'N/A', 'owner@acme.lk']),
+        'website':              pick(['', 'N/A', 'https://acme.lk']),
+        'e164_phone':           pick([None, '+94771234567']),
+        'category':             pick(['B2B', 'B2C']),
+    } for _ in range(n)]
+
+
+def as_columns(rows, fields):
+    return {f: np.array([r.get(f) for r in rows], dtype=object) for f in fields}
+
+
+def test_rules_match_the_old_scorers():
+    rows = random_rows(3000)
+    for r in rows:
+        assert score_row(RULES['contact_score'], r)[0] == legacy_lead_score(r)
+        assert score_row(RULES['contact_confidence'], r)[1] == legacy_confidence(r)
+        assert score_row(RULES['outreach'], r)[0] == legacy_outreach(r)
+        flags = (bool(r['phone_primary']), bool(r['email']), bool(r['website']))
+        score, tier, tags = score_row(RULES['places_lead'], {
+            'rating': r['rating'], 'review_count': r['review_count'], 'phone': flags[0],
+            'email': flags[1], 'website': flags[2], 'category': r['category']})
+        assert (score, tier) == legacy_places(r['rating'], r['review_count'], *flags, r['category'])
+        assert ('Website' in tags) == (flags[2] and not flags[1])
+    assert best_contact(RULES['contact_methods'], {'email_primary': 'info@a.lk', 'instagram': 'x'}) == 'Email → Instagram DM'
+    assert best_contact(RULES['contact_methods'], {'email_primary': 'noreply@a.lk'}) == 'Website Form'
+
+
+def test_columns_match_rows():
+    rows = random_rows(4000, seed=9)
+    rows[0].update(social_media_score='', rating='n/a', email=float('nan'))   # junk cells
+    for name, rules in RULES.items():
+        cols = as_columns(rows, rule_fields(rules))
+        if 'methods' in rules:
+            assert list(best_contact_columns(rules, cols)) == [best_contact(rules, r) for r in rows]
+            continue
+        got = score_columns(rules, cols)
+        want = [score_row(rules, r) for r in rows]
+        assert got['score'].tolist() == [s for s, _, _ in want], name
+        if 'tiers' in rules:
+            assert got['tier'].tolist() == [t for _, t, _ in want], name
+
+
+def test_rescore_csv_and_rule_override():
+    work = tempfile.mkdtemp()
+    src, dst = os.path.join(work, 'leads.csv'), os.path.join(work, 'out.csv')
+    rows = random_rows(250, seed=2)
+    fields = ['business_name', 'email_primary', 'phone_primary', 'social_media_score',
+              'decision_maker_found', 'linkedin_company', 'contact_page_found', 'lead_quality_score']
+    with open(src, 'w', newline='', encoding='utf-8') as f:
+        w = csv.DictWriter(f, fieldnames=fields, extrasaction='ignore', restval='')
+        w.writeheader()
+        for i, r in enumerate(rows):
+            w.writerow(dict(r, business_name=f'Biz {i}', lead_quality_score='0'))
+
+    n, used = rescore_csv(src, dst, chunk_rows=64)
+    assert n == 250 and used == ['contact_score', 'contact_confidence']
+    with open(dst, newline='', encoding='utf-8') as f:
+        out = list(csv.DictReader(f))
+    assert [o['business_name'] for o in out] == [f'Biz {i}' for i in range(250)]
+    assert [int(o['lead_quality_score']) for o in out] == [legacy_lead_score(r) for r in rows]
+    assert [o['contact_confidence'] for o in out] == [legacy_confidence(r) for r in rows]
+
+    override = os.path.join(work, 'rules.json')
+    with open(override, 'w', encoding='utf-8') as f:
+        json.dump({'contact_score': {'score_column': 'lead_quality_score',
+                                     'terms': [{'field': 'phone_primary', 'points': 50}]}}, f)
+    rules = load_rules(override)
+    assert rules['contact_confidence'] == RULES['contact_confidence']
+    rescore_csv(src, dst, ['contact_score'], rules=rules)
+    with open(dst, newline='', encoding='utf-8') as f:
+        assert [o['lead_quality_score'] for o in csv.DictReader(f)] == \
+               ['50' if r['phone_primary'] else '0' for r in rows]
+
+
+def test_enrich_scorer_batch_matches_rows():
+    from enrich import QUANTUM_SCORER
+
+    rows = random_rows(500, seed=4)
+    batch = QUANTUM_SCORER.score_batch(as_columns(rows, rule_fields(RULES['contact_score'])
+                                                  + rule_fields(RULES['contact_methods'])
+                                                  + ['contact_page_found']))
+    for i, r in enumerate(rows):
+        one = QUANTUM_SCORER.score_lead(r)
+        assert one['score'] == batch['lead_quality_score'][i]
+        assert one['confidence'] == batch['contact_confidence'][i]
+        assert one['next_best_action'] == batch['best_contact_method'][i]
+        assert 0 <= one['predictive_insights']['conversion_probability'] <= 100
+
+
+if __name__ == '__main__':
+    test_rules_match_the_old_scorers()
+    test_columns_match_rows()
+    test_rescore_csv_and_rule_override()
+    test_enrich_scorer_batch_matches_rows()
+    print('✅ lead scoring OK')
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""Tests for query batches: query files, cross-query dedupe, journal replay and resume."""
+
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from maps_batch import MapsBatch, dedupe_keys, journal_path, read_queries
+from maps_browser import BrowserPool
+from maps_enrich import batch_rows
+
+LISTINGS = {     # query -> its Maps feed
+    'digital marketing Colombo': [('1', 'https://alpha.lk/'), ('2', ''), ('3', 'https://www.beta.lk')],
+    'marketing agency Colombo':  [('3', 'https://www.beta.lk'), ('4', 'http://beta.lk/'), ('5', 'https://gamma.lk')],
+    'seo Colombo':               [('1', 'https://alpha.lk/'), ('6', ''), ('7', 'https://delta.lk')],
+}
+
+
+def fake_scrape(opened, fail_after=None):
+    """scrape_google_maps() over LISTINGS, recording which places it opened."""
+    def scrape(query, max_results, pool=None, mode=None, on_row=None, skip=()):
+        rows = []
+        for pid, site in LISTINGS[query][:max_results]:
+            if pid in skip:
+                continue
+            if fail_after is not None and len(opened) >= fail_after:
+                raise KeyboardInterrupt
+            opened.append(pid)
+            rows.append({'place_id': pid, 'business_name': f'Biz {pid}', 'website': site})
+            if on_row:
+                on_row(dict(rows[-1]))
+        return rows
+    return scrape
+
+
+def test_read_queries_and_keys():
+    path = os.path.join(tempfile.mkdtemp(), 'queries.txt')
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write("# agencies\ndigital marketing Colombo\n\n  Digital  marketing colombo  \n"
+                "marketing agency Colombo   # second pass\nseo Colombo\n")
+    assert read_queries(path) == ['digital marketing Colombo', 'marketing agency Colombo', 'seo Colombo']
+    assert dedupe_keys({'place_id': 'x', 'website': 'https://www.Beta.lk/'}) == {'pid:x', 'web:beta.lk'}
+    assert dedupe_keys({'place_id': '', 'website': ''}) == set()
+    assert journal_path('./q_enriched_1.csv') == './q_enriched_1_maps.jsonl'
+
+
+def test_batch_dedupes_across_queries():
+    queries, opened = list(LISTINGS), []
+    path = os.path.join(tempfile.mkdtemp(), 'b_maps.jsonl')
+    for stream in (False, True):
+        opened.clear()
+        with MapsBatch(path + str(stream)) as batch:
+            got = [r['place_id'] for r in batch_rows(queries, batch, 10, pool=BrowserPool(),
+                                                     stream=stream, scrape=fake_scrape(opened))]
+        assert got == ['1', '2', '3', '5', '6', '7'], got      # 4 shares beta.lk with 3
+        assert opened == ['1', '2', '3', '4', '5', '6', '7']    # 3 and 1 were not opened twice
+        assert batch.duplicates == 1 and set(batch.finished) == set(queries)
+
+
+def test_interrupted_batch_resumes_without_reopening():
+    queries, opened = list(LISTINGS), []
+    path = os.path.join(tempfile.mkdtemp(), 'b_maps.jsonl')
+    got = []
+    with MapsBatch(path) as batch:
+        try:
+            for row in batch_rows(queries, batch, 10, pool=BrowserPool(), stream=False,
+                                  scrape=fake_scrape(opened, fail_after=4)):
+                got.append(row['place_id'])
+        except KeyboardInterrupt:
+            pass
+    assert got == ['1', '2', '3'] and opened == ['1', '2', '3', '4']
+
+    # rerun: journaled rows come back for enrichment; only '4', opened by the query that never returned, reopens
+    opened.clear()
+    with MapsBatch(path) as batch:
+        assert batch.pending(queries) == queries[1:] and batch.place_ids == {'1', '2', '3'}
+        again = [r['place_id'] for r in batch_rows(queries, batch, 10, pool=BrowserPool(), stream=False,
+                                                   scrape=fake_scrape(opened))]
+    assert again == ['1', '2', '3', '5', '6', '7']
+    assert opened == ['4', '5', '6', '7']
+    with MapsBatch(path) as batch:
+        assert batch.pending(queries) == [] and batch.duplicates == 1
+
+
+if __name__ == '__main__':
+    test_read_queries_and_keys()
+    test_batch_dedupes_across_queries()
+    test_interrupted_batch_resumes_without_reopening()
+    print('✅ maps batch OK')
@@ -0,0 +1,289 @@
+#!/usr/bin/env python3
+"""Tests for the Maps browser stage: place panels, network payloads (HAR fixture), lean profile, farm Maps, streaming."""
+
+import asyncio
+import json
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+from maps_browser import (
+    Traffic, lean_action, parse_place_panel, payload_documents, place_id_from_url, places_from_har,
+    places_from_payload, search_url,
+)
+from sitefarm import MAPS_FEED_PAGE, MAPS_HOST, FarmConfig, SiteFarm, maps_listing, render_place, run_in_thread
+
+HAR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures', 'maps_search.har')
+ROW_FIELDS = ('place_id', 'business_name', 'rating', 'reviews', 'category', 'address', 'whatsapp_number',
+              'website')
+
+
+def test_place_ids_and_urls():
+    href = ('https://www.google.com/maps/place/Blue+Pixel+Studio/data=!4m7!3m6!1s0x3ae259:0x9f1c2e!8m2'
+            '!3d6.9!4d79.8!16s%2Fg%2F11c?authuser=0&hl=en&rclk=1')
+    assert place_id_from_url(href) == '0x3ae259:0x9f1c2e'
+    assert place_id_from_url('https://www.google.com/maps/place/X/@6.9,79.8,17z/data=!3m1!4b1!1sChIJabc') \
+        == 'ChIJabc'
+    assert place_id_from_url('https://www.google.com/maps/place/X/@6.9,79.8,17z') == '@6.9,79.8,17z'
+    assert place_id_from_url('') == ''
+    assert search_url('digital marketing Colombo') == 'https://www.google.com/maps/search/digital+marketing+Colombo'
+
+
+def test_panel_parsing_matches_listing():
+    farm = SiteFarm(FarmConfig(sites=30))
+    for n in range(30):
+        spec, want = farm.spec(n), maps_listing(farm.spec(n))
+        row = parse_place_panel(render_place(spec), want['href'])
+        assert row == {k: want[k] for k in ROW_FIELDS}, n
+    panel = ('<div role="main"><h1></h1><div data-tooltip="Copy address" aria-label="1 Main St"></div>'
+             '<div data-tooltip="Copy phone number" aria-label="Phone: +94 11 234 5678 "></div>'
+             '<a href="https://www.google.com/maps/dir">x</a><a href="https://acme.lk/">acme</a></div>')
+    row = parse_place_panel(panel, 'https://www.google.com/maps/place/Acme', fallback_name='Acme')
+    assert (row['business_name'], row['address'], row['whatsapp_number'], row['website']) == \
+        ('Acme', '1 Main St', '+94 11 234 5678', 'https://acme.lk')
+    assert parse_place_panel('<div role="main"></div>', '') is None
+
+
+def test_har_fixture_decodes_listings():
+    rows = places_from_har(HAR)
+    assert [r['business_name'] for r in rows] == [
+        'Example Pixel Studio', 'Sample Growth Agency', 'Demo Creative Co',       # inline in the search page
+        'Test Media Works', 'Mock Signal Labs',                                   # feed XHR (repeat dropped)
+        'Placeholder Brand Group']                                                # base64 XHR
+    first, bare, redirect, parts = rows[0], rows[2], rows[3], rows[4]
+    assert first == {'place_id': '0x3ae2596b2c1a0b1d:0x1c4a0d3a2f9e7b01',
+                     'business_name': 'Example Pixel Studio', 'rating': '4.8', 'reviews': '132', 'category': 'Website designer',
+                     'address': '12 Example Road, Colombo 00300', 'whatsapp_number': '011 234 5678',
+                     'website': 'https://examplepixel.example'}
+    assert (bare['rating'], bare['reviews'], bare['whatsapp_number'], bare['website']) == ('', '', '', '')
+    assert redirect['website'] == 'https://testmedia.example'
+    assert parts['address'] == '7 Mock Street, Dehiwala'
+    assert payload_documents('<html>no state</html>') == payload_documents(")]}'\n[1,") == []
+    assert places_from_payload('{"c":0,"d":")]}\'\\n[[\\"q\\",[null]]]"}/*""*/') == []
+
+
+def test_lean_profile_rules():
+    g = 'https://www.google.com'
+    assert lean_action('image', g + '/maps/photo.jpg') == lean_action('font', g + '/f.woff2') == 'block'
+    assert lean_action('media', g + '/v') == 'block'
+    assert lean_action('fetch', g + '/maps/vt?pb=!1m5!1m4!1i13') == 'block'         # tiles, whatever the type
+    assert lean_action('other', 'https://khms1.googleapis.com/kh?v=979&x=1') == 'block'
+    assert lean_action('xhr', 'https://lh3.googleusercontent.com/p/AF1Q=w408') == 'block'
+    assert lean_action('script', g + '/maps/_/js/k=maps.m.en.abc/m=sc2') == 'cache'
+    assert lean_action('stylesheet', g + '/maps/_/ss/k=maps.m.abc.css') == 'cache'
+    assert lean_action('script', g + '/maps/_/js/x', 'POST') == 'pass'
+    assert lean_action('document', g + '/maps/search/x') == lean_action('xhr', g + '/search?tbm=map&q=x') == 'pass'
+
+    t = Traffic(bytes=2048 * 10, requests=30, blocked=40)
+    delta = t - Traffic(bytes=1024 * 10, requests=10)
+    assert (delta.bytes, delta.requests, delta.blocked, delta.from_disk) == (10240, 20, 40, 0)
+    assert '1 KB/business' in delta.summary(10) and '40 blocked' in delta.summary(10)
+    assert t.copy() is not t and t.copy().bytes == t.bytes
+
+
+def test_farm_maps_feed_pages_through_every_site():
+    import aiohttp
+
+    farm = SiteFarm(FarmConfig(sites=45, latency_ms=0))
+    _, stop = run_in_thread(farm)
+
+    href = maps_listing(farm.spec(7))['href']
+
+    async def go():
+        pages, start = [], 0
+        async with aiohttp.ClientSession() as session:
+            async with session.get(farm.maps_url + '/search/web+design', proxy=farm.proxy_url) as resp:
+                search = await resp.text()
+            while start is not None:
+                async with session.get(f'http://{MAPS_HOST}/search', params={'tbm': 'map', 'start': start},
+                                       proxy=farm.proxy_url) as resp:
+                    body = await resp.text()
+                pages.append(places_from_payload(body))
+                start = json.loads(json.loads(body[:-len('/*""*/')])['d'][len(")]}'\n"):])[1]
+            async with session.get(href, proxy=farm.proxy_url) as resp:
+                place = await resp.text()
+        return search, pages, place
+
+    try:
+        search, pages, place = asyncio.run(go())
+    finally:
+        stop()
+    assert 'role="feed"' in search and 'web design' in search
+    assert [len(p) for p in pages] == [MAPS_FEED_PAGE, MAPS_FEED_PAGE, 5]
+    listed = [p for page in pages for p in page]
+    assert listed == [{k: maps_listing(farm.spec(n))[k] for k in ROW_FIELDS} for n in range(45)]
+    assert parse_place_panel(place, href) == listed[7]
+
+
+def test_stream_overlaps_scrape_and_enrichment():
+    import time
+    import maps_enrich
+
+    def scrape(query, max_results, pool, mode, on_row, skip):
+        for n in range(max_results):
+            time.sleep(0.03)                         # one place panel
+            on_row({'place_id': str(n), 'business_name': f'{query} {n}'})
+        if query == 'broken':
+            raise RuntimeError('browser crashed')
+        return []
+
+    class Checkpoint:
+        rows = []
+        append = rows.append
+
+    def process_row(row):
+        time.sleep(0.03)                             # one website
+        return dict(row, email='x')
+
+    original, maps_enrich.process_row = maps_enrich.process_row, process_row
+    try:
+        t = time.perf_counter()
+        n = maps_enrich.enrich_rows(maps_enrich.stream_google_maps('q', 12, maxsize=2, scrape=scrape), Checkpoint,
+                                     engine='threads')
+        wall = time.perf_counter() - t
+    finally:
+        maps_enrich.process_row = original
+    assert n == 12 and sorted(int(r['place_id']) for r in Checkpoint.rows) == list(range(12))
+    assert all(r['email'] == 'x' for r in Checkpoint.rows)
+    assert wall < 0.6, wall                         # one after the other would take 12 * 0.06 = 0.72s
+
+    got, stream = [], maps_enrich.stream_google_maps('broken', 3, scrape=scrape)
+    try:
+        for row in stream:
+            got.append(row['place_id'])
+        raise AssertionError('scrape error swallowed')
+    except RuntimeError:
+        assert got == ['0', '1', '2']               # rows parsed before the failure still arrive
+
+
+def _handing_off_scrape(finished):
+    """A scrape_google_maps() stand-in that hands rows off the way the pool's pages do."""
+    import threading
+    from maps_browser import _hand_off
+
+    def scrape(query, max_results, pool, mode, on_row, skip):
+        async def feed():
+            failed = []
+            for n in range(max_results):
+                await _hand_off(on_row, {'place_id': str(n), 'website': ''}, failed)
+                if failed:
+                    raise failed[0]
+        done = threading.Event()
+        finished.append(done)
+        try:
+            asyncio.run(feed())
+        finally:
+            done.set()
+    return scrape
+
+
+def test_stream_cancels_the_scrape_when_the_consumer_stops():
+    from contextlib import closing
+    import maps_enrich
+
+    finished = []
+    scrape = _handing_off_scrape(finished)
+    try:
+        with closing(maps_enrich.stream_google_maps('q', 50, maxsize=2, scrape=scrape)) as stream:
+            for _ in stream:
+                raise ValueError('enrichment failed')
+    except ValueError:
+        pass
+    assert finished[0].wait(5)                      # the scrape stopped instead of blocking on a full queue
+
+    stream = maps_enrich.stream_google_maps('q', 50, maxsize=2, scrape=scrape)
+    next(stream)
+    stream.close()
+    assert finished[1].wait(5)
+
+
+def test_async_engine_cancels_the_stream_it_reads():
+    import tempfile
+    import maps_enrich
+    from robots import RobotsStore
+
+    class Checkpoint:
+        def append(self, row):
+            raise OSError('disk full')
+
+    async def process_row_async(row, *crawler):
+        return row
+
+    finished = []
+    saved = (maps_enrich.process_row_async, maps_enrich.robots_store, maps_enrich.shared_cache,
+             maps_enrich.PATH_STATS_FILE)
+    with tempfile.TemporaryDirectory() as d:
+        maps_enrich.process_row_async = process_row_async
+        maps_enrich.robots_store = lambda: RobotsStore(path=None)
+        maps_enrich.shared_cache = lambda: None
+        maps_enrich.PATH_STATS_FILE = os.path.join(d, 'stats.json')
+        try:
+            stream = maps_enrich.stream_google_maps('q', 50, maxsize=2, scrape=_handing_off_scrape(finished))
+            maps_enrich.enrich_rows(stream, Checkpoint(), engine='async')
+            raise AssertionError('checkpoint error swallowed')
+        except OSError:
+            pass                                    # the real error, not "generator already executing"
+        finally:
+            (maps_enrich.process_row_async, maps_enrich.robots_store, maps_enrich.shared_cache,
+             maps_enrich.PATH_STATS_FILE) = saved
+    assert finished[0].wait(5)
+    stream.close()                                  # what main()'s closing() does afterwards: a no-op now
+
+
+def test_failed_query_leaves_no_pending_places_behind():
+    from contextlib import asynccontextmanager
+    from maps_browser import BrowserPool
+
+    class NoBrowser(BrowserPool):
+        async def _start(self):
+            if self._query is None:
+                self._query = asyncio.Lock()
+
+        @asynccontextmanager
+        async def page(self):
+            yield None
+
+        async def _scroll_feed(self, page, query, step):
+            await step([(f'https://maps.test/place/{query}-{n}', f'{query} {n}') for n in range(6)])
+            if query == 'broken':
+                raise RuntimeError('feed gone')         # with places still queued
+
+        async def _open_place(self, href, label):
+            await asyncio.sleep(0.01)
+            return {'place_id': href, 'business_name': label, 'rating': '', 'website': ''}
+
+    pool = NoBrowser(base_url='http://maps.test')
+    try:
+        try:
+            pool.scrape('broken', max_results=10)
+            raise AssertionError('feed error swallowed')
+        except RuntimeError:
+            pass
+        assert len(pool.scrape('ok', max_results=5)) == 5
+    finally:
+        pool.close()
+
+
+def test_classic_mode_bypasses_the_pool():
+    import maps_browser
+    calls, saved = [], maps_browser.scrape_classic
+    maps_browser.scrape_classic = lambda *a: calls.append(a) or ([{'place_id': 'p1'}], 2)
+    try:
+        pool = maps_browser.BrowserPool(base_url='http://maps.test')
+        assert pool.scrape('cafes', max_results=5, mode='classic', skip=['p0']) == [{'place_id': 'p1'}]
+        assert calls[0][:4] == ('cafes', 5, None, frozenset(['p0'])) and calls[0][4] == 'http://maps.test'
+        assert pool.last_skipped == 2 and pool.last_traffic.bytes == 0
+        assert pool._loop is None                       # no Chromium, no event-loop thread
+    finally:
+        maps_browser.scrape_classic = saved
+
+
+if __name__ == '__main__':
+    test_place_ids_and_urls()
+    test_panel_parsing_matches_listing()
+    test_har_fixture_decodes_listings()
+    test_lean_profile_rules()
+    test_farm_maps_feed_pages_through_every_site()
+    test_stream_overlaps_scrape_and_enrichment()
+    test_classic_mode_bypasses_the_pool()
+    print('✅ maps browser OK')
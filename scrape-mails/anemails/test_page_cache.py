@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""Tests for the on-disk page cache: storage, eviction, conditional revalidation, enrich integration."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(__file__))
+
+from page_cache import PageCache, cache_key, cached_get
+from telemetry import SiteTelemetry
+
+
+def test_cache_key_normalises_urls():
+    assert cache_key('HTTP://Acme.LK:80/contact/#team') == 'http://acme.lk/contact'
+    assert cache_key('https://acme.lk') == cache_key('https://acme.lk/')
+    assert cache_key('https://acme.lk/?b=2&a=1') == 'https://acme.lk/?a=1&b=2'
+    assert cache_key('http://acme.lk:8080/') != cache_key('http://acme.lk/')
+
+
+def test_put_get_dedupe_evict_and_reload():
+    root = tempfile.mkdtemp()
+    t0   = time.time() - 3000                               # load() ages entries by the wall clock
+    cache = PageCache(root, ttl=60, max_bytes=10_000)
+    body = b'<html>' + os.urandom(3000) + b'</html>'       # incompressible, ~3 KB on disk
+    assert cache.put('http://a.lk/', 200, {'Content-Type': 'text/html', 'ETag': '"v1"'}, body, now=t0 + 100)
+    assert cache.put('http://a.lk/home', 200, {}, body, now=t0 + 100)
+    assert len(cache._sizes) == 1                           # same body, one object
+    assert not cache.put('http://a.lk/x', 500, {}, b'oops')
+    assert not cache.put('http://a.lk/y', 200, {'Cache-Control': 'no-store'}, b'secret')
+    assert cache.put('http://a.lk/missing', 404, {}, b'')
+
+    page = cache.get('http://a.lk', now=t0 + 120)
+    assert page.fresh and page.body == body and page.headers['etag'] == '"v1"'
+    stale = cache.get('http://a.lk/', now=t0 + 1000)
+    assert not stale.fresh and cache.validators(stale) == {'If-None-Match': '"v1"'}
+    cache.refresh('http://a.lk/', {'ETag': '"v2"'}, now=t0 + 1000)
+    assert cache.get('http://a.lk/', now=t0 + 1010).fresh
+
+    # replacing a URL's body must not delete the object still used by /home
+    cache.put('http://a.lk/', 200, {}, b'new home', now=t0 + 1020)
+    assert cache.get('http://a.lk/home', now=t0 + 1030).body == body
+
+    for i in range(5):                                      # 5 × ~3 KB > 10 KB budget
+        cache.put(f'http://b.lk/{i}', 200, {}, os.urandom(3000), now=t0 + 2000 + i)
+    assert cache.evicted and cache._total <= 10_000
+    assert cache.get('http://b.lk/4', now=t0 + 2010) is not None   # most recent survives
+    assert cache.get('http://a.lk/home', now=t0 + 2010) is None     # least recent went first
+
+    cache.save()
+    again = PageCache.load(root, ttl=86400, max_bytes=10_000)
+    assert set(again._entries) == set(cache._entries) and again._total == cache._total
+    pruned = PageCache.load(root, ttl=60)                   # stale without a validator: dropped
+    assert list(pruned._entries) == ['http://a.lk/missing'] # (stored just now, still fresh)
+    stored = sum(len(files) for _, _, files in os.walk(os.path.join(root, 'objects')))
+    assert stored == len(again._sizes)
+
+
+class _EtagHandler(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        etag = '"page-1"'
+        self.hits.append((self.path, self.headers.get('If-None-Match')))
+        if self.headers.get('If-None-Match') == etag:
+            self.send_response(304)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+        body = 'Café <b>hello</b>'.encode('latin-1')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=iso-8859-1')
+        self.send_header('ETag', etag)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cached_get_revalidates_with_etag():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _EtagHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url   = f'http://127.0.0.1:{server.server_address[1]}/contact'
+    cache = PageCache(tempfile.mkdtemp(), ttl=0.2)
+    waits = []
+    try:
+        first  = cached_get(url, cache, before_request=lambda: waits.append(1), timeout=5)
+        second = cached_get(url, cache, before_request=lambda: waits.append(1), timeout=5)
+        time.sleep(0.3)
+        third  = cached_get(url, cache, before_request=lambda: waits.append(1), timeout=5)
+    finally:
+        server.shutdown()
+    assert not first.from_cache and second.from_cache and third.from_cache
+    assert first.text == second.text == third.text == 'Café <b>hello</b>'
+    assert len(waits) == 2                                  # the fresh hit skipped the rate limiter
+    assert _EtagHandler.hits == [('/contact', None), ('/contact', '"page-1"')]
+    assert cache.hits == 1 and cache.revalidated == 1
+
+
+class _RedirectHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path == '/contact-us':
+            self.send_response(301)
+            self.send_header('Location', '/contact')
+            self.end_headers()
+            return
+        body = b'<p>hello</p>'
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_cached_get_keeps_the_redirect_target():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _RedirectHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base  = f'http://127.0.0.1:{server.server_address[1]}'
+    cache = PageCache(tempfile.mkdtemp())
+    try:
+        first  = cached_get(base + '/contact-us', cache, timeout=5)
+        second = cached_get(base + '/contact-us', cache, timeout=5)
+        plain  = cached_get(base + '/about', cache, timeout=5)
+    finally:
+        server.shutdown()
+    assert second.from_cache and first.url == second.url == base + '/contact'
+    assert cached_get(base + '/about', cache).url == plain.url == base + '/about'
+    assert 'f' not in cache._entries[cache_key(base + '/about')]     # stored only when redirected
+
+
+def test_fetch_and_parse_revalidates_a_cached_404():
+    from aiohttp import ClientSession, web
+    import enrich
+
+    seen = []
+
+    async def go():
+        async def handler(req):
+            seen.append((req.path, req.headers.get('If-None-Match')))
+            if req.path == '/robots.txt':
+                return web.Response(text='User-agent: *\n')
+            if req.headers.get('If-None-Match') == '"gone-1"':
+                return web.Response(status=304, headers={'ETag': '"gone-1"'})
+            return web.Response(status=404, headers={'ETag': '"gone-1"'})
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port  = site._server.sockets[0].getsockname()[1]
+        url   = f'http://127.0.0.1:{port}/team'
+        cache = PageCache(tempfile.mkdtemp())
+        cache.put(url, 404, {'ETag': '"gone-1"'}, b'', now=time.time() - 2 * cache.ttl)
+
+        saved = enrich.MAX_RETRIES
+        enrich.MAX_RETRIES = 2
+        try:
+            async with ClientSession() as session:
+                tel  = SiteTelemetry('127.0.0.1')
+                page = await enrich.fetch_and_parse(session, url, '127.0.0.1', enrich.AsyncRobots(),
+                                                    enrich.DomainLimiter(0), asyncio.get_running_loop(),
+                                                    tel=tel, cache=cache)
+        finally:
+            enrich.MAX_RETRIES = saved
+            await runner.cleanup()
+        return page, tel, cache.get(url)
+
+    page, tel, cached = asyncio.run(go())
+    assert page is None and tel.requests == 1                      # no retries after the 304
+    assert [h for h in seen if h[0] == '/team'] == [('/team', '"gone-1"')]
+    assert cached.status == 404 and cached.fresh
+
+
+def test_scrape_site_second_run_is_served_from_cache():
+    from aiohttp import ClientSession, web
+    import enrich
+
+    pages = {
+        '/':        '<a href="/contact">Contact us</a>',
+        '/contact': '<p>Call +94 11 234 5678</p>',
+    }
+    seen = []
+
+    async def go():
+        async def handler(req):
+            seen.append(req.path)
+            if req.path == '/robots.txt':
+                return web.Response(text='User-agent: *\n')
+            if req.path in pages:
+                return web.Response(text=pages[req.path], content_type='text/html')
+            return web.Response(status=404)
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port  = site._server.sockets[0].getsockname()[1]
+        cache = PageCache(tempfile.mkdtemp())
+
+        saved = enrich.USE_SITEMAPS, enrich.MAX_RETRIES
+        enrich.USE_SITEMAPS, enrich.MAX_RETRIES = False, 0
+        runs = []
+        try:
+            async with ClientSession() as session:
+                robots = enrich.AsyncRobots()
+                for _ in range(2):
+                    tel  = SiteTelemetry('127.0.0.1')
+                    data = await enrich.scrape_site(
+                        session, f'http://127.0.0.1:{port}', robots, enrich.DomainLimiter(0),
+                        asyncio.get_running_loop(), stats=enrich.PathStats(os.devnull), tel=tel, cache=cache)
+                    runs.append((data, tel.finish(), len(seen)))
+        finally:
+            enrich.USE_SITEMAPS, enrich.MAX_RETRIES = saved
+            await runner.cleanup()
+        return runs
+
+    (cold, cold_tel, cold_seen), (warm, warm_tel, warm_seen) = asyncio.run(go())
+    assert cold['phones'] == warm['phones'] == {'+94 11 234 5678'}
+    assert warm_seen == cold_seen                           # no request reached the server
+    assert warm_tel['requests'] == 0 and warm_tel['statuses']['cache'] == cold_tel['requests']
+    assert warm_tel['pages_parsed'] == cold_tel['pages_parsed']
+
+
+if __name__ == '__main__':
+    test_cache_key_normalises_urls()
+    test_put_get_dedupe_evict_and_reload()
+    test_cached_get_revalidates_with_etag()
+    test_cached_get_keeps_the_redirect_target()
+    test_fetch_and_parse_revalidates_a_cached_404()
+    test_scrape_site_second_run_is_served_from_cache()
+    print('✅ page cache OK')
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Parity tests: streaming (lxml SAX) parse_page engine vs. the BeautifulSoup reference."""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+from enrich import parse_page, parse_page_soup, parse_page_stream
+
+PAGE_URL = 'https://acme.lk/contact'
+SITE_DOM = 'acme.lk'
+
+FIXTURES = {
+    'basic': """<!DOCTYPE html><html><head><title>Acme | Contact</title>
+        <script>var x = "hidden@acme.lk";</script><style>.a{}</style></head>
+        <body><h1>Contact Acme</h1><p>Email us at sales@acme.lk or call +94 11 234 5678.</p>
+        <a href="mailto:Info@Acme.lk?subject=Hi">Mail</a>
+        <a href="tel:+94112345679">Call</a>
+        <a href="https://www.instagram.com/acme_lk/">IG</a>
+        <a href="https://twitter.com/acmelk">Tw</a>
+        <a href="https://www.linkedin.com/company/acme-holdings/">LI</a>
+        <a href="https://linkedin.com/in/jane-perera">Jane Perera, CEO</a>
+        <a href="https://linkedin.com/in/ravi-silva"><span>Ravi</span> <b>Co-Founder</b></a>
+        <a href="https://facebook.com/acmelk">FB</a>
+        <a href="https://youtube.com/@acmelk">YT</a>
+        </body></html>""",
+
+    'noise_sections': """<html><body>
+        <header><a href="mailto:head@acme.lk">h</a> header@acme.lk</header>
+        <nav>menu@acme.lk <a href="/about">About</a></nav>
+        <main>Our team of 40 employees. Reach hello@acme.lk</main>
+        <footer>© Acme <a href="https://x.com/acme">X</a> foot@acme.lk 0771234567</footer>
+        <noscript>nojs@acme.lk</noscript><iframe src="/m">frame@acme.lk</iframe>
+        <svg><text>svg@acme.lk</text></svg>
+        </body></html>""",
+
+    'malformed_nesting': """<div><p>Unclosed <b>bold <i>italic</b> text info@acme.lk
+        <a href="https://www.linkedin.com/in/kamal-fernando">Kamal <a href="/x">nested</a> Founder</a>
+        <table><tr><td>+94 77 123 4567<td>second cell</table>
+        <p>after table <a href=" tel:0112345678 ">tel with spaces</a>""",
+
+    'entities_and_whitespace': """<p>Write&nbsp;to&#32;support&#64;acme.lk&nbsp;</p>
+        <p>   </p><p>
+        spread
+        across
+        lines </p><!-- comment@acme.lk --><p>after comment</p>
+        <a href="">empty href</a><a>no href</a><a href="#top">top</a>""",
+
+    'offsite_and_spam': """<p>Contact john@gmail.com or test@example.com or ceo@sub.acme.lk</p>
+        <a href="mailto:noreply@acme.lk">nr</a><a href="mailto:bad-address">bad</a>
+        <a href="https://www.instagram.com/p/">skip</a><a href="https://facebook.com/pages">skip</a>
+        <a href="https://www.linkedin.com/company/12345">numeric</a>""",
+
+    'no_body': "just some text 011 234 5678 with mail@acme.lk and no tags",
+
+    'script_in_anchor': """<a href="https://linkedin.com/in/nimal-raj"><script>ceo</script>Nimal</a>
+        <a href="https://linkedin.com/in/sunil-raj">Sunil <style>x</style>chief executive</a>""",
+}
+
+
+def _comparable(out):
+    out = dict(out)
+    out['emails'] = sorted(out['emails'])
+    out['phones'] = sorted(out['phones'])
+    return out
+
+
+def _assert_parity(html, page_url=PAGE_URL, site_dom=SITE_DOM):
+    ref  = _comparable(parse_page_soup(html, page_url, site_dom))
+    fast = _comparable(parse_page_stream(html, page_url, site_dom))
+    for key in ref:
+        assert fast[key] == ref[key], f"{key}: stream={fast[key]!r} soup={ref[key]!r}"
+
+
+def test_fixture_parity():
+    for name, html in FIXTURES.items():
+        try:
+            _assert_parity(html)
+        except AssertionError as e:
+            raise AssertionError(f"[{name}] {e}") from None
+
+
+def test_same_dict_shape():
+    ref  = parse_page_soup(FIXTURES['basic'], PAGE_URL, SITE_DOM)
+    fast = parse_page_stream(FIXTURES['basic'], PAGE_URL, SITE_DOM)
+    assert set(fast) == set(ref)
+    assert fast['is_contact'] is True
+    assert 'info@acme.lk' in fast['emails'] and 'hidden@acme.lk' not in fast['emails']
+    assert fast['linkedin_ceo'] == 'https://www.linkedin.com/in/jane-perera/'
+    assert fast['linkedin_founder'] == 'https://www.linkedin.com/in/ravi-silva/'
+
+
+def test_random_markup_parity():
+    rng = random.Random(1234)
+    tags = ['div', 'p', 'span', 'b', 'a', 'nav', 'footer', 'script', 'li', 'ul', 'td', 'header']
+    snippets = ['hello', 'info@acme.lk', '+94 11 222 3333', 'CEO', 'founder', '&amp;', '  ', '\n',
+                'sales@acme.lk', '0771234567', 'global leader', 'x@other.com']
+    hrefs = ['mailto:team@acme.lk', 'tel:+94 11 765 4321', 'https://linkedin.com/in/some-one',
+             'https://instagram.com/acme.studio', '/contact', 'https://youtube.com/channel/UC123']
+    for _ in range(200):
+        parts = []
+        for _ in range(rng.randint(5, 40)):
+            r = rng.random()
+            tag = rng.choice(tags)
+            if r < 0.35:
+                attrs = f' href="{rng.choice(hrefs)}"' if tag == 'a' else ''
+                parts.append(f'<{tag}{attrs}>')
+            elif r < 0.6:
+                parts.append(f'</{tag}>')
+            else:
+                parts.append(rng.choice(snippets))
+        _assert_parity(''.join(parts))
+
+
+def test_falls_back_to_soup_on_nul_bytes():
+    html = "<p>info@acme.lk\x00 and sales@acme.lk</p>"
+    out = parse_page(html, PAGE_URL, SITE_DOM, engine='stream')
+    assert out['emails'] == parse_page_soup(html, PAGE_URL, SITE_DOM)['emails']
+
+
+if __name__ == '__main__':
+    test_fixture_parity()
+    test_same_dict_shape()
+    test_random_markup_parity()
+    test_falls_back_to_soup_on_nul_bytes()
+    print('✅ parse_page parity OK')
@@ -0,0 +1,126 @@
+#!/usr/bin/env python3
+"""Tests for the bounded streaming pipeline (lazy input, worker pool, reorder buffer)."""
+
+import asyncio
+import csv
+import os
+import random
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from pipeline import ReorderBuffer, count_csv_rows, csv_header, iter_csv_rows, stream_map
+
+
+def test_reorder_buffer_releases_contiguous_runs():
+    rb = ReorderBuffer()
+    assert rb.push(2, 'c') == []
+    assert rb.push(1, 'b') == []
+    assert len(rb) == 2
+    assert rb.push(0, 'a') == ['a', 'b', 'c']
+    assert rb.push(3, 'd') == ['d']
+    assert len(rb) == 0
+
+
+def _collect(items, fn, **kw):
+    async def go():
+        return [x async for x in stream_map(items, fn, **kw)]
+    return asyncio.run(go())
+
+
+def test_ordered_output_and_bounded_read_ahead():
+    rng       = random.Random(7)
+    delays    = [rng.random() * 0.01 for _ in range(200)]
+    consumed  = [0]
+    in_flight = [0]
+    peak      = [0]
+
+    def items():
+        for i in range(200):
+            consumed[0] += 1
+            yield i
+
+    async def fn(i):
+        in_flight[0] += 1
+        peak[0] = max(peak[0], in_flight[0])
+        await asyncio.sleep(delays[i])
+        in_flight[0] -= 1
+        return i * i
+
+    async def go():
+        out = []
+        async for item, result, err in stream_map(items(), fn, workers=8, ordered=True, window=16):
+            assert err is None and result == item * item
+            # never read more than `window` rows past what has been emitted
+            assert consumed[0] - len(out) <= 16 + 1
+            out.append(item)
+        return out
+
+    assert asyncio.run(go()) == list(range(200))
+    assert peak[0] <= 8
+
+
+def test_unordered_yields_everything_and_reports_errors():
+    async def fn(i):
+        await asyncio.sleep(0.001 * (i % 3))
+        if i == 5:
+            raise ValueError('boom')
+        return i
+
+    out = _collect(range(20), fn, workers=4)
+    assert sorted(item for item, _, _ in out) == list(range(20))
+    errors = [(item, err) for item, _, err in out if err is not None]
+    assert len(errors) == 1 and errors[0][0] == 5 and isinstance(errors[0][1], ValueError)
+
+
+def test_input_errors_propagate():
+    def items():
+        yield 1
+        raise OSError('disk gone')
+
+    async def fn(i):
+        return i
+
+    try:
+        _collect(items(), fn, workers=2)
+    except OSError as e:
+        assert 'disk gone' in str(e)
+    else:
+        raise AssertionError('input error was swallowed')
+
+
+def test_async_iterable_input():
+    async def items():
+        for i in range(10):
+            await asyncio.sleep(0)
+            yield i
+
+    async def fn(i):
+        return i * i
+
+    out = _collect(items(), fn, workers=3, ordered=True)
+    assert [(item, result) for item, result, _ in out] == [(i, i * i) for i in range(10)]
+
+
+def test_csv_helpers_stream_and_skip():
+    path = os.path.join(tempfile.mkdtemp(), 'leads.csv')
+    with open(path, 'w', newline='', encoding='utf-8-sig') as f:
+        w = csv.DictWriter(f, fieldnames=['place_id', 'website'])
+        w.writeheader()
+        for i in range(5):
+            w.writerow({'place_id': f'p{i}', 'website': f'https://s{i}.lk'})
+
+    skip = lambda r: r['place_id'] in ('p1', 'p3')
+    assert csv_header(path) == ['place_id', 'website']
+    assert count_csv_rows(path, skip) == (3, 2)
+    assert [r['place_id'] for r in iter_csv_rows(path, skip)] == ['p0', 'p2', 'p4']
+
+
+if __name__ == '__main__':
+    test_reorder_buffer_releases_contiguous_runs()
+    test_ordered_output_and_bounded_read_ahead()
+    test_unordered_yields_everything_and_reports_errors()
+    test_input_errors_propagate()
+    test_async_iterable_input()
+    test_csv_helpers_stream_and_skip()
+    print('✅ pipeline OK')
@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Tests for the postings index: added/changed/removed postings, unchanged boards, keyword changes, run output."""
+
+import csv
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from checkpoint import JsonlCheckpoint
+from job_scraper import diff_against_index
+from postings_index import BOARD_UNCHANGED, PostingsIndex, posting_key
+
+
+def posting(job_id, title, location='Colombo', board='b1'):
+    return {'business_name': 'Acme', 'company_website': 'https://acme.lk', 'ats_platform': 'greenhouse',
+            'job_id': job_id, 'job_title': title, 'job_url': f'https://boards.greenhouse.io/acme/jobs/{job_id}',
+            'location': location, 'status': 'match_found', 'board_hash': board}
+
+
+def status(text, board=''):
+    return {'business_name': 'Acme', 'company_website': 'https://acme.lk', 'status': text, 'board_hash': board}
+
+
+def test_keys():
+    assert posting_key({'job_id': '7', 'job_url': 'https://x/1'}) == 'id:7'
+    assert posting_key({'job_url': 'https://acme.lk/careers/eng/#apply'}) == 'url:https://acme.lk/careers/eng'
+    assert posting_key({'job_title': '  Data   Engineer '}) == 'title:data engineer'
+
+
+def test_runs_report_only_changes():
+    path = os.path.join(tempfile.mkdtemp(), 'postings_index.json')
+    index = PostingsIndex.load(path, signature='k1')
+    run1 = index.diff('web:acme.lk', [posting('1', 'Data Engineer'), posting('2', 'ERP Analyst')], 'day1')
+    assert [(c['job_id'], c['change']) for c in run1] == [('1', 'added'), ('2', 'added')]
+    assert 'board_hash' not in run1[0]
+    index.save()
+
+    index = PostingsIndex.load(path, signature='k1')
+    assert index.board_hash('web:acme.lk') == 'b1'
+    assert index.diff('web:acme.lk', [status(BOARD_UNCHANGED)], 'day2') == []     # not parsed, nothing lost
+    rows = [posting('1', 'Data Engineer', 'Remote', 'b2'), posting('3', 'DevOps Engineer', board='b2')]
+    run3 = index.diff('web:acme.lk', rows, 'day3')
+    assert sorted((c['job_id'], c['change'], c['first_seen'], c['last_seen']) for c in run3) == [
+        ('1', 'changed', 'day1', 'day3'), ('2', 'removed', 'day1', 'day2'), ('3', 'added', 'day3', 'day3')]
+    assert index.diff('web:acme.lk', rows, 'day4') == []
+
+    # a failed fetch says nothing about which postings are still open
+    assert index.diff('web:acme.lk', [status('greenhouse_detected_no_jobs_returned')], 'day5') == []
+    assert {p['job_id'] for p in index.postings('web:acme.lk')} == {'1', '3'}
+    gone = index.diff('web:acme.lk', [status('4_jobs_found_none_matched_role_keywords', 'b3')], 'day6')
+    assert sorted(c['change'] for c in gone) == ['removed', 'removed'] and index.postings('web:acme.lk') == []
+    index.save()
+
+    # other role keywords can match other postings in the same payload: board hashes are forgotten
+    assert PostingsIndex.load(path, signature='k2').board_hash('web:acme.lk') == ''
+    assert PostingsIndex.load(path, signature='k1').board_hash('web:acme.lk') == 'b3'
+
+
+def test_run_output_from_checkpoint():
+    root = tempfile.mkdtemp()
+    cp = os.path.join(root, 'companies_jobs_1_checkpoint.jsonl')
+    with JsonlCheckpoint(cp) as checkpoint:
+        checkpoint.extend([posting('1', 'Data Engineer', board='b2'), posting('4', 'Cloud Engineer', board='b2')])
+        checkpoint.append({'business_name': 'Globex', 'company_website': 'https://globex.lk',
+                           'status': 'careers_page_not_found'})
+        checkpoint.extend([dict(posting('7', 'Data Analyst'), business_name='Initech',
+                                company_website='https://initech.lk')])
+
+    def run(full):
+        index = PostingsIndex.load(os.path.join(root, f'postings_index_{full}.json'))
+        index.diff('web:acme.lk', [posting('1', 'Data Engineer'), posting('2', 'ERP Analyst')], 'day1')
+        seen, out = [], os.path.join(root, f'companies_jobs_{full}.csv')
+        counts = diff_against_index(cp, index, out, full=full, on_row=seen.append)
+        assert len(seen) == 4
+        with open(out, newline='', encoding='utf-8') as f:
+            return counts, [(r['job_url'].rsplit('/', 1)[-1], r['change']) for r in csv.DictReader(f)]
+
+    counts, rows = run(full=False)
+    assert counts == {'added': 2, 'removed': 1}
+    assert rows == [('4', 'added'), ('7', 'added'), ('2', 'removed')]         # removals go last
+    assert run(full=True)[1] == [('1', ''), ('4', 'added'), ('', ''), ('7', 'added'), ('2', 'removed')]
+
+if __name__ == '__main__':
+    test_keys()
+    test_runs_report_only_changes()
+    test_run_output_from_checkpoint()
+    print('✅ postings index OK')
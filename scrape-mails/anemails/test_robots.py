@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""Tests for the shared robots.txt store: TTLs, crawl-delay, single-flight fetching, persistence."""
+
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+sys.path.insert(0, os.path.dirname(__file__))
+
+from robots import (
+    MAX_CRAWL_DELAY, ROBOTS_DEFAULT_TTL, ROBOTS_ERROR_TTL, ROBOTS_MAX_TTL, ROBOTS_MIN_TTL,
+    AsyncRobots, RobotsRules, RobotsStore, robots_ttl,
+)
+
+ROBOTS_TXT = """User-agent: *
+Disallow: /private
+Crawl-delay: 2
+Sitemap: http://127.0.0.1/sitemap.xml
+"""
+
+
+def test_ttl_from_headers():
+    assert robots_ttl(200, {}) == ROBOTS_DEFAULT_TTL
+    assert robots_ttl(200, {'Cache-Control': 'public, max-age=7200'}) == 7200
+    assert robots_ttl(200, {'Cache-Control': 'max-age=5'}) == ROBOTS_MIN_TTL
+    assert robots_ttl(200, {'cache-control': 'max-age=99999999'}) == ROBOTS_MAX_TTL
+    assert robots_ttl(200, {'Date': 'Sun, 18 Oct 2026 10:00:00 GMT',
+                            'Expires': 'Sun, 18 Oct 2026 14:00:00 GMT'}) == 4 * 3600
+    assert robots_ttl(200, {'Expires': '0'}) == ROBOTS_DEFAULT_TTL
+    assert robots_ttl(404, {'Cache-Control': 'max-age=7200'}) == 7200
+    assert robots_ttl(503, {'Cache-Control': 'max-age=7200'}) == ROBOTS_ERROR_TTL
+    assert robots_ttl(0, None) == ROBOTS_ERROR_TTL
+
+
+def test_rules():
+    rules = RobotsRules(ROBOTS_TXT, time.time() + 60)
+    assert rules.allowed('http://a.lk/contact') and not rules.allowed('http://a.lk/private/x')
+    assert rules.crawl_delay() == 2.0
+    assert rules.sitemaps() == ['http://127.0.0.1/sitemap.xml']
+    assert RobotsRules('User-agent: *\nRequest-rate: 1/10\n', 0).crawl_delay() == 10.0
+    assert RobotsRules('User-agent: *\nCrawl-delay: 3600\n', 0).crawl_delay() == MAX_CRAWL_DELAY
+    nothing = RobotsRules(None, 0)
+    assert nothing.allowed('http://a.lk/private') and nothing.crawl_delay() == 0 and nothing.sitemaps() == []
+
+    store = RobotsStore(path=None)
+    assert store.record('http://a.lk', 404, 'Disallow: /').allowed('http://a.lk/x')   # 4xx = no rules
+    assert store.record('http://b.lk', 0, None).expires <= time.time() + ROBOTS_ERROR_TTL
+
+
+class _SlowRobots(BaseHTTPRequestHandler):
+    hits = []
+
+    def do_GET(self):
+        self.hits.append(self.path)
+        time.sleep(0.2)                           # long enough for every worker to arrive first
+        body = ROBOTS_TXT.encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain')
+        self.send_header('Cache-Control', 'max-age=7200')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_threads_share_one_fetch_and_store_persists():
+    server = ThreadingHTTPServer(('127.0.0.1', 0), _SlowRobots)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base  = f'http://127.0.0.1:{server.server_address[1]}'
+    path  = os.path.join(tempfile.mkdtemp(), 'robots_cache.json')
+    store = RobotsStore.load(path)
+    urls  = [f'{base}/page{i}' for i in range(15)] + [f'{base}/private/{i}' for i in range(5)]
+    try:
+        with ThreadPoolExecutor(max_workers=20) as ex:
+            allowed = list(ex.map(store.allowed, urls))
+    finally:
+        server.shutdown()
+    assert allowed == [True] * 15 + [False] * 5
+    assert _SlowRobots.hits == ['/robots.txt'] and store.fetches == 1
+    assert store.crawl_delay(base + '/') == 2.0
+
+    store.save()
+    again = RobotsStore.load(path)               # the server is gone: answers come from disk
+    assert not again.allowed(base + '/private/1') and again.sitemaps(base) == ['http://127.0.0.1/sitemap.xml']
+    assert again.fetches == 0
+    rules = again.lookup(f'{base}')
+    assert 7000 < rules.expires - time.time() <= 7200
+
+
+def test_async_single_flight_and_crawl_delay_floor():
+    from aiohttp import ClientSession, web
+    import enrich
+
+    fetches = []
+
+    async def go():
+        async def handler(req):
+            fetches.append(req.path)
+            await asyncio.sleep(0.1)
+            return web.Response(text='User-agent: *\nDisallow: /private\nCrawl-delay: 1\n')
+
+        app = web.Application()
+        app.router.add_get('/robots.txt', handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        base = f"http://127.0.0.1:{site._server.sockets[0].getsockname()[1]}"
+        try:
+            async with ClientSession() as session:
+                robots  = AsyncRobots()
+                answers = await asyncio.gather(*(robots.allowed(session, f'{base}/{p}')
+                                                 for p in ['a', 'b', 'private/x'] * 10))
+        finally:
+            await runner.cleanup()
+
+        limiter = enrich.DomainLimiter(0)
+        limiter.respect('127.0.0.1', robots.crawl_delay(base + '/'))
+        t0 = time.monotonic()
+        await limiter.wait('127.0.0.1')
+        await limiter.wait('127.0.0.1')
+        return answers, time.monotonic() - t0
+
+    answers, waited = asyncio.run(go())
+    assert answers == [True, True, False] * 10
+    assert fetches == ['/robots.txt']
+    assert waited >= 0.95                         # Crawl-delay: 1 overrides the 0s default
+
+
+if __name__ == '__main__':
+    test_ttl_from_headers()
+    test_rules()
+    test_threads_share_one_fetch_and_store_persists()
+    test_async_single_flight_and_crawl_delay_floor()
+    print('✅ robots OK')
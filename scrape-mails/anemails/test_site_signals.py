@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""Parity tests: incremental SiteSignals vs. the whole-site detector functions."""
+
+import os
+import random
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+from enrich import SiteSignals, detect_tech_stack, estimate_company_size, has_decision_maker
+
+
+def _whole_site(pages):
+    text = ' '.join(t for t, _ in pages)
+    html = ' '.join(h for _, h in pages)
+    return detect_tech_stack(html), estimate_company_size(text), has_decision_maker(text)
+
+
+def _incremental(pages):
+    s = SiteSignals()
+    for text, html in pages:
+        s.feed(text, html)
+    return s.tech_stack, s.company_size, s.decision_maker
+
+
+def test_examples():
+    pages = [
+        ('we are a team of 120 employees', '<link href="/wp-content/x.css">'),
+        ('a growing agency', '<script src="https://cdn.shopify.com/s.js">'),
+        ('meet our founder', ''),
+    ]
+    assert _incremental(pages) == (['shopify', 'wordpress'], 'medium', True)
+    assert _incremental([('about 30 staff', ''), ('500 employees', '')])[1] == 'small'
+    assert _incremental([('boutique studio', ''), ('global reach', '')])[1] == 'small'
+    assert _incremental([]) == ([], 'unknown', False)
+
+
+def test_random_parity():
+    rng = random.Random(99)
+    words = ['startup', 'global', 'growing', 'ceo', 'owner', 'hello', 'services', 'team',
+             '12 employees', '300 staff', '75 team members', 'enterprise', 'lorem', 'ipsum']
+    markup = ['wp-content', 'react-dom', '_next/', 'nuxt', 'wix.com', 'ng-version', '<div>', 'x']
+    for _ in range(300):
+        pages = [(' '.join(rng.choice(words) for _ in range(rng.randint(0, 6))),
+                  ' '.join(rng.choice(markup) for _ in range(rng.randint(0, 4))))
+                 for _ in range(rng.randint(0, 6))]
+        assert _incremental(pages) == _whole_site(pages), pages
+
+
+if __name__ == '__main__':
+    test_examples()
+    test_random_parity()
+    print('✅ site signals parity OK')
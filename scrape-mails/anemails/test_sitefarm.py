@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""Tests for the synthetic site farm and the end-to-end crawl benchmark plumbing."""
+
+import asyncio
+import csv
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sitefarm import FarmConfig, SiteFarm, make_spec, render_page, run_in_thread, site_host, site_number
+
+
+def test_specs_are_deterministic():
+    cfg = FarmConfig(sites=50, seed=3)
+    a, b = make_spec(cfg, 17), make_spec(cfg, 17)
+    assert (a.name, a.email, a.pages, a.contact_style) == (b.name, b.email, b.pages, b.contact_style)
+    assert render_page(cfg, a, '/about') == render_page(cfg, b, '/about')
+    assert site_number(site_host(17)) == 17
+    assert site_number('www.' + site_host(4) + ':80') == 4
+    assert site_number('example.com') is None
+
+
+def test_farm_serves_sites_through_proxy():
+    import aiohttp
+
+    farm = SiteFarm(FarmConfig(sites=40, latency_ms=0, error_rate=0, broken_site_rate=0))
+    _, stop = run_in_thread(farm)
+    redirecting = next(n for n in range(40) if farm.spec(n).redirect)
+    spec = farm.spec(redirecting)
+
+    async def get(session, url, **kw):
+        async with session.get(url, proxy=farm.proxy_url, **kw) as resp:
+            return resp.status, await resp.text(), str(resp.url)
+
+    async def go():
+        async with aiohttp.ClientSession() as session:
+            base = f'http://{spec.host}'
+            return (await get(session, base + '/robots.txt'),
+                    await get(session, base + '/'),
+                    await get(session, base + spec.contact_path),
+                    await get(session, base + '/nope'),
+                    await get(session, 'http://elsewhere.example/'))
+
+    try:
+        robots, home, contact, missing, foreign = asyncio.run(go())
+    finally:
+        stop()
+    assert robots[0] == 200 and 'User-agent: *' in robots[1]
+    assert home[0] == 200 and home[2].endswith('/home')          # 301 followed
+    assert contact[0] == 200 and spec.phone in contact[1]
+    assert missing[0] == 404 and foreign[0] == 502
+    assert farm.pages == 2 and farm.statuses[301] == 1
+
+
+def test_bench_runs_enrich_on_the_farm():
+    import bench_crawl
+
+    farm = SiteFarm(FarmConfig(sites=12, latency_ms=1, error_rate=0))
+    _, stop = run_in_thread(farm)
+    work = tempfile.mkdtemp()
+    input_csv = os.path.join(work, 'farm_leads.csv')
+    farm.write_leads_csv(input_csv)
+    try:
+        wall, cpu, rss, code = bench_crawl.run_child('enrich', input_csv, work, farm.proxy_url, True,
+                                                     os.path.join(work, 'run.log'))
+    finally:
+        stop()
+    assert code == 0, open(os.path.join(work, 'run.log')).read()[-2000:]
+    q = bench_crawl.score_output(bench_crawl.find_output('enrich', input_csv), farm)
+    assert q['leads'] == 12 and farm.pages > 12
+    assert 0 < q['correct'] <= q['found']
+    # learned state stays in the scratch dir, not next to enrich.py
+    assert os.path.exists(os.path.join(work, 'crawl_path_stats.json'))
+
+
+def test_bench_runs_maps_enrich_async_on_the_farm():
+    import bench_crawl
+    import maps_enrich
+
+    farm = SiteFarm(FarmConfig(sites=12, latency_ms=1, error_rate=0))
+    _, stop = run_in_thread(farm)
+    work = tempfile.mkdtemp()
+    input_csv = os.path.join(work, 'farm_leads.csv')
+    farm.write_leads_csv(input_csv)
+    try:
+        wall, cpu, rss, code = bench_crawl.run_child('maps-async', input_csv, work, farm.proxy_url, True,
+                                                     os.path.join(work, 'run.log'))
+    finally:
+        stop()
+    assert code == 0, open(os.path.join(work, 'run.log')).read()[-2000:]
+    out = bench_crawl.find_output('maps-async', input_csv)
+    q = bench_crawl.score_output(out, farm)
+    assert q['leads'] == 12 and 0 < q['correct'] <= q['found']
+    with open(out, newline='', encoding='utf-8') as f:
+        assert next(csv.reader(f)) == maps_enrich.OUTPUT_COLUMNS
+    assert os.path.exists(os.path.join(work, 'crawl_path_stats.json'))
+
+
+if __name__ == '__main__':
+    test_specs_are_deterministic()
+    test_farm_serves_sites_through_proxy()
+    test_bench_runs_enrich_on_the_farm()
+    test_bench_runs_maps_enrich_async_on_the_farm()
+    print('✅ site farm OK')
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Tests for the streaming sitemap scanner and contact-intent ranking."""
+
+import gzip
+import os
+import sys
+sys.path.insert(0, os.path.dirname(__file__))
+
+from sitemaps import ContactRanker, SitemapScanner, child_score, discover_sync
+
+URLSET = b"""<?xml version="1.0" encoding="UTF-8"?>
+<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9"
+        xmlns:image="http://www.google.com/schemas/sitemap-image/1.1">
+  <url><loc>https://www.acme.lk/</loc></url>
+  <url><loc>https://www.acme.lk/blog/2024/01/new-office</loc></url>
+  <url><loc>https://www.acme.lk/contact-us/</loc>
+       <image:image><image:loc>https://cdn.acme.lk/map.png</image:loc></image:image></url>
+  <url><loc>https://acme.lk/about/leadership</loc></url>
+  <url><loc>https://other.lk/contact</loc></url>
+</urlset>"""
+
+INDEX = b"""<sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">
+  <sitemap><loc>https://acme.lk/post-sitemap.xml</loc></sitemap>
+  <sitemap><loc>https://acme.lk/page-sitemap.xml.gz</loc></sitemap>
+</sitemapindex>"""
+
+
+def _scan(body: bytes, chunk: int = 7):
+    sc = SitemapScanner()
+    out = []
+    for i in range(0, len(body), chunk):
+        out.extend(sc.feed(body[i:i + chunk]))
+    return out
+
+
+def test_streams_urlset_in_small_chunks():
+    entries = _scan(URLSET)
+    assert ('url', 'https://www.acme.lk/contact-us/') in entries
+    assert all(loc != 'https://cdn.acme.lk/map.png' for _, loc in entries)
+    assert len(entries) == 5
+
+
+def test_gzip_and_index_entries():
+    entries = _scan(gzip.compress(INDEX), chunk=16)
+    assert [k for k, _ in entries] == ['sitemap', 'sitemap']
+    pages, posts = 'https://acme.lk/page-sitemap.xml.gz', 'https://acme.lk/post-sitemap.xml'
+    assert child_score(pages) > child_score(posts)
+
+
+def test_byte_cap_and_broken_xml_stop_scanning():
+    sc = SitemapScanner(max_bytes=50)
+    sc.feed(URLSET)
+    assert sc.exhausted
+    bad = SitemapScanner()
+    bad.feed(b'<html><body>Not found</p></html>')
+    assert bad.exhausted
+
+
+def test_ranker_keeps_same_site_contact_intent_only():
+    r = ContactRanker('https://acme.lk', k=2)
+    for _, loc in _scan(URLSET):
+        r.offer(loc)
+    assert r.best() == ['https://www.acme.lk/contact-us/', 'https://acme.lk/about/leadership']
+
+
+def test_fetches_wait_their_turn_and_guesses_obey_robots():
+    import requests
+
+    class Resp:
+        status_code = 200
+
+        def __init__(self, body):
+            self.body = body
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def iter_content(self, size):
+            yield self.body
+
+    bodies = {'https://acme.lk/sitemap.xml': INDEX, 'https://acme.lk/page-sitemap.xml.gz': gzip.compress(URLSET)}
+    fetched, turns = [], []
+
+    def get(url, **kwargs):
+        fetched.append(url)
+        return Resp(bodies.get(url, b''))
+
+    saved, requests.get = requests.get, get
+    try:
+        found = discover_sync('https://acme.lk', before_request=lambda: turns.append(len(fetched)))
+        blocked = discover_sync('https://acme.lk', allowed=lambda url: False)
+    finally:
+        requests.get = saved
+    assert found[0] == 'https://www.acme.lk/contact-us/'
+    assert fetched == ['https://acme.lk/sitemap.xml', 'https://acme.lk/page-sitemap.xml.gz',
+                       'https://acme.lk/post-sitemap.xml']
+    assert turns == [0, 1, 2]                       # a rate-limit turn before every fetch
+    assert blocked == []                            # a disallowed /sitemap.xml is not even requested
+
+
+if __name__ == '__main__':
+    test_streams_urlset_in_small_chunks()
+    test_gzip_and_index_entries()
+    test_byte_cap_and_broken_xml_stop_scanning()
+    test_ranker_keeps_same_site_contact_intent_only()
+    test_fetches_wait_their_turn_and_guesses_obey_robots()
+    print('✅ sitemaps OK')
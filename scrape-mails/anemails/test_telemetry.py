@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""Tests for per-domain crawl telemetry and the report summary."""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+sys.path.insert(0, os.path.dirname(__file__))
+
+from telemetry import SiteTelemetry, TelemetryReport, format_summary, summarize, telemetry_path
+
+
+def test_report_and_summary():
+    path = telemetry_path(os.path.join(tempfile.mkdtemp(), 'leads_enriched_x.csv'))
+    assert path.endswith('leads_enriched_x_telemetry.jsonl')
+
+    with TelemetryReport(path) as report:
+        for i, (wall, requests, useful) in enumerate([(0.5, 3, 1), (9.0, 12, 0), (2.0, 6, 2), (4.0, 2, 1)]):
+            tel = SiteTelemetry(f'site{i}.lk')
+            tel.requests = requests
+            tel.status(200)
+            tel.status('timeout')
+            tel.ttfb(0.25)
+            tel.field_sources = {f'f{j}': f'https://site{i}.lk/p{j}' for j in range(useful)}
+            rec = tel.finish()
+            rec['wall_s'] = wall                     # fixed wall times for a stable ranking
+            report._f.write(json.dumps(rec) + '\n')
+        report.record(SiteTelemetry('dead.lk'), 'nxdomain')
+
+    s = summarize(path, top=2)
+    assert s['totals']['sites'] == 5 and s['totals']['requests'] == 23
+    assert s['statuses'] == {'200': 4, 'timeout': 4}
+    assert s['outcomes'] == {'ok': 4, 'nxdomain': 1}
+    assert [d['domain'] for d in s['slowest']] == ['site1.lk', 'site3.lk']
+    assert [d['domain'] for d in s['wasteful']] == ['site1.lk', 'site2.lk']
+    assert 'site1.lk' in format_summary(s)
+
+
+def test_scrape_site_fills_telemetry():
+    from aiohttp import ClientSession, web
+    import enrich
+
+    pages = {
+        '/':        '<a href="/contact">Contact us</a><a href="/blog">Blog</a>',
+        '/contact': '<p>Call +94 11 234 5678</p><a href="https://instagram.com/acme_lk">ig</a>',
+    }
+
+    async def go():
+        async def handler(req):
+            if req.path == '/robots.txt':
+                return web.Response(text='User-agent: *\nDisallow: /private\n')
+            if req.path in pages:
+                return web.Response(text=pages[req.path], content_type='text/html')
+            return web.Response(status=404)
+
+        app = web.Application()
+        app.router.add_get('/{tail:.*}', handler)
+        runner = web.AppRunner(app, access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, '127.0.0.1', 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+
+        saved = enrich.USE_SITEMAPS, enrich.MAX_RETRIES
+        enrich.USE_SITEMAPS, enrich.MAX_RETRIES = False, 0
+        try:
+            async with ClientSession() as session:
+                tel  = SiteTelemetry('127.0.0.1')
+                data = await enrich.scrape_site(
+                    session, f'http://127.0.0.1:{port}', enrich.AsyncRobots(), enrich.DomainLimiter(0),
+                    asyncio.get_running_loop(), stats=enrich.PathStats(os.devnull), tel=tel)
+        finally:
+            enrich.USE_SITEMAPS, enrich.MAX_RETRIES = saved
+            await runner.cleanup()
+        return data, tel, port
+
+    data, tel, port = asyncio.run(go())
+    rec = tel.finish()
+    assert data['phones'] == {'+94 11 234 5678'}
+    assert rec['statuses']['200'] == 2 and rec['pages_parsed'] == 2
+    assert rec['requests'] == sum(rec['statuses'].values())
+    assert rec['bytes'] == sum(len(p) for p in pages.values())
+    assert rec['field_sources']['phones'] == f'http://127.0.0.1:{port}/contact'
+    assert rec['field_sources']['instagram'] == rec['field_sources']['phones']
+    assert rec['ttfb_avg_ms'] is not None and rec['useful_pages'] == 1
+
+
+def test_phone_source_skips_the_seed():
+    import enrich
+
+    def page(*phones):
+        return {'emails': set(), 'phones': set(phones), 'is_contact': False, 'text_lower': '', 'html_lower': '',
+                **dict.fromkeys(('instagram', 'twitter', 'linkedin_company', 'linkedin_ceo', 'linkedin_founder',
+                                 'facebook', 'youtube'), '')}
+
+    agg = {'emails': set(), 'phones': {'+94 11 234 5678'}, 'contact_page_found': False,
+           'signals': enrich.SiteSignals(), 'sources': {'phones': 'input'},
+           **dict.fromkeys(('instagram', 'twitter', 'linkedin_company', 'linkedin_ceo', 'linkedin_founder',
+                            'facebook', 'youtube'), '')}
+    enrich._absorb_page(agg, page('+94 11 234 5678'), '/')               # only the seed again
+    assert agg['sources']['phones'] == 'input'
+    enrich._absorb_page(agg, page('+94 11 234 5678', '+94 77 123 4567'), '/contact')
+    enrich._absorb_page(agg, page('+94 71 000 0000'), '/about')
+    assert agg['sources']['phones'] == '/contact' and len(agg['phones']) == 3
+
+    tel = SiteTelemetry('acme.lk')
+    tel.field_sources = {'phones': 'input', 'emails': '/contact'}
+    assert tel.finish()['useful_pages'] == 1
+
+
+if __name__ == '__main__':
+    test_report_and_summary()
+    test_scrape_site_fills_telemetry()
+    test_phone_source_skips_the_seed()
+    print('✅ telemetry OK')
@@ -1,5 +1,7 @@
 import csv
+import os
 import re
+import sys
 import time
 import random
 import requests
@@ -7,6 +9,19 @@ from bs4 import BeautifulSoup
 from urllib.parse import urlparse, urljoin
 from collections import deque
 
+# Shared page cache and charset decoding from the enrichment tools, when deployed alongside them
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'anemails'))
+try:
+    from page_cache import cached_get as http_get
+except ImportError:
+    http_get = requests.get
+try:
+    from fetch_guard import response_html
+except ImportError:
+    def response_html(response):
+        response.encoding = response.apparent_encoding or 'utf-8'
+        return response.text
+
 # -----------------------------
 # CONFIGURATION
 # -----------------------------
@@ -65,10 +80,9 @@ def get_soup(url, timeout=EMAIL_TIMEOUT):
     headers = {'User-Agent': random.choice(user_agents)}
     for attempt in range(MAX_RETRIES + 1):
         try:
-            response = requests.get(url, timeout=timeout, headers=headers, allow_redirects=True)
+            response = http_get(url, timeout=timeout, headers=headers, allow_redirects=True)
             if response.status_code == 200:
-                response.encoding = response.apparent_encoding or 'utf-8'
-                return BeautifulSoup(response.text, 'html.parser')
+                return BeautifulSoup(response_html(response), 'html.parser')
         except:
             if attempt < MAX_RETRIES:
                 time.sleep(random.uniform(0.6, 1.0))